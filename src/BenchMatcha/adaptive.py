@@ -0,0 +1,388 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Adaptive input size selection, to discriminate competing complexity models.
+
+An initial (coarse) sweep of user registered input sizes is fit to all complexity
+models. While model selection is ambiguous, additional input sizes which best
+separate the two leading models are benchmarked in a subprocess, until the leading
+model is confident, or a time budget is exhausted.
+
+Google benchmark does not support running benchmarks more than once per process,
+so additional sizes are run in a fresh interpreter (``python -m
+BenchMatcha.adaptive``), re-registering benchmarks with overridden input sizes.
+
+"""
+
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+import numpy as np
+
+from .complexity import Criterion, FitResult, analyze_complexity, predict
+from .handlers import load
+from .sifter import BuilderProxy, Register, hook_registration
+from .structure import BenchmarkArray, BenchmarkContext, parse_version
+from .utils import _simple_stats
+from .worker import parser, register, run_benchmarks
+
+
+log: logging.Logger = logging.getLogger(__name__)
+
+# Benchmark builder methods which define input sizes (arguments).
+_SIZE_METHODS: frozenset[str] = frozenset(
+    {
+        "arg",
+        "args",
+        "range",
+        "ranges",
+        "dense_range",
+        "range_multiplier",
+        "args_product",
+        "apply",
+    }
+)
+
+
+@dataclass
+class AdaptiveOptions:
+    """Adaptive input size selection options.
+
+    Args:
+        paths (list[str]): benchmark file or directory paths, to re-register.
+        argv (list[str]): google benchmark command line arguments.
+        budget (float): maximum time (seconds) spent on additional input sizes.
+        confidence (float): model selection weight at which to stop.
+        sizes_per_round (int): number of additional input sizes run per round.
+        max_rounds (int): maximum number of rounds.
+        extend (float): largest candidate input size, relative to largest
+            registered input size.
+        criterion (Criterion): model selection criterion.
+        attribute (str): timing attribute ("cpu_time" | "real_time").
+
+    """
+
+    # pylint: disable=R0902
+    paths: list[str]
+    argv: list[str] = field(default_factory=list)
+    budget: float = 60.0
+    confidence: float = 0.95
+    sizes_per_round: int = 2
+    max_rounds: int = 8
+    extend: float = 4.0
+    criterion: Criterion = "bic"
+    attribute: str = "cpu_time"
+
+
+@contextmanager
+def override_sizes(
+    sizes: Mapping[str, Sequence[int]],
+    repetitions: int | None = None,
+) -> Iterator[None]:
+    """Override input sizes of benchmarks registered within context.
+
+    Args:
+        sizes (Mapping[str, Sequence[int]]): input sizes, keyed by benchmark name.
+        repetitions (int | None): number of repetitions, overriding user defined
+            repetitions, if provided.
+
+    """
+    ignored: frozenset[str] = _SIZE_METHODS
+    if repetitions is not None:
+        ignored = ignored | {"repetitions"}
+
+    def hook(name: str, func: Any, register: Register) -> Any:
+        benchmark = register(name, func)
+        if name not in sizes:
+            return benchmark
+        for n in sizes[name]:
+            benchmark.arg(int(n))
+        if repetitions is not None:
+            benchmark.repetitions(repetitions)
+
+        return BuilderProxy(benchmark, ignored)
+
+    with hook_registration(hook):
+        yield
+
+
+def model_weights(fits: Sequence[FitResult], criterion: Criterion) -> np.ndarray:
+    """Relative likelihood (e.g. Akaike weights) of each fit, summing to one."""
+    scores: np.ndarray = np.asarray([getattr(j, criterion) for j in fits], float)
+    if criterion == "rms" or not np.any(np.isfinite(scores)):
+        # NOTE: RMSD is not a likelihood, only the best fit carries weight.
+        weights = (scores == scores.min()).astype(np.float64)
+        return weights / weights.sum()
+
+    weights = np.exp(-0.5 * (scores - scores[np.isfinite(scores)].min()))
+
+    return weights / weights.sum()
+
+
+def candidate_sizes(
+    measured: np.ndarray,
+    extend: float,
+    density: int = 4,
+) -> np.ndarray:
+    """Log spaced integer input sizes, not already measured.
+
+    Args:
+        measured (np.ndarray): input sizes already benchmarked.
+        extend (float): largest candidate, relative to largest measured size.
+        density (int): number of candidates per octave (doubling).
+
+    Returns:
+        (np.ndarray) sorted candidate input sizes.
+
+    """
+    lower: float = max(float(measured.min()), 1.0)
+    upper: float = float(measured.max()) * max(extend, 1.0)
+    octaves: int = max(int(np.ceil(np.log2(upper / lower))), 1)
+    grid: np.ndarray = np.unique(
+        np.round(np.geomspace(lower, upper, octaves * density + 1)).astype(np.int64)
+    )
+
+    return np.setdiff1d(grid, measured)
+
+
+def discriminating_sizes(
+    benchmark: BenchmarkArray,
+    fits: Sequence[FitResult],
+    options: AdaptiveOptions,
+) -> np.ndarray:
+    """Select input sizes which best separate two leading complexity fits.
+
+    Separation is the absolute relative difference of both predictions, in units of
+    typical (relative) measurement noise.
+
+    Args:
+        benchmark (BenchmarkArray): benchmark measured so far.
+        fits (Sequence[FitResult]): complexity fits, sorted by criterion.
+        options (AdaptiveOptions): adaptive options.
+
+    Returns:
+        (np.ndarray) sorted input sizes, at most ``options.sizes_per_round``.
+
+    """
+    grid: np.ndarray = candidate_sizes(benchmark.size, options.extend)
+    if grid.size == 0 or len(fits) < 2:
+        return grid[:0]
+
+    mean, std = _simple_stats(getattr(benchmark, options.attribute))
+    noise: float = 1e-3
+    if np.any(valid := (mean > 0) & np.isfinite(std)):
+        noise = max(float(np.median(std[valid] / mean[valid])), noise)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        a: np.ndarray = predict(fits[0], grid.astype(np.float64))
+        b: np.ndarray = predict(fits[1], grid.astype(np.float64))
+        separation: np.ndarray = 2.0 * np.abs(a - b) / (np.abs(a) + np.abs(b))
+    separation[~np.isfinite(separation)] = -np.inf
+    separation /= noise
+
+    order: np.ndarray = np.argsort(-separation, kind="stable")
+    chosen: np.ndarray = order[np.isfinite(separation[order])]
+
+    return np.sort(grid[chosen[: options.sizes_per_round]])
+
+
+def next_sizes(
+    benchmark: BenchmarkArray,
+    options: AdaptiveOptions,
+) -> np.ndarray | None:
+    """Additional input sizes to benchmark, or None if selection is settled."""
+    fits: list[FitResult] = analyze_complexity(
+        benchmark.size.astype(np.float64),
+        getattr(benchmark, options.attribute),
+        options.criterion,
+    )
+    if len(fits) < 2:
+        return None
+
+    weights: np.ndarray = model_weights(fits, options.criterion)
+    log.debug(
+        "%s: leading model %s (weight=%.3f)",
+        benchmark.function,
+        fits[0].bigo,
+        weights[0],
+    )
+    if weights[0] >= options.confidence:
+        return None
+
+    sizes: np.ndarray = discriminating_sizes(benchmark, fits, options)
+
+    # NOTE: google benchmark only reports complexity for at least two input sizes.
+    return sizes if sizes.size >= 2 else None
+
+
+def merge(a: BenchmarkArray, b: BenchmarkArray) -> BenchmarkArray:
+    """Merge input sizes of two benchmark arrays of the same function.
+
+    Repetitions are padded (NaN timings, zero iterations) to the larger of both.
+    Complexity information is retained from the first benchmark array.
+
+    """
+    repeats: int = max(a.real_time.shape[1], b.real_time.shape[1])
+    order: np.ndarray = np.argsort(np.concatenate([a.size, b.size]), kind="stable")
+
+    def stack(attribute: str, fill: float) -> np.ndarray:
+        arrays: list[np.ndarray] = []
+        for j in (getattr(a, attribute), getattr(b, attribute)):
+            pad: int = repeats - j.shape[1]
+            arrays.append(np.pad(j, ((0, 0), (0, pad)), constant_values=fill))
+
+        return np.concatenate(arrays)[order]
+
+    return replace(
+        a,
+        size=np.concatenate([a.size, b.size])[order],
+        iterations=stack("iterations", 0),
+        real_time=stack("real_time", np.nan),
+        cpu_time=stack("cpu_time", np.nan),
+        threads=stack("threads", 1),
+        status=stack("status", 0),
+    )
+
+
+def benchmark_filter(names: Sequence[str]) -> str:
+    """Google benchmark filter (regex) matching only given benchmark names."""
+    return "^(" + "|".join(re.escape(j) for j in names) + ")/"
+
+
+def run_sizes(
+    sizes: Mapping[str, Sequence[int]],
+    options: AdaptiveOptions,
+    timeout: float,
+    repetitions: int | None = None,
+) -> BenchmarkContext | None:
+    """Benchmark input sizes in a subprocess, returning None on failure/timeout."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output: str = os.path.join(tmpdir, "adaptive.json")
+        command: list[str] = [
+            sys.executable,
+            "-m",
+            __name__,
+            "--sizes",
+            json.dumps({k: [int(n) for n in v] for k, v in sizes.items()}),
+            "--output",
+            output,
+            "--path",
+            *options.paths,
+        ]
+        if repetitions is not None:
+            command.extend(["--repetitions", str(repetitions)])
+        command.extend(["--", *options.argv])
+        try:
+            response = subprocess.run(
+                command,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                timeout=timeout,
+                check=False,
+            )
+        except subprocess.TimeoutExpired:
+            log.warning("Adaptive sizes exceeded time budget: %s", dict(sizes))
+            return None
+
+        if response.returncode != 0 or not os.path.exists(output):
+            log.error("Adaptive sizes failed: %s", response.stderr.decode())
+            return None
+
+        return parse_version(load(output))
+
+
+def refine(context: BenchmarkContext, options: AdaptiveOptions) -> BenchmarkContext:
+    """Adaptively benchmark additional input sizes, to discriminate complexity models.
+
+    Args:
+        context (BenchmarkContext): initial (coarse) benchmark results.
+        options (AdaptiveOptions): adaptive options.
+
+    Returns:
+        (BenchmarkContext) benchmark context, with merged additional input sizes.
+
+    """
+    start: float = time.monotonic()
+    merged: dict[str, BenchmarkArray] = {j.function: j for j in context.benchmarks}
+    pending: set[str] = set(merged)
+
+    for step in range(options.max_rounds):
+        sizes: dict[str, list[int]] = {}
+        for function in sorted(pending):
+            if (extra := next_sizes(merged[function], options)) is None:
+                pending.discard(function)
+                continue
+            sizes[function] = extra.tolist()
+
+        if not sizes:
+            break
+        if (remaining := options.budget - (time.monotonic() - start)) <= 0:
+            log.info("Adaptive time budget exhausted after %d rounds.", step)
+            break
+
+        log.debug("Adaptive round %d: %s", step, sizes)
+        if (result := run_sizes(sizes, options, remaining)) is None:
+            break
+        for bench in result.benchmarks:
+            if bench.function in merged:
+                merged[bench.function] = merge(merged[bench.function], bench)
+
+    return replace(context, benchmarks=[merged[j.function] for j in context.benchmarks])
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Benchmark (subprocess) entry point, with overridden input sizes."""
+    args = parser("python -m BenchMatcha.adaptive")
+    args.add_argument("--sizes", required=True, help="json of sizes by benchmark.")
+    args.add_argument("--repetitions", type=int, default=None)
+    known = args.parse_args(argv)
+
+    sizes: dict[str, list[int]] = json.loads(known.sizes)
+    register(known.path, override_sizes(sizes, known.repetitions))
+    run_benchmarks(
+        known.output,
+        [
+            *(j for j in known.others if not j.startswith("--benchmark_filter=")),
+            f"--benchmark_filter={benchmark_filter(list(sizes))}",
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Programmatic, re-entrant interface to run benchmarks.
+
+Google benchmark holds a global registry of benchmarks, and does not support running
+benchmarks more than once per process. Each call therefore registers and runs
+benchmarks within a child process, taken from a module owned pool of warm processes
+(spawned ahead of time, with google benchmark and BenchMatcha imported), so calls
+neither touch global state of the calling process (e.g. ``sys.argv``, or the shared
+multiprocessing fork server), nor pay for interpreter start-up. Calls are safe to
+repeat, and to make concurrently from a thread pool.
+
+For asyncio applications, ``arun`` supervises a worker subprocess per benchmark, and
+yields results of each benchmark as it finishes.
+
+Example:
+    >>> from BenchMatcha import api
+    >>> context = api.run(["benchmarks/"], ["bench_sort"], api.RunOptions(min_time=0.1))
+    >>> options = api.RunOptions(timeout=60.0)
+    >>> async for bench in api.arun(["benchmarks/"], options=options):
+    ...     save(bench)
+
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+
+from .handlers import load
+from .structure import (
+    BenchmarkArray,
+    BenchmarkContext,
+    convert_to_arrays,
+    get_benchmark_records,
+    get_complexity_info,
+    parse_version,
+)
+from .worker import command, register, run_benchmarks
+
+
+log: logging.Logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RunOptions:
+    """Options of a benchmark run.
+
+    Args:
+        argv (list[str]): additional google benchmark command line arguments.
+        min_time (float | None): minimum time (seconds) to run each benchmark.
+        timeout (float | None): maximum time (seconds) of a run, or of each benchmark
+            with ``arun``.
+        concurrency (int): maximum number of benchmarks run concurrently with
+            ``arun``. Concurrent benchmarks contend for resources, and may perturb
+            timings.
+
+    """
+
+    argv: list[str] = field(default_factory=list)
+    min_time: float | None = None
+    timeout: float | None = None
+    concurrency: int = 1
+
+
+class _Standby:
+    """Warm child process, awaiting the arguments of a single benchmark run."""
+
+    def __init__(self) -> None:
+        context = multiprocessing.get_context("spawn")
+        self.connection, child = context.Pipe()
+        self.process: BaseProcess = context.Process(
+            target=_standby, args=(child,), daemon=True
+        )
+        self.process.start()
+        child.close()
+
+    def run(self, *args: object) -> BaseProcess:
+        """Hand the arguments of a benchmark run to the child process, once ready.
+
+        Raises:
+            EOFError: child process exited before it was ready.
+            OSError: child process exited before receiving the arguments.
+
+        """
+        try:
+            self.connection.recv()
+            self.connection.send(args)
+        finally:
+            self.connection.close()
+
+        return self.process
+
+
+def _standby(connection: Connection) -> None:
+    """Await the arguments of a benchmark run, within a warm child process."""
+    connection.send(None)  # NOTE: ready, i.e. started and imported
+    try:
+        cwd, *args = connection.recv()
+    except EOFError:
+        return
+    os.chdir(cwd)
+    _worker(*args)
+
+
+_lock: threading.Lock = threading.Lock()
+_pool: list[_Standby] = []
+
+
+def _start(*args: object) -> BaseProcess:
+    """Start a benchmark run in a warm child process, replenishing the pool."""
+    with _lock:
+        standby: _Standby | None = _pool.pop() if _pool else None
+        _pool.append(_Standby())
+    # NOTE: runs within the current working directory of the caller
+    if standby is not None:
+        try:
+            return standby.run(os.getcwd(), *args)
+        except (EOFError, OSError):
+            standby.process.kill()
+
+    try:
+        return _Standby().run(os.getcwd(), *args)
+    except (EOFError, OSError) as e:
+        raise RuntimeError(f"Failed to start benchmark process: {e!r}") from e
+
+
+def _worker(paths: list[str], argv: list[str], output: str, errors: str) -> None:
+    """Register and run benchmarks, within a child process."""
+    with open(errors, "wb") as f:
+        os.dup2(f.fileno(), 2)
+    devnull: int = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+
+    register(paths)
+    run_benchmarks(output, argv)
+
+
+def _arguments(filters: Sequence[str] | None, options: RunOptions) -> list[str]:
+    """Google benchmark command line arguments of a run.
+
+    Raises:
+        ValueError: filters are given along with a filter within options.
+
+    """
+    if filters and any(j.startswith("--benchmark_filter=") for j in options.argv):
+        raise ValueError("Filters conflict with --benchmark_filter of options.argv.")
+    argv: list[str] = [
+        j
+        for j in options.argv
+        if not j.startswith(("--benchmark_out=", "--benchmark_out_format="))
+    ]
+    if filters:
+        argv.append("--benchmark_filter=" + "|".join(f"({j})" for j in filters))
+    if options.min_time is not None:
+        argv.append(f"--benchmark_min_time={options.min_time}s")
+
+    return argv
+
+
+def run(
+    paths: Sequence[str],
+    filters: Sequence[str] | None = None,
+    options: RunOptions | None = None,
+) -> BenchmarkContext:
+    """Run benchmarks, returning their results.
+
+    Args:
+        paths (Sequence[str]): benchmark file or directory paths.
+        filters (Sequence[str] | None): benchmark name filters (regex), of which any
+            must match. Defaults to all benchmarks.
+        options (RunOptions | None): run options.
+
+    Returns:
+        (BenchmarkContext) benchmark results.
+
+    Raises:
+        FileNotFoundError: a path does not exist.
+        ValueError: filters conflict with a filter within options.
+        TimeoutError: run exceeded its timeout.
+        RuntimeError: benchmarks failed to run.
+
+    """
+    options = options or RunOptions()
+    absolute: list[str] = [os.path.abspath(j) for j in paths]
+    for path in absolute:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Invalid benchmark path: {path}")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output: str = os.path.join(tmpdir, "run.json")
+        errors: str = os.path.join(tmpdir, "stderr.txt")
+        process: BaseProcess = _start(
+            absolute, _arguments(filters, options), output, errors
+        )
+        process.join(options.timeout)
+        if process.is_alive():
+            process.kill()
+            process.join()
+            raise TimeoutError(f"Benchmarks exceeded timeout: {options.timeout}s")
+
+        if process.exitcode != 0 or not os.path.exists(output):
+            message: str = ""
+            if os.path.exists(errors):
+                with open(errors, encoding="utf-8", errors="replace") as f:
+                    message = f.read().strip()
+            raise RuntimeError(
+                f"Benchmarks failed (exit code {process.exitcode}): {message}"
+            )
+
+        return parse_version(load(output))
+
+
+async def _list(paths: list[str], argv: list[str]) -> list[str]:
+    """Names of (filtered) benchmarks, listed by a worker subprocess."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        process = await asyncio.create_subprocess_exec(
+            *command(
+                os.path.join(tmpdir, "list.json"),
+                paths,
+                [*argv, "--benchmark_list_tests=true"],
+            ),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await process.communicate()
+    if process.returncode != 0:
+        raise RuntimeError(f"Failed to list benchmarks: {stderr.decode().strip()}")
+
+    # NOTE: listed per input size, e.g. "bench_sort/8/repeats:3"
+    names: dict[str, None] = {j.split("/")[0]: None for j in stdout.decode().split()}
+
+    return list(names)
+
+
+async def _run_benchmark(
+    name: str,
+    paths: list[str],
+    argv: list[str],
+    options: RunOptions,
+    semaphore: asyncio.Semaphore,
+) -> list[BenchmarkArray]:
+    """Run a benchmark in a worker subprocess, returning an empty list on failure.
+
+    The worker only registers the named benchmark, such that (filtered) arguments
+    select among its runs, e.g. input sizes.
+
+    """
+    async with semaphore:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output: str = os.path.join(tmpdir, "run.json")
+            process = await asyncio.create_subprocess_exec(
+                *command(output, paths, argv, [name]),
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            try:
+                _, stderr = await asyncio.wait_for(
+                    process.communicate(), options.timeout
+                )
+            except TimeoutError:
+                log.error("Benchmark %s exceeded timeout: %ss", name, options.timeout)
+                return []
+            finally:
+                # NOTE: on timeout or cancellation, never leave an orphan worker
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
+
+            if process.returncode != 0 or not os.path.exists(output):
+                log.error("Benchmark %s failed: %s", name, stderr.decode().strip())
+                return []
+            try:
+                records: list[dict] = load(output)["benchmarks"]
+                return convert_to_arrays(
+                    get_benchmark_records(records), get_complexity_info(records)
+                )
+
+            except (KeyError, ValueError) as e:
+                log.error("Benchmark %s results are invalid: %r", name, e)
+                return []
+
+
+async def arun(
+    paths: Sequence[str],
+    filters: Sequence[str] | None = None,
+    options: RunOptions | None = None,
+) -> AsyncIterator[BenchmarkArray]:
+    """Run benchmarks in worker subprocesses, yielding results as each finishes.
+
+    Each benchmark runs in its own subprocess, subject to a timeout. A benchmark which
+    fails or exceeds its timeout is logged, and skipped. Cancelling the consumer (or
+    closing the generator, e.g. with ``contextlib.aclosing``) kills running workers.
+
+    Args:
+        paths (Sequence[str]): benchmark file or directory paths.
+        filters (Sequence[str] | None): benchmark name filters (regex), of which any
+            must match. Defaults to all benchmarks.
+        options (RunOptions | None): run options.
+
+    Yields:
+        (BenchmarkArray) benchmark results, in order of completion.
+
+    Raises:
+        FileNotFoundError: a path does not exist.
+        ValueError: filters conflict with a filter within options.
+        RuntimeError: benchmarks failed to be listed (e.g. import errors).
+
+    """
+    options = options or RunOptions()
+    absolute: list[str] = [os.path.abspath(j) for j in paths]
+    for path in absolute:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Invalid benchmark path: {path}")
+
+    argv: list[str] = _arguments(filters, options)
+    names: list[str] = await _list(absolute, argv)
+    semaphore = asyncio.Semaphore(max(options.concurrency, 1))
+    tasks: list[asyncio.Task[list[BenchmarkArray]]] = [
+        asyncio.create_task(_run_benchmark(j, absolute, argv, options, semaphore))
+        for j in names
+    ]
+    try:
+        for future in asyncio.as_completed(tasks):
+            for bench in await future:
+                yield bench
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,610 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Command line arguments of the benchmatcha command and its subcommands."""
+
+import argparse
+import os
+
+from .limits import parse_memory
+
+
+def _add_common_arguments(args: argparse.ArgumentParser) -> None:
+    """Add command line arguments shared by all commands."""
+    args.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="Set Logging Level to DEBUG.",
+        required=False,
+    )
+    args.add_argument(
+        "-c",
+        "--color",
+        default=None,
+        help="Scatterplot marker color.",
+        required=False,
+    )
+    args.add_argument(
+        "-l",
+        "--line-color",
+        default=None,
+        help="Scatterplot complexity fit line color.",
+        required=False,
+    )
+    args.add_argument(
+        "-x",
+        "--x-axis",
+        default=None,
+        help="Maximum Number of units displayed on x-axis.",
+        required=False,
+        type=int,
+    )
+
+    cwd: str = os.getcwd()
+    args.add_argument(
+        "--config",
+        default=os.path.join(cwd, "pyproject.toml"),
+        help="Path location of pyproject.toml configuration file. "
+        "Defaults to Current Working Directory.",
+    )
+    args.add_argument(
+        "--cache",
+        default=os.path.join(cwd, ".benchmatcha"),
+        help="Path location of cache directory. Defaults to Current Working Directory.",
+    )
+
+
+def _add_significance_arguments(args: argparse.ArgumentParser) -> None:
+    """Add command line arguments of statistical comparison of benchmarks."""
+    args.add_argument(
+        "--alpha",
+        default=0.05,
+        type=float,
+        help="Significance level of comparison (one sided) tests.",
+    )
+    args.add_argument(
+        "--min-effect",
+        default=0.05,
+        type=float,
+        help="Minimum relative change of timing considered a regression.",
+    )
+
+
+def _add_revision_arguments(args: argparse.ArgumentParser) -> None:
+    """Add command line arguments of benchmarking git revisions in worktrees."""
+    args.add_argument(
+        "--repo",
+        default=os.getcwd(),
+        help="Path location of git repository. Defaults to Current Working Directory.",
+    )
+    args.add_argument(
+        "--build",
+        default=None,
+        help="Shell command building a revision, run within its worktree.",
+    )
+    args.add_argument(
+        "--real-time",
+        action="store_true",
+        help="Compare real (wall clock) time, instead of cpu time.",
+    )
+    _add_significance_arguments(args)
+
+
+def get_args() -> tuple[argparse.Namespace, list[str]]:
+    """Get BenchMatcha command line arguments and reset to support google_benchmark."""
+    args = argparse.ArgumentParser("benchmatcha", conflict_handler="error")
+    _add_common_arguments(args)
+    args.add_argument(
+        "-j",
+        "--jobs",
+        default=None,
+        help="Maximum number of processes used to render figures. "
+        "Defaults to the number of available cpus.",
+        required=False,
+        type=int,
+    )
+    args.add_argument(
+        "--path",
+        action="extend",
+        nargs="+",
+        help="Valid file or directory path to benchmarks.",
+    )
+    args.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Benchmark additional input sizes, which best discriminate between"
+        " competing complexity models.",
+    )
+    args.add_argument(
+        "--adaptive-budget",
+        default=60.0,
+        type=float,
+        help="Maximum time (seconds) spent on additional input sizes.",
+    )
+    args.add_argument(
+        "--adaptive-confidence",
+        default=0.95,
+        type=float,
+        help="Model selection weight (0-1) at which to stop adding input sizes.",
+    )
+    args.add_argument(
+        "--precision",
+        default=None,
+        type=float,
+        help="Rerun input sizes until the relative half width of the 95%% confidence"
+        " interval of mean real time is within precision (e.g. 0.02).",
+    )
+    args.add_argument(
+        "--precision-time-cap",
+        default=10.0,
+        type=float,
+        help="Maximum time (seconds) spent on additional repetitions, per benchmark.",
+    )
+    args.add_argument(
+        "--precision-max-repetitions",
+        default=50,
+        type=int,
+        help="Maximum number of repetitions per input size.",
+    )
+    args.add_argument(
+        "--time-budget",
+        default=None,
+        type=float,
+        help="Wall clock time budget (seconds) of benchmark run. Benchmarks run in"
+        " subprocesses, with minimum time and repetitions fit to the budget from"
+        " historical cost, most variable first. Partial results are saved.",
+    )
+    args.add_argument(
+        "--checkpoint",
+        action="store_true",
+        help="Run each benchmark in a subprocess, storing it as soon as it completes.",
+    )
+    args.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume an interrupted checkpointed run, skipping completed benchmarks.",
+    )
+    args.add_argument(
+        "--run-id",
+        default=None,
+        help="Run identifier of a checkpointed run. Defaults to the interrupted run"
+        " (with --resume), or a new identifier.",
+    )
+    args.add_argument(
+        "--run-timeout",
+        default=None,
+        type=float,
+        help="Maximum wall clock time (seconds) of each benchmark run, i.e. input size"
+        " and repetition. Benchmarks run in subprocesses, where runs exceeding it are"
+        " recorded as timed out, and remaining benchmarks continue.",
+    )
+    args.add_argument(
+        "--memory-limit",
+        default=None,
+        type=parse_memory,
+        help="Maximum memory (e.g. 512M, 2G) allocated by benchmarks. Benchmarks run"
+        " in subprocesses, where runs exceeding it are recorded as out of memory.",
+    )
+    args.add_argument(
+        "--sample-noise",
+        action="store_true",
+        help="Sample system noise (load, busy cores, cpu frequency) in the background,"
+        " stored with the run, and flag benchmarks which ran during a noise spike.",
+    )
+    args.add_argument(
+        "--noise-interval",
+        default=0.25,
+        type=float,
+        help="Seconds between system noise samples.",
+    )
+    args.add_argument(
+        "--noise-reruns",
+        default=0,
+        type=int,
+        help="Maximum number of reruns of benchmarks which ran during a noise spike.",
+    )
+    args.add_argument(
+        "--no-report",
+        action="store_true",
+        help="Skip rendering figures to the html report, only storing results.",
+    )
+
+    # Capture anything that doesn't fit (to be fed downstream to google_benchmark cli)
+    args.add_argument("others", nargs=argparse.REMAINDER)
+    known, unknown = args.parse_known_args()
+
+    return known, unknown
+
+
+def get_plot_args(argv: list[str]) -> argparse.Namespace:
+    """Get command line arguments of plot command."""
+    args = argparse.ArgumentParser(
+        "benchmatcha plot",
+        description="Plot benchmark history (pulling from database).",
+        conflict_handler="error",
+    )
+    _add_common_arguments(args)
+    args.add_argument(
+        "--min-date",
+        default=None,
+        help="Filter data after minimum date (inclusive).",
+    )
+    args.add_argument(
+        "--max-date",
+        default=None,
+        help="Filter data before date (inclusive).",
+    )
+    args.add_argument("--host", default=None, help="Filter data by specific host.")
+    args.add_argument("--os", default=None, help="Filter data by specific OS type.")
+    args.add_argument(
+        "--function",
+        default=None,
+        help="Filter data to present a specific function name.",
+    )
+    args.add_argument(
+        "--max-points",
+        default=2000,
+        type=int,
+        help="Maximum number of points drawn per input size (LTTB downsampling).",
+    )
+    args.add_argument(
+        "--metric",
+        default="time",
+        choices=["time", "ns_per_element", "throughput"],
+        help="Plotted metric: absolute time, time per element, or throughput.",
+    )
+    args.add_argument(
+        "--divergence",
+        action="store_true",
+        help="Include real / cpu time ratio history figures.",
+    )
+    args.add_argument(
+        "-o",
+        "--output",
+        default=None,
+        help="Path location of html output. Defaults to history.html in cache.",
+    )
+
+    return args.parse_args(argv)
+
+
+def get_compare_args(argv: list[str]) -> argparse.Namespace:
+    """Get command line arguments of compare command."""
+    args = argparse.ArgumentParser(
+        "benchmatcha compare",
+        description="Overlay benchmark functions and/or git revisions on one figure.",
+        conflict_handler="error",
+    )
+    _add_common_arguments(args)
+    args.add_argument(
+        "--function",
+        action="extend",
+        nargs="+",
+        required=True,
+        help="Function name(s) to compare.",
+    )
+    args.add_argument(
+        "--sha",
+        action="extend",
+        nargs="+",
+        default=None,
+        help="Git sha(s) to compare. Defaults to the latest run of each function.",
+    )
+    args.add_argument("--host", default=None, help="Filter data by specific host.")
+    args.add_argument("--os", default=None, help="Filter data by specific OS type.")
+    args.add_argument(
+        "--real-time",
+        action="store_true",
+        help="Compare real (wall clock) time, instead of cpu time.",
+    )
+    _add_significance_arguments(args)
+    args.add_argument(
+        "-o",
+        "--output",
+        default=None,
+        help="Path location of html output. Defaults to compare.html in cache.",
+    )
+
+    return args.parse_args(argv)
+
+
+def get_changepoint_args(argv: list[str]) -> argparse.Namespace:
+    """Get command line arguments of changepoints command."""
+    args = argparse.ArgumentParser(
+        "benchmatcha changepoints",
+        description="Detect shifts across the stored history of each function and"
+        " input size, reporting the first git sha after each shift.",
+        conflict_handler="error",
+    )
+    _add_common_arguments(args)
+    args.add_argument("--function", default=None, help="Filter data by function.")
+    args.add_argument("--host", default=None, help="Filter data by specific host.")
+    args.add_argument("--os", default=None, help="Filter data by specific OS type.")
+    args.add_argument(
+        "--min-date",
+        default=None,
+        help="Filter data after minimum date (inclusive).",
+    )
+    args.add_argument(
+        "--max-date",
+        default=None,
+        help="Filter data before date (inclusive).",
+    )
+    args.add_argument(
+        "--real-time",
+        action="store_true",
+        help="Analyze real (wall clock) time, instead of cpu time.",
+    )
+    args.add_argument(
+        "--penalty",
+        default=3.0,
+        type=float,
+        help="Change point penalty, as a multiple of log(number of runs).",
+    )
+    args.add_argument(
+        "-j",
+        "--jobs",
+        default=None,
+        type=int,
+        help="Maximum number of worker processes. Defaults to the number of cpus.",
+    )
+    args.add_argument(
+        "-o",
+        "--output",
+        default=None,
+        help="Path location of json output. Defaults to changepoints.json in cache.",
+    )
+
+    return args.parse_args(argv)
+
+
+def get_bisect_args(argv: list[str]) -> tuple[argparse.Namespace, list[str]]:
+    """Get command line arguments of bisect command, and google benchmark args."""
+    args = argparse.ArgumentParser(
+        "benchmatcha bisect",
+        description="Binary search the first git revision where a benchmark regressed.",
+        conflict_handler="error",
+    )
+    _add_common_arguments(args)
+    args.add_argument("--good", required=True, help="Revision without regression.")
+    args.add_argument("--bad", required=True, help="Revision with regression.")
+    args.add_argument("--function", required=True, help="Benchmark function name.")
+    args.add_argument(
+        "--path",
+        action="extend",
+        nargs="+",
+        required=True,
+        help="Benchmark file(s) or directory(ies), within the repository.",
+    )
+    _add_revision_arguments(args)
+    args.add_argument(
+        "--timeout",
+        default=None,
+        type=float,
+        help="Maximum seconds to build and benchmark each revision.",
+    )
+    args.add_argument(
+        "-o",
+        "--output",
+        default=None,
+        help="Path location of json output. Defaults to bisect.json in cache.",
+    )
+
+    return args.parse_known_args(argv)
+
+
+def get_ab_args(argv: list[str]) -> tuple[argparse.Namespace, list[str]]:
+    """Get command line arguments of A/B command, and google benchmark args."""
+    args = argparse.ArgumentParser(
+        "benchmatcha ab",
+        description="Compare two git revisions with interleaved benchmark runs.",
+        conflict_handler="error",
+    )
+    _add_common_arguments(args)
+    args.add_argument("--baseline", required=True, help="Baseline revision (A).")
+    args.add_argument("--candidate", required=True, help="Candidate revision (B).")
+    args.add_argument(
+        "--path",
+        action="extend",
+        nargs="+",
+        required=True,
+        help="Benchmark file(s) or directory(ies), within the repository.",
+    )
+    args.add_argument(
+        "--function",
+        action="extend",
+        nargs="+",
+        default=[],
+        help="Benchmark function name(s). Defaults to all.",
+    )
+    args.add_argument(
+        "--rounds",
+        default=10,
+        type=int,
+        help="Number of interleaved rounds, i.e. paired samples of each benchmark.",
+    )
+    _add_revision_arguments(args)
+    args.set_defaults(min_effect=0.01)
+    args.add_argument(
+        "--timeout",
+        default=None,
+        type=float,
+        help="Maximum seconds to build a revision, or to benchmark a round.",
+    )
+    args.add_argument(
+        "-o",
+        "--output",
+        default=None,
+        help="Path location of json output. Defaults to ab.json in cache.",
+    )
+
+    return args.parse_known_args(argv)
+
+
+def get_watch_args(argv: list[str]) -> tuple[argparse.Namespace, list[str]]:
+    """Get command line arguments of watch command, and google benchmark args."""
+    args = argparse.ArgumentParser(
+        "benchmatcha watch",
+        description="Rerun benchmarks of changed files, reporting differences.",
+        conflict_handler="error",
+    )
+    _add_common_arguments(args)
+    args.add_argument(
+        "--path",
+        action="extend",
+        nargs="+",
+        required=True,
+        help="Benchmark file(s) or directory(ies) to watch.",
+    )
+    args.add_argument(
+        "--real-time",
+        action="store_true",
+        help="Compare real (wall clock) time, instead of cpu time.",
+    )
+    _add_significance_arguments(args)
+    args.add_argument(
+        "--interval",
+        default=0.25,
+        type=float,
+        help="Polling interval (seconds), where inotify is unavailable.",
+    )
+    args.add_argument(
+        "--max-iterations",
+        default=None,
+        type=int,
+        help="Stop after a number of benchmark runs. Defaults to watch indefinitely.",
+    )
+
+    return args.parse_known_args(argv)
+
+
+def get_coordinator_args(argv: list[str]) -> tuple[argparse.Namespace, list[str]]:
+    """Get command line arguments of coordinator command, and google benchmark args."""
+    args = argparse.ArgumentParser(
+        "benchmatcha coordinator",
+        description="Hand out benchmark shards to workers, storing their results.",
+        conflict_handler="error",
+    )
+    _add_common_arguments(args)
+    args.add_argument(
+        "--path",
+        action="extend",
+        nargs="+",
+        required=True,
+        help="Benchmark file(s) or directory(ies), relative to working directory of"
+        " workers.",
+    )
+    args.add_argument(
+        "--function",
+        action="extend",
+        nargs="+",
+        default=[],
+        help="Benchmark function name(s). Defaults to all.",
+    )
+    args.add_argument(
+        "--bind",
+        default="127.0.0.1",
+        help="Address to bind coordinator. Defaults to the loopback interface. Any"
+        " peer able to connect may store results, and workers run benchmarks sent by"
+        " the coordinator, so only bind other interfaces on a trusted network.",
+    )
+    args.add_argument("--port", default=8765, type=int, help="Coordinator port.")
+    args.add_argument(
+        "--shard-size",
+        default=1,
+        type=int,
+        help="Number of benchmark functions handed out to a worker at once.",
+    )
+    args.add_argument(
+        "--max-attempts",
+        default=3,
+        type=int,
+        help="Maximum times a shard is handed out, when workers disconnect.",
+    )
+
+    return args.parse_known_args(argv)
+
+
+def get_worker_args(argv: list[str]) -> argparse.Namespace:
+    """Get command line arguments of worker command."""
+    args = argparse.ArgumentParser(
+        "benchmatcha worker",
+        description="Run benchmark shards handed out by a coordinator.",
+        conflict_handler="error",
+    )
+    _add_common_arguments(args)
+    args.add_argument(
+        "--connect",
+        required=True,
+        help="Coordinator address, as host:port.",
+    )
+    args.add_argument(
+        "--host",
+        default=None,
+        help="Host name reported with results. Defaults to the machine host name.",
+    )
+    args.add_argument(
+        "--timeout",
+        default=None,
+        type=float,
+        help="Maximum seconds to benchmark a shard.",
+    )
+    args.add_argument(
+        "--retry",
+        default=10.0,
+        type=float,
+        help="Seconds to retry connecting to the coordinator.",
+    )
+
+    return args.parse_args(argv)
+
+
+def get_serve_args(argv: list[str]) -> argparse.Namespace:
+    """Get command line arguments of serve command."""
+    args = argparse.ArgumentParser(
+        "benchmatcha serve",
+        description="Serve a local dashboard of benchmark history.",
+        conflict_handler="error",
+    )
+    _add_common_arguments(args)
+    args.add_argument(
+        "--bind",
+        default="127.0.0.1",
+        help="Address to bind server. Defaults to localhost.",
+    )
+    args.add_argument("--port", default=8000, type=int, help="Server port.")
+    args.add_argument(
+        "--lru-size",
+        default=512,
+        type=int,
+        help="Maximum number of decoded benchmark arrays held in memory.",
+    )
+
+    return args.parse_args(argv)
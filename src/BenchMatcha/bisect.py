@@ -0,0 +1,289 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Automated git bisection of a performance regression.
+
+Each candidate revision is checked out into a temporary git worktree (optionally
+built), and only the affected benchmark is run in a subprocess. Revisions are binary
+searched, comparing each candidate against the known good revision with the same
+statistical test as the compare command. Raw results are cached per sha, such that
+repeated bisections do not rerun anything.
+
+"""
+
+import contextlib
+import hashlib
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from collections.abc import Iterator
+from dataclasses import dataclass, field, replace
+
+import orjson
+
+from .comparison import Comparison, compare_arrays
+from .handlers import load
+from .structure import BenchmarkArray, parse_version
+from .worker import environment, run_worker
+
+
+log: logging.Logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BisectOptions:
+    """Options of a bisection.
+
+    Args:
+        repo (str): path location of git repository.
+        good (str): revision without regression.
+        bad (str): revision with regression.
+        function (str): benchmark function name.
+        paths (list[str]): benchmark paths, relative to repository root.
+        cache_dir (str): path location of cache directory.
+        argv (list[str]): additional google benchmark arguments.
+        build (str | None): shell command to build a revision, within its worktree.
+        attribute (str): timing attribute ("cpu_time" | "real_time").
+        alpha (float): significance level of comparison test.
+        min_effect (float): minimum relative change of timing of a regression.
+        timeout (float | None): maximum seconds to build and benchmark a revision.
+
+    """
+
+    # pylint: disable=R0902
+
+    repo: str
+    good: str
+    bad: str
+    function: str
+    paths: list[str]
+    cache_dir: str
+    argv: list[str] = field(default_factory=list)
+    build: str | None = None
+    attribute: str = "cpu_time"
+    alpha: float = 0.05
+    min_effect: float = 0.05
+    timeout: float | None = None
+
+
+@dataclass
+class Step:
+    """Comparison of a tested revision against the good revision.
+
+    Args:
+        sha (str): tested revision.
+        comparison (Comparison): comparison against good revision.
+
+    """
+
+    sha: str
+    comparison: Comparison
+
+
+@dataclass
+class BisectResult:
+    """Outcome of a bisection.
+
+    Args:
+        culprit (str | None): first revision with regression, if found.
+        steps (list[Step]): tested revisions, in order of testing.
+
+    """
+
+    culprit: str | None
+    steps: list[Step]
+
+
+def git(repo: str, *args: str) -> str:
+    """Run a git command within repository, returning its stripped output."""
+    return subprocess.check_output(
+        ["git", *args], cwd=repo, text=True, stderr=subprocess.PIPE
+    ).strip()
+
+
+def revisions(repo: str, good: str, bad: str) -> list[str]:
+    """Full shas from good to bad revision (inclusive), in topological order.
+
+    Raises:
+        ValueError: bad revision is not a descendant of good revision.
+
+    """
+    start: str = git(repo, "rev-parse", "--verify", f"{good}^{{commit}}")
+    path: str = git(repo, "rev-list", "--reverse", "--ancestry-path", f"{start}..{bad}")
+    if not path:
+        raise ValueError(f"Revision {bad} is not a descendant of {good}.")
+
+    return [start, *path.split()]
+
+
+@contextlib.contextmanager
+def worktree(repo: str, sha: str) -> Iterator[str]:
+    """Check out a revision into a temporary (detached) git worktree."""
+    path: str = tempfile.mkdtemp(prefix=f"benchmatcha-{sha[:12]}-")
+    git(repo, "worktree", "add", "--detach", "--force", path, sha)
+    try:
+        yield path
+    finally:
+        git(repo, "worktree", "remove", "--force", path)
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def cache_path(options: BisectOptions, sha: str) -> str:
+    """Path location of cached raw results of a revision."""
+    digest = hashlib.sha256(
+        orjson.dumps(
+            [sha, options.function, options.paths, options.argv, options.build]
+        )
+    ).hexdigest()[:16]
+
+    return os.path.join(options.cache_dir, "bisect", f"{sha}-{digest}.json")
+
+
+def build_revision(path: str, command: str, timeout: float | None = None) -> None:
+    """Build a revision with a shell command, within its worktree.
+
+    Raises:
+        subprocess.CalledProcessError: build command failed.
+        subprocess.TimeoutExpired: build command exceeded timeout.
+
+    """
+    log.debug("Building %s: %s", path, command)
+    subprocess.run(
+        command,
+        shell=True,
+        cwd=path,
+        env=environment(path),
+        check=True,
+        timeout=timeout,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def _benchmark_revision(options: BisectOptions, sha: str, output: str) -> bool:
+    """Build and benchmark a revision within a worktree, writing raw json output."""
+    with worktree(options.repo, sha) as path:
+        if options.build:
+            build_revision(path, options.build, options.timeout)
+
+        return run_worker(
+            path,
+            options.paths,
+            [options.function],
+            options.argv,
+            output,
+            options.timeout,
+        )
+
+
+def run_revision(options: BisectOptions, sha: str) -> BenchmarkArray | None:
+    """Benchmark function at a revision, reusing cached results when available.
+
+    Args:
+        options (BisectOptions): bisection options.
+        sha (str): full revision sha.
+
+    Returns:
+        (BenchmarkArray | None) benchmark array, or None on failure.
+
+    """
+    path: str = cache_path(options, sha)
+    if os.path.exists(path):
+        log.debug("Reusing cached results of %s: %s", sha, path)
+    else:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp: str = f"{path}.{os.getpid()}.tmp"
+        try:
+            if not _benchmark_revision(options, sha, tmp):
+                return None
+            os.replace(tmp, path)
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
+            log.error("Revision %s failed: %s", sha, e)
+            return None
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    context = replace(parse_version(load(path)), git_sha=sha)
+    for bench in context.benchmarks:
+        if bench.function == options.function:
+            return bench
+    log.error("Benchmark %s not found at revision %s.", options.function, sha)
+
+    return None
+
+
+def bisect(options: BisectOptions) -> BisectResult:
+    """Binary search the first revision where a benchmark regressed.
+
+    Args:
+        options (BisectOptions): bisection options.
+
+    Returns:
+        (BisectResult) first bad revision (if any), and tested revisions.
+
+    """
+    revs: list[str] = revisions(options.repo, options.good, options.bad)
+    steps: list[Step] = []
+    if (baseline := run_revision(options, revs[0])) is None:
+        log.error("Unable to benchmark good revision %s, aborted.", options.good)
+        return BisectResult(None, steps)
+
+    def regressed(index: int) -> bool | None:
+        if (candidate := run_revision(options, revs[index])) is None:
+            return None
+        result: Comparison = compare_arrays(
+            baseline,
+            candidate,
+            options.attribute,
+            options.alpha,
+            options.min_effect,
+        )
+        steps.append(Step(revs[index], result))
+        log.info("%s: x%.3f (p=%.3g)", revs[index], result.ratio, result.pvalue)
+
+        return result.regressed
+
+    lo, hi = 0, len(revs) - 1
+    if (verdict := regressed(hi)) is None:
+        log.error("Unable to benchmark bad revision %s, aborted.", options.bad)
+        return BisectResult(None, steps)
+    if not verdict:
+        log.warning("No regression between %s and %s.", options.good, options.bad)
+        return BisectResult(None, steps)
+
+    while hi - lo > 1:
+        mid: int = (lo + hi) // 2
+        if (verdict := regressed(mid)) is None:
+            log.error("Unable to benchmark revision %s, aborted.", revs[mid])
+            return BisectResult(None, steps)
+        lo, hi = (lo, mid) if verdict else (mid, hi)
+
+    return BisectResult(revs[hi], steps)
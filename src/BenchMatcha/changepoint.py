@@ -0,0 +1,337 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Offline change point detection across the full benchmark history.
+
+Each function x input size series of mean timings (log scale) in the result store
+is segmented by PELT (pruned exact linear time), with a normal mean shift cost.
+Series of equal length are batched, such that the dynamic program is vectorized
+across series, and batches are distributed over a process pool. Each detected
+shift is reported with the first git sha after it, and its effect size.
+
+"""
+
+import logging
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import groupby
+
+import numpy as np
+
+from .store import Query, ResultStore, RunInfo
+from .structure import BenchmarkArray
+from .utils import _robust_stats, _simple_stats
+
+
+log: logging.Logger = logging.getLogger(__name__)
+
+# Minimum noise (standard deviation of log time), to avoid segmenting exact data.
+_MIN_NOISE: float = 1e-3
+
+
+@dataclass
+class Series:
+    """Time series of mean timing of a function and input size, across runs of a host.
+
+    Args:
+        function (str): function name or alias.
+        size (int): input size.
+        runs (list[RunInfo]): metadata of each run (of a single host), in
+            chronological order.
+        values (np.ndarray): log mean timing of each run.
+
+    """
+
+    function: str
+    size: int
+    runs: list[RunInfo]
+    values: np.ndarray
+
+
+@dataclass
+class ChangePoint:
+    """Detected shift of a benchmark timing series.
+
+    Args:
+        function (str): function name or alias.
+        size (int): input size.
+        host_name (str): host machine name of series.
+        index (int): index of first run after shift.
+        git_sha (str): git commit description of first run after shift.
+        date (datetime): date of first run after shift.
+        ratio (float): geometric mean timing after, relative to before, shift.
+        effect (float): standardized effect size (shift of log timing, in units
+            of series noise).
+
+    """
+
+    function: str
+    size: int
+    host_name: str
+    index: int
+    git_sha: str
+    date: datetime
+    ratio: float
+    effect: float
+
+
+def collect_series(
+    history: Iterable[tuple[RunInfo, BenchmarkArray]],
+    attribute: str = "cpu_time",
+) -> list[Series]:
+    """Arrange stored benchmark history into function x host x input size series.
+
+    Timings of different hosts are not comparable, thus form separate series.
+
+    Args:
+        history (Iterable[tuple[RunInfo, BenchmarkArray]]): run metadata and
+            benchmark arrays, ordered by function and date (see ResultStore.history).
+        attribute (str): timing attribute ("cpu_time" | "real_time").
+
+    Returns:
+        (list[Series]) series of each function, host and input size.
+
+    """
+    result: list[Series] = []
+    for function, group in groupby(history, key=lambda x: x[1].function):
+        hosts: dict[str, list[tuple[RunInfo, BenchmarkArray]]] = {}
+        for info, bench in group:
+            hosts.setdefault(info.host_name, []).append((info, bench))
+
+        for _, entries in sorted(hosts.items()):
+            runs: list[RunInfo] = []
+            sizes: dict[int, list[tuple[int, float]]] = {}
+            for row, (info, bench) in enumerate(entries):
+                runs.append(info)
+                mean, _ = _simple_stats(getattr(bench, attribute))
+                for size, value in zip(bench.size.tolist(), mean.tolist(), strict=True):
+                    if value > 0:
+                        sizes.setdefault(size, []).append((row, np.log(value)))
+
+            for size, points in sorted(sizes.items()):
+                rows, values = zip(*points, strict=True)
+                result.append(
+                    Series(function, size, [runs[j] for j in rows], np.asarray(values))
+                )
+
+    return result
+
+
+def noise(x: np.ndarray) -> np.ndarray:
+    """Robust noise (standard deviation) of each series, from successive differences.
+
+    Differencing removes level shifts, such that noise is not inflated by them.
+
+    Args:
+        x (np.ndarray): series (n_series x n_runs).
+
+    Returns:
+        (np.ndarray) noise of each series.
+
+    """
+    if x.shape[1] < 2:
+        return np.full(x.shape[0], _MIN_NOISE)
+    _, scale = _robust_stats(np.diff(x, axis=1))
+
+    return np.maximum(scale / np.sqrt(2.0), _MIN_NOISE)
+
+
+def pelt(
+    x: np.ndarray,
+    penalty: np.ndarray,
+    min_size: int = 2,
+) -> list[np.ndarray]:
+    """Detect mean shifts of many (equal length) series with PELT.
+
+    The optimal partitioning recursion is evaluated for all series at once.
+    Candidates pruned by PELT are masked, per series.
+
+    Args:
+        x (np.ndarray): standardized series (n_series x n_runs).
+        penalty (np.ndarray): cost of each change point, per series.
+        min_size (int): minimum number of runs per segment.
+
+    Returns:
+        (list[np.ndarray]) indices of first run of each new segment, per series.
+
+    """
+    batch, n = x.shape
+    s1: np.ndarray = np.zeros((batch, n + 1))
+    s2: np.ndarray = np.zeros((batch, n + 1))
+    np.cumsum(x, axis=1, out=s1[:, 1:])
+    np.cumsum(x * x, axis=1, out=s2[:, 1:])
+
+    rows: np.ndarray = np.arange(batch)
+    best: np.ndarray = np.full((batch, n + 1), np.inf)
+    best[:, 0] = -penalty
+    last: np.ndarray = np.zeros((batch, n + 1), dtype=np.int64)
+    active: np.ndarray = np.ones((batch, n + 1), dtype=bool)
+    for t in range(min_size, n + 1):
+        s: np.ndarray = np.arange(t - min_size + 1)
+        a: np.ndarray = s1[:, t, None] - s1[:, s]
+        cost: np.ndarray = s2[:, t, None] - s2[:, s] - a * a / (t - s)
+        total: np.ndarray = np.where(active[:, s], best[:, s] + cost, np.inf)
+        arg: np.ndarray = np.argmin(total, axis=1)
+        best[:, t] = total[rows, arg] + penalty
+        last[:, t] = arg
+        active[:, s] &= total <= best[:, t, None]
+
+    result: list[np.ndarray] = []
+    for row in range(batch):
+        points: list[int] = []
+        t = int(last[row, n])
+        while t > 0:
+            points.append(t)
+            t = int(last[row, t])
+        result.append(np.asarray(points[::-1], dtype=np.int64))
+
+    return result
+
+
+def _detect_batch(
+    x: np.ndarray,
+    penalty_scale: float,
+    min_size: int,
+) -> list[np.ndarray]:
+    """Standardize a batch of equal length series, and detect change points."""
+    scale: np.ndarray = noise(x)
+    penalty: np.ndarray = np.full(x.shape[0], penalty_scale * np.log(x.shape[1]))
+
+    return pelt(x / scale[:, None], penalty, min_size)
+
+
+def _batches(series: Sequence[Series], chunk: int) -> list[list[int]]:
+    """Group series indices by length, in chunks of at most `chunk` series."""
+    order: list[int] = sorted(range(len(series)), key=lambda j: series[j].values.size)
+    result: list[list[int]] = []
+    for _, group in groupby(order, key=lambda j: series[j].values.size):
+        indices: list[int] = list(group)
+        result.extend(indices[j : j + chunk] for j in range(0, len(indices), chunk))
+
+    return result
+
+
+def _change_points(series: Series, points: np.ndarray) -> list[ChangePoint]:
+    """Describe detected shifts of a series, relative to the preceding segment."""
+    scale: float = float(noise(series.values[None, :])[0])
+    bounds: list[int] = [0, *points.tolist(), series.values.size]
+    result: list[ChangePoint] = []
+    for j, index in enumerate(points.tolist()):
+        before: float = float(series.values[bounds[j] : index].mean())
+        after: float = float(series.values[index : bounds[j + 2]].mean())
+        info: RunInfo = series.runs[index]
+        result.append(
+            ChangePoint(
+                function=series.function,
+                size=series.size,
+                host_name=info.host_name,
+                index=index,
+                git_sha=info.git_sha,
+                date=info.date,
+                ratio=float(np.exp(after - before)),
+                effect=(after - before) / scale,
+            )
+        )
+
+    return result
+
+
+def detect_changes(
+    series: Sequence[Series],
+    penalty_scale: float = 3.0,
+    min_size: int = 2,
+    workers: int | None = None,
+    chunk: int = 256,
+) -> list[ChangePoint]:
+    """Detect shifts of many benchmark timing series.
+
+    Args:
+        series (Sequence[Series]): function x input size series.
+        penalty_scale (float): change point penalty, as a multiple of log(n_runs).
+        min_size (int): minimum number of runs per segment.
+        workers (int | None): maximum number of worker processes. Defaults to the
+            number of available cpus. Detection is performed in process when 1.
+        chunk (int): maximum number of series per (vectorized) batch.
+
+    Returns:
+        (list[ChangePoint]) detected shifts, ordered by function, host, size and
+        date.
+
+    """
+    valid: list[Series] = [j for j in series if j.values.size >= 2 * min_size]
+    batches: list[list[int]] = _batches(valid, chunk)
+    arrays: list[np.ndarray] = [
+        np.stack([valid[j].values for j in batch]) for batch in batches
+    ]
+    scales: list[float] = [penalty_scale] * len(arrays)
+    sizes: list[int] = [min_size] * len(arrays)
+
+    detected: Iterable[list[np.ndarray]]
+    if len(arrays) > 1 and (workers is None or workers > 1):
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            detected = list(pool.map(_detect_batch, arrays, scales, sizes))
+    else:
+        detected = [_detect_batch(*j) for j in zip(arrays, scales, sizes, strict=True)]
+
+    result: list[ChangePoint] = []
+    for batch, points in zip(batches, detected, strict=True):
+        for j, p in zip(batch, points, strict=True):
+            result.extend(_change_points(valid[j], p))
+    result.sort(key=lambda j: (j.function, j.host_name, j.size, j.date))
+    log.debug("Detected %d change points in %d series.", len(result), len(series))
+
+    return result
+
+
+def store_changes(
+    store: ResultStore,
+    query: Query | None = None,
+    attribute: str = "cpu_time",
+    penalty_scale: float = 3.0,
+    workers: int | None = None,
+) -> list[ChangePoint]:
+    """Detect shifts across the stored history of benchmarks matching query.
+
+    Args:
+        store (ResultStore): result store.
+        query (Query | None): filter criteria.
+        attribute (str): timing attribute ("cpu_time" | "real_time").
+        penalty_scale (float): change point penalty, as a multiple of log(n_runs).
+        workers (int | None): maximum number of worker processes.
+
+    Returns:
+        (list[ChangePoint]) detected shifts, ordered by function, host, size and
+        date.
+
+    """
+    series: list[Series] = collect_series(store.history(query), attribute)
+
+    return detect_changes(series, penalty_scale, workers=workers)
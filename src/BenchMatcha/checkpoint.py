@@ -0,0 +1,135 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Crash resilient checkpointing, and resume, of benchmark runs.
+
+Benchmarks run in separate subprocesses (see :mod:`BenchMatcha.schedule`), and each
+completed benchmark is added to the result store immediately, under the run
+identifier of the current run. The run identifier is recorded in a checkpoint file
+within the cache directory until the run completes, such that an interrupted run
+(e.g. a crash, or a killed CI job) can be resumed, skipping completed benchmarks.
+
+"""
+
+import logging
+import os
+import uuid
+from dataclasses import replace
+
+import orjson
+
+from .metrics import compute_metrics
+from .noise import Timeline
+from .schedule import ScheduleOptions, schedule
+from .store import ResultStore
+from .structure import BenchmarkContext
+
+
+log: logging.Logger = logging.getLogger(__name__)
+
+_CHECKPOINT: str = "checkpoint.json"
+
+
+def checkpoint_path(cache_dir: str) -> str:
+    """Path location of checkpoint file within cache directory."""
+    return os.path.join(cache_dir, _CHECKPOINT)
+
+
+def begin(cache_dir: str, resume: bool = False, run_id: str | None = None) -> str:
+    """Begin (or resume) a checkpointed run, recording its run identifier.
+
+    Args:
+        cache_dir (str): path location of cache directory.
+        resume (bool): resume the run identifier of an interrupted run, if any.
+        run_id (str | None): explicit run identifier, taking precedence.
+
+    Returns:
+        (str) run identifier of current run.
+
+    """
+    path: str = checkpoint_path(cache_dir)
+    if run_id is None and resume and os.path.exists(path):
+        with open(path, "rb") as f:
+            run_id = orjson.loads(f.read())["run_id"]
+        log.info("Resuming interrupted run: %s", run_id)
+    elif resume and run_id is None:
+        log.info("No interrupted run to resume, starting a new run.")
+    run_id = run_id or uuid.uuid4().hex
+
+    with open(path, "wb") as f:
+        f.write(orjson.dumps({"run_id": run_id}))
+
+    return run_id
+
+
+def finish(cache_dir: str) -> None:
+    """Complete a checkpointed run, removing its checkpoint file."""
+    path: str = checkpoint_path(cache_dir)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def run_checkpointed(
+    store: ResultStore,
+    options: ScheduleOptions,
+    run_id: str,
+    robust: bool = False,
+    timeline: Timeline | None = None,
+) -> BenchmarkContext | None:
+    """Run benchmarks, storing each as it completes, skipping completed benchmarks.
+
+    Args:
+        store (ResultStore): result store.
+        options (ScheduleOptions): scheduler options.
+        run_id (str): run identifier of current run.
+        robust (bool): compute metrics with robust statistics.
+        timeline (Timeline | None): records the interval of each benchmark run.
+
+    Returns:
+        (BenchmarkContext | None) all stored benchmarks of run, or None if none.
+
+    """
+    completed: list[str] = store.completed(run_id)
+    if completed:
+        log.info("Skipping completed benchmarks of run %s: %s", run_id, completed)
+    pending: list[str] = [j for j in options.functions if j not in completed]
+
+    def checkpoint(context: BenchmarkContext) -> None:
+        metrics = compute_metrics(context.benchmarks, robust=robust)
+        store.add(context, run_id, metrics=metrics)
+        log.debug(
+            "Checkpointed %s: %s", [j.function for j in context.benchmarks], run_id
+        )
+
+    if pending:
+        schedule(store, replace(options, functions=pending), checkpoint, timeline)
+    if not store.completed(run_id):
+        return None
+
+    return store.load(run_id)
@@ -0,0 +1,211 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Statistical comparison of two benchmark arrays.
+
+Shared by the compare and bisect commands, such that a regression means the same
+thing in both. Per input size, log timings are compared with Welch's t test, and
+evidence is combined across input sizes with Stouffer's method. When repetitions
+are unavailable, per size log ratios are tested with a one sample t test instead.
+Interleaved (A/B) runs instead pair repetitions, and test per size paired log ratios.
+
+"""
+
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+import scipy  # type: ignore[import-untyped]
+
+from .structure import BenchmarkArray
+
+
+log: logging.Logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Comparison:
+    """Result of comparing a candidate benchmark against a baseline.
+
+    Args:
+        ratio (float): geometric mean (across input sizes) of candidate timing,
+            relative to baseline.
+        pvalue (float): one sided p value that candidate is slower than baseline.
+        sizes (int): number of input sizes in common.
+        regressed (bool): candidate is significantly slower, by at least the
+            minimum effect.
+        improved (bool): candidate is significantly faster, by at least the
+            minimum effect.
+
+    """
+
+    ratio: float
+    pvalue: float
+    sizes: int
+    regressed: bool
+    improved: bool
+
+
+def _welch_z(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Normal scores of Welch's t test (b slower than a), per row of log timings."""
+    na: np.ndarray = np.sum(~np.isnan(a), axis=1)
+    nb: np.ndarray = np.sum(~np.isnan(b), axis=1)
+    va: np.ndarray = np.nanvar(a, axis=1, ddof=1) / na
+    vb: np.ndarray = np.nanvar(b, axis=1, ddof=1) / nb
+    se: np.ndarray = np.sqrt(va + vb)
+    diff: np.ndarray = np.nanmean(b, axis=1) - np.nanmean(a, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t: np.ndarray = np.where(se > 0, diff / se, np.sign(diff) * np.inf)
+        dof: np.ndarray = (va + vb) ** 2 / (va**2 / (na - 1) + vb**2 / (nb - 1))
+    dof = np.where(np.isfinite(dof) & (dof > 0), dof, 1.0)
+
+    return scipy.stats.norm.isf(scipy.stats.t.sf(t, dof))
+
+
+def _log_timings(
+    baseline: BenchmarkArray,
+    candidate: BenchmarkArray,
+    attribute: str,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Common input sizes, and log timings (NaN if invalid) of both benchmarks."""
+    common, ia, ib = np.intersect1d(baseline.size, candidate.size, return_indices=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a: np.ndarray = np.log(getattr(baseline, attribute)[ia])
+        b: np.ndarray = np.log(getattr(candidate, attribute)[ib])
+
+    return (
+        common,
+        np.where(np.isfinite(a), a, np.nan),
+        np.where(np.isfinite(b), b, np.nan),
+    )
+
+
+def _verdict(
+    ratio: float,
+    pvalue: float,
+    sizes: int,
+    alpha: float,
+    min_effect: float,
+) -> Comparison:
+    """Comparison of a timing ratio, given one sided p value that it is slower."""
+    return Comparison(
+        ratio=ratio,
+        pvalue=pvalue,
+        sizes=sizes,
+        regressed=bool(pvalue < alpha and ratio >= 1.0 + min_effect),
+        improved=bool(1.0 - pvalue < alpha and ratio <= 1.0 / (1.0 + min_effect)),
+    )
+
+
+def compare_arrays(
+    baseline: BenchmarkArray,
+    candidate: BenchmarkArray,
+    attribute: str = "cpu_time",
+    alpha: float = 0.05,
+    min_effect: float = 0.05,
+) -> Comparison:
+    """Test whether a candidate benchmark is slower (or faster) than a baseline.
+
+    Args:
+        baseline (BenchmarkArray): baseline benchmark array.
+        candidate (BenchmarkArray): candidate benchmark array.
+        attribute (str): timing attribute ("cpu_time" | "real_time").
+        alpha (float): significance level (of each one sided test).
+        min_effect (float): minimum relative change of timing to report.
+
+    Returns:
+        (Comparison) comparison of candidate against baseline.
+
+    """
+    common, a, b = _log_timings(baseline, candidate, attribute)
+    if common.size == 0:
+        return Comparison(np.nan, np.nan, 0, False, False)
+
+    diff: np.ndarray = np.nanmean(b, axis=1) - np.nanmean(a, axis=1)
+    ratio: float = float(np.exp(np.nanmean(diff)))
+    replicated: bool = bool(
+        (np.sum(~np.isnan(a), axis=1) > 1).all()
+        and (np.sum(~np.isnan(b), axis=1) > 1).all()
+    )
+    pvalue: float
+    if replicated:
+        z: np.ndarray = _welch_z(a, b)
+        pvalue = float(scipy.stats.norm.sf(np.sum(z) / np.sqrt(z.size)))
+    elif common.size > 1:
+        pvalue = float(scipy.stats.ttest_1samp(diff, 0.0, alternative="greater").pvalue)
+    else:
+        pvalue = np.nan
+
+    return _verdict(ratio, pvalue, int(common.size), alpha, min_effect)
+
+
+def compare_paired(
+    baseline: BenchmarkArray,
+    candidate: BenchmarkArray,
+    attribute: str = "cpu_time",
+    alpha: float = 0.05,
+    min_effect: float = 0.05,
+) -> Comparison:
+    """Paired test whether a candidate benchmark is slower (or faster) than baseline.
+
+    Repetitions (columns) of both benchmark arrays are paired, as obtained from
+    interleaved runs, such that drift shared by a pair cancels from its log ratio.
+    Per input size, log ratios are tested with a paired t test, and evidence is
+    combined across input sizes with Stouffer's method.
+
+    Args:
+        baseline (BenchmarkArray): baseline benchmark array.
+        candidate (BenchmarkArray): candidate benchmark array, paired by repetition.
+        attribute (str): timing attribute ("cpu_time" | "real_time").
+        alpha (float): significance level (of each one sided test).
+        min_effect (float): minimum relative change of timing to report.
+
+    Returns:
+        (Comparison) comparison of candidate against baseline.
+
+    """
+    common, a, b = _log_timings(baseline, candidate, attribute)
+    pairs: int = min(a.shape[1], b.shape[1])
+    diff: np.ndarray = b[:, :pairs] - a[:, :pairs]
+    n: np.ndarray = np.sum(~np.isnan(diff), axis=1)
+    valid: np.ndarray = n > 1
+    if common.size == 0 or not valid.any():
+        return Comparison(np.nan, np.nan, int(common.size), False, False)
+
+    diff, n = diff[valid], n[valid]
+    mean: np.ndarray = np.nanmean(diff, axis=1)
+    se: np.ndarray = np.nanstd(diff, axis=1, ddof=1) / np.sqrt(n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t: np.ndarray = np.where(se > 0, mean / se, np.sign(mean) * np.inf)
+    z: np.ndarray = scipy.stats.norm.isf(scipy.stats.t.sf(t, n - 1))
+    pvalue: float = float(scipy.stats.norm.sf(np.sum(z) / np.sqrt(z.size)))
+
+    return _verdict(
+        float(np.exp(np.mean(mean))), pvalue, int(valid.sum()), alpha, min_effect
+    )
@@ -29,14 +29,18 @@
 
 """Complexity calculations."""
 
+import inspect
+import warnings
 from collections.abc import Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from operator import attrgetter
+from typing import Any, Literal
 
 import google_benchmark as gbench
 import numpy as np
-from scipy.optimize import curve_fit  # type: ignore[import-untyped]
+import scipy  # type: ignore[import-untyped]
 
-from .utils import _simple_stats
+from .utils import _MAD_SCALE, BigO, _robust_stats, _simple_stats, outlier_mask
 
 
 @dataclass
@@ -48,6 +52,8 @@ class FitResult:
         params (np.ndarray): coefficient value(s).
         cov (np.ndarray): covariance std of coefficients
         rms (float): root mean square error of fit.
+        aic (float): small sample corrected Akaike information criterion (AICc).
+        bic (float): Bayesian information criterion.
 
     """
 
@@ -55,6 +61,8 @@ class FitResult:
     params: np.ndarray
     cov: np.ndarray
     rms: float
+    aic: float = np.inf
+    bic: float = np.inf
 
     @staticmethod
     def _handle(x: np.ndarray) -> str:
@@ -108,6 +116,26 @@ def cubic(n: np.ndarray, a: float, b: float, c: float, d: float) -> np.ndarray:
     return a * np.power(n, 3) + quadratic(n, b, c, d)
 
 
+def sqrtn(n: np.ndarray, a: float, b: float) -> np.ndarray:
+    """Square root O(sqrtN) equation."""
+    return a * np.sqrt(n) + b
+
+
+def nlog2n(n: np.ndarray, a: float, b: float) -> np.ndarray:
+    """Log squared linear O(Nlg^2N) equation."""
+    return a * n * np.square(np.log2(n)) + b
+
+
+def power(n: np.ndarray, a: float, k: float, b: float) -> np.ndarray:
+    """Polynomial O(N^k) equation, with a fitted exponent."""
+    return a * np.power(n, k) + b
+
+
+def exponential(n: np.ndarray, a: float, b: float) -> np.ndarray:
+    """Exponential O(2^N) equation."""
+    return a * np.exp2(n) + b
+
+
 complexity_functions: dict[str, Equation] = {
     # gbench.oNone.name: "",
     gbench.o1.name: constant,
@@ -116,8 +144,28 @@ complexity_functions: dict[str, Equation] = {
     gbench.oNLogN.name: nlogn,
     gbench.oNSquared.name: quadratic,
     gbench.oNCubed.name: cubic,
+    # NOTE: extended complexity classes, see utils.BigO
+    "oSqrtN": sqrtn,
+    "oNLogSquaredN": nlog2n,
+    "oNPowerK": power,
+    "o2N": exponential,
 }
 
+# Model selection criterion, with which to rank complexity fits (lower is better).
+Criterion = Literal["aic", "bic", "rms"]
+
+# Robust loss function, with which to reduce the influence of outlying observations.
+Loss = Literal["linear", "huber", "soft_l1", "cauchy"]
+
+# Huber threshold (in units of residual scale), with 95% efficiency on normal error.
+_HUBER: float = 1.345
+
+# Number of robust refits, when residual scale is estimated from residuals.
+_ROBUST_ITERATIONS: int = 4
+
+# Relative timing resolution, below which residuals are indistinguishable from zero.
+_RESOLUTION: float = 1e-6
+
 
 def compute_rmsd(y_true: np.ndarray, y_pred: np.ndarray, k: int) -> float:
     r"""Mean normalized root mean square deviation (RMSD).
@@ -137,16 +185,111 @@ def compute_rmsd(y_true: np.ndarray, y_pred: np.ndarray, k: int) -> float:
     residuals: np.ndarray = y_true - y_pred
     sum_square_error: np.float64 = (residuals * residuals).sum()
     dof: np.int64 = np.prod(y_pred.size) - k
+    if dof <= 0:
+        # NOTE: an exactly determined fit carries no evidence of goodness of fit.
+        return float("inf")
 
     return float(np.sqrt(sum_square_error / dof) / y_true.mean())
 
 
+def information_criteria(
+    y_true: np.ndarray,
+    y_pred: np.ndarray,
+    k: int,
+    sigma: np.ndarray | None,
+) -> tuple[float, float]:
+    r"""Information criteria of a least squares fit, under gaussian error.
+
+    With known uncertainty, the deviance ($-2 \ln L$) is the chi-square statistic.
+    Otherwise, the error variance is estimated from the residuals, and counted as an
+    additional parameter.
+
+    Args:
+        y_true (np.ndarray): observed y values.
+        y_pred (np.ndarray): predicted y values.
+        k (int): number of parameters used to estimate predicted values.
+        sigma (np.ndarray | None): observed error in y values, if known.
+
+    Returns:
+        (tuple[float, float]) small sample corrected AIC (AICc), and BIC.
+
+    Equations:
+        $AICc = D + 2k + \frac{2k(k + 1)}{n - k - 1}$
+
+        $BIC = D + k \ln n$
+
+    """
+    n: int = y_true.size
+    residuals: np.ndarray = y_true - y_pred
+    if sigma is None:
+        deviance = _profiled_deviance(residuals @ residuals, y_true)
+        k += 1
+    else:
+        deviance = np.square(residuals / sigma).sum()
+    aic, bic = _penalize(deviance, n, k)
+
+    return float(aic), float(bic)
+
+
+def _profiled_deviance(sse: np.ndarray, y_true: np.ndarray) -> np.ndarray:
+    """Gaussian deviance, with error variance estimated from sum of square error."""
+    n: int = y_true.shape[-1]
+    floor: float = n * (_RESOLUTION * float(np.abs(y_true).mean())) ** 2
+
+    return n * np.log(np.maximum(sse, max(floor, np.finfo(float).tiny)) / n)
+
+
+def _penalize(deviance: np.ndarray, n: int, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Penalize deviance by number of parameters, as AICc and BIC."""
+    aic: np.ndarray = np.full_like(deviance, np.inf, dtype=np.float64)
+    if n - k - 1 > 0:
+        aic = deviance + 2 * k + 2 * k * (k + 1) / (n - k - 1)
+    bic: np.ndarray = deviance + k * np.log(n)
+
+    return aic, bic
+
+
+def _robust_refit(
+    func: Callable,
+    x: np.ndarray,
+    y: np.ndarray,
+    sigma: np.ndarray | None,
+    loss: Loss,
+    fitted: tuple[np.ndarray, np.ndarray],
+) -> tuple[np.ndarray, np.ndarray]:
+    """Refine least squares parameters (and covariance) with a robust loss."""
+    popt, pcov = fitted
+    options: dict[str, Any] = dict(sigma=sigma, absolute_sigma=sigma is not None)
+    # NOTE: without known uncertainty, residual scale is re-estimated after each
+    #       robust fit, as outliers inflate the least squares residuals at first.
+    for _ in range(1 if sigma is not None else _ROBUST_ITERATIONS):
+        scale: float = 1.0
+        if sigma is None:
+            residuals: np.ndarray = y - func(x, *popt)
+            scale = _MAD_SCALE * float(np.median(np.abs(residuals)))
+        if scale <= 0:
+            break
+        popt, pcov, *_ = scipy.optimize.curve_fit(
+            func,
+            x,
+            y,
+            p0=popt,
+            method="trf",
+            loss=loss,
+            f_scale=_HUBER * scale,
+            **options,
+        )
+
+    return popt, pcov
+
+
 def fit(
     func: Callable,
     label: str,
     x: np.ndarray,
     y: np.ndarray,
-    sigma: np.ndarray,
+    sigma: np.ndarray | None,
+    loss: Loss = "linear",
 ) -> FitResult | None:
     """Fit observed data to an equation.
 
@@ -155,7 +298,11 @@ def fit(
         label (str): complexity label
         x (np.ndarray): x input values
         y (np.ndarray): observed y values
-        sigma (np.ndarray): observed error in y values
+        sigma (np.ndarray | None): observed error in y values. An unweighted fit is
+            performed when unavailable (e.g. single repetition), or not positive.
+        loss (Loss): loss function. A robust loss refines the least squares fit,
+            with a threshold scaled to unit (weighted) residuals, or otherwise to
+            the MAD of least squares residuals.
 
     Returns:
         (FitResult | None) returns fit result if converged.
@@ -163,47 +310,368 @@ def fit(
     """
     popt: np.ndarray
     pcov: np.ndarray
+    if sigma is not None and not np.all(np.isfinite(sigma) & (sigma > 0)):
+        sigma = None
+
     try:
-        popt, pcov, *_ = curve_fit(
-            func,
-            x,
-            y,
-            sigma=sigma,
-            absolute_sigma=True,
-        )
-        pred = func(x, *popt)
+        # NOTE: e.g. exponential equations overflow on large input sizes, and
+        #       degenerate parameters report an infinite covariance.
+        with np.errstate(over="ignore", invalid="ignore"), warnings.catch_warnings():
+            warnings.simplefilter("ignore", scipy.optimize.OptimizeWarning)
+            popt, pcov, *_ = scipy.optimize.curve_fit(
+                func,
+                x,
+                y,
+                sigma=sigma,
+                absolute_sigma=sigma is not None,
+            )
+            if loss != "linear":
+                popt, pcov = _robust_refit(func, x, y, sigma, loss, (popt, pcov))
+            pred = func(x, *popt)
+        if not np.all(np.isfinite(pred)):
+            return None
         cov = np.sqrt(pcov.diagonal())
         rms = compute_rmsd(y, pred, len(popt))
+        aic, bic = information_criteria(y, pred, len(popt), sigma)
 
         return FitResult(
             bigo=label,
             params=popt,
             cov=cov,
             rms=rms,
+            aic=aic,
+            bic=bic,
         )
 
-    except RuntimeError:
+    # NOTE: TypeError is raised when there are fewer observations than parameters,
+    #       and ValueError when residuals are not finite at the initial guess.
+    except (RuntimeError, TypeError, ValueError):
         return None
 
 
-def fit_complexity(x: np.ndarray, y: np.ndarray, sigma: np.ndarray) -> list[FitResult]:
+def fit_complexity(
+    x: np.ndarray,
+    y: np.ndarray,
+    sigma: np.ndarray,
+    loss: Loss = "linear",
+) -> list[FitResult]:
     """Perform curve fitting to available complexity algorithms."""
     results: list[FitResult] = []
 
     for label, func in complexity_functions.items():
-        if (res := fit(func, label, x, y, sigma)) is not None:
+        if (res := fit(func, label, x, y, sigma, loss)) is not None:
             results.append(res)
 
     return results
 
 
-def analyze_complexity(x: np.ndarray, y: np.ndarray) -> list[FitResult]:
-    """Analyze algorithmic complexity."""
-    mean, std = _simple_stats(y)
+def robust_stats(
+    y: np.ndarray,
+    threshold: float = 3.5,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Median and scaled MAD of repetitions, excluding flagged outliers."""
+    return _robust_stats(np.where(outlier_mask(y, threshold), np.nan, y))
+
+
+def analyze_complexity(
+    x: np.ndarray,
+    y: np.ndarray,
+    criterion: Criterion = "bic",
+    robust: bool = False,
+) -> list[FitResult]:
+    """Analyze algorithmic complexity, ranked by model selection criterion.
+
+    Robust analysis fits the median of repetitions (excluding outliers) with a
+    Huber loss, instead of least squares fit of the mean. Input sizes without any
+    finite observation (e.g. every run timed out) are excluded.
+
+    """
+    observed: np.ndarray = np.isfinite(y).any(axis=1)
+    x, y = x[observed], y[observed]
+    if robust:
+        median, mad = robust_stats(y)
+        fits = fit_complexity(x, median, mad, "huber")
+    else:
+        mean, std = _simple_stats(y)
+        fits = fit_complexity(x, mean, std)
+
+    return sorted(fits, key=attrgetter(criterion))
+
+
+def get_best_fit(fits: list[FitResult], criterion: Criterion = "bic") -> FitResult:
+    """Return best fit by minimizing model selection criterion.
+
+    Information criteria penalize the number of parameters, unlike RMSD, which favors
+    higher order polynomials on noisy data.
+
+    """
+    return min(fits, key=attrgetter(criterion))
+
+
+def predict(result: FitResult, x: np.ndarray) -> np.ndarray:
+    """Evaluate a fitted complexity equation."""
+    return complexity_functions[result.bigo](x, *result.params)
+
+
+def describe(result: FitResult) -> str:
+    """Big O notation of a fit result, including any fitted exponent."""
+    if result.bigo == BigO.oNPowerK.name:
+        return f"N^{result.params[1]:.2f}"
+
+    return BigO.get(result.bigo)
 
-    return sorted(fit_complexity(x, mean, std), key=lambda x: x.rms)
 
+def best_fit(
+    x: np.ndarray,
+    y: np.ndarray,
+    criterion: Criterion = "bic",
+    robust: bool = False,
+) -> FitResult | None:
+    """Return best complexity fit of repeated observations, if any converged."""
+    fits: list[FitResult] = analyze_complexity(x, y, criterion, robust)
+
+    return fits[0] if fits else None
+
+
+def crossover_points(
+    a: FitResult,
+    b: FitResult,
+    lower: float,
+    upper: float,
+    samples: int = 256,
+) -> np.ndarray:
+    """Find input sizes where two fitted complexity curves intersect.
+
+    Args:
+        a (FitResult): first fitted complexity curve.
+        b (FitResult): second fitted complexity curve.
+        lower (float): minimum input size searched.
+        upper (float): maximum input size searched.
+        samples (int): number of log spaced samples used to bracket crossovers.
+
+    Returns:
+        (np.ndarray) sorted input sizes, where the faster of the two changes.
+
+    """
+
+    def diff(n: np.ndarray | float) -> np.ndarray:
+        x: np.ndarray = np.asarray(n, dtype=np.float64)
+
+        return predict(a, x) - predict(b, x)
+
+    grid: np.ndarray = np.geomspace(lower, upper, samples)
+    sign: np.ndarray = np.sign(diff(grid))
+    brackets: np.ndarray = np.flatnonzero(sign[:-1] * sign[1:] < 0)
+
+    return np.asarray(
+        [scipy.optimize.brentq(diff, grid[j], grid[j + 1]) for j in brackets],
+        dtype=np.float64,
+    )
+
+
+# Complexity equations which are not linear in their parameters, thus excluded from
+# batched (bootstrap) least squares.
+_nonlinear: frozenset[str] = frozenset({"oNPowerK"})
+
+
+@dataclass
+class BootstrapResult:
+    """Bootstrap resampled complexity fit.
+
+    Args:
+        bigo (str): Big O notation string identifier.
+        params (np.ndarray): coefficient value(s), fit to observed mean.
+        lower (np.ndarray): lower confidence bound of coefficient value(s).
+        upper (np.ndarray): upper confidence bound of coefficient value(s).
+        probability (float): fraction of resamples selecting this complexity class.
+        samples (np.ndarray): resampled coefficient values, shape (resamples, k).
+
+    """
+
+    bigo: str
+    params: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    probability: float
+    samples: np.ndarray = field(repr=False)
+
+
+def design_matrix(func: Callable, x: np.ndarray, k: int) -> np.ndarray:
+    """Design matrix, of an equation linear in its k parameters, evaluated at x."""
+    basis: np.ndarray = np.eye(k)
+    with np.errstate(over="ignore", invalid="ignore"):
+        columns = [func(x, *basis[j]) for j in range(k)]
+
+    return np.stack(columns, axis=1).astype(np.float64)
+
+
+def resample_means(
+    y: np.ndarray,
+    resamples: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Mean of y, resampled with replacement along repetition (column) axis.
+
+    Args:
+        y (np.ndarray): observed values, shape (sizes, repetitions).
+        resamples (int): number of bootstrap resamples.
+        rng (np.random.Generator): random number generator.
 
-def get_best_fit(fits: list[FitResult]) -> FitResult:
-    """Return best fit by minimizing RMSD."""
-    return min(fits, key=lambda x: x.rms)
+    Returns:
+        (np.ndarray) resampled means, shape (resamples, sizes).
+
+    """
+    rows, repeats = y.shape
+    index: np.ndarray = rng.integers(0, repeats, size=(resamples, rows, repeats))
+
+    return np.take_along_axis(y[None, :, :], index, axis=2).mean(axis=2)
+
+
+def _batched_fit(
+    design: np.ndarray,
+    rhs: np.ndarray,
+    weight: np.ndarray | None,
+    observed: np.ndarray,
+    criterion: Criterion,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Least squares fit of (weighted) design matrix to many right hand sides.
+
+    Returns:
+        (tuple[np.ndarray, np.ndarray]) coefficients, shape (k, columns), and
+        selection criterion of each resampled column (excluding the first).
+
+    """
+    n, k = design.shape
+    # NOTE: Normalize columns, which may span many orders of magnitude.
+    scale: np.ndarray = np.linalg.norm(design, axis=0)
+    scale[scale == 0] = 1.0
+    coef, *_ = np.linalg.lstsq(design / scale, rhs, rcond=None)
+    coef /= scale[:, None]
+
+    residuals: np.ndarray = rhs[:, 1:] - design @ coef[:, 1:]
+    sse: np.ndarray = np.square(residuals).sum(axis=0)
+    if criterion == "rms":
+        if weight is not None:
+            sse = np.square(residuals / weight[:, None]).sum(axis=0)
+        return coef, np.sqrt(sse / max(n - k, 1)) / np.abs(observed.mean())
+
+    if weight is None:
+        aic, bic = _penalize(_profiled_deviance(sse, observed), n, k + 1)
+    else:
+        aic, bic = _penalize(sse, n, k)
+
+    return coef, aic if criterion == "aic" else bic
+
+
+def bootstrap_complexity(
+    x: np.ndarray,
+    y: np.ndarray,
+    resamples: int = 2000,
+    confidence: float = 0.95,
+    criterion: Criterion = "bic",
+    seed: int | None = None,
+) -> list[BootstrapResult]:
+    """Bootstrap confidence intervals and class probabilities of complexity fits.
+
+    Repetitions of each input size are resampled with replacement, and every
+    complexity equation linear in its parameters is fit to all resampled means at
+    once, as a single least squares problem with many right hand sides. As with
+    :func:`fit`, residuals are weighted by observed standard deviation when it is
+    available. Each resample votes for the complexity class minimizing the
+    selection criterion. Input sizes with any invalid (non-finite) repetition are
+    excluded, and nothing is fit without repeated observations.
+
+    Args:
+        x (np.ndarray): x input values (sizes).
+        y (np.ndarray): observed values, shape (sizes, repetitions).
+        resamples (int): number of bootstrap resamples.
+        confidence (float): confidence level of coefficient intervals.
+        criterion (Criterion): model selection criterion.
+        seed (int | None): random seed, for reproducible resampling.
+
+    Returns:
+        (list[BootstrapResult]) results, sorted by descending class probability.
+
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    finite: np.ndarray = np.isfinite(y).all(axis=1)
+    x, y = x[finite], y[finite]
+    if y.ndim != 2 or y.shape[1] < 2:
+        return []
+    rng: np.random.Generator = np.random.default_rng(seed)
+    means: np.ndarray = resample_means(y, resamples, rng)
+    observed, sigma = _simple_stats(y)
+    weighted: bool = bool(np.all(np.isfinite(sigma) & (sigma > 0)))
+    weight: np.ndarray = 1.0 / sigma if weighted else np.ones_like(observed)
+    rhs: np.ndarray = np.concatenate([observed[:, None], means.T], axis=1)
+    rhs *= weight[:, None]
+    n: int = x.size
+    alpha: float = (1.0 - confidence) / 2.0
+
+    labels: list[str] = []
+    estimates: list[np.ndarray] = []
+    scores: list[np.ndarray] = []
+    for label, func in complexity_functions.items():
+        k: int = len(inspect.signature(func).parameters) - 1
+        if label in _nonlinear or n <= k:
+            continue
+        design: np.ndarray = design_matrix(func, x, k) * weight[:, None]
+        if not np.all(np.isfinite(design)):
+            continue
+        coef, score = _batched_fit(
+            design, rhs, weight if weighted else None, observed, criterion
+        )
+
+        labels.append(label)
+        estimates.append(coef)
+        scores.append(score)
+
+    if not labels:
+        return []
+
+    votes: np.ndarray = np.bincount(
+        np.argmin(np.stack(scores), axis=0), minlength=len(labels)
+    )
+    results: list[BootstrapResult] = []
+    for label, coef, count in zip(labels, estimates, votes, strict=True):
+        samples: np.ndarray = coef[:, 1:].T
+        lower, upper = np.quantile(samples, [alpha, 1.0 - alpha], axis=0)
+        results.append(
+            BootstrapResult(
+                bigo=label,
+                params=coef[:, 0],
+                lower=lower,
+                upper=upper,
+                probability=float(count) / resamples,
+                samples=samples,
+            )
+        )
+
+    return sorted(results, key=lambda j: j.probability, reverse=True)
+
+
+def predict_interval(
+    result: BootstrapResult,
+    x: np.ndarray,
+    confidence: float = 0.95,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Confidence band of bootstrapped complexity equation (e.g. extrapolation).
+
+    Args:
+        result (BootstrapResult): bootstrap resampled fit.
+        x (np.ndarray): input sizes to evaluate.
+        confidence (float): confidence level of band.
+
+    Returns:
+        (tuple[np.ndarray, np.ndarray]) lower and upper bound at each input size.
+
+    """
+    x = np.asarray(x, dtype=np.float64)
+    design: np.ndarray = design_matrix(
+        complexity_functions[result.bigo], x, result.params.size
+    )
+    alpha: float = (1.0 - confidence) / 2.0
+    lower, upper = np.quantile(design @ result.samples.T, [alpha, 1.0 - alpha], axis=1)
+
+    return lower, upper
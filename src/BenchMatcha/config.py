@@ -63,9 +63,18 @@ class ConfigBase(_ConfigBase):
         line_color (str): plot line color.
         font (str): plot font family style.
         x_axis (int): Maximum number of line ticks on x-axis.
+        robust (bool): use robust (median/MAD, Huber) statistics and fits.
+        outlier_threshold (float): modified z-score above which a repetition is
+            flagged as an outlier.
+        element_size (int): bytes of working set per input element, to locate cache
+            boundaries along input size axis (0 disables cache analysis).
+        metrics (bool): include size normalized metrics (time per element,
+            throughput, residual) figure of each benchmark in report.
 
     """
 
+    # pylint: disable=R0902
+
     color: str = field(converter=str, default="#0f8554")
     line_color: str = field(converter=str, default="#73af48")
     font: str = field(
@@ -73,6 +82,10 @@ class ConfigBase(_ConfigBase):
         default="Space Grotesk Light, Courier New, monospace",
     )
     x_axis: int = field(converter=int, default=13)
+    robust: bool = field(converter=bool, default=False)
+    outlier_threshold: float = field(converter=float, default=3.5)
+    element_size: int = field(converter=int, default=8)
+    metrics: bool = field(converter=bool, default=True)
 
 
 class ConfigUpdater:
@@ -135,6 +148,7 @@ def update_config_from_pyproject(path: str, config: _ConfigBase) -> None:
             line_color="#333"
             font="Courier"
             x_axis=5
+            robust=true
 
     """
     cu = ConfigUpdater(path, config)
@@ -0,0 +1,423 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Distributed benchmark runs, across hosts, with a coordinator and workers.
+
+A coordinator discovers benchmarks, and hands out shards (of benchmark functions)
+over TCP to workers as they become available. Each worker runs its shard in a
+benchmark subprocess, within an equivalent checkout of the benchmarks, and sends back
+the parsed benchmark context in compact binary form (see `wire`). Shards of a worker
+which disconnects are handed out again.
+
+The coordinator stores results of each host as a separate run, incrementally, such
+that per host metadata (caches, number and frequency of cpus) is retained alongside
+its benchmarks.
+
+The protocol is unauthenticated, and trusts both ends: any peer able to connect to
+the coordinator may store results, and a worker imports (i.e. executes) whichever
+benchmark paths a coordinator sends. The coordinator binds to the loopback interface
+by default, and should only be exposed on a trusted network (or e.g. an ssh tunnel).
+
+Protocol (json control messages, unless noted)::
+
+    worker: {"type": "ready", "host": ...}
+    coordinator: {"type": "shard", "id": ..., "paths": ..., "functions": ..., ...}
+    worker: {"type": "result", "id": ...} followed by a binary context message
+          | {"type": "failed", "id": ...}
+    ...
+    coordinator: {"type": "done"}
+
+"""
+
+import logging
+import os
+import queue
+import socket
+import socketserver
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+from .errors import SchemaError
+from .handlers import load
+from .metrics import compute_metrics
+from .sifter import manage_registration
+from .store import ResultStore
+from .structure import BenchmarkContext, parse_version
+from .watch import record_registrations
+from .wire import (
+    CONTEXT,
+    decode_context_bytes,
+    encode_context,
+    receive,
+    receive_json,
+    send,
+    send_json,
+)
+from .worker import run_worker
+
+
+log: logging.Logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Shard:
+    """Benchmark functions handed out to a worker.
+
+    Args:
+        id (int): shard identifier.
+        functions (list[str]): benchmark function names.
+        attempts (int): number of times handed out to a worker.
+
+    """
+
+    id: int
+    functions: list[str]
+    attempts: int = 0
+
+
+@dataclass
+class CoordinatorOptions:
+    """Options of a distributed benchmark run.
+
+    Args:
+        paths (list[str]): benchmark paths, relative to working directory of workers.
+        functions (list[str]): benchmark function names to hand out.
+        argv (list[str]): google benchmark arguments.
+        shard_size (int): number of benchmark functions per shard.
+        max_attempts (int): maximum times a shard is handed out, when workers
+            disconnect before completing it.
+
+    """
+
+    paths: list[str]
+    functions: list[str]
+    argv: list[str] = field(default_factory=list)
+    shard_size: int = 1
+    max_attempts: int = 3
+
+
+@dataclass
+class WorkerOptions:
+    """Options of a distributed benchmark worker.
+
+    Args:
+        address (tuple[str, int]): coordinator host and port.
+        host (str | None): host name reported with results. Defaults to the host
+            name reported by google benchmark.
+        timeout (float | None): maximum seconds to benchmark a shard.
+        retry (float): seconds to retry connecting to coordinator.
+
+    """
+
+    address: tuple[str, int]
+    host: str | None = None
+    timeout: float | None = None
+    retry: float = 10.0
+
+
+def discover(paths: list[str]) -> list[str]:
+    """Names of benchmarks within paths, without registering them."""
+    with record_registrations() as recorded:
+        for path in paths:
+            manage_registration(path)
+
+    return list(dict.fromkeys(j.name for j in recorded))
+
+
+def shards(functions: list[str], size: int = 1) -> list[Shard]:
+    """Split benchmark functions into shards."""
+    size = max(size, 1)
+
+    return [
+        Shard(j // size, functions[j : j + size])
+        for j in range(0, len(functions), size)
+    ]
+
+
+class ShardQueue:
+    """Thread safe queue of shards, handed out to workers until resolved.
+
+    Args:
+        pending (list[Shard]): shards to hand out.
+        max_attempts (int): maximum times a shard is handed out.
+
+    """
+
+    def __init__(self, pending: list[Shard], max_attempts: int = 3) -> None:
+        self.max_attempts = max_attempts
+        self.failed: list[Shard] = []
+        self._pending: list[Shard] = list(pending)
+        self._outstanding: int = 0
+        self._condition = threading.Condition()
+
+    @property
+    def done(self) -> bool:
+        """All shards are resolved (completed or failed)."""
+        with self._condition:
+            return not self._pending and not self._outstanding
+
+    def next(self) -> Shard | None:
+        """Hand out the next shard, waiting on outstanding shards, or None when done."""
+        with self._condition:
+            while not self._pending and self._outstanding:
+                self._condition.wait()
+            if not self._pending:
+                return None
+            shard: Shard = self._pending.pop(0)
+            shard.attempts += 1
+            self._outstanding += 1
+
+            return shard
+
+    def _resolve(self, shard: Shard, pending: bool = False) -> None:
+        with self._condition:
+            self._outstanding -= 1
+            if pending:
+                self._pending.append(shard)
+            self._condition.notify_all()
+
+    def complete(self, shard: Shard) -> None:
+        """Resolve a completed shard."""
+        self._resolve(shard)
+
+    def fail(self, shard: Shard) -> None:
+        """Resolve a failed shard."""
+        with self._condition:
+            self.failed.append(shard)
+            self._resolve(shard)
+
+    def requeue(self, shard: Shard) -> None:
+        """Hand out a shard again (e.g. its worker disconnected), up to max attempts."""
+        if shard.attempts >= self.max_attempts:
+            log.error(
+                "Shard %d exceeded maximum attempts: %s", shard.id, shard.functions
+            )
+            self.fail(shard)
+        else:
+            self._resolve(shard, pending=True)
+
+
+class CoordinatorHandler(socketserver.BaseRequestHandler):
+    """Hand out shards to a connected worker, collecting its results."""
+
+    server: "Coordinator"
+
+    def handle(self) -> None:
+        """Serve a worker connection."""
+        shard: Shard | None = None
+        try:
+            host: str = receive_json(self.request).get("host", "unknown")
+            log.info("Worker connected: %s (%s)", host, self.client_address[0])
+            while (shard := self.server.shards.next()) is not None:
+                send_json(
+                    self.request,
+                    {
+                        "type": "shard",
+                        "id": shard.id,
+                        "paths": self.server.options.paths,
+                        "functions": shard.functions,
+                        "argv": self.server.options.argv,
+                    },
+                )
+                reply: dict[str, Any] = receive_json(self.request)
+                if reply.get("type") == "result":
+                    kind, payload = receive(self.request)
+                    if kind != CONTEXT:
+                        raise ValueError(f"Unexpected message kind: {kind!r}")
+                    self.server.results.put(decode_context_bytes(payload))
+                    self.server.shards.complete(shard)
+                else:
+                    log.error(
+                        "Shard %d failed on %s: %s", shard.id, host, shard.functions
+                    )
+                    self.server.shards.fail(shard)
+                shard = None
+            send_json(self.request, {"type": "done"})
+
+        except (ConnectionError, OSError, ValueError) as e:
+            log.warning("Worker %s disconnected: %r", self.client_address[0], e)
+        # NOTE: e.g. malformed results, which must not leave a shard outstanding
+        except Exception:  # pylint: disable=W0718
+            log.exception("Worker %s sent invalid results", self.client_address[0])
+        finally:
+            if shard is not None:
+                self.server.shards.requeue(shard)
+
+
+class Coordinator(socketserver.ThreadingTCPServer):
+    """Coordinator of a distributed benchmark run.
+
+    Args:
+        address (tuple[str, int]): host and port to bind.
+        options (CoordinatorOptions): distributed run options.
+
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: tuple[str, int], options: CoordinatorOptions) -> None:
+        self.options = options
+        self.shards = ShardQueue(
+            shards(options.functions, options.shard_size), options.max_attempts
+        )
+        self.results: queue.Queue[BenchmarkContext] = queue.Queue()
+        super().__init__(address, CoordinatorHandler)
+
+
+def coordinate(
+    server: Coordinator,
+    store: ResultStore,
+    robust: bool = False,
+) -> list[str]:
+    """Serve workers until all shards are resolved, storing results per host.
+
+    Args:
+        server (Coordinator): coordinator server, bound to its address.
+        store (ResultStore): result store.
+        robust (bool): compute metrics with robust statistics.
+
+    Returns:
+        (list[str]) run identifiers, one per host.
+
+    """
+    session: str = uuid.uuid4().hex
+    runs: dict[str, str] = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        while True:
+            # NOTE: results are queued before shards resolve, so drain after done
+            finished: bool = server.shards.done
+            try:
+                context: BenchmarkContext = server.results.get(timeout=0.1)
+            except queue.Empty:
+                if finished:
+                    break
+                continue
+
+            run_id: str = runs.setdefault(context.host_name, f"{session}-{len(runs)}")
+            metrics = compute_metrics(context.benchmarks, robust=robust)
+            store.add(context, run_id, metrics=metrics)
+            log.info(
+                "Stored %s from %s: %s",
+                [j.function for j in context.benchmarks],
+                context.host_name,
+                run_id,
+            )
+    finally:
+        server.shutdown()
+        thread.join()
+
+    return list(runs.values())
+
+
+def _connect(options: WorkerOptions) -> socket.socket:
+    """Connect to coordinator, retrying until it accepts connections."""
+    deadline: float = time.monotonic() + options.retry
+    while True:
+        try:
+            return socket.create_connection(options.address)
+        except OSError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.25)
+
+
+def run_shard(
+    message: dict[str, Any], options: WorkerOptions
+) -> BenchmarkContext | None:
+    """Run benchmarks of a shard in a subprocess, returning None on failure."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output: str = os.path.join(tmpdir, "shard.json")
+        try:
+            if not run_worker(
+                os.getcwd(),
+                message["paths"],
+                message["functions"],
+                message["argv"],
+                output,
+                options.timeout,
+            ):
+                return None
+            context: BenchmarkContext = parse_version(load(output))
+
+        except subprocess.TimeoutExpired:
+            log.error("Shard %d exceeded timeout: %ss", message["id"], options.timeout)
+            return None
+
+        except subprocess.CalledProcessError as e:
+            log.error("Shard %d failed to describe git revision: %r", message["id"], e)
+            return None
+
+        except (KeyError, ValueError, SchemaError) as e:
+            log.error("Shard %d results are invalid: %r", message["id"], e)
+            return None
+
+    if options.host is not None:
+        context = replace(context, host_name=options.host)
+
+    return context
+
+
+def work(options: WorkerOptions) -> int:
+    """Run shards handed out by a coordinator, until it is done.
+
+    Args:
+        options (WorkerOptions): worker options.
+
+    Returns:
+        (int) number of completed shards.
+
+    Raises:
+        OSError: failed to connect to coordinator.
+        ConnectionError: coordinator closed connection.
+
+    """
+    completed: int = 0
+    with _connect(options) as connection:
+        send_json(
+            connection,
+            {"type": "ready", "host": options.host or socket.gethostname()},
+        )
+        while (message := receive_json(connection)).get("type") == "shard":
+            log.info("Running shard %d: %s", message["id"], message["functions"])
+            if (context := run_shard(message, options)) is None:
+                send_json(connection, {"type": "failed", "id": message["id"]})
+                continue
+            send_json(connection, {"type": "result", "id": message["id"]})
+            send(connection, CONTEXT, encode_context(context))
+            completed += 1
+
+    return completed
@@ -0,0 +1,240 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Real (wall) time versus cpu time divergence analysis.
+
+A wall / cpu time ratio above one means a benchmark spent time waiting, not
+computing: lock contention, I/O waits, GIL stalls, or preemption. The ratio is
+computed per input size, per thread count, and per run, and a one sided trend test
+over run history flags benchmarks where the ratio grows.
+
+"""
+
+import logging
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+import scipy  # type: ignore[import-untyped]
+
+from .structure import BenchmarkArray
+
+
+log: logging.Logger = logging.getLogger(__name__)
+
+
+def wall_cpu_ratio(benchmark: BenchmarkArray) -> np.ndarray:
+    """Ratio of real (wall) time to cpu time of each measurement.
+
+    Returns:
+        (np.ndarray) ratio (n_sizes x repetitions), NaN where cpu time is not
+        positive.
+
+    """
+    cpu: np.ndarray = np.where(benchmark.cpu_time > 0, benchmark.cpu_time, np.nan)
+
+    return benchmark.real_time / cpu
+
+
+def ratio_by_threads(benchmark: BenchmarkArray) -> dict[int, np.ndarray]:
+    """Geometric mean wall / cpu time ratio per input size, of each thread count.
+
+    Args:
+        benchmark (BenchmarkArray): benchmark array data.
+
+    Returns:
+        (dict[int, np.ndarray]) map of thread count to ratio per input size (NaN
+        where a size was not run with that thread count).
+
+    """
+    log_ratio: np.ndarray = np.log(wall_cpu_ratio(benchmark))
+    result: dict[int, np.ndarray] = {}
+    for threads in np.unique(benchmark.threads).tolist():
+        valid: np.ndarray = (benchmark.threads == threads) & ~np.isnan(log_ratio)
+        total: np.ndarray = np.where(valid, log_ratio, 0.0).sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result[int(threads)] = np.exp(total / valid.sum(axis=1))
+
+    return result
+
+
+def ratio_matrix(
+    benchmarks: Sequence[BenchmarkArray],
+) -> tuple[np.ndarray, dict[int, np.ndarray]]:
+    """Align wall / cpu time ratio of a benchmark across runs by input size.
+
+    Args:
+        benchmarks (Sequence[BenchmarkArray]): benchmark arrays, one per run.
+
+    Returns:
+        (tuple[np.ndarray, dict[int, np.ndarray]]) sorted union of input sizes, and
+        map of thread count to a 2D array (n_runs x n_sizes) of ratios, with NaN
+        where a size (or thread count) was not run.
+
+    """
+    sizes: np.ndarray = np.unique(
+        np.concatenate([j.size for j in benchmarks] or [np.empty(0, np.int64)])
+    )
+    result: dict[int, np.ndarray] = {}
+    for row, bench in enumerate(benchmarks):
+        columns: np.ndarray = np.searchsorted(sizes, bench.size)
+        for threads, ratio in ratio_by_threads(bench).items():
+            matrix: np.ndarray = result.setdefault(
+                threads, np.full((len(benchmarks), sizes.size), np.nan)
+            )
+            matrix[row, columns] = ratio
+
+    return sizes, result
+
+
+@dataclass
+class RatioTrend:
+    """Trend of wall / cpu time ratio over run history, of a size and thread count.
+
+    Args:
+        function (str): function name or alias.
+        threads (int): number of threads.
+        size (int): input size.
+        runs (int): number of runs with a measured ratio.
+        last (float): ratio of most recent run.
+        slope (float): log ratio growth per run.
+        increase (float): relative ratio growth over history, per fitted trend.
+        pvalue (float): one sided p value of an upward trend.
+        flagged (bool): whether the ratio trends significantly upward.
+
+    """
+
+    # pylint: disable=R0902
+
+    function: str
+    threads: int
+    size: int
+    runs: int
+    last: float
+    slope: float
+    increase: float
+    pvalue: float
+    flagged: bool
+
+
+def _trend(y: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Least squares slope (per run) of each column, with t statistic and dof.
+
+    Missing (NaN) values are excluded column wise, in a single vectorized pass.
+
+    """
+    valid: np.ndarray = ~np.isnan(y)
+    x: np.ndarray = np.broadcast_to(np.arange(y.shape[0])[:, None], y.shape)
+    n: np.ndarray = valid.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        xm: np.ndarray = np.where(valid, x, 0).sum(axis=0) / n
+        ym: np.ndarray = np.where(valid, y, 0).sum(axis=0) / n
+        dx: np.ndarray = np.where(valid, x - xm, 0.0)
+        dy: np.ndarray = np.where(valid, y - ym, 0.0)
+        sxx: np.ndarray = (dx * dx).sum(axis=0)
+        sxy: np.ndarray = (dx * dy).sum(axis=0)
+        slope: np.ndarray = sxy / sxx
+        sse: np.ndarray = np.maximum((dy * dy).sum(axis=0) - slope * sxy, 0.0)
+        dof: np.ndarray = n - 2
+        se: np.ndarray = np.sqrt(sse / dof / sxx)
+        t: np.ndarray = np.where(se > 0, slope / se, np.sign(slope) * np.inf)
+
+    return slope, t, dof
+
+
+def divergence_trends(
+    benchmarks: Sequence[BenchmarkArray],
+    alpha: float = 0.05,
+    min_increase: float = 0.05,
+    min_runs: int = 4,
+) -> list[RatioTrend]:
+    """Test for upward trends of wall / cpu time ratio over run history.
+
+    Log ratio is regressed on run order, for each input size and thread count. A
+    trend is flagged when its one sided p value is significant after a Bonferroni
+    correction over input sizes, and ratio grew by at least `min_increase`.
+
+    Args:
+        benchmarks (Sequence[BenchmarkArray]): benchmark arrays of a function, one
+            per run, in chronological order.
+        alpha (float): family wise significance level.
+        min_increase (float): minimum relative growth of ratio over history.
+        min_runs (int): minimum number of runs to test a trend.
+
+    Returns:
+        (list[RatioTrend]) trend of each thread count and input size.
+
+    """
+    if not benchmarks:
+        return []
+
+    sizes, matrices = ratio_matrix(benchmarks)
+    function: str = benchmarks[-1].function
+    result: list[RatioTrend] = []
+    for threads, matrix in sorted(matrices.items()):
+        slope, t, dof = _trend(np.log(matrix))
+        pvalue: np.ndarray = np.where(
+            dof > 0, scipy.stats.t.sf(t, np.maximum(dof, 1)), np.nan
+        )
+        runs: np.ndarray = dof + 2
+        increase: np.ndarray = np.expm1(slope * np.maximum(runs - 1, 0))
+        flagged: np.ndarray = (
+            (runs >= min_runs)
+            & (pvalue < alpha / max(sizes.size, 1))
+            & (increase >= min_increase)
+        )
+        for j, size in enumerate(sizes.tolist()):
+            column: np.ndarray = matrix[:, j][~np.isnan(matrix[:, j])]
+            result.append(
+                RatioTrend(
+                    function=function,
+                    threads=threads,
+                    size=size,
+                    runs=int(runs[j]),
+                    last=float(column[-1]) if column.size else np.nan,
+                    slope=float(slope[j]),
+                    increase=float(increase[j]),
+                    pvalue=float(pvalue[j]),
+                    flagged=bool(flagged[j]),
+                )
+            )
+    for trend in result:
+        if trend.flagged:
+            log.warning(
+                "%s (threads=%d, n=%d): wall/cpu time ratio grew %.1f%% over %d runs"
+                " (p=%.2g).",
+                trend.function,
+                trend.threads,
+                trend.size,
+                100 * trend.increase,
+                trend.runs,
+                trend.pvalue,
+            )
+
+    return result
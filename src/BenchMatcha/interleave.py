@@ -0,0 +1,223 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Interleaved (A/B) benchmarking of two revisions.
+
+Benchmarking a baseline and a candidate minutes apart on the same host is confounded
+by thermal and frequency drift. Instead, both revisions are checked out into their own
+git worktree, and rounds of benchmark repetitions alternate between them in separate
+subprocess workers. The order within each round alternates as well (AB, BA, AB, ...),
+such that linear drift cancels from paired samples, which are compared with a paired
+statistical test.
+
+"""
+
+import contextlib
+import logging
+import os
+import subprocess
+import tempfile
+from dataclasses import dataclass, field, replace
+
+import numpy as np
+
+from .bisect import build_revision, git, worktree
+from .comparison import Comparison, compare_paired
+from .handlers import load
+from .structure import BenchmarkArray, parse_version
+from .worker import run_worker
+
+
+log: logging.Logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ABOptions:
+    """Options of interleaved benchmarking.
+
+    Args:
+        repo (str): path location of git repository.
+        baseline (str): baseline revision (A).
+        candidate (str): candidate revision (B).
+        paths (list[str]): benchmark paths, relative to repository root.
+        functions (list[str]): benchmark function names (all if empty).
+        argv (list[str]): additional google benchmark arguments.
+        build (str | None): shell command to build a revision, within its worktree.
+        rounds (int): number of interleaved rounds (pairs of samples).
+        attribute (str): timing attribute ("cpu_time" | "real_time").
+        alpha (float): significance level of paired test.
+        min_effect (float): minimum relative change of timing of a regression.
+        timeout (float | None): maximum seconds to build, or to benchmark a round.
+
+    """
+
+    # pylint: disable=R0902
+
+    repo: str
+    baseline: str
+    candidate: str
+    paths: list[str]
+    functions: list[str] = field(default_factory=list)
+    argv: list[str] = field(default_factory=list)
+    build: str | None = None
+    rounds: int = 10
+    attribute: str = "cpu_time"
+    alpha: float = 0.05
+    min_effect: float = 0.01
+    timeout: float | None = None
+
+
+@dataclass
+class ABResult:
+    """Outcome of interleaved benchmarking.
+
+    Args:
+        baseline (str): full sha of baseline revision.
+        candidate (str): full sha of candidate revision.
+        rounds (int): number of completed rounds.
+        comparisons (dict[str, Comparison]): paired comparison per benchmark function.
+
+    """
+
+    baseline: str
+    candidate: str
+    rounds: int
+    comparisons: dict[str, Comparison]
+
+
+def extend(a: BenchmarkArray, b: BenchmarkArray) -> BenchmarkArray:
+    """Append repetitions of a benchmark array, over input sizes in common."""
+    size, ia, ib = np.intersect1d(a.size, b.size, return_indices=True)
+
+    def stack(attribute: str) -> np.ndarray:
+        return np.hstack([getattr(a, attribute)[ia], getattr(b, attribute)[ib]])
+
+    return replace(
+        a,
+        size=size,
+        iterations=stack("iterations"),
+        real_time=stack("real_time"),
+        cpu_time=stack("cpu_time"),
+        threads=stack("threads"),
+        status=stack("status"),
+    )
+
+
+def _run_round(
+    options: ABOptions,
+    worktrees: tuple[str, str],
+    order: tuple[int, int],
+    tmpdir: str,
+) -> tuple[list[BenchmarkArray], list[BenchmarkArray]] | None:
+    """Benchmark both revisions once (in given order), or None on failure."""
+    outputs: list[str] = [os.path.join(tmpdir, f"{j}.json") for j in range(2)]
+    for k in order:
+        try:
+            if not run_worker(
+                worktrees[k],
+                options.paths,
+                options.functions,
+                options.argv,
+                outputs[k],
+                options.timeout,
+            ):
+                return None
+        except subprocess.TimeoutExpired as e:
+            log.error("Benchmark of %s timed out: %s", worktrees[k], e)
+            return None
+    benchmarks = [parse_version(load(j)).benchmarks for j in outputs]
+    for j in outputs:
+        os.remove(j)
+
+    return benchmarks[0], benchmarks[1]
+
+
+def interleave(options: ABOptions) -> ABResult:
+    """Benchmark two revisions in interleaved rounds, and compare paired samples.
+
+    Args:
+        options (ABOptions): interleaved benchmarking options.
+
+    Returns:
+        (ABResult) paired comparison of candidate against baseline, per function.
+
+    Raises:
+        subprocess.CalledProcessError: revision is unknown, or failed to build.
+
+    """
+    shas: tuple[str, str] = (
+        git(options.repo, "rev-parse", "--verify", f"{options.baseline}^{{commit}}"),
+        git(options.repo, "rev-parse", "--verify", f"{options.candidate}^{{commit}}"),
+    )
+    samples: tuple[dict[str, BenchmarkArray], dict[str, BenchmarkArray]] = ({}, {})
+    completed: int = 0
+    with contextlib.ExitStack() as stack:
+        worktrees: tuple[str, str] = (
+            stack.enter_context(worktree(options.repo, shas[0])),
+            stack.enter_context(worktree(options.repo, shas[1])),
+        )
+        if options.build:
+            for path in worktrees:
+                build_revision(path, options.build, options.timeout)
+        tmpdir: str = stack.enter_context(tempfile.TemporaryDirectory())
+
+        for r in range(options.rounds):
+            order: tuple[int, int] = (0, 1) if r % 2 == 0 else (1, 0)
+            if (result := _run_round(options, worktrees, order, tmpdir)) is None:
+                log.error("Round %d failed, comparing %d completed.", r, completed)
+                break
+            for sample, benchmarks in zip(samples, result, strict=True):
+                for bench in benchmarks:
+                    previous: BenchmarkArray | None = sample.get(bench.function)
+                    sample[bench.function] = (
+                        bench if previous is None else extend(previous, bench)
+                    )
+            completed += 1
+            log.debug("Completed round %d of %d.", completed, options.rounds)
+
+    comparisons: dict[str, Comparison] = {}
+    for function, baseline in samples[0].items():
+        if (candidate := samples[1].get(function)) is None:
+            log.warning("Benchmark %s not found in candidate revision.", function)
+            continue
+        comparisons[function] = compare_paired(
+            baseline,
+            candidate,
+            options.attribute,
+            options.alpha,
+            options.min_effect,
+        )
+        log.info(
+            "%s: x%.4f (p=%.3g)",
+            function,
+            comparisons[function].ratio,
+            comparisons[function].pvalue,
+        )
+
+    return ABResult(shas[0], shas[1], completed, comparisons)
@@ -0,0 +1,272 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Resource limits of benchmark runs, in benchmark (worker) subprocesses.
+
+Registered benchmark functions are wrapped, such that a call exceeding its wall clock
+timeout is interrupted (by SIGALRM), and a call exhausting the memory limit (address
+space, via ``resource.setrlimit``) is caught. Either is reported as an error run to
+google benchmark, which continues with the remaining benchmarks, and is parsed into
+the status (validity mask) of its BenchmarkArray. Once an input size times out, its
+remaining repetitions are skipped.
+
+Timeouts interrupt python code, such that a long running call into an extension
+module is interrupted once it returns. To bound such calls, the name of the run in
+progress is written to a progress file, from which the parent process detects (and
+kills) a stuck subprocess, to run it again with the stuck run reported as timed out.
+
+"""
+
+import functools
+import logging
+import os
+import re
+import resource
+import signal
+import threading
+import time
+from collections.abc import Callable, Collection, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+from .sifter import Register, hook_registration
+from .structure import _ERROR_PREFIXES, BenchmarkArray, Status
+
+
+log: logging.Logger = logging.getLogger(__name__)
+
+_UNITS: dict[str, int] = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+
+
+@dataclass
+class Limits:
+    """Resource limits of benchmark runs.
+
+    Args:
+        timeout (float | None): wall clock time (seconds) of each call to a benchmark
+            function, i.e. of a single input size and repetition.
+        memory (int | None): memory (bytes) a benchmark subprocess may allocate, in
+            addition to its address space after registering benchmarks.
+
+    """
+
+    timeout: float | None = None
+    memory: int | None = None
+
+
+def parse_memory(value: str) -> int:
+    """Parse a memory size in bytes, with an optional binary unit (e.g. 512M, 2GiB).
+
+    Raises:
+        ValueError: value is not a memory size.
+
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d*)?)\s*([KMGT]?)(?:i?B)?\s*", value, re.I)
+    if match is None:
+        raise ValueError(f"Invalid memory size: {value!r}")
+
+    return int(float(match[1]) * _UNITS[match[2].upper()])
+
+
+class _TimedOut(BaseException):
+    """Benchmark run exceeded its timeout.
+
+    NOTE: not an Exception, such that it is not caught by benchmark code.
+
+    """
+
+
+def _alarm(signum: int, frame: Any) -> None:  # pylint: disable=W0613
+    raise _TimedOut
+
+
+def run_name(state: Any) -> str:
+    """Name of a benchmark run, i.e. benchmark name and arguments (e.g. bench/8)."""
+    arguments: list[str] = []
+    while True:
+        try:
+            arguments.append(str(state.range(len(arguments))))
+        except IndexError:
+            return "/".join([state.name, *arguments])
+
+
+def _mark(progress: str, name: str) -> None:
+    """Write the name of the benchmark run in progress (empty once it returns)."""
+    with open(progress, "w", encoding="utf-8") as f:
+        f.write(name)
+
+
+def in_progress(progress: str, elapsed: float) -> str | None:
+    """Name of the benchmark run in progress for longer than elapsed seconds, if any.
+
+    Args:
+        progress (str): progress file path, written by guarded benchmarks.
+        elapsed (float): seconds since the run started.
+
+    """
+    try:
+        if time.time() - os.stat(progress).st_mtime < elapsed:
+            return None
+        with open(progress, encoding="utf-8") as f:
+            return f.read() or None
+    except OSError:
+        return None
+
+
+def guard(
+    func: Callable,
+    limits: Limits,
+    timed_out: set[str],
+    progress: str | None = None,
+) -> Callable:
+    """Wrap a benchmark function, reporting runs exceeding resource limits as errors.
+
+    Args:
+        func (Callable): benchmark function.
+        limits (Limits): resource limits.
+        timed_out (set[str]): names of benchmark runs (input sizes) which timed out,
+            shared across benchmarks.
+        progress (str | None): progress file path, to write the name of each timed
+            run in progress.
+
+    Returns:
+        (Callable) wrapped benchmark function.
+
+    """
+    timeout: float = limits.timeout or 0.0
+    message: str = f"{_ERROR_PREFIXES[Status.TIMED_OUT]} after {timeout:g}s"
+
+    @functools.wraps(func)
+    def wrapper(state: Any) -> Any:
+        name: str = run_name(state)
+        if name in timed_out:
+            state.skip_with_error(message)
+            return None
+        # NOTE: signals are only handled by the main thread.
+        alarm: bool = (
+            timeout > 0 and threading.current_thread() is threading.main_thread()
+        )
+        try:
+            if alarm and progress is not None:
+                _mark(progress, name)
+            if alarm:
+                signal.setitimer(signal.ITIMER_REAL, timeout)
+            return func(state)
+        except _TimedOut:
+            timed_out.add(name)
+            state.skip_with_error(message)
+        except MemoryError:
+            state.skip_with_error(_ERROR_PREFIXES[Status.OUT_OF_MEMORY])
+        finally:
+            if alarm:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+            if alarm and progress is not None:
+                _mark(progress, "")
+
+        return None
+
+    return wrapper
+
+
+@contextmanager
+def enforce(
+    limits: Limits,
+    timed_out: Collection[str] = (),
+    progress: str | None = None,
+) -> Iterator[None]:
+    """Guard benchmarks registered within context with resource limits.
+
+    Args:
+        limits (Limits): resource limits.
+        timed_out (Collection[str]): names of benchmark runs known to time out, which
+            are skipped.
+        progress (str | None): progress file path, to write the name of each timed
+            run in progress.
+
+    """
+    skipped: set[str] = set(timed_out)
+
+    def hook(name: str, func: Any, register: Register) -> Any:
+        return register(name, guard(func, limits, skipped, progress))
+
+    with hook_registration(hook):
+        yield
+
+
+def _address_space() -> int:
+    """Virtual memory size (bytes) of the current process, or zero if unknown."""
+    try:
+        with open("/proc/self/statm", encoding="utf-8") as f:
+            pages: int = int(f.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return 0
+
+    return pages * resource.getpagesize()
+
+
+def apply(limits: Limits) -> None:
+    """Apply resource limits to the current (benchmark) process.
+
+    Must be called from the main thread, after registering benchmarks, such that the
+    memory limit is relative to the address space of imported modules.
+
+    """
+    if limits.timeout is not None:
+        signal.signal(signal.SIGALRM, _alarm)
+    if limits.memory is None:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    soft: int = _address_space() + limits.memory
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (soft, hard))
+    except (OSError, ValueError) as e:
+        log.warning("Unable to limit memory: %r", e)
+
+
+def exceeded(
+    benchmarks: Sequence[BenchmarkArray],
+) -> dict[str, dict[Status, list[int]]]:
+    """Input sizes of benchmarks with runs exceeding resource limits.
+
+    Returns:
+        (dict[str, dict[Status, list[int]]]) input sizes by status, keyed by
+        benchmark function name.
+
+    """
+    result: dict[str, dict[Status, list[int]]] = {}
+    for bench in benchmarks:
+        for status in (Status.TIMED_OUT, Status.OUT_OF_MEMORY):
+            sizes: list[int] = bench.size[(bench.status == status).any(axis=1)].tolist()
+            if sizes:
+                result.setdefault(bench.function, {})[status] = sizes
+
+    return result
@@ -0,0 +1,237 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Derived (size normalized) benchmark metrics.
+
+Absolute timings on log-log axes hide small constant factor changes. Time per element
+(ns / element), throughput (elements / sec), and the relative residual against the
+fitted complexity curve are derived here with vectorized array operations, in bulk
+across many benchmark arrays at once.
+
+"""
+
+import logging
+import warnings
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from .complexity import FitResult, best_fit, predict
+from .structure import BenchmarkArray
+from .utils import _robust_stats, _simple_stats
+
+
+log: logging.Logger = logging.getLogger(__name__)
+
+# Seconds per unit of time reported by google benchmark
+_SECONDS: dict[str, float] = {"ns": 1e-9, "us": 1e-6, "ms": 1e-3, "s": 1.0}
+
+
+def unit_scale(unit: str) -> float:
+    """Seconds per unit of time.
+
+    Raises:
+        ValueError: unsupported unit of time.
+
+    """
+    try:
+        return _SECONDS[unit]
+
+    except KeyError as e:
+        raise ValueError(f"Unsupported unit of time: {unit}") from e
+
+
+def ns_per_element(size: np.ndarray, time: np.ndarray, unit: str) -> np.ndarray:
+    """Time per element, in nanoseconds.
+
+    Args:
+        size (np.ndarray): input sizes, broadcastable against time (e.g. n_sizes x 1).
+        time (np.ndarray): timings.
+        unit (str): unit of time.
+
+    Returns:
+        (np.ndarray) nanoseconds per element, NaN where size is not positive.
+
+    """
+    n: np.ndarray = np.where(size > 0, size, np.nan)
+
+    return time * (unit_scale(unit) * 1e9) / n
+
+
+def elements_per_second(size: np.ndarray, time: np.ndarray, unit: str) -> np.ndarray:
+    """Throughput, in elements per second.
+
+    Args:
+        size (np.ndarray): input sizes, broadcastable against time (e.g. n_sizes x 1).
+        time (np.ndarray): timings.
+        unit (str): unit of time.
+
+    Returns:
+        (np.ndarray) elements per second, NaN where time is not positive.
+
+    """
+    t: np.ndarray = np.where(time > 0, time, np.nan)
+
+    return size / (t * unit_scale(unit))
+
+
+def relative_residual(size: np.ndarray, mean: np.ndarray, fit: FitResult) -> np.ndarray:
+    """Relative residual of mean timings against a fitted complexity curve.
+
+    Args:
+        size (np.ndarray): input sizes.
+        mean (np.ndarray): mean timings per input size.
+        fit (FitResult): fitted complexity curve.
+
+    Returns:
+        (np.ndarray) (observed - predicted) / predicted, NaN where undefined.
+
+    """
+    expected: np.ndarray = predict(fit, size.astype(np.float64))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result: np.ndarray = np.where(expected > 0, mean / expected - 1.0, np.nan)
+
+    return result
+
+
+@dataclass
+class Metrics:
+    """Size normalized metrics of a benchmark array.
+
+    Args:
+        function (str): function name or alias.
+        size (np.ndarray): input sizes.
+        ns_per_element (np.ndarray): nanoseconds per element (n_sizes x repetitions).
+        throughput (np.ndarray): elements per second (n_sizes x repetitions).
+        residual (np.ndarray): relative residual of mean (or median) timing per size,
+            against best fitted complexity curve (NaN if no model converged).
+        fit (FitResult | None): best fitted complexity curve.
+
+    """
+
+    function: str
+    size: np.ndarray
+    ns_per_element: np.ndarray
+    throughput: np.ndarray
+    residual: np.ndarray
+    fit: FitResult | None
+
+    def summary(self) -> dict[str, np.ndarray]:
+        """Mean metrics per input size."""
+        with np.errstate(invalid="ignore"), warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            return {
+                "size": self.size,
+                "ns_per_element": np.nanmean(self.ns_per_element, axis=1),
+                "throughput": np.nanmean(self.throughput, axis=1),
+                "residual": self.residual,
+            }
+
+
+def _stack(
+    benchmarks: Sequence[BenchmarkArray],
+    attribute: str,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Concatenate sizes and timings of benchmarks, padding repetitions with NaN.
+
+    Timings are converted to seconds, such that benchmarks of mixed units are
+    combined into a single (total n_sizes x max repetitions) array.
+
+    """
+    reps: int = max(getattr(j, attribute).shape[1] for j in benchmarks)
+    counts: np.ndarray = np.asarray([j.size.size for j in benchmarks], dtype=np.int64)
+    time: np.ndarray = np.full((int(counts.sum()), reps), np.nan)
+    size: np.ndarray = np.concatenate([j.size for j in benchmarks]).astype(np.float64)
+    offset: int = 0
+    for j, count in zip(benchmarks, counts.tolist(), strict=True):
+        y: np.ndarray = getattr(j, attribute)
+        time[offset : offset + count, : y.shape[1]] = y * unit_scale(j.unit)
+        offset += count
+
+    return size, time, np.cumsum(counts)[:-1]
+
+
+def _residual(
+    benchmark: BenchmarkArray,
+    attribute: str,
+    robust: bool,
+) -> tuple[np.ndarray, FitResult | None]:
+    """Relative residual of a benchmark against its best fitted complexity curve."""
+    y: np.ndarray = getattr(benchmark, attribute)
+    fit: FitResult | None = best_fit(benchmark.size, y, robust=robust)
+    if fit is None:
+        return np.full(benchmark.size.size, np.nan), None
+    center, _ = _robust_stats(y) if robust else _simple_stats(y)
+
+    return relative_residual(benchmark.size, center, fit), fit
+
+
+def compute_metrics(
+    benchmarks: Sequence[BenchmarkArray],
+    attribute: str = "cpu_time",
+    robust: bool = False,
+) -> list[Metrics]:
+    """Compute size normalized metrics of many benchmark arrays at once.
+
+    Timings of all benchmarks are stacked into a single array, such that time per
+    element and throughput are computed in one vectorized pass. Residuals require a
+    complexity fit per benchmark.
+
+    Args:
+        benchmarks (Sequence[BenchmarkArray]): benchmark array data.
+        attribute (str): timing attribute ("cpu_time" | "real_time").
+        robust (bool): use robust statistics and fits.
+
+    Returns:
+        (list[Metrics]) metrics, in the same order as benchmarks.
+
+    """
+    if not benchmarks:
+        return []
+
+    size, time, splits = _stack(benchmarks, attribute)
+    per_element: np.ndarray = ns_per_element(size[:, None], time, "s")
+    throughput: np.ndarray = elements_per_second(size[:, None], time, "s")
+
+    result: list[Metrics] = []
+    for bench, a, b in zip(
+        benchmarks,
+        np.split(per_element, splits),
+        np.split(throughput, splits),
+        strict=True,
+    ):
+        reps: int = getattr(bench, attribute).shape[1]
+        residual, fit = _residual(bench, attribute, robust)
+        result.append(
+            Metrics(bench.function, bench.size, a[:, :reps], b[:, :reps], residual, fit)
+        )
+    log.debug("Computed metrics of %d benchmarks.", len(result))
+
+    return result
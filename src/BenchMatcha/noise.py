@@ -0,0 +1,447 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Background sampling of system noise throughout a benchmark run.
+
+A daemon thread samples the load average (``/proc/loadavg``), the number of busy cpu
+cores (``/proc/stat``), and the mean cpu frequency (``scaling_cur_freq`` of each core)
+at a fixed interval. Samples are timestamped with the wall clock, as is the interval
+in which each benchmark ran, such that benchmarks which ran during a noise spike, i.e.
+more busy cores or a lower frequency than the median of the run, are flagged and
+optionally rerun. Unavailable sources (e.g. not linux) are sampled as NaN.
+
+"""
+
+import functools
+import glob
+import logging
+import os
+import threading
+import time
+import warnings
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+import numpy as np
+
+from .adaptive import AdaptiveOptions, run_sizes
+from .sifter import Register, hook_registration
+from .structure import BenchmarkArray, BenchmarkContext
+
+
+log: logging.Logger = logging.getLogger(__name__)
+
+# Columns of sampled noise
+COLUMNS: tuple[str, ...] = ("timestamp", "load", "busy", "frequency")
+
+_FREQUENCIES: str = "/sys/devices/system/cpu/cpu[0-9]*/cpufreq/scaling_cur_freq"
+
+# Minimum (seconds) and multiple of the original duration, of a rerun timeout.
+_RERUN_TIMEOUT: tuple[float, float] = (60.0, 10.0)
+
+
+def read_load(path: str = "/proc/loadavg") -> float:
+    """One minute load average, or NaN if unavailable."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return float(f.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return np.nan
+
+
+def read_cpu_times(path: str = "/proc/stat") -> tuple[int, int] | None:
+    """Busy and total cpu time (jiffies) of all cores, or None if unavailable."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            fields: list[int] = [int(j) for j in f.readline().split()[1:]]
+    except (OSError, ValueError):
+        return None
+    if len(fields) < 4:
+        return None
+    # NOTE: idle and iowait are the 4th and 5th fields
+    idle: int = sum(fields[3:5])
+
+    return sum(fields) - idle, sum(fields)
+
+
+def read_frequency(pattern: str = _FREQUENCIES) -> float:
+    """Mean current frequency (MHz) of cpu cores, or NaN if unavailable."""
+    values: list[float] = []
+    for path in glob.glob(pattern):
+        try:
+            with open(path, encoding="utf-8") as f:
+                values.append(int(f.read()) / 1000)
+        except (OSError, ValueError):
+            continue
+
+    return float(np.mean(values)) if values else np.nan
+
+
+class NoiseSampler:
+    """Sample system noise in a background (daemon) thread.
+
+    Args:
+        interval (float): seconds between samples.
+
+    """
+
+    interval: float
+    _rows: list[tuple[float, ...]]
+    _previous: tuple[int, int] | None
+    _lock: threading.Lock
+    _stopped: threading.Event
+    _thread: threading.Thread | None
+
+    def __init__(self, interval: float = 0.25) -> None:
+        self.interval = interval
+        self._rows = []
+        self._previous = read_cpu_times()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def sample(self) -> tuple[float, ...]:
+        """Sample system noise, with busy cores since the previous sample."""
+        timestamp: float = time.time()
+        busy: float = np.nan
+        if (current := read_cpu_times()) is not None and self._previous is not None:
+            total: int = current[1] - self._previous[1]
+            if total > 0:
+                ratio: float = (current[0] - self._previous[0]) / total
+                busy = ratio * (os.cpu_count() or 1)
+        self._previous = current
+
+        return timestamp, read_load(), busy, read_frequency()
+
+    def _append(self) -> None:
+        row: tuple[float, ...] = self.sample()
+        with self._lock:
+            self._rows.append(row)
+
+    def _loop(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self._append()
+
+    def start(self) -> None:
+        """Start sampling in a background thread, with an initial sample."""
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._previous = read_cpu_times()
+        self._append()
+        self._thread = threading.Thread(
+            target=self._loop, name="noise-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> np.ndarray:
+        """Stop sampling, with a final sample, returning all samples."""
+        if self._thread is not None:
+            self._stopped.set()
+            self._thread.join()
+            self._thread = None
+            self._append()
+
+        return self.samples()
+
+    def samples(self) -> np.ndarray:
+        """Samples so far (n_samples x columns)."""
+        with self._lock:
+            rows: list[tuple[float, ...]] = list(self._rows)
+
+        return np.asarray(rows, dtype=np.float64).reshape(-1, len(COLUMNS))
+
+
+class Timeline:
+    """Wall clock interval (start, end) in which each benchmark function ran."""
+
+    intervals: dict[str, tuple[float, float]]
+    _lock: threading.Lock
+
+    def __init__(self) -> None:
+        self.intervals = {}
+        self._lock = threading.Lock()
+
+    def record(self, function: str, start: float, end: float) -> None:
+        """Extend the interval of a benchmark function."""
+        with self._lock:
+            if (previous := self.intervals.get(function)) is not None:
+                start, end = min(start, previous[0]), max(end, previous[1])
+            self.intervals[function] = (start, end)
+
+    def reset(self, function: str, start: float, end: float) -> None:
+        """Replace the interval of a benchmark function, e.g. once rerun."""
+        with self._lock:
+            self.intervals[function] = (start, end)
+
+    def _wrap(self, function: str, func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(state: Any) -> Any:
+            start: float = time.time()
+            try:
+                return func(state)
+            finally:
+                self.record(function, start, time.time())
+
+        return wrapper
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        """Record intervals of benchmarks registered within context, as they run."""
+
+        def hook(name: str, func: Any, register: Register) -> Any:
+            return register(name, self._wrap(name.split("/")[0], func))
+
+        with hook_registration(hook):
+            yield
+
+
+@dataclass
+class NoiseProfile:
+    """System noise sampled throughout a benchmark run.
+
+    Args:
+        samples (np.ndarray): samples (n_samples x columns), see COLUMNS.
+        intervals (dict[str, tuple[float, float]]): wall clock interval (start, end)
+            of each benchmark function.
+
+    """
+
+    samples: np.ndarray
+    intervals: dict[str, tuple[float, float]] = field(default_factory=dict)
+
+    def column(self, name: str) -> np.ndarray:
+        """Samples of a single column."""
+        return self.samples[:, COLUMNS.index(name)]
+
+    def window(self, function: str, interval: float = 0.0) -> np.ndarray:
+        """Samples while a benchmark function ran.
+
+        Args:
+            function (str): benchmark function name.
+            interval (float): sampling interval, such that the sample after a
+                benchmark ended (which spans its end) is included.
+
+        """
+        start, end = self.intervals[function]
+        timestamp: np.ndarray = self.column("timestamp")
+
+        return self.samples[(timestamp > start) & (timestamp <= end + interval)]
+
+
+@dataclass
+class NoiseFlag:
+    """Noise spike during a benchmark.
+
+    Args:
+        function (str): benchmark function name.
+        busy (float): most busy cores, in excess of the median of the run.
+        throttle (float): largest relative drop of cpu frequency, below the median
+            of the run.
+
+    """
+
+    function: str
+    busy: float
+    throttle: float
+
+
+@dataclass
+class NoiseOptions:
+    """System noise sampling options.
+
+    Args:
+        paths (list[str]): benchmark file or directory paths, to rerun benchmarks.
+        argv (list[str]): google benchmark command line arguments.
+        interval (float): seconds between samples.
+        reruns (int): maximum number of reruns of benchmarks flagged as noisy.
+        busy (float): excess busy cores considered a noise spike.
+        throttle (float): relative frequency drop considered a noise spike.
+
+    """
+
+    paths: list[str]
+    argv: list[str] = field(default_factory=list)
+    interval: float = 0.25
+    reruns: int = 0
+    busy: float = 0.5
+    throttle: float = 0.1
+
+
+def _nan_reduce(func: Callable[[np.ndarray], Any], x: np.ndarray) -> float:
+    """Reduce array, ignoring NaN, or NaN if no value is finite."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return float(func(x)) if x.size else np.nan
+
+
+def score(flag: NoiseFlag, options: NoiseOptions) -> float:
+    """Noise of a benchmark relative to thresholds, where above one is a spike."""
+    values: list[float] = [flag.busy / options.busy, flag.throttle / options.throttle]
+
+    return max((j for j in values if np.isfinite(j)), default=0.0)
+
+
+def measure(
+    profile: NoiseProfile,
+    options: NoiseOptions,
+    function: str,
+) -> NoiseFlag:
+    """Measure noise of a benchmark, relative to the median of the run."""
+    rows: np.ndarray = profile.window(function, options.interval)
+    busy: np.ndarray = rows[:, COLUMNS.index("busy")]
+    frequency: np.ndarray = rows[:, COLUMNS.index("frequency")]
+
+    return NoiseFlag(
+        function,
+        _nan_reduce(np.nanmax, busy)
+        - _nan_reduce(np.nanmedian, profile.column("busy")),
+        1.0
+        - _nan_reduce(np.nanmin, frequency)
+        / _nan_reduce(np.nanmedian, profile.column("frequency")),
+    )
+
+
+def flag(profile: NoiseProfile, options: NoiseOptions) -> list[NoiseFlag]:
+    """Flag benchmarks which ran during a noise spike.
+
+    Args:
+        profile (NoiseProfile): system noise sampled throughout the run.
+        options (NoiseOptions): noise options.
+
+    Returns:
+        (list[NoiseFlag]) noise spike of each flagged benchmark.
+
+    """
+    if len(profile.samples) < 3:
+        return []
+
+    flags: list[NoiseFlag] = [
+        measure(profile, options, function) for function in profile.intervals
+    ]
+
+    return [j for j in flags if score(j, options) > 1.0]
+
+
+def _rerun(
+    bench: BenchmarkArray,
+    options: NoiseOptions,
+    duration: float,
+) -> tuple[BenchmarkArray | None, tuple[float, float]]:
+    """Rerun all input sizes of a benchmark in a subprocess."""
+    minimum, multiple = _RERUN_TIMEOUT
+    start: float = time.time()
+    result: BenchmarkContext | None = run_sizes(
+        {bench.function: bench.size.tolist()},
+        AdaptiveOptions(paths=options.paths, argv=options.argv),
+        max(minimum, multiple * duration),
+    )
+    end: float = time.time()
+    if result is None:
+        return None, (start, end)
+    rerun: list[BenchmarkArray] = [
+        j for j in result.benchmarks if j.function == bench.function
+    ]
+
+    return (rerun[0] if rerun else None), (start, end)
+
+
+class NoiseMonitor:
+    """Sample system noise throughout a benchmark run, and settle noisy benchmarks.
+
+    Args:
+        options (NoiseOptions): noise options.
+
+    """
+
+    options: NoiseOptions
+    sampler: NoiseSampler
+    timeline: Timeline
+
+    def __init__(self, options: NoiseOptions) -> None:
+        self.options = options
+        self.sampler = NoiseSampler(options.interval)
+        self.timeline = Timeline()
+
+    def profile(self) -> NoiseProfile:
+        """System noise sampled so far."""
+        return NoiseProfile(self.sampler.samples(), dict(self.timeline.intervals))
+
+    def settle(self, context: BenchmarkContext) -> BenchmarkContext:
+        """Rerun benchmarks which ran during a noise spike, keeping the quieter run.
+
+        Benchmarks remaining noisy after all reruns are logged.
+
+        """
+        benchmarks: dict[str, BenchmarkArray] = {
+            j.function: j for j in context.benchmarks
+        }
+        flags: list[NoiseFlag] = [
+            j for j in flag(self.profile(), self.options) if j.function in benchmarks
+        ]
+        for attempt in range(self.options.reruns):
+            if not flags:
+                break
+            remaining: list[NoiseFlag] = []
+            for previous in flags:
+                start, end = self.timeline.intervals[previous.function]
+                log.info("Rerun noisy benchmark %s (%d)", previous.function, attempt)
+                rerun, interval = _rerun(
+                    benchmarks[previous.function], self.options, end - start
+                )
+                if rerun is None:
+                    remaining.append(previous)
+                    continue
+                profile: NoiseProfile = replace(
+                    self.profile(), intervals={previous.function: interval}
+                )
+                current: NoiseFlag = measure(profile, self.options, previous.function)
+                if score(current, self.options) >= score(previous, self.options):
+                    remaining.append(previous)
+                    continue
+                benchmarks[previous.function] = rerun
+                self.timeline.reset(previous.function, *interval)
+                if score(current, self.options) > 1.0:
+                    remaining.append(current)
+            flags = remaining
+
+        for j in flags:
+            log.warning(
+                "Benchmark %s ran during a noise spike (busy cores +%.2f, cpu"
+                " frequency -%.1f%%)",
+                j.function,
+                j.busy,
+                100 * j.throttle,
+            )
+
+        return replace(
+            context, benchmarks=[benchmarks[j.function] for j in context.benchmarks]
+        )
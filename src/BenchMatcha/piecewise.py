@@ -0,0 +1,326 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Cache hierarchy aware change point detection and piecewise complexity fits.
+
+Time per element often steps up as the working set of a benchmark outgrows a cache
+level. A single (global) complexity fit blurs these regimes together. Instead,
+change points of time per element are detected along the input size axis, and
+compared to cache boundaries, where the working set (input size times element size)
+exceeds each cache size. A complexity fit is performed within each cache regime.
+
+"""
+
+import logging
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from .complexity import Criterion, FitResult, best_fit
+from .structure import BenchmarkArray, Cache
+from .utils import _simple_stats
+
+
+log: logging.Logger = logging.getLogger(__name__)
+
+# Minimum relative noise (standard deviation of log time), to avoid over segmenting.
+_MIN_NOISE: float = 0.01
+
+
+@dataclass
+class Regime:
+    """Range of input sizes whose working set fits within a memory level.
+
+    Args:
+        name (str): memory level (e.g. "L1", "L2", "L3", "Memory").
+        lower (float): minimum input size (inclusive), in elements.
+        upper (float): maximum input size (exclusive), in elements.
+
+    """
+
+    name: str
+    lower: float
+    upper: float
+
+    def contains(self, size: np.ndarray) -> np.ndarray:
+        """Mask of input sizes within regime."""
+        return (size >= self.lower) & (size < self.upper)
+
+
+@dataclass
+class Segment:
+    """Complexity fit of benchmark input sizes within a cache regime.
+
+    Args:
+        regime (Regime): cache regime.
+        index (np.ndarray): indices of benchmark input sizes within regime.
+        fit (FitResult | None): best complexity fit, if enough sizes converged.
+
+    """
+
+    regime: Regime
+    index: np.ndarray
+    fit: FitResult | None
+
+
+@dataclass
+class Knee:
+    """Detected change point of time per element.
+
+    Args:
+        size (float): input size (geometric midpoint of neighboring sizes).
+        ratio (float): time per element after, relative to before, change point.
+        level (str | None): nearest cache boundary, if within tolerance.
+
+    """
+
+    size: float
+    ratio: float
+    level: str | None
+
+
+@dataclass
+class CacheAnalysis:
+    """Cache hierarchy aware analysis of a benchmark.
+
+    Args:
+        regimes (list[Regime]): cache regimes, by increasing input size.
+        knees (list[Knee]): detected change points of time per element.
+        segments (list[Segment]): complexity fit per (measured) cache regime.
+
+    """
+
+    regimes: list[Regime]
+    knees: list[Knee]
+    segments: list[Segment]
+
+
+def cache_regimes(caches: Sequence[Cache], element_size: int) -> list[Regime]:
+    """Partition input sizes by the smallest (data) cache level holding working set.
+
+    Args:
+        caches (Sequence[Cache]): system cache information.
+        element_size (int): bytes of working set per input element.
+
+    Returns:
+        (list[Regime]) contiguous regimes, from zero to infinite input size.
+
+    """
+    levels: list[Cache] = sorted(
+        (j for j in caches if j.type != "Instruction" and j.size > 0),
+        key=lambda j: (j.level, j.size),
+    )
+    regimes: list[Regime] = []
+    lower: float = 0.0
+    for cache in levels:
+        upper: float = cache.size / element_size
+        if upper <= lower:
+            continue
+        regimes.append(Regime(f"L{cache.level}", lower, upper))
+        lower = upper
+    regimes.append(Regime("Memory", lower, np.inf))
+
+    return regimes
+
+
+# Polynomial degree of smooth trend, on which level shifts are detected.
+_TREND_DEGREE: int = 3
+
+
+def _shift_sse(design: np.ndarray, z: np.ndarray, points: Sequence[int]) -> float:
+    """Sum of square error of least squares fit of trend and level shifts."""
+    steps: list[np.ndarray] = [(np.arange(z.size) >= k).astype(float) for k in points]
+    a: np.ndarray = np.column_stack([design, *steps])
+    coef, *_ = np.linalg.lstsq(a, z, rcond=None)
+    residuals: np.ndarray = z - a @ coef
+
+    return float(residuals @ residuals)
+
+
+def _noise(y: np.ndarray) -> float:
+    """Typical standard deviation of log time, across repetitions of each size."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        spread: np.ndarray = np.nanstd(np.log(y), axis=1, ddof=1)
+    spread = spread[np.isfinite(spread)]
+    noise: float = float(np.median(spread)) if spread.size else 0.0
+
+    return max(noise, _MIN_NOISE)
+
+
+def change_points(
+    size: np.ndarray,
+    y: np.ndarray,
+    min_size: int = 3,
+    penalty: float | None = None,
+) -> np.ndarray:
+    """Detect change points (level shifts) of time per element, along input size axis.
+
+    Log time per element is modeled as a smooth (cubic) trend in log input size,
+    plus level shifts. Level shifts are added by forward selection, while each
+    reduces the sum of square error by more than a BIC like penalty. A smooth trend
+    absorbs the curvature of any complexity class (e.g. O(NlogN)), such that only
+    abrupt changes, as when a working set outgrows a cache level, are detected.
+
+    Args:
+        size (np.ndarray): sorted input sizes.
+        y (np.ndarray): timings (n_sizes x repetitions).
+        min_size (int): minimum number of input sizes between change points.
+        penalty (float | None): cost of each change point. Defaults to a penalty
+            scaled by measurement noise.
+
+    Returns:
+        (np.ndarray) indices of the first input size of each new segment.
+
+    """
+    mean, _ = _simple_stats(y)
+    valid: np.ndarray = (size > 0) & (mean > 0)
+    index: np.ndarray = np.flatnonzero(valid)
+    n: int = index.size
+    if n < 2 * min_size:
+        return np.empty(0, dtype=np.int64)
+
+    x: np.ndarray = np.log2(size[valid].astype(np.float64))
+    z: np.ndarray = np.log(mean[valid] / size[valid])
+    if penalty is None:
+        penalty = 3.0 * _noise(y[valid]) ** 2 * np.log(n)
+
+    degree: int = min(_TREND_DEGREE, n - 2 * min_size)
+    design: np.ndarray = np.vander(x - x.mean(), degree + 1)
+    points: list[int] = []
+    current: float = _shift_sse(design, z, points)
+    while True:
+        candidates: list[tuple[float, int]] = [
+            (_shift_sse(design, z, [*points, k]), k)
+            for k in range(min_size, n - min_size + 1)
+            if all(abs(k - j) >= min_size for j in points)
+        ]
+        if not candidates:
+            break
+        sse, k = min(candidates)
+        if current - sse <= penalty:
+            break
+        current = sse
+        points.append(k)
+
+    return np.sort(index[points]).astype(np.int64)
+
+
+def nearest_level(
+    size: float,
+    regimes: Sequence[Regime],
+    tolerance: float = 2.0,
+) -> str | None:
+    """Name of the cache level whose boundary is nearest a change point.
+
+    Args:
+        size (float): input size of change point.
+        regimes (Sequence[Regime]): cache regimes.
+        tolerance (float): maximum factor between change point and boundary.
+
+    Returns:
+        (str | None) name of the cache level outgrown at boundary, if any.
+
+    """
+    bounds: list[tuple[float, str]] = [
+        (abs(np.log2(size / j.upper)), j.name)
+        for j in regimes
+        if np.isfinite(j.upper) and j.upper > 0
+    ]
+    if not bounds:
+        return None
+    distance, name = min(bounds)
+
+    return name if distance <= np.log2(tolerance) else None
+
+
+def find_knees(
+    size: np.ndarray, y: np.ndarray, regimes: Sequence[Regime]
+) -> list[Knee]:
+    """Locate change points of time per element, and attribute them to cache levels.
+
+    Args:
+        size (np.ndarray): sorted input sizes.
+        y (np.ndarray): timings (n_sizes x repetitions).
+        regimes (Sequence[Regime]): cache regimes.
+
+    Returns:
+        (list[Knee]) detected change points, by increasing input size.
+
+    """
+    mean, _ = _simple_stats(y)
+    per_element: np.ndarray = mean / size
+    knees: list[Knee] = []
+    for k in change_points(size, y):
+        point: float = float(np.sqrt(size[k - 1] * size[k]))
+        ratio: float = float(per_element[k] / per_element[k - 1])
+        knees.append(Knee(point, ratio, nearest_level(point, regimes)))
+
+    return knees
+
+
+def analyze_cache(  # pylint: disable=R0913,R0917
+    benchmark: BenchmarkArray,
+    caches: Sequence[Cache],
+    element_size: int,
+    attribute: str = "cpu_time",
+    criterion: Criterion = "bic",
+    robust: bool = False,
+) -> CacheAnalysis:
+    """Detect cache knees, and fit complexity within each cache regime.
+
+    Args:
+        benchmark (BenchmarkArray): benchmark array data.
+        caches (Sequence[Cache]): system cache information.
+        element_size (int): bytes of working set per input element.
+        attribute (str): timing attribute ("cpu_time" | "real_time").
+        criterion (Criterion): model selection criterion.
+        robust (bool): use robust statistics and fits.
+
+    Returns:
+        (CacheAnalysis) cache regimes, change points and piecewise fits.
+
+    """
+    y: np.ndarray = getattr(benchmark, attribute)
+    size: np.ndarray = benchmark.size.astype(np.float64)
+    regimes: list[Regime] = cache_regimes(caches, element_size)
+    knees: list[Knee] = find_knees(size, y, regimes)
+    log.debug("%s: cache knees %s", benchmark.function, knees)
+
+    segments: list[Segment] = []
+    for regime in regimes:
+        index: np.ndarray = np.flatnonzero(regime.contains(size))
+        if index.size == 0:
+            continue
+        fit: FitResult | None = None
+        if index.size >= 3:
+            fit = best_fit(size[index], y[index], criterion, robust)
+        segments.append(Segment(regime, index, fit))
+
+    return CacheAnalysis(regimes, knees, segments)
@@ -29,24 +29,249 @@
 
 """Plotting utilities."""
 
-from collections.abc import Callable
+import base64
+import hashlib
+import os
+import uuid
+from collections.abc import Callable, Sequence
+from datetime import UTC, datetime
+from typing import Any
 
 import numpy as np
 import plotly.graph_objs as go  # type: ignore[import-untyped]
-from plotly.express import colors  # type: ignore[import-untyped]
-from plotly.io import to_json as _to_json  # type: ignore[import-untyped]
+import plotly.io as pio  # type: ignore[import-untyped]
+from plotly import colors
+from plotly.io.json import to_json_plotly  # type: ignore[import-untyped]
+from plotly.offline import get_plotlyjs_version  # type: ignore[import-untyped]
+from plotly.subplots import make_subplots  # type: ignore[import-untyped]
 
+from .complexity import (
+    BootstrapResult,
+    FitResult,
+    best_fit,
+    bootstrap_complexity,
+    crossover_points,
+    describe,
+    predict,
+    predict_interval,
+    robust_stats,
+)
 from .config import ConfigBase
-from .structure import BenchmarkArray
-from .utils import _simple_stats, power_of_2
+from .divergence import RatioTrend, ratio_by_threads, ratio_matrix
+from .metrics import Metrics, elements_per_second, ns_per_element
+from .piecewise import CacheAnalysis, analyze_cache
+from .structure import BenchmarkArray, Cache
+from .utils import BigO, _simple_stats, lttb, power_of_2
 
 
 Prism: list[str] = colors.qualitative.Prism[:]
 
 
+# Typed array codes understood by plotly.js (int64 is intentionally unsupported)
+_integer_codes: tuple[tuple[str, type[np.integer]], ...] = (
+    ("u1", np.uint8),
+    ("i1", np.int8),
+    ("u2", np.uint16),
+    ("i2", np.int16),
+    ("u4", np.uint32),
+    ("i4", np.int32),
+)
+_typed_array_keys: frozenset[str] = frozenset({"dtype", "bdata"})
+
+# Resolve shared (deduplicated) arrays once, then hand the figure to plotly.js
+_LOADER: str = """(function(){{
+var T={{u1:Uint8Array,i1:Int8Array,u2:Uint16Array,i2:Int16Array,u4:Uint32Array,\
+i4:Int32Array,f4:Float32Array,f8:Float64Array}};
+var d=function(a){{var b=atob(a.bdata),u=new Uint8Array(b.length);\
+for(var i=0;i<b.length;i++)u[i]=b.charCodeAt(i);return new T[a.dtype](u.buffer);}};
+var s={shared};for(var k in s)s[k]=d(s[k]);
+var g=window.BenchMatchaTemplates||{{}};
+var r=function(o){{if(Array.isArray(o))return o.map(r);\
+if(o&&typeof o==="object"){{if(typeof o.$ref==="string")return s[o.$ref];\
+if(typeof o.$template==="string")return g[o.$template];\
+var t={{}};for(var j in o)t[j]=r(o[j]);return t;}}return o;}};
+Plotly.newPlot("{div_id}",r({data}),r({layout}),{{"responsive":true}});
+}})();"""
+
+
+def _narrowest_dtype(x: np.ndarray) -> tuple[str, np.ndarray]:
+    """Select the smallest lossless plotly.js typed array representation."""
+    if x.dtype.kind in "biu" and x.size:
+        low, high = int(x.min()), int(x.max())
+        for code, dtype in _integer_codes:
+            info = np.iinfo(dtype)
+            if info.min <= low and high <= info.max:
+                return code, x.astype(dtype)
+
+    return "f8", x.astype(np.float64)
+
+
+def encode_typed_array(x: np.ndarray | list) -> dict[str, str]:
+    """Encode a 1D numeric array as a plotly base64 typed array specification.
+
+    Args:
+        x (np.ndarray | list): 1D numeric array.
+
+    Returns:
+        (dict[str, str]) typed array specification, e.g. ``{"dtype", "bdata"}``.
+
+    """
+    code, arr = _narrowest_dtype(np.asarray(x))
+    bdata: bytes = base64.b64encode(arr.astype(arr.dtype.newbyteorder("<")).tobytes())
+
+    return {"dtype": code, "bdata": bdata.decode("ascii")}
+
+
+def _is_numeric_array(x: Any) -> bool:
+    if isinstance(x, np.ndarray):
+        return x.ndim == 1 and x.dtype.kind in "biuf"
+
+    return (
+        isinstance(x, list | tuple)
+        and len(x) > 0
+        and all(isinstance(j, int | float) and not isinstance(j, bool) for j in x)
+    )
+
+
+def _is_typed_array(x: Any) -> bool:
+    return isinstance(x, dict) and _typed_array_keys.issubset(x) and "shape" not in x
+
+
+def _encode(obj: Any) -> Any:
+    """Recursively encode numeric arrays of trace data as typed arrays."""
+    if _is_typed_array(obj):
+        return {"dtype": obj["dtype"], "bdata": obj["bdata"]}
+    if _is_numeric_array(obj):
+        return encode_typed_array(obj)
+    if isinstance(obj, dict):
+        return {k: _encode(v) for k, v in obj.items()}
+    if isinstance(obj, list | tuple):
+        return [_encode(v) for v in obj]
+
+    return obj
+
+
+def _deduplicate(obj: Any, counts: dict[tuple[str, str], int], shared: dict) -> Any:
+    """Replace typed arrays occurring more than once with a shared reference."""
+    if _is_typed_array(obj):
+        key: tuple[str, str] = (obj["dtype"], obj["bdata"])
+        if counts[key] < 2:
+            return obj
+        ref: str = shared.setdefault(key, f"a{len(shared)}")
+
+        return {"$ref": ref}
+    if isinstance(obj, dict):
+        return {k: _deduplicate(v, counts, shared) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_deduplicate(v, counts, shared) for v in obj]
+
+    return obj
+
+
+def _count(obj: Any, counts: dict[tuple[str, str], int]) -> None:
+    if _is_typed_array(obj):
+        key = (obj["dtype"], obj["bdata"])
+        counts[key] = counts.get(key, 0) + 1
+    elif isinstance(obj, dict):
+        for v in obj.values():
+            _count(v, counts)
+    elif isinstance(obj, list):
+        for v in obj:
+            _count(v, counts)
+
+
+def compact_figure(figure: go.Figure) -> tuple[dict[str, Any], dict[str, dict]]:
+    """Encode trace arrays as typed arrays and deduplicate shared axes.
+
+    Args:
+        figure (go.Figure): Plotly figure.
+
+    Returns:
+        (tuple[dict[str, Any], dict[str, dict]]) compacted figure dictionary, whose
+        repeated arrays are replaced by ``{"$ref": key}``, and the shared arrays
+        table mapping each key to its typed array specification.
+
+    """
+    fig: dict[str, Any] = figure.to_plotly_json()
+    data: list[dict] = _encode(fig.get("data", []))
+
+    counts: dict[tuple[str, str], int] = {}
+    _count(data, counts)
+    shared: dict[tuple[str, str], str] = {}
+    fig["data"] = _deduplicate(data, counts, shared)
+    table: dict[str, dict] = {
+        v: {"dtype": k[0], "bdata": k[1]} for k, v in shared.items()
+    }
+
+    return fig, table
+
+
+def _template_key(template: dict[str, Any]) -> str:
+    text: bytes = to_json_plotly(template, engine="orjson").encode()
+
+    return hashlib.sha1(text, usedforsecurity=False).hexdigest()[:12]
+
+
+def _default_template() -> dict[str, Any]:
+    return pio.templates[pio.templates.default].to_plotly_json()
+
+
+def html_header() -> str:
+    """Render the html report header, written once per report file.
+
+    The header references the plotly.js CDN and registers the default layout
+    template, which each figure fragment then refers to instead of embedding.
+
+    """
+    cdn: str = f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"
+    template: dict[str, Any] = _default_template()
+    registry: str = to_json_plotly({_template_key(template): template}, engine="orjson")
+
+    return (
+        f'<div><script charset="utf-8" src="{cdn}"></script>'
+        '<script type="text/javascript">window.BenchMatchaTemplates='
+        f"Object.assign(window.BenchMatchaTemplates||{{}},{registry});</script></div>\n"
+    )
+
+
+def to_html_fragment(figure: go.Figure, div_id: str | None = None) -> str:
+    """Render a compact html div of a plotly figure.
+
+    Args:
+        figure (go.Figure): Plotly figure.
+        div_id (str | None): html id of figure div. Defaults to a random uuid.
+
+    Returns:
+        (str) html fragment, expected to follow an :func:`html_header`.
+
+    """
+    fig, shared = compact_figure(figure)
+    layout: dict[str, Any] = fig.get("layout", {})
+    if (template := layout.get("template")) == _default_template():
+        layout["template"] = {"$template": _template_key(template)}
+
+    div_id = div_id or str(uuid.uuid4())
+    loader: str = _LOADER.format(
+        shared=to_json_plotly(shared, engine="orjson"),
+        div_id=div_id,
+        data=to_json_plotly(fig["data"], engine="orjson"),
+        layout=to_json_plotly(layout, engine="orjson"),
+    )
+
+    return (
+        f'<div><div id="{div_id}" class="plotly-graph-div" '
+        'style="height:100%; width:100%;"></div>'
+        f'<script type="text/javascript">{loader}</script></div>\n'
+    )
+
+
 def to_html(figure: go.Figure, path: str, mode: str = "w") -> None:
     """Saves a plotly figure in HTML Format to a file.
 
+    Numeric trace data is written as base64 typed arrays, and arrays shared across
+    traces (e.g. input size) are written once. The plotly.js script tag and layout
+    template are written once per file, rather than with every appended figure.
+
     Args:
         figure (go.Figure): Plotly figure.
         path (str): Filepath to save plotly figure.
@@ -56,14 +281,19 @@ def to_html(figure: go.Figure, path: str, mode: str = "w") -> None:
         (None) Appends/writes figure to html filepath.
 
     """
+    create: bool = mode == "w" or not os.path.exists(path) or not os.path.getsize(path)
     with open(path, mode) as f:
-        f.write(figure.to_html(full_html=False, include_plotlyjs="cdn"))
+        if create:
+            f.write(html_header())
+        f.write(to_html_fragment(figure))
 
 
 def to_json(figure: go.Figure, path: str) -> None:
-    """Serialize a plotly figure to a json file."""
+    """Serialize a plotly figure to a json file, with numeric arrays base64 encoded."""
+    fig: dict[str, Any] = figure.to_plotly_json()
+    fig["data"] = _encode(fig.get("data", []))
     with open(path, "w") as f:
-        f.write(_to_json(figure, False, False, True, engine="orjson"))
+        f.write(pio.to_json(fig, False, False, True, engine="orjson"))
 
 
 def construct_log2_axis(x: np.ndarray) -> tuple[list[int], list[str]]:
@@ -92,6 +322,7 @@ def create_scatter_trace(
     y: np.ndarray,
     name: str,
     color: str,
+    robust: bool = False,
 ) -> go.Scatter:
     """Create scatter trace of mean and std.
 
@@ -100,12 +331,13 @@ def create_scatter_trace(
         y (np.ndarray): y values
         name (str): name to give plot
         color (str): trace color
+        robust (bool): use median and MAD (excluding outliers) instead.
 
     Returns:
         (go.Scatter) scatter plot trace of data.
 
     """
-    mean, std = _simple_stats(y)
+    mean, std = robust_stats(y) if robust else _simple_stats(y)
 
     return go.Scatter(
         mode="lines+markers",
@@ -117,6 +349,35 @@ def create_scatter_trace(
     )
 
 
+def outlier_trace(
+    x: np.ndarray,
+    y: np.ndarray,
+    mask: np.ndarray,
+    name: str,
+) -> go.Scatter:
+    """Create scatter trace of individual repetitions flagged as outliers.
+
+    Args:
+        x (np.ndarray): x values
+        y (np.ndarray): y values (n_sizes x repetitions)
+        mask (np.ndarray): boolean outlier mask, with same shape as y
+        name (str): name to give plot
+
+    Returns:
+        (go.Scatter) scatter plot trace of outliers.
+
+    """
+    rows, _ = np.nonzero(mask)
+
+    return go.Scatter(
+        mode="markers",
+        x=x[rows],
+        y=y[mask],
+        name=name,
+        marker=dict(symbol="x", color="crimson", size=8),
+    )
+
+
 def box_plot(
     x: np.ndarray,
     y: np.ndarray,
@@ -156,12 +417,15 @@ def box_plot(
 def create_annotation_text(
     label: str,
     error: float,
+    probabilities: Sequence[tuple[str, float]] = (),
 ) -> dict:
     """Build a simple annotation data of complexity fit information.
 
     Args:
         label (str): Complexity label
-        error (float): error to fit (e.g. RMSD)
+        error (float): relative error of fit (e.g. normalized RMSD)
+        probabilities (Sequence[tuple[str, float]]): bootstrap probability of
+            complexity classes, by label.
 
     Example:
 
@@ -169,19 +433,18 @@ def create_annotation_text(
 
             benchmark: BenchmarkArray
             figure = go.Figure()
-            figure.add_annotation(
-                **create_annotation_text(
-                    benchmark.complexity.bigo,
-                    benchmark.complexity.rms,
-                )
-            )
+            fit: FitResult
+            figure.add_annotation(**create_annotation_text(describe(fit), fit.rms))
 
     """
-    a = f"{error:.2f}% "
-    b = f"O({label}) "
-    length = max(len(a), len(b))
-    c = f" Complexity: {b: >{length}}"
-    d = f"        RMS: {a: >{length}}"
+    rows: list[tuple[str, str]] = [
+        ("Complexity", f"O({label}) "),
+        ("RMS", f"{100 * error:.2f}% "),
+        *((f"P(O({k}))", f"{p:.0%} ") for k, p in probabilities),
+    ]
+    width: int = max(len(k) for k, _ in rows) + 1
+    length: int = max(len(v) for _, v in rows)
+    text: str = "<br>".join(f"{k: >{width}}: {v: >{length}}" for k, v in rows)
 
     return dict(
         xref="paper",
@@ -189,7 +452,7 @@ def create_annotation_text(
         x=0.01,
         y=0.99,
         showarrow=False,
-        text=f"{c}<br>{d}",
+        text=text,
         align="left",
         bgcolor="rgba(255,255,255,0.6)",
         bordercolor="black",
@@ -249,12 +512,194 @@ def draw_complexity_line(
     )
 
 
-def plot_benchmark_array(benchmark: BenchmarkArray, config: ConfigBase) -> go.Figure:
+def draw_fit_line(
+    x: np.ndarray,
+    result: FitResult,
+    name: str,
+    color: str,
+) -> go.Scatter:
+    """Create a scatter plot of a fitted complexity equation.
+
+    Args:
+        x (np.ndarray): x axis data (n).
+        result (FitResult): complexity fit.
+        name (str): name (label) to give trace on plot.
+        color (str): color of line.
+
+    Returns:
+        (go.Scatter): scatter plot trace of fitted complexity equation.
+
+    """
+    return go.Scatter(
+        x=x,
+        y=predict(result, x),
+        name=name,
+        mode="lines",
+        line=dict(
+            color=color,
+            dash="dash",
+            shape="spline",
+        ),
+        opacity=0.7,
+    )
+
+
+def draw_fit_band(
+    x: np.ndarray,
+    result: BootstrapResult,
+    name: str,
+    color: str,
+    confidence: float = 0.95,
+) -> list[go.Scatter]:
+    """Create scatter plots of the confidence band of a bootstrapped complexity fit.
+
+    Args:
+        x (np.ndarray): x axis data (n).
+        result (BootstrapResult): bootstrap resampled complexity fit.
+        name (str): name (label) to give trace on plot.
+        color (str): color of band.
+        confidence (float): confidence level of band.
+
+    Returns:
+        (list[go.Scatter]): lower bound, and upper bound filled to lower bound.
+
+    """
+    lower, upper = predict_interval(result, x, confidence)
+    line: dict[str, Any] = dict(color=color, width=0, shape="spline")
+
+    return [
+        go.Scatter(
+            x=x,
+            y=lower,
+            mode="lines",
+            line=line,
+            legendgroup=name,
+            showlegend=False,
+            hoverinfo="skip",
+        ),
+        go.Scatter(
+            x=x,
+            y=upper,
+            name=name,
+            mode="lines",
+            line=line,
+            fill="tonexty",
+            fillcolor=color,
+            legendgroup=name,
+            opacity=0.2,
+        ),
+    ]
+
+
+def _format_bytes(x: float) -> str:
+    """Format size in bytes with binary prefix (e.g. 32 KiB)."""
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if x < 1024:
+            return f"{x:.3g} {unit}"
+        x /= 1024
+
+    return f"{x:.3g} TiB"
+
+
+def annotate_cache_regimes(
+    fig: go.Figure,
+    analysis: CacheAnalysis,
+    benchmark: BenchmarkArray,
+    config: ConfigBase,
+) -> None:
+    """Annotate cache boundaries, detected knees, and piecewise fits of a figure.
+
+    Args:
+        fig (go.Figure): benchmark figure to annotate (in place).
+        analysis (CacheAnalysis): cache hierarchy aware analysis of benchmark.
+        benchmark (BenchmarkArray): benchmark array data.
+        config (ConfigBase): configuration settings.
+
+    """
+    lower, upper = float(benchmark.size.min()), float(benchmark.size.max())
+    for regime in analysis.regimes[:-1]:
+        if not lower <= regime.upper <= upper:
+            continue
+        fig.add_vline(x=regime.upper, line=dict(color="gray", dash="dash", width=1))
+        fig.add_annotation(
+            x=np.log10(regime.upper),
+            y=1.0,
+            yref="y domain",
+            text=f"{regime.name} ({_format_bytes(regime.upper * config.element_size)})",
+            textangle=-90,
+            xanchor="right",
+            yanchor="top",
+            showarrow=False,
+        )
+
+    for knee in analysis.knees:
+        fig.add_vline(x=knee.size, line=dict(color="crimson", dash="dot", width=1))
+        fig.add_annotation(
+            x=np.log10(knee.size),
+            y=0.0,
+            yref="y domain",
+            text=f"{knee.level or 'knee'}: x{knee.ratio:.2f}",
+            textangle=-90,
+            xanchor="left",
+            yanchor="bottom",
+            showarrow=False,
+            font=dict(color="crimson"),
+        )
+
+    for segment in analysis.segments:
+        if segment.fit is None:
+            continue
+        x: np.ndarray = benchmark.size[segment.index].astype(np.float64)
+        fig.add_trace(
+            go.Scatter(
+                x=x,
+                y=predict(segment.fit, x),
+                name=f"{segment.regime.name} Fit ({describe(segment.fit)})",
+                mode="lines",
+                line=dict(color=config.line_color, dash="dot"),
+                opacity=0.7,
+            )
+        )
+
+
+def divergence_traces(benchmark: BenchmarkArray) -> list[go.Scatter]:
+    """Create wall / cpu time ratio traces (secondary y axis), per thread count.
+
+    Args:
+        benchmark (BenchmarkArray): benchmark array data.
+
+    Returns:
+        (list[go.Scatter]) ratio per input size, of each thread count.
+
+    """
+    ratios: dict[int, np.ndarray] = ratio_by_threads(benchmark)
+
+    return [
+        go.Scatter(
+            mode="lines+markers",
+            x=benchmark.size,
+            y=ratio,
+            name="Real / CPU" if len(ratios) == 1 else f"Real / CPU ({threads}T)",
+            line=dict(color=Prism[(2 + idx) % len(Prism)], width=1),
+            marker=dict(symbol="diamond"),
+            yaxis="y2",
+        )
+        for idx, (threads, ratio) in enumerate(sorted(ratios.items()))
+    ]
+
+
+def plot_benchmark_array(
+    benchmark: BenchmarkArray,
+    config: ConfigBase,
+    caches: Sequence[Cache] = (),
+) -> go.Figure:
     """Plot benchmark array.
 
     Args:
         benchmark (BenchmarkArray): benchmark array data.
         config (ConfigBase): configuration settings.
+        caches (Sequence[Cache]): system cache information, to annotate cache
+            boundaries, knees and per cache level fits.
 
     Returns:
         (go.Figure) returns plotly figure.
@@ -267,25 +712,81 @@ def plot_benchmark_array(benchmark: BenchmarkArray, config: ConfigBase) -> go.Fi
             benchmark.cpu_time,
             "CPU Time",
             config.color,
+            config.robust,
         )
     )
-
+    mask: np.ndarray = benchmark.outliers("cpu_time", config.outlier_threshold)
+    if mask.any():
+        fig.add_trace(
+            outlier_trace(benchmark.size, benchmark.cpu_time, mask, "Outliers")
+        )
     fig.add_trace(
-        draw_complexity_line(
+        create_scatter_trace(
             benchmark.size,
-            benchmark.complexity.cpu_coefficient,
-            benchmark.complexity.big_o,
-            f"CPU Time Fit ({benchmark.complexity.big_o})",
-            config.line_color,
+            benchmark.real_time,
+            "Real Time",
+            Prism[1],
+            config.robust,
         )
     )
+    for trace in divergence_traces(benchmark):
+        fig.add_trace(trace)
 
-    fig.add_annotation(
-        **create_annotation_text(
-            benchmark.complexity.big_o,
-            benchmark.complexity.rms,
-        )
+    # NOTE: google benchmark complexity is only drawn when no equation converged.
+    fit: FitResult | None = best_fit(
+        benchmark.size, benchmark.cpu_time, robust=config.robust
+    )
+    bootstrap: list[BootstrapResult] = bootstrap_complexity(
+        benchmark.size, benchmark.cpu_time, seed=0
+    )
+    probabilities: list[tuple[str, float]] = [
+        (BigO.get(j.bigo), j.probability) for j in bootstrap[:2] if j.probability > 0
+    ]
+    # NOTE: band is pinned to the fitted equation, hence omitted for the power law,
+    #       which is fit by nonlinear least squares and not bootstrapped.
+    band: BootstrapResult | None = next(
+        (j for j in bootstrap if fit is not None and j.bigo == fit.bigo), None
     )
+    if band is not None:
+        for trace in draw_fit_band(
+            benchmark.size,
+            band,
+            f"95% Band ({BigO.get(band.bigo)})",
+            config.line_color,
+        ):
+            fig.add_trace(trace)
+    if fit is None:
+        big_o: str = benchmark.complexity.big_o
+        fig.add_trace(
+            draw_complexity_line(
+                benchmark.size,
+                benchmark.complexity.cpu_coefficient,
+                big_o,
+                f"CPU Time Fit ({big_o})",
+                config.line_color,
+            )
+        )
+        annotation: dict = create_annotation_text(
+            big_o, benchmark.complexity.rms, probabilities
+        )
+    else:
+        label: str = describe(fit)
+        fig.add_trace(
+            draw_fit_line(
+                benchmark.size, fit, f"CPU Time Fit ({label})", config.line_color
+            )
+        )
+        annotation = create_annotation_text(label, fit.rms, probabilities)
+    if caches and config.element_size > 0:
+        analysis: CacheAnalysis = analyze_cache(
+            benchmark,
+            caches,
+            config.element_size,
+            robust=config.robust,
+        )
+        annotate_cache_regimes(fig, analysis, benchmark, config)
+
+    fig.add_annotation(**annotation)
 
     vals, labels = construct_log2_axis(benchmark.size)
     if (p := len(vals) // config.x_axis) > 0:
@@ -307,6 +808,426 @@ def plot_benchmark_array(benchmark: BenchmarkArray, config: ConfigBase) -> go.Fi
             dtick=1,
             exponentformat="power",
         ),
+        yaxis2=dict(
+            title="Real / CPU Time",
+            overlaying="y",
+            side="right",
+            showgrid=False,
+        ),
+        legend_title="Timing",
+        font=dict(
+            family=config.font,
+            size=12,
+        ),
+    )
+
+    return fig
+
+
+def plot_metrics(metrics: Metrics, config: ConfigBase) -> go.Figure:
+    """Plot size normalized metrics of a benchmark.
+
+    Time per element, throughput, and residual against the best fitted complexity
+    curve are stacked on a shared input size axis, where constant factor changes
+    are easier to see than on absolute timings.
+
+    Args:
+        metrics (Metrics): size normalized metrics of a benchmark.
+        config (ConfigBase): configuration settings.
+
+    Returns:
+        (go.Figure) returns plotly figure.
+
+    """
+    fig = make_subplots(
+        rows=3,
+        cols=1,
+        shared_xaxes=True,
+        row_heights=[0.4, 0.3, 0.3],
+        vertical_spacing=0.04,
+    )
+    fig.add_trace(
+        create_scatter_trace(
+            metrics.size,
+            metrics.ns_per_element,
+            "Time / Element",
+            config.color,
+            config.robust,
+        ),
+        row=1,
+        col=1,
+    )
+    fig.add_trace(
+        create_scatter_trace(
+            metrics.size,
+            metrics.throughput,
+            "Throughput",
+            config.line_color,
+            config.robust,
+        ),
+        row=2,
+        col=1,
+    )
+    name: str = "Residual"
+    if metrics.fit is not None:
+        name = f"Residual ({describe(metrics.fit)})"
+    fig.add_trace(
+        go.Bar(x=metrics.size, y=metrics.residual, name=name, marker_color="gray"),
+        row=3,
+        col=1,
+    )
+    fig.add_hline(y=0.0, line=dict(color="gray", width=1), row=3, col=1)
+
+    vals, labels = construct_log2_axis(metrics.size)
+    if (p := len(vals) // config.x_axis) > 0:
+        vals = vals[:: p + 1]
+        labels = labels[:: p + 1]
+
+    fig.update_xaxes(type="log", tickvals=vals, ticktext=labels, tickmode="array")
+    fig.update_xaxes(title="Input Size (n)", row=3, col=1)
+    fig.update_yaxes(title="ns / element", type="log", row=1, col=1)
+    fig.update_yaxes(
+        title="elements / s",
+        type="log",
+        exponentformat="SI",
+        row=2,
+        col=1,
+    )
+    fig.update_yaxes(title="Residual", tickformat=".0%", row=3, col=1)
+    fig.update_layout(
+        title=f"Benchmark Metrics<br><i>{metrics.function}</i>",
+        legend_title="Metric",
+        font=dict(
+            family=config.font,
+            size=12,
+        ),
+    )
+
+    return fig
+
+
+# Map of history metric to (y axis title, conversion of mean timings)
+_history_metrics: dict[
+    str, tuple[str, Callable[[np.ndarray, np.ndarray, str], np.ndarray]]
+] = {
+    "time": ("Time ({unit})", lambda size, y, unit: y),
+    "ns_per_element": ("ns / element", ns_per_element),
+    "throughput": ("elements / s", elements_per_second),
+}
+
+
+def history_matrix(
+    benchmarks: Sequence[BenchmarkArray],
+    attribute: str = "cpu_time",
+) -> tuple[np.ndarray, np.ndarray]:
+    """Align mean timings of a benchmark across runs by input size.
+
+    Args:
+        benchmarks (Sequence[BenchmarkArray]): benchmark arrays, one per run.
+        attribute (str): timing attribute ("cpu_time" | "real_time").
+
+    Returns:
+        (tuple[np.ndarray, np.ndarray]) sorted union of input sizes, and a 2D array
+        (n_runs x n_sizes) of mean timings, with NaN where a size was not run.
+
+    """
+    sizes: np.ndarray = np.unique(
+        np.concatenate([j.size for j in benchmarks] or [np.empty(0, np.int64)])
+    )
+    matrix: np.ndarray = np.full((len(benchmarks), sizes.size), np.nan)
+    for row, bench in enumerate(benchmarks):
+        mean, _ = _simple_stats(getattr(bench, attribute))
+        matrix[row, np.searchsorted(sizes, bench.size)] = mean
+
+    return sizes, matrix
+
+
+def plot_history(
+    function: str,
+    dates: Sequence[datetime],
+    shas: Sequence[str],
+    benchmarks: Sequence[BenchmarkArray],
+    config: ConfigBase,
+    max_points: int = 2000,
+    metric: str = "time",
+) -> go.Figure:
+    """Plot time series of per size timings of a benchmark across runs.
+
+    WebGL traces are used, and each series is downsampled (LTTB) to at most
+    `max_points`, to keep long histories responsive.
+
+    Args:
+        function (str): benchmark function name.
+        dates (Sequence[datetime]): date of each run, in ascending order.
+        shas (Sequence[str]): git commit description of each run.
+        benchmarks (Sequence[BenchmarkArray]): benchmark array of each run.
+        config (ConfigBase): configuration settings.
+        max_points (int): maximum number of points drawn per input size.
+        metric (str): plotted metric ("time" | "ns_per_element" | "throughput").
+
+    Returns:
+        (go.Figure) returns plotly figure.
+
+    """
+    sizes, matrix = history_matrix(benchmarks)
+    x: np.ndarray = np.asarray(
+        [j.astimezone(UTC).replace(tzinfo=None) for j in dates],
+        dtype="datetime64[us]",
+    )
+    text: np.ndarray = np.asarray(shas, dtype=object)
+    unit: str = benchmarks[0].unit if len(benchmarks) else ""
+    title, convert = _history_metrics[metric]
+    title = title.format(unit=unit)
+    if metric != "time" and len(benchmarks):
+        matrix = convert(sizes[None, :], matrix, unit)
+        unit = title
+
+    fig = go.Figure()
+    for idx, size in enumerate(sizes.tolist()):
+        valid: np.ndarray = np.flatnonzero(~np.isnan(matrix[:, idx]))
+        keep: np.ndarray = valid[
+            lttb(x[valid].astype(np.int64), matrix[valid, idx], max_points)
+        ]
+        fig.add_trace(
+            go.Scattergl(
+                mode="lines+markers",
+                x=x[keep],
+                y=matrix[keep, idx],
+                text=text[keep],
+                name=f"n={size}",
+                line=dict(color=Prism[idx % len(Prism)]),
+                hovertemplate="%{text}<br>%{y:.4g}" + f" {unit}<extra>n={size}</extra>",
+            )
+        )
+
+    fig.update_layout(
+        title=f"Benchmark History<br><i>{function}</i>",
+        xaxis=dict(title="Date (UTC)"),
+        yaxis=dict(
+            title=title,
+            type="log",
+            exponentformat="power",
+        ),
+        legend_title="Input Size",
+        font=dict(
+            family=config.font,
+            size=12,
+        ),
+    )
+
+    return fig
+
+
+def plot_divergence_history(
+    function: str,
+    dates: Sequence[datetime],
+    shas: Sequence[str],
+    benchmarks: Sequence[BenchmarkArray],
+    config: ConfigBase,
+    trends: Sequence[RatioTrend] = (),
+) -> go.Figure:
+    """Plot time series of per size wall / cpu time ratio of a benchmark across runs.
+
+    Args:
+        function (str): benchmark function name.
+        dates (Sequence[datetime]): date of each run, in ascending order.
+        shas (Sequence[str]): git commit description of each run.
+        benchmarks (Sequence[BenchmarkArray]): benchmark array of each run.
+        config (ConfigBase): configuration settings.
+        trends (Sequence[RatioTrend]): ratio trends; flagged series are emphasized.
+
+    Returns:
+        (go.Figure) returns plotly figure.
+
+    """
+    sizes, matrices = ratio_matrix(benchmarks)
+    flagged: set[tuple[int, int]] = {(j.threads, j.size) for j in trends if j.flagged}
+    x: np.ndarray = np.asarray(
+        [j.astimezone(UTC).replace(tzinfo=None) for j in dates],
+        dtype="datetime64[us]",
+    )
+    text: np.ndarray = np.asarray(shas, dtype=object)
+
+    fig = go.Figure()
+    idx: int = 0
+    for threads, matrix in sorted(matrices.items()):
+        for col, size in enumerate(sizes.tolist()):
+            valid: np.ndarray = ~np.isnan(matrix[:, col])
+            if not valid.any():
+                continue
+            alert: bool = (threads, size) in flagged
+            label: str = f"n={size}" if len(matrices) == 1 else f"n={size}, {threads}T"
+            fig.add_trace(
+                go.Scattergl(
+                    mode="lines+markers",
+                    x=x[valid],
+                    y=matrix[valid, col],
+                    text=text[valid],
+                    name=f"{label} ▲" if alert else label,
+                    line=dict(
+                        color="crimson" if alert else Prism[idx % len(Prism)],
+                        width=3 if alert else 1,
+                    ),
+                    hovertemplate="%{text}<br>%{y:.3f}" + f"<extra>{label}</extra>",
+                )
+            )
+            idx += 1
+
+    fig.add_hline(y=1.0, line=dict(color="gray", width=1))
+    fig.update_layout(
+        title=f"Real / CPU Time History<br><i>{function}</i>",
+        xaxis=dict(title="Date (UTC)"),
+        yaxis=dict(title="Real / CPU Time"),
+        legend_title="Input Size",
+        font=dict(
+            family=config.font,
+            size=12,
+        ),
+    )
+
+    return fig
+
+
+def ratio_trace(
+    reference: BenchmarkArray,
+    other: BenchmarkArray,
+    name: str,
+    color: str,
+    attribute: str = "cpu_time",
+) -> go.Scatter:
+    """Create scatter trace of mean timing ratio (other / reference) at shared sizes.
+
+    Args:
+        reference (BenchmarkArray): baseline benchmark (denominator).
+        other (BenchmarkArray): compared benchmark (numerator).
+        name (str): name to give trace.
+        color (str): trace color.
+        attribute (str): timing attribute ("cpu_time" | "real_time").
+
+    Returns:
+        (go.Scatter) scatter plot trace of timing ratio.
+
+    """
+    sizes, a, b = np.intersect1d(reference.size, other.size, return_indices=True)
+    ref_mean, _ = _simple_stats(getattr(reference, attribute))
+    other_mean, _ = _simple_stats(getattr(other, attribute))
+
+    return go.Scatter(
+        mode="lines+markers",
+        x=sizes,
+        y=other_mean[b] / ref_mean[a],
+        name=name,
+        line=dict(color=color, dash="dot"),
+        showlegend=False,
+    )
+
+
+def plot_comparison(
+    benchmarks: Sequence[BenchmarkArray],
+    labels: Sequence[str],
+    config: ConfigBase,
+    attribute: str = "cpu_time",
+) -> go.Figure:
+    """Overlay several benchmarks, with a ratio subplot and crossover annotations.
+
+    The first benchmark is the reference of the ratio subplot. Crossovers are the
+    input sizes where the best fitted complexity curves of two benchmarks intersect,
+    i.e. where one implementation starts to beat another.
+
+    Args:
+        benchmarks (Sequence[BenchmarkArray]): benchmark arrays to compare.
+        labels (Sequence[str]): label of each benchmark (e.g. function or git sha).
+        config (ConfigBase): configuration settings.
+        attribute (str): timing attribute ("cpu_time" | "real_time").
+
+    Returns:
+        (go.Figure) returns plotly figure.
+
+    """
+    fig = make_subplots(
+        rows=2,
+        cols=1,
+        shared_xaxes=True,
+        row_heights=[0.7, 0.3],
+        vertical_spacing=0.04,
+    )
+    sizes: np.ndarray = np.concatenate([j.size for j in benchmarks])
+    lower, upper = float(sizes.min()), float(sizes.max())
+    grid: np.ndarray = np.geomspace(lower, upper, 128)
+
+    fits: list[FitResult | None] = []
+    for idx, (bench, label) in enumerate(zip(benchmarks, labels, strict=True)):
+        color: str = Prism[idx % len(Prism)]
+        y: np.ndarray = getattr(bench, attribute)
+        fig.add_trace(
+            create_scatter_trace(bench.size, y, label, color, config.robust),
+            row=1,
+            col=1,
+        )
+
+        fits.append(result := best_fit(bench.size, y, robust=config.robust))
+        if result is not None:
+            fig.add_trace(
+                go.Scatter(
+                    x=grid,
+                    y=predict(result, grid),
+                    name=f"{label} Fit ({describe(result)})",
+                    mode="lines",
+                    line=dict(color=color, dash="dash"),
+                    opacity=0.7,
+                ),
+                row=1,
+                col=1,
+            )
+        if idx:
+            fig.add_trace(
+                ratio_trace(benchmarks[0], bench, label, color, attribute),
+                row=2,
+                col=1,
+            )
+
+    fig.add_hline(y=1.0, line=dict(color="gray", width=1), row=2, col=1)
+    for i, a in enumerate(fits):
+        for j in range(i + 1, len(fits)):
+            if a is None or (b := fits[j]) is None:
+                continue
+            for n in crossover_points(a, b, lower, upper):
+                fig.add_vline(
+                    x=n,
+                    line=dict(color="gray", dash="dot"),
+                    row="all",
+                    col=1,
+                )
+                fig.add_annotation(
+                    x=np.log10(n),
+                    xref="x",
+                    y=1.0,
+                    yref="y domain",
+                    text=f"{labels[i]} / {labels[j]}: n≈{n:.3g}",
+                    textangle=-90,
+                    xanchor="right",
+                    yanchor="top",
+                    showarrow=False,
+                )
+
+    vals, ticks = construct_log2_axis(sizes)
+    if (p := len(vals) // config.x_axis) > 0:
+        vals = vals[:: p + 1]
+        ticks = ticks[:: p + 1]
+
+    fig.update_xaxes(type="log", tickvals=vals, ticktext=ticks, tickmode="array")
+    fig.update_xaxes(title="Input Size (n)", row=2, col=1)
+    unit: str = benchmarks[0].unit if len(benchmarks) else ""
+    fig.update_yaxes(
+        title=f"Time ({unit})",
+        type="log",
+        exponentformat="power",
+        row=1,
+        col=1,
+    )
+    fig.update_yaxes(title=f"Ratio to {labels[0]}", type="log", row=2, col=1)
+    fig.update_layout(
+        title="Benchmark Comparison",
         legend_title="Timing",
         font=dict(
             family=config.font,
@@ -0,0 +1,280 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Adaptive repetitions, until timings are precise enough.
+
+Instead of a fixed number of repetitions, which is wasteful for stable benchmarks and
+too few for noisy ones, input sizes whose confidence interval (of mean timing) is
+wider than a target relative precision are rerun in a subprocess, with the number of
+additional repetitions projected from the current interval width. Reruns stop once
+every input size is precise enough, or a per benchmark time cap is exhausted.
+
+"""
+
+import logging
+import time
+import warnings
+from collections import defaultdict
+from dataclasses import dataclass, field, replace
+
+import numpy as np
+import scipy  # type: ignore[import-untyped]
+
+from .adaptive import AdaptiveOptions, run_sizes
+from .metrics import unit_scale
+from .structure import BenchmarkArray, BenchmarkContext
+from .utils import _simple_stats
+
+
+log: logging.Logger = logging.getLogger(__name__)
+
+# Additional seconds allowed for interpreter startup and benchmark registration.
+_OVERHEAD: float = 30.0
+
+
+@dataclass
+class RepetitionOptions:
+    """Adaptive repetition options.
+
+    Args:
+        paths (list[str]): benchmark file or directory paths, to re-register.
+        argv (list[str]): google benchmark command line arguments.
+        precision (float): target relative half width of confidence interval.
+        confidence (float): confidence level of interval.
+        time_cap (float): maximum time (seconds) spent on additional repetitions,
+            per benchmark.
+        min_repetitions (int): minimum number of repetitions per input size.
+        max_repetitions (int): maximum number of repetitions per input size.
+        max_rounds (int): maximum number of rounds.
+        attribute (str): timing attribute ("cpu_time" | "real_time").
+
+    """
+
+    # pylint: disable=R0902
+    paths: list[str]
+    argv: list[str] = field(default_factory=list)
+    precision: float = 0.02
+    confidence: float = 0.95
+    time_cap: float = 10.0
+    min_repetitions: int = 3
+    max_repetitions: int = 50
+    max_rounds: int = 4
+    attribute: str = "real_time"
+
+
+def relative_precision(
+    bench: BenchmarkArray,
+    attribute: str = "real_time",
+    confidence: float = 0.95,
+) -> np.ndarray:
+    """Relative half width of confidence interval of mean timing, per input size.
+
+    Args:
+        bench (BenchmarkArray): benchmark array.
+        attribute (str): timing attribute ("cpu_time" | "real_time").
+        confidence (float): confidence level of interval.
+
+    Returns:
+        (np.ndarray) relative half widths (inf with fewer than two repetitions).
+
+    """
+    x: np.ndarray = getattr(bench, attribute)
+    n: np.ndarray = np.sum(~np.isnan(x), axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        mean, std = _simple_stats(x)
+        q: np.ndarray = scipy.stats.t.ppf(0.5 + confidence / 2, n - 1)
+        width: np.ndarray = q * std / np.sqrt(n) / np.abs(mean)
+
+    return np.where(np.isnan(width), np.inf, width)
+
+
+def repetition_cost(bench: BenchmarkArray) -> np.ndarray:
+    """Mean duration (seconds) of a single repetition, per input size."""
+    seconds: np.ndarray = bench.iterations * bench.real_time * unit_scale(bench.unit)
+
+    return np.nanmean(np.where(bench.iterations > 0, seconds, np.nan), axis=1)
+
+
+def needed_repetitions(
+    width: np.ndarray,
+    n: np.ndarray,
+    options: RepetitionOptions,
+) -> np.ndarray:
+    """Additional repetitions per input size, to reach target precision.
+
+    Interval width shrinks with the square root of repetitions, but is projected
+    from few repetitions, so at most doubles repetitions (or reaches the minimum).
+
+    """
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        projected: np.ndarray = np.ceil(n * (width / options.precision) ** 2)
+    target: np.ndarray = np.where(
+        np.isfinite(projected), projected, options.min_repetitions
+    )
+    target = np.minimum(
+        np.maximum(target, options.min_repetitions),
+        np.maximum(2 * n, options.min_repetitions),
+    )
+
+    return np.clip(target - n, 0, np.maximum(options.max_repetitions - n, 0))
+
+
+def append_repetitions(a: BenchmarkArray, b: BenchmarkArray) -> BenchmarkArray:
+    """Append repetitions of a benchmark array to matching input sizes.
+
+    Valid repetitions of each input size are packed to the front, and padded (NaN
+    timings, zero iterations) to the largest number of repetitions.
+
+    """
+    index: dict[int, int] = {int(s): j for j, s in enumerate(b.size)}
+    valid_a: np.ndarray = ~np.isnan(a.real_time)
+    valid_b: np.ndarray = ~np.isnan(b.real_time)
+    fills: dict[str, float] = {
+        "iterations": 0,
+        "real_time": np.nan,
+        "cpu_time": np.nan,
+        "threads": 1,
+        "status": 0,
+    }
+
+    rows: dict[str, list[np.ndarray]] = {k: [] for k in fills}
+    for i, size in enumerate(a.size):
+        j: int | None = index.get(int(size))
+        for attribute, values in rows.items():
+            row: np.ndarray = getattr(a, attribute)[i][valid_a[i]]
+            if j is not None:
+                row = np.concatenate([row, getattr(b, attribute)[j][valid_b[j]]])
+            values.append(row)
+    repeats: int = max(len(j) for j in rows["real_time"])
+
+    def stack(attribute: str) -> np.ndarray:
+        return np.stack(
+            [
+                np.pad(j, (0, repeats - len(j)), constant_values=fills[attribute])
+                for j in rows[attribute]
+            ]
+        ).astype(getattr(a, attribute).dtype)
+
+    return replace(
+        a,
+        iterations=stack("iterations"),
+        real_time=stack("real_time"),
+        cpu_time=stack("cpu_time"),
+        threads=stack("threads"),
+        status=stack("status"),
+    )
+
+
+def plan(
+    bench: BenchmarkArray,
+    options: RepetitionOptions,
+    remaining: float,
+) -> tuple[int, list[int]] | None:
+    """Additional repetitions, and input sizes to rerun, of a benchmark.
+
+    At least two input sizes are rerun (adding the cheapest precise input size, if
+    necessary), as google benchmark only reports complexity of multiple sizes.
+
+    Args:
+        bench (BenchmarkArray): benchmark array.
+        options (RepetitionOptions): adaptive repetition options.
+        remaining (float): remaining time (seconds) of benchmark time cap.
+
+    Returns:
+        (tuple[int, list[int]] | None) repetitions and input sizes, or None if
+        precise enough or time cap is exhausted.
+
+    """
+    x: np.ndarray = getattr(bench, options.attribute)
+    n: np.ndarray = np.sum(~np.isnan(x), axis=1)
+    width: np.ndarray = relative_precision(bench, options.attribute, options.confidence)
+    needed: np.ndarray = needed_repetitions(width, n, options)
+    if not (pending := needed > 0).any():
+        log.debug("%s reached target precision: %s", bench.function, width)
+        return None
+
+    cost: np.ndarray = repetition_cost(bench)
+    if pending.sum() < 2 and pending.size > 1:
+        pending[np.argmin(np.where(pending, np.inf, cost))] = True
+    per_repetition: float = float(np.nansum(cost[pending]))
+    repetitions: int = int(needed.max())
+    if per_repetition > 0:
+        repetitions = min(repetitions, int(remaining // per_repetition))
+    if repetitions < 1:
+        log.info("%s exhausted repetition time cap: %s", bench.function, width)
+        return None
+
+    return repetitions, bench.size[pending].tolist()
+
+
+def repeat(context: BenchmarkContext, options: RepetitionOptions) -> BenchmarkContext:
+    """Adaptively rerun benchmark input sizes, until timings are precise enough.
+
+    Args:
+        context (BenchmarkContext): initial benchmark results.
+        options (RepetitionOptions): adaptive repetition options.
+
+    Returns:
+        (BenchmarkContext) benchmark context, with appended repetitions.
+
+    """
+    merged: dict[str, BenchmarkArray] = {j.function: j for j in context.benchmarks}
+    spent: dict[str, float] = dict.fromkeys(merged, 0.0)
+    worker = AdaptiveOptions(paths=options.paths, argv=options.argv)
+
+    for step in range(options.max_rounds):
+        # NOTE: group benchmarks by repetitions, to run each group in one subprocess
+        rounds: defaultdict[int, dict[str, list[int]]] = defaultdict(dict)
+        for function, bench in merged.items():
+            remaining: float = options.time_cap - spent[function]
+            if (result := plan(bench, options, remaining)) is not None:
+                rounds[result[0]][function] = result[1]
+        if not rounds:
+            break
+
+        for repetitions, sizes in sorted(rounds.items()):
+            log.debug("Repetition round %d (x%d): %s", step, repetitions, sizes)
+            start: float = time.monotonic()
+            timeout: float = _OVERHEAD + sum(options.time_cap - spent[j] for j in sizes)
+            rerun = run_sizes(sizes, worker, timeout, repetitions)
+            if rerun is None:
+                spent.update(dict.fromkeys(sizes, options.time_cap))
+                continue
+            elapsed: float = time.monotonic() - start
+            for bench in rerun.benchmarks:
+                if bench.function not in merged:
+                    continue
+                seconds: float = float(np.nansum(repetition_cost(bench)))
+                spent[bench.function] += min(seconds * repetitions, elapsed)
+                merged[bench.function] = append_repetitions(
+                    merged[bench.function], bench
+                )
+
+    return replace(context, benchmarks=[merged[j.function] for j in context.benchmarks])
@@ -0,0 +1,232 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Report generation of benchmark figures."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import uuid
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+
+import orjson
+import plotly  # type: ignore[import-untyped]
+
+from . import __version__
+from .config import ConfigBase
+from .metrics import compute_metrics
+from .plotting import (
+    html_header,
+    plot_benchmark_array,
+    plot_metrics,
+    to_html_fragment,
+)
+from .structure import BenchmarkArray, Cache
+
+
+log: logging.Logger = logging.getLogger(__name__)
+
+# NOTE: fragments are rendered (and cached) with placeholder div ids, substituted by
+#       fresh ids on each use, such that repeated figures within a report are unique.
+_PLACEHOLDER: str = "benchmatcha-figure-"
+_PLACEHOLDERS: re.Pattern[str] = re.compile(rf"{_PLACEHOLDER}(\d+)")
+
+
+def figure_key(
+    benchmark: BenchmarkArray,
+    config: ConfigBase,
+    caches: Sequence[Cache] = (),
+) -> str:
+    """Content hash of a benchmark array and the configuration used to plot it.
+
+    Args:
+        benchmark (BenchmarkArray): benchmark array data.
+        config (ConfigBase): configuration settings.
+        caches (Sequence[Cache]): system cache information.
+
+    Returns:
+        (str) hexadecimal sha256 digest.
+
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{__version__}:{plotly.__version__}".encode())
+    digest.update(orjson.dumps(config.tojson(), option=orjson.OPT_SORT_KEYS))
+    digest.update(orjson.dumps([j.to_json() for j in caches]))
+    digest.update(
+        orjson.dumps(
+            benchmark.to_json(),
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_SORT_KEYS,
+        )
+    )
+
+    return digest.hexdigest()
+
+
+class FigureCache:
+    """File based cache of rendered html figure fragments.
+
+    Args:
+        directory (str): path location of cache directory.
+
+    """
+
+    directory: str
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        """Path location of a cached fragment."""
+        return os.path.join(self.directory, f"{key}.html")
+
+    def get(self, key: str) -> str | None:
+        """Retrieve a cached fragment, if available."""
+        try:
+            with open(self.path(key), "r") as f:
+                return f.read()
+
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, fragment: str) -> None:
+        """Atomically store a rendered fragment."""
+        tmp: str = f"{self.path(key)}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            f.write(fragment)
+        os.replace(tmp, self.path(key))
+
+
+def render_fragment(
+    benchmark: BenchmarkArray,
+    config: ConfigBase,
+    caches: Sequence[Cache] = (),
+) -> str:
+    """Plot a benchmark array (and its metrics) and render it as an html fragment.
+
+    Figure divs hold placeholder ids, see :func:`assign_ids`.
+
+    """
+    fragment: str = to_html_fragment(
+        plot_benchmark_array(benchmark, config, caches), f"{_PLACEHOLDER}0"
+    )
+    if config.metrics:
+        (metrics,) = compute_metrics([benchmark], robust=config.robust)
+        fragment += to_html_fragment(plot_metrics(metrics, config), f"{_PLACEHOLDER}1")
+
+    return fragment
+
+
+def assign_ids(fragment: str) -> str:
+    """Substitute a fresh (unique) div id for each placeholder id of a fragment."""
+    ids: dict[str, str] = {}
+
+    return _PLACEHOLDERS.sub(
+        lambda m: ids.setdefault(m[1], str(uuid.uuid4())),
+        fragment,
+    )
+
+
+def render_fragments(
+    benchmarks: list[BenchmarkArray],
+    config: ConfigBase,
+    cache: FigureCache | None = None,
+    workers: int | None = None,
+    caches: Sequence[Cache] = (),
+) -> list[str]:
+    """Render html fragments of benchmarks, reusing cached fragments when available.
+
+    Args:
+        benchmarks (list[BenchmarkArray]): benchmark array data.
+        config (ConfigBase): configuration settings.
+        cache (FigureCache | None): optional cache of previously rendered fragments.
+        workers (int | None): maximum number of worker processes. Defaults to the
+            number of available cpus. Rendering is performed in process when 1.
+        caches (Sequence[Cache]): system cache information, to annotate figures.
+
+    Returns:
+        (list[str]) html fragments, in the same order as benchmarks, each with fresh
+        div ids.
+
+    """
+    fragments: list[str | None] = [None] * len(benchmarks)
+    keys: list[str] = [figure_key(j, config, caches) for j in benchmarks]
+    if cache is not None:
+        fragments = [cache.get(k) for k in keys]
+
+    missing: list[int] = [i for i, j in enumerate(fragments) if j is None]
+    log.debug(
+        "Rendering %d of %d figures (%d cached).",
+        len(missing),
+        len(benchmarks),
+        len(benchmarks) - len(missing),
+    )
+
+    rendered: Iterable[str]
+    todo: list[BenchmarkArray] = [benchmarks[i] for i in missing]
+    if len(missing) > 1 and (workers is None or workers > 1):
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rendered = list(
+                pool.map(
+                    render_fragment,
+                    todo,
+                    [config] * len(todo),
+                    [caches] * len(todo),
+                    chunksize=4,
+                )
+            )
+    else:
+        rendered = [render_fragment(j, config, caches) for j in todo]
+
+    for idx, fragment in zip(missing, rendered, strict=True):
+        fragments[idx] = fragment
+        if cache is not None:
+            cache.put(keys[idx], fragment)
+
+    return [assign_ids(j) for j in fragments]  # type: ignore[arg-type]
+
+
+def write_report(path: str, fragments: Iterable[str], mode: str = "a") -> None:
+    """Write html fragments to a report file.
+
+    Args:
+        path (str): Filepath of html report.
+        fragments (Iterable[str]): rendered html figure fragments.
+        mode (str): Writing mode ("a" | "w")
+
+    """
+    create: bool = mode == "w" or not os.path.exists(path) or not os.path.getsize(path)
+    with open(path, mode) as f:
+        if create:
+            f.write(html_header())
+        f.writelines(fragments)
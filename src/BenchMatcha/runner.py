@@ -31,25 +31,59 @@
 
 import argparse
 import logging
+import math
 import os
+import socket
+import subprocess
 import sys
+import time
+from collections.abc import Callable
+from contextlib import nullcontext
+from dataclasses import replace
+from itertools import groupby
 from json import JSONDecodeError
+from typing import TYPE_CHECKING
 
 import google_benchmark as gbench
 import orjson
-import plotly.graph_objs as go  # type: ignore[import-untyped]
 from wurlitzer import pipes  # type: ignore[import-untyped]
 
-from . import plotting
-
-# from .complexity import analyze_complexity
+from .adaptive import AdaptiveOptions, refine
+from .arguments import (
+    get_ab_args,
+    get_args,
+    get_bisect_args,
+    get_changepoint_args,
+    get_compare_args,
+    get_coordinator_args,
+    get_plot_args,
+    get_serve_args,
+    get_watch_args,
+    get_worker_args,
+)
+from .checkpoint import begin, finish, run_checkpointed
+from .comparison import compare_arrays
 from .config import ConfigBase, update_config_from_pyproject
+from .divergence import RatioTrend, divergence_trends
 from .errors import ParsingError
 from .handlers import HandleText
-from .plotting import plot_benchmark_array
+from .limits import Limits
+from .metrics import Metrics, compute_metrics
+from .noise import NoiseMonitor, NoiseOptions, NoiseProfile
+from .repetition import RepetitionOptions, repeat
+from .schedule import ScheduleOptions, collect_names
 from .sifter import manage_registration
-from .structure import BenchmarkContext, parse_version
+from .store import Query, ResultStore, open_store
+from .structure import BenchmarkArray, BenchmarkContext, parse_version
+from .worker import list_functions
+
 
+if TYPE_CHECKING:
+    import plotly.graph_objs as go  # type: ignore[import-untyped]
+
+# NOTE: plotting (plotly) and modules of other subcommands (e.g. bisect, distributed,
+#       watch) are imported on use within commands, which keeps start-up of benchmark
+#       runs fast. See test_runner.test_import_time and test_runner.test_lazy_imports.
 
 log: logging.Logger = logging.getLogger(__name__)
 
@@ -91,39 +125,119 @@ def _run() -> BenchmarkContext:
     return context
 
 
-def save(context: BenchmarkContext, cache_dir: str, config: ConfigBase) -> None:
-    """Save benchmark data."""
-    for j in context.benchmarks:
-        figure: go.Figure = plot_benchmark_array(j, config)
-        plotting.to_html(figure, os.path.join(cache_dir, "out.html"), "a")
-
-    # TODO: Save data to database. Serialize to json in the interim.
-    database: str = os.path.join(cache_dir, "benchmark.json")
-    data: list[dict] = []
-    if os.path.exists(database):
-        with open(database, "br") as f:
-            data = orjson.loads(f.read())
-
-    data.append(context.to_json())
-    serialized: bytes = orjson.dumps(
-        data,
-        option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_SERIALIZE_DATACLASS,
-    )
-
-    with open(database, "bw") as f:
-        f.write(serialized)
-
-
-def run(cache_dir: str, config: ConfigBase) -> None:
+def check_divergence(store: ResultStore, context: BenchmarkContext) -> list[RatioTrend]:
+    """Flag upward trends of wall / cpu time ratio, over history of the same host."""
+    flagged: list[RatioTrend] = []
+    for bench in context.benchmarks:
+        query = Query(function=bench.function, host=context.host_name)
+        history: list[BenchmarkArray] = [j for _, j in store.history(query)]
+        flagged.extend(j for j in divergence_trends(history) if j.flagged)
+
+    return flagged
+
+
+def save(
+    context: BenchmarkContext,
+    cache_dir: str,
+    config: ConfigBase,
+    workers: int | None = None,
+    run_id: str | None = None,
+    report: bool = True,
+    noise: NoiseProfile | None = None,
+) -> list[RatioTrend]:
+    """Save benchmark data, and (optionally) render figures to html report.
+
+    Flagged (upward) trends of wall / cpu time ratio are written to divergence.json
+    within the cache directory, replacing those of the previous run.
+
+    Returns:
+        (list[RatioTrend]) flagged wall / cpu time ratio trends.
+
+    """
+    if report:
+        from .report import (  # pylint: disable=C0415
+            FigureCache,
+            render_fragments,
+            write_report,
+        )
+
+        fragments: list[str] = render_fragments(
+            context.benchmarks,
+            config,
+            FigureCache(os.path.join(cache_dir, "figures")),
+            workers,
+            context.caches,
+        )
+        write_report(os.path.join(cache_dir, "out.html"), fragments, "a")
+
+    metrics: list[Metrics] = compute_metrics(context.benchmarks, robust=config.robust)
+    with open_store(cache_dir) as store:
+        run_id = store.add(context, run_id, metrics=metrics)
+        if noise is not None:
+            store.add_noise(run_id, noise)
+        flagged: list[RatioTrend] = check_divergence(store, context)
+    log.debug("Saved benchmark run: %s", run_id)
+
+    output: str = os.path.join(cache_dir, "divergence.json")
+    with open(output, "wb") as f:
+        f.write(orjson.dumps(flagged, option=orjson.OPT_INDENT_2))
+    log.debug("Flagged %d wall / cpu time ratio trends: %s", len(flagged), output)
+
+    return flagged
+
+
+def run(
+    cache_dir: str,
+    config: ConfigBase,
+    workers: int | None = None,
+    adaptive: AdaptiveOptions | None = None,
+    repetitions: RepetitionOptions | None = None,
+    scheduled: ScheduleOptions | None = None,
+    run_id: str | None = None,
+    report: bool = True,
+    noise: NoiseMonitor | None = None,
+) -> None:
     """BenchMatcha Runner."""
-    context: BenchmarkContext = _run()
-
-    # TODO: Capture re-analyzed complexity information. Determine where to store, or
-    #       how to present this information in a manner that is useful.
-    # for bench in context.benchmarks:
-    #     analyze_complexity(bench.size, bench.real_time)
-
-    save(context, cache_dir, config)
+    start: float = time.monotonic()
+    context: BenchmarkContext
+    if noise is not None:
+        noise.sampler.start()
+    if scheduled is None:
+        context = _run()
+    else:
+        run_id = run_id or begin(cache_dir)
+        timeline = None if noise is None else noise.timeline
+        with open_store(cache_dir) as store:
+            partial = run_checkpointed(
+                store, scheduled, run_id, config.robust, timeline
+            )
+        if partial is None:
+            log.error("No benchmark completed.")
+            sys.exit(1)
+        context = partial
+
+        # NOTE: refinements are bounded by the remaining time budget
+        remaining: float = max(scheduled.budget - (time.monotonic() - start), 0.0)
+        if adaptive is not None:
+            adaptive = replace(adaptive, budget=min(adaptive.budget, remaining))
+        if repetitions is not None and context.benchmarks:
+            cap: float = remaining / len(context.benchmarks)
+            repetitions = replace(repetitions, time_cap=min(repetitions.time_cap, cap))
+
+    profile: NoiseProfile | None = None
+    if noise is not None:
+        context = noise.settle(context)
+        noise.sampler.stop()
+        profile = noise.profile()
+
+    if adaptive is not None:
+        context = refine(context, adaptive)
+    if repetitions is not None:
+        context = repeat(context, repetitions)
+
+    save(context, cache_dir, config, workers, run_id, report, profile)
+    if scheduled is not None:
+        finish(cache_dir)
 
 
 def prepare_benchmark_sys_args(known: argparse.Namespace, unknown: list[str]) -> None:
@@ -145,91 +259,8 @@ def prepare_benchmark_sys_args(known: argparse.Namespace, unknown: list[str]) ->
     sys.argv = [sys.argv[0], *unknown, *known.others]
 
 
-def get_args() -> tuple[argparse.Namespace, list[str]]:
-    """Get BenchMatcha command line arguments and reset to support google_benchmark."""
-    args = argparse.ArgumentParser("benchmatcha", conflict_handler="error")
-    args.add_argument(
-        "-v",
-        "--verbose",
-        action="store_true",
-        help="Set Logging Level to DEBUG.",
-        required=False,
-    )
-    args.add_argument(
-        "-c",
-        "--color",
-        default=None,
-        help="Scatterplot marker color.",
-        required=False,
-    )
-    args.add_argument(
-        "-l",
-        "--line-color",
-        default=None,
-        help="Scatterplot complexity fit line color.",
-        required=False,
-    )
-    args.add_argument(
-        "-x",
-        "--x-axis",
-        default=None,
-        help="Maximum Number of units displayed on x-axis.",
-        required=False,
-        type=int,
-    )
-
-    cwd: str = os.getcwd()
-    args.add_argument(
-        "--config",
-        default=os.path.join(cwd, "pyproject.toml"),
-        help="Path location of pyproject.toml configuration file. "
-        "Defaults to Current Working Directory.",
-    )
-    args.add_argument(
-        "--cache",
-        default=os.path.join(cwd, ".benchmatcha"),
-        help="Path location of cache directory. Defaults to Current Working Directory.",
-    )
-    args.add_argument(
-        "--path",
-        action="extend",
-        nargs="+",
-        help="Valid file or directory path to benchmarks.",
-    )
-
-    # Capture anything that doesn't fit (to be fed downstream to google_benchmark cli)
-    args.add_argument("others", nargs=argparse.REMAINDER)
-
-    # TODO: Plotting over time (pulling from database)
-    # sub = args.add_subparsers()
-    # plot = sub.add_parser("plot")
-    # plot.add_argument(
-    #     "--min-date",
-    #     default=None,
-    #     help="Filter data after minimum date (inclusive).",
-    # )
-    # plot.add_argument(
-    #     "--max-date",
-    #     default=None,
-    #     help="Filter data before date (inclusive).",
-    # )
-    # plot.add_argument("--host", default=None, help="Filter data by specific host.")
-    # plot.add_argument("--os", default=None, help="Filter data by specific OS type.")
-    # plot.add_argument(
-    #     "--function",
-    #     default=None,
-    #     help="Filter data to present a specific function name.",
-    # )
-    known, unknown = args.parse_known_args()
-
-    return known, unknown
-
-
-def main() -> None:
-    """Primary CLI Entry Point."""
-    args: argparse.Namespace
-    unknowns: list[str]
-    args, unknowns = get_args()
+def configure(args: argparse.Namespace) -> ConfigBase:
+    """Setup logging and configuration from command line arguments."""
     default_config = ConfigBase()
 
     if args.verbose:
@@ -260,9 +291,404 @@ def main() -> None:
         log.debug("Creating cache directory at: %s", cache)
         os.mkdir(cache)
 
+    return default_config
+
+
+def plot(argv: list[str]) -> None:
+    """Plot benchmark history command."""
+    from .plotting import (  # pylint: disable=C0415
+        plot_divergence_history,
+        plot_history,
+        to_html_fragment,
+    )
+    from .report import write_report  # pylint: disable=C0415
+
+    args: argparse.Namespace = get_plot_args(argv)
+    config: ConfigBase = configure(args)
+    query = Query(
+        function=args.function,
+        host=args.host,
+        os=args.os,
+        min_date=args.min_date,
+        max_date=args.max_date,
+    )
+
+    fragments: list[str] = []
+    with open_store(args.cache) as store:
+        for function, group in groupby(
+            store.history(query),
+            key=lambda x: x[1].function,
+        ):
+            infos, benchmarks = zip(*group, strict=True)
+            figure: go.Figure = plot_history(
+                function,
+                [j.date for j in infos],
+                [j.git_sha for j in infos],
+                benchmarks,
+                config,
+                args.max_points,
+                args.metric,
+            )
+            fragments.append(to_html_fragment(figure))
+            if args.divergence:
+                figure = plot_divergence_history(
+                    function,
+                    [j.date for j in infos],
+                    [j.git_sha for j in infos],
+                    benchmarks,
+                    config,
+                    divergence_trends(benchmarks),
+                )
+                fragments.append(to_html_fragment(figure))
+
+    output: str = args.output or os.path.join(args.cache, "history.html")
+    write_report(output, fragments, "w")
+    log.debug("Plotted history of %d benchmarks: %s", len(fragments), output)
+
+
+def compare(argv: list[str]) -> None:
+    """Compare benchmarks command."""
+    from .plotting import plot_comparison, to_html_fragment  # pylint: disable=C0415
+    from .report import write_report  # pylint: disable=C0415
+
+    args: argparse.Namespace = get_compare_args(argv)
+    config: ConfigBase = configure(args)
+    shas: list[str | None] = args.sha or [None]
+
+    benchmarks: list[BenchmarkArray] = []
+    labels: list[str] = []
+    with open_store(args.cache) as store:
+        for function in args.function:
+            for sha in shas:
+                query = Query(function=function, host=args.host, os=args.os, sha=sha)
+                if not (entries := store.entries(query)):
+                    log.warning("No stored runs: function=%s, sha=%s", function, sha)
+                    continue
+                info, _ = entries[-1]  # NOTE: latest matching run
+                benchmarks.append(store.benchmark(info.run_id, function))
+                labels.append(f"{function}@{info.git_sha}" if sha else function)
+
+    if not benchmarks:
+        log.error("No benchmarks found to compare.")
+        sys.exit(1)
+
+    attribute: str = "real_time" if args.real_time else "cpu_time"
+    for bench, label in zip(benchmarks[1:], labels[1:], strict=True):
+        result = compare_arrays(
+            benchmarks[0], bench, attribute, args.alpha, args.min_effect
+        )
+        verdict: str = (
+            "regressed" if result.regressed else "improved" if result.improved else ""
+        )
+        sys.stdout.write(
+            f"{label} vs {labels[0]}\tx{result.ratio:.3f}"
+            f"\tp={result.pvalue:.3g}\t{verdict}\n"
+        )
+    figure: go.Figure = plot_comparison(benchmarks, labels, config, attribute)
+    output: str = args.output or os.path.join(args.cache, "compare.html")
+    write_report(output, [to_html_fragment(figure)], "w")
+    log.debug("Compared %d benchmarks: %s", len(benchmarks), output)
+
+
+def changepoints(argv: list[str]) -> None:
+    """Detect change points across benchmark history command."""
+    from .changepoint import ChangePoint, store_changes  # pylint: disable=C0415
+
+    args: argparse.Namespace = get_changepoint_args(argv)
+    configure(args)
+    query = Query(
+        function=args.function,
+        host=args.host,
+        os=args.os,
+        min_date=args.min_date,
+        max_date=args.max_date,
+    )
+    with open_store(args.cache) as store:
+        result: list[ChangePoint] = store_changes(
+            store,
+            query,
+            "real_time" if args.real_time else "cpu_time",
+            args.penalty,
+            args.jobs,
+        )
+
+    for j in result:
+        sys.stdout.write(
+            f"{j.function}\tn={j.size}\t{j.host_name}\t{j.git_sha}"
+            f"\t{j.date.isoformat()}"
+            f"\tx{j.ratio:.3f}\td={j.effect:+.1f}\n"
+        )
+    output: str = args.output or os.path.join(args.cache, "changepoints.json")
+    with open(output, "wb") as f:
+        f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2))
+    log.debug("Detected %d change points: %s", len(result), output)
+
+
+def bisect(argv: list[str]) -> None:
+    """Bisect a performance regression command."""
+    from .bisect import BisectOptions, BisectResult, git  # pylint: disable=C0415
+    from .bisect import bisect as bisect_revisions  # pylint: disable=C0415
+
+    args, unknowns = get_bisect_args(argv)
+    configure(args)
+    try:
+        root: str = git(args.repo, "rev-parse", "--show-toplevel")
+        options = BisectOptions(
+            repo=root,
+            good=args.good,
+            bad=args.bad,
+            function=args.function,
+            paths=[os.path.relpath(os.path.abspath(j), root) for j in args.path],
+            cache_dir=os.path.abspath(args.cache),
+            argv=unknowns,
+            build=args.build,
+            attribute="real_time" if args.real_time else "cpu_time",
+            alpha=args.alpha,
+            min_effect=args.min_effect,
+            timeout=args.timeout,
+        )
+        result: BisectResult = bisect_revisions(options)
+    except (
+        ValueError,
+        subprocess.CalledProcessError,
+        subprocess.TimeoutExpired,
+    ) as e:
+        log.error(e)
+        sys.exit(1)
+
+    output: str = args.output or os.path.join(args.cache, "bisect.json")
+    with open(output, "wb") as f:
+        f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2))
+    if result.culprit is None:
+        log.error("No culprit revision found: %s", output)
+        sys.exit(1)
+    sys.stdout.write(f"{result.culprit} is the first bad commit\n")
+
+
+def ab(argv: list[str]) -> None:
+    """Interleaved A/B comparison of two revisions command."""
+    from .bisect import git  # pylint: disable=C0415
+    from .interleave import ABOptions, ABResult, interleave  # pylint: disable=C0415
+
+    args, unknowns = get_ab_args(argv)
+    configure(args)
+    try:
+        root: str = git(args.repo, "rev-parse", "--show-toplevel")
+        options = ABOptions(
+            repo=root,
+            baseline=args.baseline,
+            candidate=args.candidate,
+            paths=[os.path.relpath(os.path.abspath(j), root) for j in args.path],
+            functions=args.function,
+            argv=unknowns,
+            build=args.build,
+            rounds=args.rounds,
+            attribute="real_time" if args.real_time else "cpu_time",
+            alpha=args.alpha,
+            min_effect=args.min_effect,
+            timeout=args.timeout,
+        )
+        result: ABResult = interleave(options)
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
+        log.error(e)
+        sys.exit(1)
+
+    output: str = args.output or os.path.join(args.cache, "ab.json")
+    with open(output, "wb") as f:
+        f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2))
+    if not result.comparisons:
+        log.error("No paired benchmarks to compare: %s", output)
+        sys.exit(1)
+    for function, comparison in result.comparisons.items():
+        verdict: str = (
+            "regressed"
+            if comparison.regressed
+            else "improved"
+            if comparison.improved
+            else ""
+        )
+        sys.stdout.write(
+            f"{function}\tx{comparison.ratio:.4f}\tp={comparison.pvalue:.3g}"
+            f"\t{verdict}\n"
+        )
+
+
+def serve(argv: list[str]) -> None:
+    """Serve dashboard command."""
+    from .server import serve as serve_dashboard  # pylint: disable=C0415
+
+    args: argparse.Namespace = get_serve_args(argv)
+    configure(args)
+    serve_dashboard(args.cache, args.bind, args.port, args.lru_size)
+
+
+def coordinator(argv: list[str]) -> None:
+    """Distributed benchmark run coordinator command."""
+    from .distributed import (  # pylint: disable=C0415
+        Coordinator,
+        CoordinatorOptions,
+        coordinate,
+        discover,
+    )
+
+    args, unknowns = get_coordinator_args(argv)
+    config: ConfigBase = configure(args)
+    functions: list[str] = [
+        j for j in discover(args.path) if not args.function or j in args.function
+    ]
+    if not functions:
+        log.error("No benchmarks found to hand out.")
+        sys.exit(1)
+
+    options = CoordinatorOptions(
+        paths=args.path,
+        functions=functions,
+        argv=unknowns,
+        shard_size=args.shard_size,
+        max_attempts=args.max_attempts,
+    )
+    with Coordinator((args.bind, args.port), options) as server:
+        log.info(
+            "Coordinating %d benchmarks at %s:%d",
+            len(functions),
+            *server.server_address[:2],
+        )
+        with open_store(args.cache) as store:
+            runs: list[str] = coordinate(server, store, config.robust)
+    if server.shards.failed:
+        log.error("Failed shards: %s", [j.functions for j in server.shards.failed])
+    if not runs:
+        log.error("No benchmark completed.")
+        sys.exit(1)
+    log.debug("Stored runs: %s", runs)
+
+
+def worker(argv: list[str]) -> None:
+    """Distributed benchmark run worker command."""
+    from .distributed import WorkerOptions, work  # pylint: disable=C0415
+
+    args: argparse.Namespace = get_worker_args(argv)
+    configure(args)
+    host, _, port = args.connect.rpartition(":")
+    options = WorkerOptions((host, int(port)), args.host, args.timeout, args.retry)
+    try:
+        completed: int = work(options)
+    except OSError as e:
+        log.error("Lost coordinator at %s: %r", args.connect, e)
+        sys.exit(1)
+    log.info("Completed %d shards.", completed)
+
+
+def watch_paths(argv: list[str]) -> None:
+    """Watch benchmark files command."""
+    from .watch import WatchSession, watch  # pylint: disable=C0415
+
+    args, unknowns = get_watch_args(argv)
+    configure(args)
+    session = WatchSession(args.path, unknowns)
+    watch(
+        session,
+        "real_time" if args.real_time else "cpu_time",
+        args.alpha,
+        args.min_effect,
+        args.interval,
+        args.max_iterations,
+    )
+
+
+_commands: dict[str, Callable[[list[str]], None]] = {
+    "ab": ab,
+    "bisect": bisect,
+    "changepoints": changepoints,
+    "compare": compare,
+    "coordinator": coordinator,
+    "plot": plot,
+    "serve": serve,
+    "watch": watch_paths,
+    "worker": worker,
+}
+
+
+def main() -> None:
+    """Primary CLI Entry Point."""
+    if len(sys.argv) > 1 and sys.argv[1] in _commands:
+        _commands[sys.argv[1]](sys.argv[2:])
+        return
+
+    args: argparse.Namespace
+    unknowns: list[str]
+    args, unknowns = get_args()
+    default_config: ConfigBase = configure(args)
+
+    noise: NoiseMonitor | None = None
+    if args.sample_noise:
+        noise = NoiseMonitor(
+            NoiseOptions(
+                paths=[os.path.abspath(j) for j in args.path],
+                interval=args.noise_interval,
+                reruns=args.noise_reruns,
+            )
+        )
+
     # Natively handle multiple provided paths
-    for path in args.path:
-        manage_registration(path)
+    with (
+        collect_names() as names,
+        nullcontext() if noise is None else noise.timeline.track(),
+    ):
+        for path in args.path:
+            manage_registration(path)
 
     prepare_benchmark_sys_args(args, unknowns)
-    run(cache, default_config)
+    if noise is not None:
+        noise.options.argv = sys.argv[1:]
+    adaptive: AdaptiveOptions | None = None
+    if args.adaptive:
+        adaptive = AdaptiveOptions(
+            paths=[os.path.abspath(j) for j in args.path],
+            argv=sys.argv[1:],
+            budget=args.adaptive_budget,
+            confidence=args.adaptive_confidence,
+        )
+    repetitions: RepetitionOptions | None = None
+    if args.precision is not None:
+        repetitions = RepetitionOptions(
+            paths=[os.path.abspath(j) for j in args.path],
+            argv=sys.argv[1:],
+            precision=args.precision,
+            time_cap=args.precision_time_cap,
+            max_repetitions=args.precision_max_repetitions,
+        )
+    scheduled: ScheduleOptions | None = None
+    run_id: str | None = None
+    limits = Limits(args.run_timeout, args.memory_limit)
+    paths: list[str] = [os.path.abspath(j) for j in args.path]
+    if (
+        args.time_budget is not None
+        or args.checkpoint
+        or args.resume
+        or limits != Limits()
+    ):
+        # NOTE: benchmarks run one per subprocess, restricted to the user filter
+        if any(j.startswith("--benchmark_filter=") for j in sys.argv[1:]):
+            selected: set[str] = set(list_functions(paths, sys.argv[1:]))
+            names = [j for j in names if j in selected]
+        scheduled = ScheduleOptions(
+            paths=paths,
+            functions=names,
+            budget=math.inf if args.time_budget is None else args.time_budget,
+            argv=sys.argv[1:],
+            host=socket.gethostname(),
+            limits=limits,
+        )
+        run_id = begin(args.cache, args.resume, args.run_id)
+    run(
+        args.cache,
+        default_config,
+        args.jobs,
+        adaptive,
+        repetitions,
+        scheduled,
+        run_id,
+        not args.no_report,
+        noise,
+    )
@@ -0,0 +1,505 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Wall clock time budget scheduler of a benchmark run.
+
+Historical results (of the same host) estimate the cost of each benchmark, per
+iteration of each input size. The time budget is divided across benchmarks, weighted
+by their recent variability, and each benchmark is run in its own subprocess, with
+minimum time and repetitions adjusted to fit its share. Benchmarks run in order of
+priority (unknown, then most variable first), and shares are recomputed from the
+remaining budget after each benchmark, such that results obtained before the budget
+runs out are kept. Without a budget (infinite), benchmarks run in order of
+registration with user defined options, e.g. to checkpoint each one. Resource limits
+of each benchmark run are enforced within the subprocess, and a subprocess stuck in a
+run beyond its timeout (e.g. within an extension module) is killed, and run again with
+the stuck run reported as timed out.
+
+"""
+
+import json
+import logging
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from typing import IO, Any
+
+import numpy as np
+
+from .errors import SchemaError
+from .handlers import load
+from .limits import Limits, apply, enforce, exceeded, in_progress
+from .metrics import unit_scale
+from .noise import Timeline
+from .repetition import relative_precision
+from .sifter import (
+    BuilderProxy,
+    Register,
+    hook_registration,
+    select_registration,
+)
+from .store import Query, ResultStore
+from .structure import BenchmarkArray, BenchmarkContext, parse_version
+from .worker import parser, register, run_benchmarks
+
+
+log: logging.Logger = logging.getLogger(__name__)
+
+# Google benchmark estimates iteration counts before each measured repetition.
+_ESTIMATION_OVERHEAD: float = 1.5
+
+# Seconds of interpreter startup and benchmark registration, per subprocess.
+_STARTUP: float = 1.0
+
+# Multiple of the run timeout, after which a run not interrupted by its timeout (e.g.
+# within an extension module) is killed, along with its subprocess.
+_BACKSTOP: float = 2.0
+
+# Seconds between checks of a benchmark subprocess.
+_POLL: float = 0.1
+
+
+@dataclass
+class ScheduleOptions:
+    """Time budget scheduler options.
+
+    Args:
+        paths (list[str]): benchmark file or directory paths, to re-register.
+        functions (list[str]): registered benchmark function names.
+        budget (float): wall clock time budget (seconds) of benchmark run, which may
+            be infinite.
+        argv (list[str]): google benchmark command line arguments.
+        host (str | None): host machine name of historical results.
+        min_time (float): default minimum time (seconds) per repetition.
+        min_time_floor (float): smallest minimum time (seconds) per repetition.
+        max_repetitions (int): maximum number of repetitions per input size.
+        window (int): number of recent runs used to estimate variability.
+        limits (Limits): resource limits of each benchmark run.
+
+    """
+
+    # pylint: disable=R0902
+    paths: list[str]
+    functions: list[str]
+    budget: float
+    argv: list[str] = field(default_factory=list)
+    host: str | None = None
+    min_time: float = 0.5
+    min_time_floor: float = 0.01
+    max_repetitions: int = 10
+    window: int = 10
+    limits: Limits = field(default_factory=Limits)
+
+
+@dataclass
+class Estimate:
+    """Historical cost, and variability, of a benchmark.
+
+    Args:
+        function (str): benchmark function name.
+        iteration_time (np.ndarray): seconds per iteration, per input size.
+        repetitions (int): number of repetitions of latest run.
+        variability (float): recent relative variability of timings.
+
+    """
+
+    function: str
+    iteration_time: np.ndarray
+    repetitions: int
+    variability: float
+
+    def cost(self, repetitions: int, min_time: float) -> float:
+        """Expected duration (seconds) of a run."""
+        cells: float = float(np.sum(np.maximum(self.iteration_time, min_time)))
+
+        return _STARTUP + _ESTIMATION_OVERHEAD * repetitions * cells
+
+
+@dataclass
+class Plan:
+    """Scheduled run of a single benchmark.
+
+    Args:
+        function (str): benchmark function name.
+        repetitions (int | None): number of repetitions (user defined if None).
+        min_time (float | None): minimum time per repetition (user defined if None).
+
+    """
+
+    function: str
+    repetitions: int | None = None
+    min_time: float | None = None
+
+
+def variability(history: list[BenchmarkArray]) -> float:
+    """Recent relative variability of a benchmark, between and within runs.
+
+    Between runs, the standard deviation of mean log timing (relative to the latest
+    run, over common input sizes), and within the latest run, the median relative
+    precision of mean timing.
+
+    """
+    latest: BenchmarkArray = history[-1]
+    shifts: list[float] = []
+    for bench in history:
+        _, ia, ib = np.intersect1d(bench.size, latest.size, return_indices=True)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = np.log(
+                np.nanmean(bench.real_time[ia], axis=1)
+                / np.nanmean(latest.real_time[ib], axis=1)
+            )
+        if np.isfinite(ratio).any():
+            shifts.append(
+                float(np.nanmean(np.where(np.isfinite(ratio), ratio, np.nan)))
+            )
+    between: float = float(np.std(shifts, ddof=1)) if len(shifts) > 1 else 0.0
+    width: np.ndarray = relative_precision(latest)
+    within: float = float(np.median(width)) if np.isfinite(width).any() else 1.0
+
+    return math.hypot(between, min(within, 1.0))
+
+
+def estimate(function: str, history: list[BenchmarkArray]) -> Estimate | None:
+    """Estimate cost and variability of a benchmark from its (ordered) history."""
+    if not history:
+        return None
+    latest: BenchmarkArray = history[-1]
+    seconds: np.ndarray = np.nanmean(latest.real_time, axis=1) * unit_scale(latest.unit)
+
+    return Estimate(
+        function=function,
+        iteration_time=np.nan_to_num(seconds),
+        repetitions=latest.real_time.shape[1],
+        variability=variability(history),
+    )
+
+
+def weights(estimates: Mapping[str, Estimate | None]) -> dict[str, float]:
+    """Share of time budget per benchmark, between 1 (stable) and 2 (most variable).
+
+    Benchmarks without history are given the largest share.
+
+    """
+    known: list[float] = [j.variability for j in estimates.values() if j is not None]
+    top: float = max(known, default=0.0)
+
+    return {
+        k: 2.0 if j is None else 1.0 + (j.variability / top if top > 0 else 0.0)
+        for k, j in estimates.items()
+    }
+
+
+def plan(
+    function: str,
+    estimated: Estimate | None,
+    share: float,
+    weight: float,
+    options: ScheduleOptions,
+) -> Plan:
+    """Repetitions and minimum time of a benchmark, to fit its share of the budget.
+
+    Args:
+        function (str): benchmark function name.
+        estimated (Estimate | None): historical estimate, if any.
+        share (float): allocated time (seconds).
+        weight (float): relative priority (1-2), scaling repetitions.
+        options (ScheduleOptions): scheduler options.
+
+    Returns:
+        (Plan) scheduled run of benchmark.
+
+    """
+    if estimated is None or math.isinf(share):
+        return Plan(function)
+
+    most: int = min(options.max_repetitions, math.ceil(estimated.repetitions * weight))
+    per_repetition: float = estimated.cost(1, options.min_time) - _STARTUP
+    repetitions: int = int((share - _STARTUP) // max(per_repetition, 1e-9))
+    if repetitions >= 1:
+        return Plan(function, min(repetitions, most), options.min_time)
+
+    cells: int = max(estimated.iteration_time.size, 1)
+    min_time: float = (share - _STARTUP) / (_ESTIMATION_OVERHEAD * cells)
+
+    return Plan(
+        function, 1, float(np.clip(min_time, options.min_time_floor, options.min_time))
+    )
+
+
+@contextmanager
+def override_runs(plans: Mapping[str, Plan]) -> Iterator[None]:
+    """Override repetitions and minimum time of benchmarks registered within context.
+
+    Args:
+        plans (Mapping[str, Plan]): scheduled runs, keyed by benchmark name.
+
+    """
+
+    def hook(name: str, func: Any, register: Register) -> Any:
+        benchmark = register(name, func)
+        if (scheduled := plans.get(name)) is None:
+            return benchmark
+        ignored: set[str] = set()
+        if scheduled.repetitions is not None:
+            benchmark.repetitions(scheduled.repetitions)
+            ignored.add("repetitions")
+        if scheduled.min_time is not None:
+            benchmark.min_time(scheduled.min_time)
+            ignored.add("min_time")
+
+        return BuilderProxy(benchmark, frozenset(ignored))
+
+    with hook_registration(hook):
+        yield
+
+
+@contextmanager
+def collect_names() -> Iterator[list[str]]:
+    """Collect names of benchmarks registered within context."""
+    names: list[str] = []
+
+    def hook(name: str, func: Any, register: Register) -> Any:
+        names.append(name)
+        return register(name, func)
+
+    with hook_registration(hook):
+        yield names
+
+
+def _supervise(
+    command: list[str],
+    stderr: IO[bytes],
+    progress: str,
+    backstop: float | None,
+    timeout: float | None,
+) -> tuple[int, str | None]:
+    """Run a benchmark subprocess, killing it once a run is stuck beyond backstop.
+
+    Returns:
+        (tuple[int, str | None]) return code, and name of stuck run, if killed.
+
+    Raises:
+        subprocess.TimeoutExpired: subprocess exceeded its timeout.
+
+    """
+    deadline: float = math.inf if timeout is None else time.monotonic() + timeout
+    with subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=stderr) as process:
+        while True:
+            try:
+                return process.wait(_POLL), None
+            except subprocess.TimeoutExpired:
+                pass
+            if time.monotonic() > deadline:
+                process.kill()
+                raise subprocess.TimeoutExpired(command, timeout)  # type: ignore[arg-type]
+            if backstop is not None and (stuck := in_progress(progress, backstop)):
+                process.kill()
+                return process.wait(), stuck
+
+
+def run_plan(
+    scheduled: Plan,
+    options: ScheduleOptions,
+    timeout: float | None,
+) -> BenchmarkContext | None:
+    """Run a scheduled benchmark in a subprocess, returning None on failure/timeout.
+
+    Runs stuck beyond their timeout are killed, and the benchmark is run again with
+    those reported as timed out.
+
+    """
+    deadline: float = math.inf if timeout is None else time.monotonic() + timeout
+    backstop: float | None = None
+    if options.limits.timeout:
+        backstop = _BACKSTOP * options.limits.timeout + _STARTUP
+    timed_out: list[str] = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output: str = os.path.join(tmpdir, "schedule.json")
+        progress: str = os.path.join(tmpdir, "progress")
+        while True:
+            command: list[str] = [
+                sys.executable,
+                "-m",
+                __name__,
+                "--plan",
+                json.dumps(scheduled.__dict__),
+                "--limits",
+                json.dumps(options.limits.__dict__),
+                "--timed-out",
+                json.dumps(timed_out),
+                "--progress",
+                progress,
+                "--output",
+                output,
+                "--path",
+                *options.paths,
+                "--",
+                *options.argv,
+            ]
+            if os.path.exists(progress):
+                os.remove(progress)
+            remaining: float | None = None
+            if not math.isinf(deadline):
+                remaining = max(deadline - time.monotonic(), 0.0)
+            with tempfile.TemporaryFile() as stderr:
+                try:
+                    code, stuck = _supervise(
+                        command, stderr, progress, backstop, remaining
+                    )
+                except subprocess.TimeoutExpired:
+                    log.warning(
+                        "Benchmark %s exceeded time budget.", scheduled.function
+                    )
+                    return None
+                stderr.seek(0)
+                error: str = stderr.read().decode()
+            if stuck is None:
+                break
+            log.warning(
+                "Benchmark %s stuck in %s beyond %gs, killed.",
+                scheduled.function,
+                stuck,
+                backstop,
+            )
+            timed_out.append(stuck)
+
+        if code != 0 or not os.path.exists(output):
+            log.error("Benchmark %s failed: %s", scheduled.function, error)
+            return None
+
+        try:
+            context: BenchmarkContext = parse_version(load(output))
+
+        except (KeyError, ValueError, SchemaError) as e:
+            log.error("Benchmark %s results are invalid: %r", scheduled.function, e)
+            return None
+
+    for function, statuses in exceeded(context.benchmarks).items():
+        for status, sizes in statuses.items():
+            label: str = status.name.lower().replace("_", " ")
+            log.warning("Benchmark %s %s at sizes: %s", function, label, sizes)
+
+    return context
+
+
+def schedule(
+    store: ResultStore,
+    options: ScheduleOptions,
+    on_result: Callable[[BenchmarkContext], None] | None = None,
+    timeline: Timeline | None = None,
+) -> BenchmarkContext | None:
+    """Run benchmarks within a wall clock time budget, prioritizing variable ones.
+
+    Args:
+        store (ResultStore): result store of historical benchmark runs.
+        options (ScheduleOptions): scheduler options.
+        on_result (Callable[[BenchmarkContext], None] | None): called with results
+            of each benchmark, as soon as it completes.
+        timeline (Timeline | None): records the interval of each benchmark
+            subprocess.
+
+    Returns:
+        (BenchmarkContext | None) (partial) results, or None if none completed.
+
+    """
+    deadline: float = time.monotonic() + options.budget
+    estimates: dict[str, Estimate | None] = {}
+    for name in options.functions:
+        if math.isinf(options.budget):
+            estimates[name] = None
+            continue
+        query = Query(function=name, host=options.host)
+        history: list[BenchmarkArray] = [j for _, j in store.history(query)]
+        estimates[name] = estimate(name, history[-options.window :])
+    weight: dict[str, float] = weights(estimates)
+    pending: list[str] = sorted(
+        options.functions, key=lambda j: (-weight[j], estimates[j] is not None)
+    )
+
+    contexts: list[BenchmarkContext] = []
+    while pending:
+        remaining: float = deadline - time.monotonic()
+        if remaining <= _STARTUP:
+            log.warning("Time budget exhausted, skipped benchmarks: %s", pending)
+            break
+        function: str = pending.pop(0)
+        share: float = remaining * weight[function]
+        share /= weight[function] + sum(weight[j] for j in pending)
+        scheduled: Plan = plan(
+            function, estimates[function], share, weight[function], options
+        )
+        log.debug(
+            "Scheduled %s (%.1fs of %.1fs): %s", function, share, remaining, scheduled
+        )
+        timeout: float | None = None if math.isinf(remaining) else remaining
+        started: float = time.time()
+        if (result := run_plan(scheduled, options, timeout)) is not None:
+            if timeline is not None:
+                for bench in result.benchmarks:
+                    timeline.record(bench.function, started, time.time())
+            contexts.append(result)
+            if on_result is not None:
+                on_result(result)
+
+    if not contexts:
+        return None
+
+    return replace(contexts[0], benchmarks=[j for c in contexts for j in c.benchmarks])
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Benchmark (subprocess) entry point, running a single scheduled benchmark."""
+    args = parser("python -m BenchMatcha.schedule")
+    args.add_argument("--plan", required=True, help="json of scheduled run.")
+    args.add_argument("--limits", default="{}", help="json of resource limits.")
+    args.add_argument("--timed-out", default="[]", help="json of timed out runs.")
+    args.add_argument("--progress", default=None, help="progress file path.")
+    known = args.parse_args(argv)
+
+    scheduled = Plan(**json.loads(known.plan))
+    limits = Limits(**json.loads(known.limits))
+    # NOTE: only the scheduled benchmark is registered, retaining any user filter
+    register(
+        known.path,
+        select_registration([scheduled.function]),
+        override_runs({scheduled.function: scheduled}),
+        enforce(limits, json.loads(known.timed_out), known.progress),
+    )
+    apply(limits)
+    run_benchmarks(known.output, known.others)
+
+
+if __name__ == "__main__":
+    main()
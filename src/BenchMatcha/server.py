@@ -0,0 +1,293 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Local dashboard server of stored benchmark results."""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import logging
+import os
+from collections.abc import Callable
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import orjson
+from plotly.offline import get_plotlyjs_version  # type: ignore[import-untyped]
+
+from . import __version__
+from .metrics import elements_per_second, ns_per_element
+from .store import Query, ResultStore, open_store
+from .structure import BenchmarkArray
+from .utils import _simple_stats
+
+
+log: logging.Logger = logging.getLogger(__name__)
+
+DEFAULT_LIMIT: int = 100
+MAX_LIMIT: int = 1000
+
+_DASHBOARD: str = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>BenchMatcha</title>
+<script charset="utf-8" src="https://cdn.plot.ly/plotly-{plotlyjs}.min.js"></script>
+<style>body{{font-family:monospace;margin:1em}}input,select{{margin-right:1em}}</style>
+</head><body>
+<form id="filters">
+<select name="function" id="function"></select>
+<input name="host" placeholder="host"><input name="os" placeholder="os">
+<input name="min_sha" placeholder="from sha"><input name="max_sha" placeholder="to sha">
+<button type="submit">Plot</button>
+</form>
+<div id="figure" style="height:85vh"></div>
+<script type="text/javascript">
+var form=document.getElementById("filters");
+var get=function(path,params){{return fetch(path+"?"+new URLSearchParams(params))
+.then(function(r){{return r.json();}});}};
+var filters=function(){{var p={{}};new FormData(form).forEach(function(v,k){{
+if(v)p[k]=v;}});return p;}};
+var draw=function(){{
+var params=filters(),traces={{}};params.limit={limit};
+var page=function(offset){{params.offset=offset;
+return get("/api/history",params).then(function(body){{
+body.items.forEach(function(item){{item.size.forEach(function(n,i){{
+var t=traces[n]||(traces[n]={{type:"scattergl",mode:"lines+markers",name:"n="+n,
+x:[],y:[],text:[]}});t.x.push(item.run.date);t.y.push(item.cpu_time[i]);
+t.text.push(item.run.git_sha);}});}});
+Plotly.react("figure",Object.values(traces),{{title:params.function||"",
+yaxis:{{type:"log",title:"CPU Time"}},xaxis:{{title:"Date (UTC)"}}}});
+if(body.next!==null)return page(body.next);}});}};
+return page(0);}};
+form.addEventListener("submit",function(e){{e.preventDefault();draw();}});
+get("/api/functions",{{}}).then(function(body){{
+var s=document.getElementById("function");body.items.forEach(function(f){{
+var o=document.createElement("option");o.text=f;s.add(o);}});
+if(body.items.length)draw();}});
+</script></body></html>
+"""
+
+
+def _integer(params: dict[str, str], key: str, default: int, maximum: int) -> int:
+    """Parse a bounded, non-negative integer query parameter."""
+    try:
+        value = int(params.get(key, default))
+    except ValueError as e:
+        raise ValueError(f"Invalid integer parameter `{key}`") from e
+    if value < 0:
+        raise ValueError(f"Negative integer parameter `{key}`")
+
+    return min(value, maximum)
+
+
+def _query(params: dict[str, str]) -> Query:
+    """Construct store query from request parameters."""
+    return Query(
+        function=params.get("function"),
+        host=params.get("host"),
+        os=params.get("os"),
+        min_date=params.get("min_date"),
+        max_date=params.get("max_date"),
+        min_sha=params.get("min_sha"),
+        max_sha=params.get("max_sha"),
+    )
+
+
+def summarize(benchmark: BenchmarkArray) -> dict[str, Any]:
+    """Summarize benchmark repetitions into mean and standard deviation."""
+    cpu_mean, cpu_std = _simple_stats(benchmark.cpu_time)
+    real_mean, real_std = _simple_stats(benchmark.real_time)
+    size: np.ndarray = benchmark.size.astype(np.float64)
+
+    return {
+        "function": benchmark.function,
+        "unit": benchmark.unit,
+        "size": benchmark.size,
+        "cpu_time": cpu_mean,
+        "cpu_std": cpu_std,
+        "real_time": real_mean,
+        "real_std": real_std,
+        "ns_per_element": ns_per_element(size, cpu_mean, benchmark.unit),
+        "throughput": elements_per_second(size, cpu_mean, benchmark.unit),
+        "big_o": benchmark.complexity.big_o,
+    }
+
+
+# Map of request path to handler method name, and response content type
+_ROUTES: dict[str, tuple[str, str]] = {
+    "/": ("index", "text/html; charset=utf-8"),
+    "/api/functions": ("functions", "application/json"),
+    "/api/runs": ("runs", "application/json"),
+    "/api/history": ("history", "application/json"),
+}
+
+
+class Dashboard(ThreadingHTTPServer):
+    """Dashboard http server of a result store.
+
+    Args:
+        address (tuple[str, int]): host and port to bind.
+        cache_dir (str): path location of cache directory, containing result store.
+        lru_size (int): maximum number of decoded benchmark arrays held in memory.
+
+    """
+
+    daemon_threads = True
+    database: str
+    load_benchmark: Callable[[str, str], BenchmarkArray]
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        cache_dir: str,
+        lru_size: int = 512,
+    ) -> None:
+        open_store(cache_dir).close()  # NOTE: create and/or migrate database
+        self.database = os.path.join(cache_dir, "benchmark.db")
+        self.load_benchmark = functools.lru_cache(maxsize=lru_size)(
+            self._load_benchmark
+        )
+        super().__init__(address, DashboardHandler)
+
+    def _load_benchmark(self, run_id: str, function: str) -> BenchmarkArray:
+        with self.store() as store:
+            return store.benchmark(run_id, function)
+
+    def store(self) -> ResultStore:
+        """Open a (thread local) connection to the result store."""
+        return ResultStore(self.database)
+
+
+class DashboardHandler(BaseHTTPRequestHandler):
+    """Request handler of dashboard server."""
+
+    server: Dashboard
+
+    # pylint: disable-next=redefined-builtin
+    def log_message(self, format: str, *args: Any) -> None:
+        log.debug("%s - " + format, self.address_string(), *args)
+
+    def index(self, params: dict[str, str], store: ResultStore) -> bytes:
+        """Dashboard html page."""
+        limit: int = _integer(params, "limit", MAX_LIMIT, MAX_LIMIT)
+
+        return _DASHBOARD.format(plotlyjs=get_plotlyjs_version(), limit=limit).encode()
+
+    def functions(self, params: dict[str, str], store: ResultStore) -> bytes:
+        """Benchmark function names matching filters."""
+        query: Query = _query(params)
+        query.function = None
+
+        return orjson.dumps({"items": store.functions(query)})
+
+    def runs(self, params: dict[str, str], store: ResultStore) -> bytes:
+        """Paginated run metadata matching filters."""
+        offset: int = _integer(params, "offset", 0, 2**62)
+        limit: int = _integer(params, "limit", DEFAULT_LIMIT, MAX_LIMIT)
+        items = store.runs(_query(params), offset, limit + 1)
+
+        return orjson.dumps(
+            {
+                "offset": offset,
+                "next": offset + limit if len(items) > limit else None,
+                "items": [j.to_json() for j in items[:limit]],
+            },
+            option=orjson.OPT_SERIALIZE_DATACLASS,
+        )
+
+    def history(self, params: dict[str, str], store: ResultStore) -> bytes:
+        """Paginated summaries of benchmark arrays matching filters."""
+        offset: int = _integer(params, "offset", 0, 2**62)
+        limit: int = _integer(params, "limit", DEFAULT_LIMIT, MAX_LIMIT)
+        entries = store.entries(_query(params), offset, limit + 1)
+        items: list[dict[str, Any]] = [
+            {
+                "run": info.to_json(),
+                **summarize(self.server.load_benchmark(info.run_id, function)),
+            }
+            for info, function in entries[:limit]
+        ]
+
+        return orjson.dumps(
+            {
+                "offset": offset,
+                "next": offset + limit if len(entries) > limit else None,
+                "items": items,
+            },
+            option=orjson.OPT_SERIALIZE_NUMPY,
+        )
+
+    def do_GET(self) -> None:
+        """Handle GET request."""
+        url = urlsplit(self.path)
+        if url.path not in _ROUTES:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+
+        method, content_type = _ROUTES[url.path]
+        params: dict[str, str] = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        with self.server.store() as store:
+            key: bytes = f"{__version__}:{store.generation()}:{self.path}".encode()
+            etag: str = f'"{hashlib.sha1(key, usedforsecurity=False).hexdigest()}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+
+            try:
+                body: bytes = getattr(self, method)(params, store)
+            except ValueError as e:
+                self.send_error(HTTPStatus.BAD_REQUEST, str(e))
+                return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve(
+    cache_dir: str,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    lru_size: int = 512,
+) -> None:
+    """Serve dashboard until interrupted."""
+    with Dashboard((host, port), cache_dir, lru_size) as server:
+        log.info("Serving dashboard at http://%s:%d", *server.server_address[:2])
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            log.info("Stopping dashboard.")
@@ -27,16 +27,19 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-"""Discovery of benchmark tests to register."""
+"""Discovery of benchmark tests to register, and hooks into their registration."""
 
 import glob
 import logging
 import os
-from collections.abc import Iterator
+from collections.abc import Callable, Collection, Iterator
+from contextlib import contextmanager
 from pathlib import Path
 from types import ModuleType
+from typing import Any
 
 from _pytest.pathlib import import_path
+from google_benchmark import _benchmark
 
 
 log: logging.Logger = logging.getLogger(__name__)
@@ -113,3 +116,82 @@ def manage_registration(path: str) -> None:
             abspath,
         )
         raise TypeError(f"Unsupported path type: {abspath}")
+
+
+Register = Callable[[str, Callable[..., Any]], Any]
+Hook = Callable[[str, Callable[..., Any], Register], Any]
+
+
+class BuilderProxy:
+    """Benchmark builder proxy, forwarding (chained) method calls to a builder.
+
+    Args:
+        benchmark (Any): benchmark builder, or None to discard method calls.
+        ignored (frozenset[str]): names of methods which are not forwarded.
+        calls (list[tuple[str, tuple, dict]] | None): records method calls (name,
+            args, kwargs), if provided.
+
+    """
+
+    def __init__(
+        self,
+        benchmark: Any = None,
+        ignored: frozenset[str] = frozenset(),
+        calls: list[tuple[str, tuple, dict]] | None = None,
+    ) -> None:
+        self._benchmark = benchmark
+        self._ignored = ignored
+        self._calls = calls
+
+    def __getattr__(self, name: str) -> Any:
+        forwarded: bool = self._benchmark is not None and name not in self._ignored
+        method = getattr(self._benchmark, name) if forwarded else None
+
+        def forward(*args, **kwargs) -> "BuilderProxy":
+            if self._calls is not None:
+                self._calls.append((name, args, kwargs))
+            if method is not None:
+                method(*args, **kwargs)
+            return self
+
+        return forward
+
+
+@contextmanager
+def hook_registration(hook: Hook) -> Iterator[None]:
+    """Intercept benchmarks registered within context.
+
+    Hooks are nested, such that the hook is called with the name and function of
+    each registered benchmark, along with the (outer) registration function, and
+    returns the benchmark builder, to which registration options are applied.
+
+    Args:
+        hook (Hook): registration hook.
+
+    """
+    original: Register = _benchmark.RegisterBenchmark
+
+    def register(name: str, func: Callable[..., Any]) -> Any:
+        return hook(name, func, original)
+
+    _benchmark.RegisterBenchmark = register
+    try:
+        yield
+    finally:
+        _benchmark.RegisterBenchmark = original
+
+
+@contextmanager
+def select_registration(functions: Collection[str]) -> Iterator[None]:
+    """Register only the given benchmarks, of those registered within context.
+
+    Args:
+        functions (Collection[str]): names of registered benchmarks.
+
+    """
+
+    def hook(name: str, func: Callable[..., Any], register: Register) -> Any:
+        return register(name, func) if name in functions else BuilderProxy()
+
+    with hook_registration(hook):
+        yield
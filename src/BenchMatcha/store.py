@@ -0,0 +1,602 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Indexed storage of benchmark results over time."""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import uuid
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import groupby
+from typing import Any, Self
+
+import numpy as np
+import orjson
+
+from .metrics import Metrics
+from .noise import COLUMNS, NoiseProfile
+from .structure import (
+    BenchmarkArray,
+    BenchmarkContext,
+    Cache,
+    ComplexityInfo,
+    parse_datetime,
+)
+
+
+log: logging.Logger = logging.getLogger(__name__)
+
+_SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    date TEXT NOT NULL,
+    host_name TEXT NOT NULL,
+    os_name TEXT NOT NULL,
+    git_sha TEXT NOT NULL,
+    context BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_date ON runs (date);
+CREATE INDEX IF NOT EXISTS runs_host ON runs (host_name, os_name);
+CREATE INDEX IF NOT EXISTS runs_sha ON runs (git_sha);
+CREATE TABLE IF NOT EXISTS benchmarks (
+    run_id TEXT NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    function TEXT NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (run_id, function)
+);
+CREATE INDEX IF NOT EXISTS benchmarks_function ON benchmarks (function);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id TEXT NOT NULL,
+    function TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    ns_per_element REAL,
+    throughput REAL,
+    residual REAL,
+    PRIMARY KEY (run_id, function, size),
+    FOREIGN KEY (run_id, function) REFERENCES benchmarks (run_id, function)
+        ON DELETE CASCADE
+);
+CREATE TABLE IF NOT EXISTS noise (
+    run_id TEXT PRIMARY KEY REFERENCES runs (run_id) ON DELETE CASCADE,
+    samples BLOB NOT NULL,
+    intervals BLOB NOT NULL
+);
+"""
+
+_OPTIONS: int = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_SERIALIZE_DATACLASS
+
+
+def _format_date(x: datetime) -> str:
+    """Uniform (lexicographically sortable) UTC representation of a datetime."""
+    return parse_datetime(x.isoformat()).isoformat()
+
+
+def parse_date_bound(x: str, upper: bool = False) -> str:
+    """Parse a user supplied date (or datetime) filter into a storage bound.
+
+    Args:
+        x (str): ISO 8601 date or datetime string.
+        upper (bool): whether the bound is an inclusive upper bound. A date without
+            time includes the entire day.
+
+    Returns:
+        (str) storage formatted bound.
+
+    """
+    value: datetime = datetime.fromisoformat(x)
+    if upper and len(x) <= len("YYYY-MM-DD"):
+        value += timedelta(days=1, microseconds=-1)
+
+    return _format_date(value)
+
+
+def decode_complexity(record: dict[str, Any]) -> ComplexityInfo:
+    """Convert a stored json dictionary object to ComplexityInfo."""
+    return ComplexityInfo(**record)
+
+
+def decode_benchmark(record: dict[str, Any]) -> BenchmarkArray:
+    """Convert a stored json dictionary object to BenchmarkArray."""
+    return BenchmarkArray(
+        function=record["function"],
+        unit=record["unit"],
+        size=np.asarray(record["size"], dtype=np.int64),
+        iterations=np.asarray(record["iterations"], dtype=np.int64),
+        real_time=np.asarray(record["real_time"], dtype=np.float64),
+        cpu_time=np.asarray(record["cpu_time"], dtype=np.float64),
+        complexity=decode_complexity(record["complexity"]),
+        threads=np.asarray(record.get("threads", []), dtype=np.int64),
+        status=np.asarray(record.get("status", []), dtype=np.int8),
+    )
+
+
+def decode_context(
+    record: dict[str, Any],
+    benchmarks: list[BenchmarkArray] | None = None,
+) -> BenchmarkContext:
+    """Convert a stored json dictionary object to BenchmarkContext."""
+    data: dict[str, Any] = record.copy()
+    data.pop("benchmarks", None)
+    data.setdefault("os_name", "")
+    if benchmarks is None:
+        benchmarks = [decode_benchmark(j) for j in record.get("benchmarks", [])]
+
+    return BenchmarkContext(
+        **{
+            k: v
+            for k, v in data.items()
+            if k in BenchmarkContext.__annotations__
+            and k not in {"caches", "date", "benchmarks"}
+        },
+        caches=[Cache.from_json(j) for j in data.get("caches", [])],
+        date=parse_datetime(data["date"]),
+        benchmarks=benchmarks,
+    )
+
+
+def _metric_rows(run_id: str, metrics: Sequence[Metrics]) -> list[tuple]:
+    """Flatten metrics into database rows (one per input size), NaN as NULL."""
+    rows: list[tuple] = []
+    for j in metrics:
+        summary: dict[str, np.ndarray] = j.summary()
+        values: np.ndarray = np.column_stack(
+            [summary[k] for k in ("ns_per_element", "throughput", "residual")]
+        )
+        cells: np.ndarray = values.astype(object)
+        cells[np.isnan(values)] = None
+        rows.extend(
+            (run_id, j.function, size, *cell)
+            for size, cell in zip(summary["size"].tolist(), cells.tolist(), strict=True)
+        )
+
+    return rows
+
+
+@dataclass
+class RunInfo:
+    """Indexed metadata of a stored benchmark run.
+
+    Args:
+        run_id (str): unique run identifier.
+        date (datetime): date of benchmark run.
+        host_name (str): host machine name.
+        os_name (str): operating system name.
+        git_sha (str): git commit description of benchmarked project.
+
+    """
+
+    run_id: str
+    date: datetime
+    host_name: str
+    os_name: str
+    git_sha: str
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> Self:
+        """Convert a database row to RunInfo."""
+        return cls(
+            run_id=row["run_id"],
+            date=parse_datetime(row["date"]),
+            host_name=row["host_name"],
+            os_name=row["os_name"],
+            git_sha=row["git_sha"],
+        )
+
+    def to_json(self) -> dict:
+        """Convert to json dictionary object."""
+        return self.__dict__.copy()
+
+
+@dataclass
+class Query:
+    """Filter criteria of stored benchmark runs.
+
+    Args:
+        function (str | None): benchmark function name.
+        host (str | None): host machine name.
+        os (str | None): operating system name.
+        min_date (str | None): minimum date (inclusive), in ISO 8601 format.
+        max_date (str | None): maximum date (inclusive), in ISO 8601 format.
+        min_sha (str | None): filter runs on or after first run of git sha.
+        max_sha (str | None): filter runs on or before last run of git sha.
+        sha (str | None): filter runs of a specific git sha.
+
+    """
+
+    # pylint: disable=R0902
+
+    function: str | None = None
+    host: str | None = None
+    os: str | None = None
+    min_date: str | None = None
+    max_date: str | None = None
+    min_sha: str | None = None
+    max_sha: str | None = None
+    sha: str | None = None
+
+    def where(self) -> tuple[str, list[Any]]:
+        """Construct the sql where clause (on runs) and its parameters."""
+        clauses: list[str] = []
+        params: list[Any] = []
+        if self.host is not None:
+            clauses.append("runs.host_name = ?")
+            params.append(self.host)
+        if self.os is not None:
+            clauses.append("runs.os_name = ?")
+            params.append(self.os)
+        if self.min_date is not None:
+            clauses.append("runs.date >= ?")
+            params.append(parse_date_bound(self.min_date))
+        if self.max_date is not None:
+            clauses.append("runs.date <= ?")
+            params.append(parse_date_bound(self.max_date, upper=True))
+        if self.min_sha is not None:
+            clauses.append(
+                "runs.date >= (SELECT MIN(date) FROM runs WHERE git_sha = ?)"
+            )
+            params.append(self.min_sha)
+        if self.max_sha is not None:
+            clauses.append(
+                "runs.date <= (SELECT MAX(date) FROM runs WHERE git_sha = ?)"
+            )
+            params.append(self.max_sha)
+        if self.sha is not None:
+            clauses.append("runs.git_sha = ?")
+            params.append(self.sha)
+        if self.function is not None:
+            clauses.append("benchmarks.function = ?")
+            params.append(self.function)
+
+        return " AND ".join(clauses) or "1", params
+
+
+class ResultStore:
+    """Sqlite backed storage of benchmark results.
+
+    Runs and their benchmark arrays are stored in separate, indexed tables, such
+    that queries only decode the benchmark arrays which match.
+
+    Args:
+        path (str): path location of database file.
+
+    """
+
+    path: str
+    connection: sqlite3.Connection
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.connection = sqlite3.connect(path, timeout=30.0)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(_SCHEMA)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close database connection."""
+        self.connection.close()
+
+    def add(
+        self,
+        context: BenchmarkContext,
+        run_id: str | None = None,
+        metrics: Sequence[Metrics] = (),
+    ) -> str:
+        """Store a benchmark run.
+
+        Benchmarks of an existing run identifier are added to (or replaced within)
+        that run, such that a run may be stored incrementally, one benchmark at a
+        time. Metadata of an existing run is retained.
+
+        Args:
+            context (BenchmarkContext): benchmark run.
+            run_id (str | None): unique run identifier. Generated if not provided.
+            metrics (Sequence[Metrics]): size normalized metrics of benchmarks, to
+                store (per input size) alongside the run.
+
+        Returns:
+            (str) run identifier.
+
+        """
+        run_id = run_id or uuid.uuid4().hex
+        record: dict[str, Any] = context.to_json()
+        benchmarks: list[dict] = record.pop("benchmarks")
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR IGNORE INTO runs VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    run_id,
+                    _format_date(context.date),
+                    context.host_name,
+                    context.os_name,
+                    context.git_sha,
+                    orjson.dumps(record, option=_OPTIONS),
+                ),
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO benchmarks VALUES (?, ?, ?)",
+                [
+                    (run_id, j["function"], orjson.dumps(j, option=_OPTIONS))
+                    for j in benchmarks
+                ],
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO metrics VALUES (?, ?, ?, ?, ?, ?)",
+                _metric_rows(run_id, metrics),
+            )
+
+        return run_id
+
+    def import_json(self, path: str) -> int:
+        """Import runs from a (legacy) json list of serialized benchmark contexts.
+
+        Args:
+            path (str): path to json file.
+
+        Returns:
+            (int) number of imported runs.
+
+        """
+        with open(path, "br") as f:
+            data: list[dict] = orjson.loads(f.read())
+
+        for record in data:
+            self.add(decode_context(record))
+
+        return len(data)
+
+    def runs(
+        self,
+        query: Query | None = None,
+        offset: int = 0,
+        limit: int = -1,
+    ) -> list[RunInfo]:
+        """Retrieve metadata of runs matching query, ordered by date.
+
+        Args:
+            query (Query | None): filter criteria.
+            offset (int): number of runs to skip.
+            limit (int): maximum number of runs. Unbounded when negative.
+
+        """
+        clause, params = (query or Query()).where()
+        rows = self.connection.execute(
+            "SELECT DISTINCT runs.run_id, runs.date, runs.host_name, runs.os_name,"
+            " runs.git_sha FROM runs JOIN benchmarks USING (run_id)"
+            f" WHERE {clause} ORDER BY runs.date LIMIT ? OFFSET ?",
+            [*params, limit, offset],
+        )
+
+        return [RunInfo.from_row(row) for row in rows]
+
+    def functions(self, query: Query | None = None) -> list[str]:
+        """Retrieve names of benchmark functions matching query."""
+        clause, params = (query or Query()).where()
+        rows = self.connection.execute(
+            "SELECT DISTINCT benchmarks.function FROM runs JOIN benchmarks"
+            f" USING (run_id) WHERE {clause} ORDER BY benchmarks.function",
+            params,
+        )
+
+        return [row[0] for row in rows]
+
+    def history(
+        self, query: Query | None = None
+    ) -> Iterator[tuple[RunInfo, BenchmarkArray]]:
+        """Iterate over benchmark arrays (and run metadata) matching query.
+
+        Only matching benchmark arrays are decoded, ordered by function and date.
+
+        """
+        clause, params = (query or Query()).where()
+        rows = self.connection.execute(
+            "SELECT runs.run_id, runs.date, runs.host_name, runs.os_name,"
+            " runs.git_sha, benchmarks.data FROM runs JOIN benchmarks USING (run_id)"
+            f" WHERE {clause} ORDER BY benchmarks.function, runs.date",
+            params,
+        )
+        for row in rows:
+            yield RunInfo.from_row(row), decode_benchmark(orjson.loads(row["data"]))
+
+    def entries(
+        self,
+        query: Query | None = None,
+        offset: int = 0,
+        limit: int = -1,
+    ) -> list[tuple[RunInfo, str]]:
+        """Retrieve a page of (run metadata, function name) matching query.
+
+        Benchmark arrays are not decoded, see :meth:`benchmark`.
+
+        Args:
+            query (Query | None): filter criteria.
+            offset (int): number of entries to skip.
+            limit (int): maximum number of entries. Unbounded when negative.
+
+        Returns:
+            (list[tuple[RunInfo, str]]) entries ordered by function and date.
+
+        """
+        clause, params = (query or Query()).where()
+        rows = self.connection.execute(
+            "SELECT runs.run_id, runs.date, runs.host_name, runs.os_name,"
+            " runs.git_sha, benchmarks.function FROM runs JOIN benchmarks"
+            f" USING (run_id) WHERE {clause}"
+            " ORDER BY benchmarks.function, runs.date LIMIT ? OFFSET ?",
+            [*params, limit, offset],
+        )
+
+        return [(RunInfo.from_row(row), row["function"]) for row in rows]
+
+    def benchmark(self, run_id: str, function: str) -> BenchmarkArray:
+        """Load a single benchmark array of a run.
+
+        Raises:
+            KeyError: run identifier and function pair is not found.
+
+        """
+        row = self.connection.execute(
+            "SELECT data FROM benchmarks WHERE run_id = ? AND function = ?",
+            (run_id, function),
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown benchmark: {run_id}/{function}")
+
+        return decode_benchmark(orjson.loads(row["data"]))
+
+    def add_noise(self, run_id: str, profile: NoiseProfile) -> None:
+        """Store system noise sampled throughout a (stored) run, replacing any.
+
+        Samples are stored as a compact (little endian float64) array.
+
+        """
+        samples: bytes = np.ascontiguousarray(profile.samples, dtype="<f8").tobytes()
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO noise VALUES (?, ?, ?)",
+                (run_id, samples, orjson.dumps(profile.intervals)),
+            )
+
+    def noise(self, run_id: str) -> NoiseProfile | None:
+        """Load system noise sampled throughout a run, if any."""
+        row = self.connection.execute(
+            "SELECT samples, intervals FROM noise WHERE run_id = ?", (run_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        samples: np.ndarray = np.frombuffer(row["samples"], dtype="<f8")
+        intervals: dict[str, list[float]] = orjson.loads(row["intervals"])
+
+        return NoiseProfile(
+            samples.reshape(-1, len(COLUMNS)).astype(np.float64),
+            {k: (v[0], v[1]) for k, v in intervals.items()},
+        )
+
+    def metrics(
+        self, query: Query | None = None
+    ) -> Iterator[tuple[RunInfo, str, dict[str, np.ndarray]]]:
+        """Iterate over stored metrics of benchmarks matching query.
+
+        Args:
+            query (Query | None): filter criteria.
+
+        Yields:
+            (tuple[RunInfo, str, dict[str, np.ndarray]]) run metadata, function name,
+            and arrays of size, ns_per_element, throughput and residual, ordered by
+            function and date.
+
+        """
+        clause, params = (query or Query()).where()
+        rows = self.connection.execute(
+            "SELECT runs.run_id, runs.date, runs.host_name, runs.os_name,"
+            " runs.git_sha, benchmarks.function, metrics.size,"
+            " metrics.ns_per_element, metrics.throughput, metrics.residual"
+            " FROM runs JOIN benchmarks USING (run_id)"
+            " JOIN metrics USING (run_id, function)"
+            f" WHERE {clause}"
+            " ORDER BY benchmarks.function, runs.date, runs.run_id, metrics.size",
+            params,
+        )
+        for _, group in groupby(rows, key=lambda x: (x["run_id"], x["function"])):
+            records: list[sqlite3.Row] = list(group)
+            data: np.ndarray = np.asarray(
+                [tuple(j)[6:] for j in records], dtype=np.float64
+            )
+            yield (
+                RunInfo.from_row(records[0]),
+                records[0]["function"],
+                {
+                    "size": data[:, 0].astype(np.int64),
+                    "ns_per_element": data[:, 1],
+                    "throughput": data[:, 2],
+                    "residual": data[:, 3],
+                },
+            )
+
+    def completed(self, run_id: str) -> list[str]:
+        """Retrieve names of benchmark functions stored within a run."""
+        rows = self.connection.execute(
+            "SELECT function FROM benchmarks WHERE run_id = ? ORDER BY rowid",
+            (run_id,),
+        )
+
+        return [row[0] for row in rows]
+
+    def generation(self) -> int:
+        """Monotonic identifier of stored content, which changes on insertion."""
+        row = self.connection.execute(
+            "SELECT COALESCE(MAX(rowid), 0) FROM benchmarks"
+        ).fetchone()
+
+        return int(row[0])
+
+    def load(self, run_id: str) -> BenchmarkContext:
+        """Load a complete benchmark run.
+
+        Raises:
+            KeyError: run identifier is not found.
+
+        """
+        row = self.connection.execute(
+            "SELECT context FROM runs WHERE run_id = ?", (run_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown run id: {run_id}")
+
+        benchmarks: list[BenchmarkArray] = [
+            decode_benchmark(orjson.loads(j["data"]))
+            for j in self.connection.execute(
+                "SELECT data FROM benchmarks WHERE run_id = ? ORDER BY rowid",
+                (run_id,),
+            )
+        ]
+
+        return decode_context(orjson.loads(row["context"]), benchmarks)
+
+
+def open_store(cache_dir: str) -> ResultStore:
+    """Open result store within cache directory, migrating legacy json data."""
+    store = ResultStore(os.path.join(cache_dir, "benchmark.db"))
+    legacy: str = os.path.join(cache_dir, "benchmark.json")
+    if os.path.exists(legacy):
+        count: int = store.import_json(legacy)
+        os.replace(legacy, f"{legacy}.migrated")
+        log.info("Migrated %d runs from legacy json database: %s", count, legacy)
+
+    return store
@@ -31,23 +31,53 @@
 
 from __future__ import annotations
 
+import enum
 import os
+import platform
 import subprocess
 import sys
 from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from typing import Any, Literal, Self
 
 import numpy as np
 
 from .errors import SchemaError
+from .utils import outlier_mask
 
 
 BuildType = Literal["release", "debug"]
 SUPPORTED_VERSIONS: tuple[int, ...] = (1,)
 
 
+class Status(enum.IntEnum):
+    """Outcome of a benchmark run (i.e. a single size and repetition)."""
+
+    VALID = 0
+    FAILED = 1
+    TIMED_OUT = 2
+    OUT_OF_MEMORY = 3
+
+    @classmethod
+    def from_error(cls, message: str | None) -> Status:
+        """Classify the error message of a benchmark run."""
+        if message is None:
+            return cls.VALID
+        for status, prefix in _ERROR_PREFIXES.items():
+            if message.startswith(prefix):
+                return status
+
+        return cls.FAILED
+
+
+# Error message prefixes of runs interrupted by resource limits.
+_ERROR_PREFIXES: dict[Status, str] = {
+    Status.TIMED_OUT: "Timed out",
+    Status.OUT_OF_MEMORY: "Out of memory",
+}
+
+
 def parse_datetime(x: str) -> datetime:
     """Parse ISO 8601 datetime string."""
     return datetime.fromisoformat(x).astimezone(UTC)
@@ -133,9 +163,12 @@ class BenchmarkRecord:
         real_time (float): total real time per measurement
         cpu_time (float): total cpu time per measurement
         time_unit (str): unit of time
+        error (str | None): error message, if the run failed.
 
     """
 
+    # pylint: disable=R0902
+
     function: str
     size: int
     threads: int
@@ -143,6 +176,7 @@ class BenchmarkRecord:
     real_time: float
     cpu_time: float
     time_unit: str
+    error: str | None = None
 
     @classmethod
     def from_json(cls, record: dict[str, Any]) -> Self:
@@ -158,6 +192,11 @@ class BenchmarkRecord:
             real_time=record["real_time"],
             cpu_time=record["cpu_time"],
             time_unit=record["time_unit"],
+            error=(
+                record.get("error_message", "")
+                if record.get("error_occurred", False)
+                else None
+            ),
         )
 
 
@@ -209,9 +248,14 @@ class BenchmarkArray:
         real_time (np.ndarray): total real time per measurement
         cpu_time (np.ndarray): total cpu time per measurement
         complexity (ComplexityInfo): algorithmic time complexity information
+        threads (np.ndarray): number of threads per measurement. Defaults to a
+            single thread.
+        status (np.ndarray): outcome (Status) per measurement. Defaults to valid.
 
     """
 
+    # pylint: disable=R0902
+
     function: str
     unit: str
     size: np.ndarray  # 1D array
@@ -219,6 +263,28 @@ class BenchmarkArray:
     real_time: np.ndarray  # 2D array (n_sizes x repetitions)
     cpu_time: np.ndarray  # 2D array (n_sizes x repetitions)
     complexity: ComplexityInfo
+    threads: np.ndarray = field(  # 2D array (n_sizes x repetitions)
+        default_factory=lambda: np.empty((0, 0), dtype=np.int64)
+    )
+    status: np.ndarray = field(  # 2D array (n_sizes x repetitions)
+        default_factory=lambda: np.empty((0, 0), dtype=np.int8)
+    )
+
+    def __post_init__(self) -> None:
+        if self.threads.size == 0:
+            self.threads = np.ones(np.shape(self.iterations), dtype=np.int64)
+        if self.status.size == 0:
+            self.status = np.zeros(np.shape(self.iterations), dtype=np.int8)
+
+    @property
+    def valid(self) -> np.ndarray:
+        """Validity mask (n_sizes x repetitions) of measurements.
+
+        Failed, timed out, and out of memory runs, as well as padded repetitions,
+        are invalid.
+
+        """
+        return (self.status == Status.VALID) & np.isfinite(self.real_time)
 
     def to_json(self) -> dict:
         """Convert to json dictionary object."""
@@ -227,6 +293,23 @@ class BenchmarkArray:
 
         return d
 
+    def outliers(
+        self,
+        attribute: str = "real_time",
+        threshold: float = 3.5,
+    ) -> np.ndarray:
+        """Flag outlier repetitions (e.g. preempted runs) of a timing attribute.
+
+        Args:
+            attribute (str): timing attribute ("cpu_time" | "real_time").
+            threshold (float): modified z-score above which a value is an outlier.
+
+        Returns:
+            (np.ndarray) boolean mask (n_sizes x repetitions) of outliers.
+
+        """
+        return outlier_mask(getattr(self, attribute), threshold)
+
 
 def get_benchmark_records(
     data: list[dict[str, Any]],
@@ -277,15 +360,19 @@ def convert_to_arrays(
     grouped_arrays: list[BenchmarkArray] = []
 
     for function, records in grouped_records.items():
-        size_to_times: defaultdict[int, list[tuple[int, float, float]]] = defaultdict(
-            list
+        size_to_times: defaultdict[int, list[tuple[int, float, float, int, Status]]] = (
+            defaultdict(list)
         )
         for record in records:
+            status: Status = Status.from_error(record.error)
+            # NOTE: timings of failed runs are meaningless (i.e. zero).
             size_to_times[record.size].append(
                 (
                     record.iterations,
-                    record.real_time,
-                    record.cpu_time,
+                    record.real_time if status == Status.VALID else np.nan,
+                    record.cpu_time if status == Status.VALID else np.nan,
+                    record.threads,
+                    status,
                 )
             )
 
@@ -293,13 +380,17 @@ def convert_to_arrays(
         iter_arr: list[list[int]] = []
         real_arr: list[list[float]] = []
         cpu_arr: list[list[float]] = []
+        thread_arr: list[list[int]] = []
+        status_arr: list[list[int]] = []
         container: list[list[int] | list[float]]
         idx: int
 
         for size in sorted_sizes:
-            times: list[tuple[int, float, float]] = size_to_times[size]
+            times: list[tuple[int, float, float, int, Status]] = size_to_times[size]
             for idx, container in zip(  # type: ignore[assignment]
-                range(3), (iter_arr, real_arr, cpu_arr), strict=True
+                range(5),
+                (iter_arr, real_arr, cpu_arr, thread_arr, status_arr),
+                strict=True,
             ):
                 container.append([t[idx] for t in times])
 
@@ -313,6 +404,8 @@ def convert_to_arrays(
                 real_time=np.asarray(real_arr, dtype=np.float64),
                 cpu_time=np.asarray(cpu_arr, dtype=np.float64),
                 complexity=complexity_data[function],
+                threads=np.asarray(thread_arr, dtype=np.int64),
+                status=np.asarray(status_arr, dtype=np.int8),
             )
         )
 
@@ -340,6 +433,7 @@ class BenchmarkContext:
     aslr_enabled: bool
     python_version: str
     git_sha: str
+    os_name: str
 
     @classmethod
     def from_json(cls, record: dict[str, Any]) -> Self:
@@ -365,6 +459,7 @@ class BenchmarkContext:
             aslr_enabled=aslr,
             python_version=get_python_version(),
             git_sha=_get_commit_hash(os.getcwd()),
+            os_name=platform.system(),
         )
 
     def to_json(self) -> dict:
@@ -33,6 +33,7 @@ from __future__ import annotations
 
 import enum
 import sys
+import warnings
 
 import numpy as np
 
@@ -50,13 +51,94 @@ def power_of_2(x: int) -> int:
 
 
 def _simple_stats(x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
-    """Compute mean and standard deviation."""
-    mean: np.ndarray = np.nanmean(x, axis=1)
-    std: np.ndarray = np.nanstd(x, axis=1, ddof=1)
+    """Compute mean and standard deviation, NaN where no observation is finite."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        mean: np.ndarray = np.nanmean(x, axis=1)
+        std: np.ndarray = np.nanstd(x, axis=1, ddof=1)
 
     return mean, std
 
 
+# Consistency constants, scaling absolute deviations to normal standard deviation.
+_MAD_SCALE: float = 1.482602218505602
+_MEANAD_SCALE: float = 1.2533141373155001
+
+
+def _robust_stats(x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Compute median and (normal consistent) median absolute deviation."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        median: np.ndarray = np.nanmedian(x, axis=1)
+        mad: np.ndarray = np.nanmedian(np.abs(x - median[:, None]), axis=1)
+
+    return median, _MAD_SCALE * mad
+
+
+def outlier_mask(x: np.ndarray, threshold: float = 3.5) -> np.ndarray:
+    """Flag outliers along repetition (column) axis, by modified z-score.
+
+    Where more than half of the repetitions are identical (i.e. zero MAD), the
+    mean absolute deviation is used instead (Iglewicz and Hoaglin, 1993).
+
+    Args:
+        x (np.ndarray): 2D array of observations (n_sizes x repetitions).
+        threshold (float): modified z-score above which a value is an outlier.
+
+    Returns:
+        (np.ndarray) boolean mask of outliers, with same shape as x.
+
+    """
+    median, scale = _robust_stats(x)
+    deviation: np.ndarray = np.abs(x - median[:, None])
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        fallback: np.ndarray = _MEANAD_SCALE * np.nanmean(deviation, axis=1)
+    scale = np.where(scale > 0, scale, fallback)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        score: np.ndarray = deviation / scale[:, None]
+
+    return np.where(scale[:, None] > 0, score > threshold, False)
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Largest Triangle Three Buckets (LTTB) downsampling.
+
+    Args:
+        x (np.ndarray): monotonically increasing (numeric) x values.
+        y (np.ndarray): y values.
+        threshold (int): maximum number of points to retain.
+
+    Returns:
+        (np.ndarray) sorted indices of retained points.
+
+    """
+    n: int = x.size
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+    # NOTE: first and last points are always retained; the rest are bucketed
+    edges: np.ndarray = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    edges = np.append(edges, n)
+    selected: np.ndarray = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    a: int = 0
+    for i in range(threshold - 2):
+        lo, hi, end = edges[i], edges[i + 1], edges[i + 2]
+        avg_x: float = x[hi:end].mean()
+        avg_y: float = y[hi:end].mean()
+        area: np.ndarray = np.abs(
+            (x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a])
+        )
+        a = int(lo + np.argmax(area))
+        selected[i + 1] = a
+
+    return selected
+
+
 # pylint: disable=invalid-name
 # https://github.com/google/benchmark/blob/main/src/complexity.cc#L52-L69
 class BigO(enum.StrEnum):
@@ -69,6 +151,11 @@ class BigO(enum.StrEnum):
     oLogN = "lgN"
     oNLogN = "NlgN"
     oLambda = "f(N)"
+    # NOTE: Extended complexity classes, fit by BenchMatcha (not google benchmark)
+    oSqrtN = "sqrtN"
+    oNLogSquaredN = "Nlg^2N"
+    oNPowerK = "N^k"
+    o2N = "2^N"
 
     @classmethod
     def get(cls, value: str) -> str:
@@ -0,0 +1,521 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Watch mode, rerunning benchmarks of changed files with a warm worker.
+
+The watching process is a persistent worker: google benchmark, numpy, scipy and the
+user's modules are imported once. Benchmark registrations are recorded (rather than
+registered) on import, and on change only the changed module is re-imported (or, when
+a helper module changes, every benchmark module). Google benchmark does not support
+running benchmarks more than once per process, so each iteration forks a child
+process, which replays the recorded registrations of affected benchmarks and runs
+them once. Differences against the previous iteration are written to the terminal.
+
+Files are watched with inotify (linux), falling back to polling file modification
+times elsewhere.
+
+"""
+
+import ctypes
+import ctypes.util
+import importlib
+import logging
+import os
+import select
+import struct
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+import google_benchmark as gbench
+import numpy as np
+from google_benchmark import _benchmark
+
+from .adaptive import benchmark_filter
+from .comparison import compare_arrays
+from .handlers import load
+from .sifter import BuilderProxy, Register, collect, hook_registration, load_benchmark
+from .structure import (
+    BenchmarkArray,
+    convert_to_arrays,
+    get_benchmark_records,
+    get_complexity_info,
+)
+
+
+log: logging.Logger = logging.getLogger(__name__)
+
+# inotify(7) event masks, and event header (wd, mask, cookie, len).
+_IN_MODIFY: int = 0x00000002
+_IN_CLOSE_WRITE: int = 0x00000008
+_IN_MOVED_TO: int = 0x00000080
+_IN_CREATE: int = 0x00000100
+_IN_DELETE: int = 0x00000200
+_IN_NONBLOCK: int = os.O_NONBLOCK
+_IN_CLOEXEC: int = 0o2000000
+_EVENT: struct.Struct = struct.Struct("iIII")
+
+
+@dataclass
+class Registration:
+    """Recorded registration of a benchmark.
+
+    Args:
+        name (str): benchmark name.
+        func (Callable): benchmark function.
+        calls (list[tuple[str, tuple, dict]]): benchmark builder method calls.
+
+    """
+
+    name: str
+    func: Callable[..., Any]
+    calls: list[tuple[str, tuple, dict]] = field(default_factory=list)
+
+
+@contextmanager
+def record_registrations() -> Iterator[list[Registration]]:
+    """Record (without registering) benchmarks registered within context."""
+    recorded: list[Registration] = []
+
+    def hook(name: str, func: Any, register: Register) -> Any:  # pylint: disable=W0613
+        recorded.append(registration := Registration(name, func))
+        return BuilderProxy(calls=registration.calls)
+
+    with hook_registration(hook):
+        yield recorded
+
+
+@contextmanager
+def no_bytecode() -> Iterator[None]:
+    """Do not write bytecode of modules imported within context.
+
+    Edits within the same second (mtime resolution of bytecode) must never load stale
+    bytecode on a later re-import.
+
+    """
+    previous: bool = sys.dont_write_bytecode
+    sys.dont_write_bytecode = True
+    try:
+        yield
+    finally:
+        sys.dont_write_bytecode = previous
+
+
+def replay(registrations: list[Registration]) -> None:
+    """Register recorded benchmarks."""
+    for j in registrations:
+        benchmark = _benchmark.RegisterBenchmark(j.name, j.func)
+        for name, args, kwargs in j.calls:
+            getattr(benchmark, name)(*args, **kwargs)
+
+
+class Watcher(Protocol):
+    """File watcher interface."""
+
+    def changes(self, timeout: float | None = None) -> set[str]:
+        """Wait for changed python files, returning their paths (empty on timeout)."""
+
+    def close(self) -> None:
+        """Release resources."""
+
+
+def _python_files(directories: list[str]) -> dict[str, tuple[int, int]]:
+    """Modification time and size of python files, recursively within directories."""
+    stats: dict[str, tuple[int, int]] = {}
+    for directory in directories:
+        for root, _, files in os.walk(directory):
+            for name in files:
+                if name.endswith(".py"):
+                    path: str = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    stats[path] = (stat.st_mtime_ns, stat.st_size)
+
+    return stats
+
+
+class PollingWatcher:
+    """Watch python files by polling their modification time and size."""
+
+    def __init__(self, directories: list[str], interval: float = 0.25) -> None:
+        self.directories = directories
+        self.interval = interval
+        self._snapshot: dict[str, tuple[int, int]] = _python_files(directories)
+
+    def changes(self, timeout: float | None = None) -> set[str]:
+        """Wait for changed python files, returning their paths (empty on timeout)."""
+        deadline: float = time.monotonic() + (np.inf if timeout is None else timeout)
+        while True:
+            current: dict[str, tuple[int, int]] = _python_files(self.directories)
+            changed: set[str] = {
+                k
+                for k in current.keys() | self._snapshot.keys()
+                if current.get(k) != self._snapshot.get(k)
+            }
+            self._snapshot = current
+            if changed or time.monotonic() >= deadline:
+                return changed
+            time.sleep(self.interval)
+
+    def close(self) -> None:
+        """Release resources."""
+
+
+class InotifyWatcher:
+    """Watch python files within directories with inotify.
+
+    Raises:
+        OSError: inotify is unavailable.
+
+    """
+
+    def __init__(self, directories: list[str], debounce: float = 0.05) -> None:
+        name: str | None = ctypes.util.find_library("c")
+        libc = ctypes.CDLL(name, use_errno=True)
+        self.debounce = debounce
+        self._fd: int = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask: int = (
+            _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+        )
+        self._dirs: dict[int, str] = {}
+        for directory in directories:
+            for root, _, _ in os.walk(directory):
+                wd: int = libc.inotify_add_watch(self._fd, os.fsencode(root), mask)
+                if wd < 0:
+                    os.close(self._fd)
+                    raise OSError(ctypes.get_errno(), f"inotify_add_watch: {root}")
+                self._dirs[wd] = root
+
+    def _read(self) -> set[str]:
+        try:
+            data: bytes = os.read(self._fd, 1 << 16)
+        except BlockingIOError:
+            return set()
+        changed: set[str] = set()
+        offset: int = 0
+        while offset < len(data):
+            wd, _, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name: str = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+            if name.endswith(".py") and wd in self._dirs:
+                changed.add(os.path.join(self._dirs[wd], name))
+
+        return changed
+
+    def changes(self, timeout: float | None = None) -> set[str]:
+        """Wait for changed python files, returning their paths (empty on timeout)."""
+        deadline: float = time.monotonic() + (np.inf if timeout is None else timeout)
+        changed: set[str] = set()
+        while not changed:
+            remaining: float = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            ready, _, _ = select.select([self._fd], [], [], min(remaining, 1.0))
+            if ready:
+                changed |= self._read()
+        # NOTE: editors write files in several steps, collect them all at once
+        while changed and select.select([self._fd], [], [], self.debounce)[0]:
+            changed |= self._read()
+
+        return changed
+
+    def close(self) -> None:
+        """Release resources."""
+        os.close(self._fd)
+
+
+def open_watcher(directories: list[str], interval: float = 0.25) -> Watcher:
+    """Watch python files within directories, with inotify if available."""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(directories)
+        except (OSError, AttributeError) as e:
+            log.debug("Inotify unavailable, polling instead: %s", e)
+
+    return PollingWatcher(directories, interval)
+
+
+def _module_files() -> dict[str, str]:
+    """Imported module names, keyed by their (absolute) source file path."""
+    files: dict[str, str] = {}
+    for name, module in list(sys.modules.items()):
+        if (path := getattr(module, "__file__", None)) is not None:
+            files[os.path.abspath(path)] = name
+
+    return files
+
+
+class WatchSession:
+    """Warm benchmark worker, re-importing changed modules of watched paths.
+
+    Args:
+        paths (list[str]): benchmark file or directory paths.
+        argv (list[str]): google benchmark command line arguments.
+
+    """
+
+    def __init__(self, paths: list[str], argv: list[str] | None = None) -> None:
+        self.paths: list[str] = [os.path.abspath(j) for j in paths]
+        self.argv: list[str] = argv or []
+        self.registrations: dict[str, list[Registration]] = {}
+
+    @property
+    def directories(self) -> list[str]:
+        """Watched directories."""
+        return sorted(
+            {j if os.path.isdir(j) else os.path.dirname(j) for j in self.paths}
+        )
+
+    def benchmark_files(self) -> dict[str, str]:
+        """Benchmark files, and their import root directory."""
+        files: dict[str, str] = {}
+        for path in self.paths:
+            if os.path.isdir(path):
+                files.update({os.path.abspath(j): path for j in collect(path)})
+            else:
+                files[path] = os.path.dirname(path)
+
+        return files
+
+    def _import(self, path: str, root: str) -> None:
+        with record_registrations() as recorded:
+            try:
+                load_benchmark(path, root)
+            except Exception as e:  # pylint: disable=W0718
+                log.error("Failed to import %s: %r", path, e)
+        self.registrations[path] = recorded
+
+    def reload(self, changed: set[str] | None = None) -> list[str]:
+        """Re-import changed (or all, if None) modules, returning affected benchmarks.
+
+        A changed helper module (imported, other than benchmark files) re-imports all
+        benchmark modules, which may hold references to it. Changed python files which
+        were never imported are ignored.
+
+        Args:
+            changed (set[str] | None): changed python file paths.
+
+        Returns:
+            (list[str]) names of benchmarks to rerun.
+
+        """
+        files: dict[str, str] = self.benchmark_files()
+        modules: dict[str, str] = _module_files()
+        targets: set[str] = set(files) if changed is None else changed & set(files)
+        helpers: set[str] = set()
+        if changed is not None:
+            helpers = {j for j in changed - set(files) if j in modules}
+        if helpers:
+            targets = set(files)
+        for path in helpers | targets:
+            if (name := modules.get(path)) is not None:
+                del sys.modules[name]
+        importlib.invalidate_caches()
+
+        for path in list(self.registrations):
+            if path not in files:
+                del self.registrations[path]
+        with no_bytecode():
+            for path in sorted(targets):
+                self._import(path, files[path])
+
+        return [j.name for path in sorted(targets) for j in self.registrations[path]]
+
+    def run(self, names: list[str]) -> list[BenchmarkArray] | None:
+        """Run benchmarks (by name) once, in a forked child process.
+
+        Args:
+            names (list[str]): names of benchmarks to run.
+
+        Returns:
+            (list[BenchmarkArray] | None) benchmark results, or None on failure.
+
+        """
+        selected: list[Registration] = [
+            j for v in self.registrations.values() for j in v if j.name in names
+        ]
+        if not selected:
+            return None
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output: str = os.path.join(tmpdir, "watch.json")
+            sys.stdout.flush()
+            sys.stderr.flush()
+            if (pid := os.fork()) == 0:  # pragma: no cover
+                status: int = 1
+                try:
+                    devnull: int = os.open(os.devnull, os.O_WRONLY)
+                    os.dup2(devnull, sys.stdout.fileno())
+                    replay(selected)
+                    gbench.main(
+                        [
+                            sys.argv[0],
+                            *(j for j in self.argv if "--benchmark_filter=" not in j),
+                            f"--benchmark_filter={benchmark_filter(names)}",
+                            f"--benchmark_out={output}",
+                            "--benchmark_out_format=json",
+                        ]
+                    )
+                    status = 0
+                finally:
+                    os._exit(status)  # pylint: disable=W0150,W0212
+
+            _, code = os.waitpid(pid, 0)
+            if os.waitstatus_to_exitcode(code) != 0 or not os.path.exists(output):
+                log.error(
+                    "Benchmark worker failed: %d", os.waitstatus_to_exitcode(code)
+                )
+                return None
+            try:
+                records: list[dict] = load(output)["benchmarks"]
+                return convert_to_arrays(
+                    get_benchmark_records(records), get_complexity_info(records)
+                )
+
+            except (KeyError, ValueError) as e:
+                log.error("Benchmark results are invalid: %r", e)
+                return None
+
+
+def _format_time(value: float, unit: str) -> str:
+    return f"{value:10.4g} {unit}"
+
+
+def diff_lines(
+    previous: dict[str, BenchmarkArray],
+    current: list[BenchmarkArray],
+    attribute: str = "cpu_time",
+    alpha: float = 0.05,
+    min_effect: float = 0.05,
+) -> list[str]:
+    """Format differences of benchmarks against their previous iteration.
+
+    Args:
+        previous (dict[str, BenchmarkArray]): previous iteration, keyed by function.
+        current (list[BenchmarkArray]): current iteration.
+        attribute (str): timing attribute ("cpu_time" | "real_time").
+        alpha (float): significance level of comparison test.
+        min_effect (float): minimum relative change of timing to report.
+
+    Returns:
+        (list[str]) lines of text, one per function and input size.
+
+    """
+    lines: list[str] = []
+    for bench in current:
+        new: np.ndarray = np.nanmean(getattr(bench, attribute), axis=1)
+        if (before := previous.get(bench.function)) is None:
+            lines.append(f"{bench.function}\tnew")
+            lines.extend(
+                f"  n={n:<10}{_format_time(t, bench.unit)}"
+                for n, t in zip(bench.size.tolist(), new.tolist(), strict=True)
+            )
+            continue
+
+        result = compare_arrays(before, bench, attribute, alpha, min_effect)
+        verdict: str = (
+            "regressed" if result.regressed else "improved" if result.improved else ""
+        )
+        lines.append(
+            f"{bench.function}\tx{result.ratio:.3f}\tp={result.pvalue:.3g}\t{verdict}"
+        )
+        old: dict[int, float] = dict(
+            zip(
+                before.size.tolist(),
+                np.nanmean(getattr(before, attribute), axis=1).tolist(),
+                strict=True,
+            )
+        )
+        for n, t in zip(bench.size.tolist(), new.tolist(), strict=True):
+            if (o := old.get(n)) is None:
+                lines.append(f"  n={n:<10}{_format_time(t, bench.unit)}")
+                continue
+            change: float = 100.0 * (t / o - 1.0) if o > 0 else np.nan
+            lines.append(
+                f"  n={n:<10}{_format_time(o, before.unit)} ->"
+                f"{_format_time(t, bench.unit)}  ({change:+.1f}%)"
+            )
+
+    return lines
+
+
+def watch(  # pylint: disable=R0913,R0917
+    session: WatchSession,
+    attribute: str = "cpu_time",
+    alpha: float = 0.05,
+    min_effect: float = 0.05,
+    interval: float = 0.25,
+    max_iterations: int | None = None,
+) -> None:
+    """Rerun benchmarks of changed files, writing differences to stdout.
+
+    Args:
+        session (WatchSession): warm benchmark worker.
+        attribute (str): timing attribute ("cpu_time" | "real_time").
+        alpha (float): significance level of comparison test.
+        min_effect (float): minimum relative change of timing to report.
+        interval (float): polling interval (seconds), without inotify.
+        max_iterations (int | None): stop after a number of iterations.
+
+    """
+    watcher: Watcher = open_watcher(session.directories, interval)
+    previous: dict[str, BenchmarkArray] = {}
+    names: list[str] = session.reload()
+    iteration: int = 0
+    try:
+        while True:
+            if (benchmarks := session.run(names)) is not None:
+                for line in diff_lines(
+                    previous, benchmarks, attribute, alpha, min_effect
+                ):
+                    sys.stdout.write(line + "\n")
+                sys.stdout.flush()
+                previous.update({j.function: j for j in benchmarks})
+            iteration += 1
+            if max_iterations is not None and iteration >= max_iterations:
+                break
+
+            names = []
+            while not names:
+                changed: set[str] = watcher.changes()
+                log.debug("Changed: %s", sorted(changed))
+                names = session.reload(changed)
+    except KeyboardInterrupt:
+        log.debug("Stopped watching.")
+    finally:
+        watcher.close()
@@ -0,0 +1,189 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Compact binary encoding of benchmark contexts, and message framing over sockets.
+
+A context is encoded as a json header of metadata (context, and per benchmark
+function, unit and complexity), followed by the raw (little endian) buffers of each
+benchmark array, compressed with zlib::
+
+    magic (4 bytes) | header length (uint32) | header (json) | array buffers
+
+Messages over a socket are framed by a kind (1 byte) and payload length (uint32).
+
+"""
+
+import socket
+import struct
+import zlib
+from typing import Any
+
+import numpy as np
+import orjson
+
+from .store import decode_complexity, decode_context
+from .structure import BenchmarkArray, BenchmarkContext
+
+
+_MAGIC: bytes = b"BMC1"
+_HEADER: struct.Struct = struct.Struct("!4sI")
+_FRAME: struct.Struct = struct.Struct("!cI")
+_ARRAYS: dict[str, str] = {
+    "size": "<i8",
+    "iterations": "<i8",
+    "real_time": "<f8",
+    "cpu_time": "<f8",
+    "threads": "<i8",
+    "status": "i1",
+}
+
+# Message kinds
+JSON: bytes = b"J"
+CONTEXT: bytes = b"C"
+
+
+def encode_context(context: BenchmarkContext) -> bytes:
+    """Encode a benchmark context in a compact binary form."""
+    record: dict[str, Any] = context.to_json()
+    record.pop("benchmarks")
+    benchmarks: list[dict[str, Any]] = []
+    buffers: list[bytes] = []
+    for bench in context.benchmarks:
+        shapes: dict[str, list[int]] = {}
+        for name, dtype in _ARRAYS.items():
+            array: np.ndarray = np.ascontiguousarray(getattr(bench, name), dtype=dtype)
+            shapes[name] = list(array.shape)
+            buffers.append(array.tobytes())
+        benchmarks.append(
+            {
+                "function": bench.function,
+                "unit": bench.unit,
+                "complexity": bench.complexity.to_json(),
+                "shapes": shapes,
+            }
+        )
+    header: bytes = orjson.dumps(
+        {"context": record, "benchmarks": benchmarks},
+        option=orjson.OPT_SERIALIZE_DATACLASS,
+    )
+
+    return zlib.compress(
+        _HEADER.pack(_MAGIC, len(header)) + header + b"".join(buffers), 1
+    )
+
+
+def decode_context_bytes(data: bytes) -> BenchmarkContext:
+    """Decode a benchmark context from its compact binary form.
+
+    Raises:
+        ValueError: data is not an encoded benchmark context.
+
+    """
+    try:
+        raw: bytes = zlib.decompress(data)
+    except zlib.error as e:
+        raise ValueError("Invalid encoded benchmark context.") from e
+    if len(raw) < _HEADER.size:
+        raise ValueError("Invalid encoded benchmark context.")
+    magic, length = _HEADER.unpack_from(raw)
+    if magic != _MAGIC:
+        raise ValueError(f"Invalid encoded benchmark context: {magic!r}")
+
+    offset: int = _HEADER.size + length
+    header: dict[str, Any] = orjson.loads(raw[_HEADER.size : offset])
+    benchmarks: list[BenchmarkArray] = []
+    for record in header["benchmarks"]:
+        arrays: dict[str, np.ndarray] = {}
+        for name, dtype in _ARRAYS.items():
+            shape: tuple[int, ...] = tuple(record["shapes"][name])
+            count: int = int(np.prod(shape))
+            arrays[name] = np.frombuffer(
+                raw, dtype=dtype, count=count, offset=offset
+            ).reshape(shape)
+            offset += count * np.dtype(dtype).itemsize
+        benchmarks.append(
+            BenchmarkArray(
+                function=record["function"],
+                unit=record["unit"],
+                complexity=decode_complexity(record["complexity"]),
+                **{k: v.astype(v.dtype.newbyteorder("=")) for k, v in arrays.items()},
+            )
+        )
+
+    return decode_context(header["context"], benchmarks)
+
+
+def _receive(connection: socket.socket, size: int) -> bytes:
+    """Receive exactly size bytes."""
+    chunks: list[bytes] = []
+    while size > 0:
+        chunk: bytes = connection.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError("Connection closed by peer.")
+        chunks.append(chunk)
+        size -= len(chunk)
+
+    return b"".join(chunks)
+
+
+def send(connection: socket.socket, kind: bytes, payload: bytes) -> None:
+    """Send a framed message."""
+    connection.sendall(_FRAME.pack(kind, len(payload)) + payload)
+
+
+def receive(connection: socket.socket) -> tuple[bytes, bytes]:
+    """Receive a framed message, returning its kind and payload.
+
+    Raises:
+        ConnectionError: connection closed by peer.
+
+    """
+    kind, length = _FRAME.unpack(_receive(connection, _FRAME.size))
+
+    return kind, _receive(connection, length)
+
+
+def send_json(connection: socket.socket, message: dict[str, Any]) -> None:
+    """Send a (json) control message."""
+    send(connection, JSON, orjson.dumps(message))
+
+
+def receive_json(connection: socket.socket) -> dict[str, Any]:
+    """Receive a (json) control message.
+
+    Raises:
+        ConnectionError: connection closed by peer.
+        ValueError: unexpected kind of message.
+
+    """
+    kind, payload = receive(connection)
+    if kind != JSON:
+        raise ValueError(f"Expected json message, not: {kind!r}")
+
+    return orjson.loads(payload)
@@ -0,0 +1,206 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Benchmark (subprocess) worker, shared by commands running benchmarks.
+
+Google benchmark runs at most once per process, hence benchmarks are registered and
+run in a subprocess (``python -m BenchMatcha.worker``), writing raw json output.
+Commands overriding registration (e.g. adaptive input sizes, scheduled runs) reuse
+the parser, registration and run helpers within their own entry points.
+
+"""
+
+import argparse
+import contextlib
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+from collections.abc import Sequence
+from contextlib import AbstractContextManager
+
+import google_benchmark as gbench
+
+from .sifter import manage_registration, select_registration
+
+
+log: logging.Logger = logging.getLogger(__name__)
+
+
+def environment(path: str) -> dict[str, str]:
+    """Environment importing python sources of a worktree before installed ones."""
+    roots: list[str] = [path]
+    if os.path.isdir(src := os.path.join(path, "src")):
+        roots.insert(0, src)
+    env: dict[str, str] = os.environ.copy()
+    env["PYTHONPATH"] = os.pathsep.join([*roots, env.get("PYTHONPATH", "")]).rstrip(
+        os.pathsep
+    )
+
+    return env
+
+
+def parser(prog: str) -> argparse.ArgumentParser:
+    """Argument parser of a worker entry point, with output, path and gbench args."""
+    args = argparse.ArgumentParser(prog)
+    args.add_argument("--output", required=True, help="json output path.")
+    args.add_argument("--path", action="extend", nargs="+", required=True)
+    args.add_argument("others", nargs=argparse.REMAINDER)
+
+    return args
+
+
+def register(paths: Sequence[str], *contexts: AbstractContextManager) -> None:
+    """Register benchmarks of paths, within (registration hook) contexts."""
+    with contextlib.ExitStack() as stack:
+        for context in contexts:
+            stack.enter_context(context)
+        for path in paths:
+            manage_registration(path)
+
+
+def run_benchmarks(output: str, argv: Sequence[str]) -> None:
+    """Run registered benchmarks with google benchmark args, writing json output."""
+    gbench.main(
+        [
+            sys.argv[0],
+            *(j for j in argv if j != "--"),
+            f"--benchmark_out={output}",
+            "--benchmark_out_format=json",
+        ]
+    )
+
+
+def command(
+    output: str,
+    paths: Sequence[str],
+    argv: Sequence[str],
+    functions: Sequence[str] = (),
+) -> list[str]:
+    """Command line of a worker subprocess, running (selected) benchmarks of paths."""
+    args: list[str] = [sys.executable, "-m", __name__, "--output", output]
+    if functions:
+        args.extend(["--function", *functions])
+
+    return [*args, "--path", *paths, "--", *argv]
+
+
+def run_worker(
+    path: str,
+    paths: list[str],
+    functions: list[str],
+    argv: list[str],
+    output: str,
+    timeout: float | None = None,
+) -> bool:
+    """Run benchmarks of a worktree in a subprocess, writing raw json output.
+
+    Args:
+        path (str): path location of worktree.
+        paths (list[str]): benchmark paths, relative to worktree root.
+        functions (list[str]): benchmark function names to run (all if empty).
+        argv (list[str]): additional google benchmark arguments.
+        output (str): json output path.
+        timeout (float | None): maximum seconds to benchmark.
+
+    Returns:
+        (bool) benchmarks completed successfully.
+
+    Raises:
+        subprocess.TimeoutExpired: benchmarks exceeded timeout.
+
+    """
+    response = subprocess.run(
+        command(output, [os.path.join(path, j) for j in paths], argv, functions),
+        cwd=path,
+        env=environment(path),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        timeout=timeout,
+        check=False,
+    )
+    if response.returncode != 0 or not os.path.exists(output):
+        log.error("Benchmark of %s failed: %s", path, response.stderr.decode())
+        return False
+
+    return True
+
+
+def list_functions(paths: list[str], argv: list[str]) -> list[str]:
+    """Names of benchmark functions selected by google benchmark arguments.
+
+    Benchmarks are listed by a subprocess, such that a user defined filter (e.g.
+    ``--benchmark_filter=``) selects benchmarks exactly as google benchmark does.
+
+    Raises:
+        subprocess.CalledProcessError: benchmarks failed to register.
+
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        response = subprocess.run(
+            command(
+                os.path.join(tmpdir, "list.json"),
+                paths,
+                [*argv, "--benchmark_list_tests=true"],
+            ),
+            capture_output=True,
+            check=True,
+        )
+
+    # NOTE: listed per input size, e.g. "bench_sort/8/repeats:3"
+    names: dict[str, None] = {
+        j.split("/")[0]: None for j in response.stdout.decode().split()
+    }
+
+    return list(names)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Benchmark (subprocess) entry point, running selected benchmark functions."""
+    args = parser("python -m BenchMatcha.worker")
+    args.add_argument(
+        "--function",
+        action="extend",
+        nargs="+",
+        default=[],
+        help="benchmark function name(s). Defaults to all.",
+    )
+    known = args.parse_args(argv)
+
+    # NOTE: only selected functions are registered, retaining any user filter
+    contexts: list[AbstractContextManager] = []
+    if known.function:
+        contexts.append(select_registration(known.function))
+    register(known.path, *contexts)
+    run_benchmarks(known.output, known.others)
+
+
+if __name__ == "__main__":
+    main()
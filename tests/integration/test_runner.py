@@ -30,10 +30,18 @@
 """Integration test suite for cli runner entry point."""
 
 import os
+import socket
+import subprocess
+import tempfile
 from collections.abc import Callable
 
+import numpy as np
+import orjson
 import pytest
 
+from BenchMatcha.store import open_store
+from BenchMatcha.structure import Status
+
 
 HERE: str = os.path.abspath(os.path.dirname(__file__))
 DATA: str = os.path.join(HERE, "data")
@@ -46,11 +54,12 @@ def _assert_cache_created(cache: str, status: int) -> None:
         "expected figures to be generated."
     )
 
-    # NOTE: this output is temporary.
-    assert os.path.exists(os.path.join(cache, "benchmark.json")), (
+    assert os.path.exists(os.path.join(cache, "benchmark.db")), (
         "expected data to be saved."
     )
     assert status == 0, "Expected no errors."
+    with open(os.path.join(cache, "divergence.json"), "rb") as f:
+        assert orjson.loads(f.read()) == [], "Expected no divergence of a single run."
 
 
 @pytest.mark.parametrize(
@@ -93,6 +102,45 @@ def test_json_key_val(
     _assert_cache_created(cache, status)
 
 
+def test_no_report(
+    benchmark: Callable[[list[str]], tuple[int, str, str, str]],
+) -> None:
+    """Confirm results are stored without rendering an html report."""
+    path: str = os.path.join(DATA, "single")
+    status, _, error, tmpath = benchmark(["--no-report", "--path", path])
+    assert status == 0, error
+
+    cache: str = os.path.join(tmpath, ".benchmatcha")
+    assert not os.path.exists(os.path.join(cache, "out.html"))
+    with open_store(cache) as store:
+        assert len(store.runs()) == 1
+
+
+@pytest.mark.parametrize("mode", [[], ["--checkpoint"]])
+def test_sample_noise(
+    benchmark: Callable[[list[str]], tuple[int, str, str, str]],
+    mode: list[str],
+) -> None:
+    """Confirm system noise is sampled throughout, and stored alongside the run."""
+    path: str = os.path.join(DATA, "single")
+    status, _, error, tmpath = benchmark(
+        [*mode, "--no-report", "--sample-noise", "--noise-interval", "0.01"]
+        + ["--path", path, "--benchmark_min_time=0.05s"]
+    )
+    assert status == 0, error
+
+    with open_store(os.path.join(tmpath, ".benchmatcha")) as store:
+        (run,) = store.runs()
+        functions = [j.function for j in store.load(run.run_id).benchmarks]
+        profile = store.noise(run.run_id)
+    assert profile is not None, "Expected stored noise samples."
+    assert sorted(profile.intervals) == sorted(functions)
+    timestamp = profile.column("timestamp")
+    assert (np.diff(timestamp) > 0).all(), "Expected increasing timestamps."
+    for start, end in profile.intervals.values():
+        assert timestamp[0] <= start <= end <= timestamp[-1], "Expected aligned."
+
+
 def _setup_pyproject(x: str) -> None:
     p: str = os.path.join(x, "pyproject.toml")
     with open(p, "w") as f:
@@ -148,6 +196,9 @@ def test_previous_db(
 
     cache: str = os.path.join(tmpath, ".benchmatcha")
     _assert_cache_created(cache, status)
+    assert os.path.exists(os.path.join(cache, "benchmark.json.migrated")), (
+        "expected legacy database to be migrated."
+    )
 
 
 @pytest.mark.parametrize(
@@ -156,6 +207,7 @@ def test_previous_db(
         ("--color", "red"),
         ("--line-color", "black"),
         ("--x-axis", "2"),
+        ("--jobs", "2"),
         ("--verbose", None),
     ],
 )
@@ -176,3 +228,597 @@ def test_config_parameters(
 
     if param == "--verbose":
         assert "DEBUG" in error, "Expected debug logging in stderr."
+
+
+@pytest.mark.parametrize(
+    ["args"],
+    [
+        ([],),
+        (["--function", "bench_multiply", "--max-points", "2"],),
+        (["--host", "unknown-host"],),
+        (["--min-date", "2000-01-01", "--max-date", "2999-12-31"],),
+        (["--metric", "ns_per_element"],),
+        (["--divergence"],),
+    ],
+)
+def test_plot_history(
+    args: list[str],
+    benchmark: Callable[[list[str]], tuple[int, str, str, str]],
+) -> None:
+    """Plot benchmark history from the result store."""
+    path: str = os.path.join(DATA, "single")
+    for _ in range(2):
+        status, out, error, tmpath = benchmark(["--path", path])
+        assert status == 0, "Expected no errors."
+
+    response = subprocess.run(
+        ["benchmatcha", "plot", *args],
+        capture_output=True,
+        check=False,
+        cwd=tmpath,
+        env=os.environ,
+    )
+    assert response.returncode == 0, response.stderr.decode()
+
+    output: str = os.path.join(tmpath, ".benchmatcha", "history.html")
+    assert os.path.exists(output), "Expected history figures to be generated."
+    with open(output) as f:
+        data: str = f.read()
+    expected: int = 0 if "--host" in args else 1 + ("--divergence" in args)
+    assert data.count("Plotly.newPlot") == expected, "Unexpected number of figures."
+
+
+@pytest.mark.parametrize(
+    ["args", "status"],
+    [
+        (["--function", "bench_multiply", "unknown"], 0),
+        (["--function", "bench_multiply", "--real-time"], 0),
+        (["--function", "unknown"], 1),
+    ],
+)
+def test_compare(
+    args: list[str],
+    status: int,
+    benchmark: Callable[[list[str]], tuple[int, str, str, str]],
+) -> None:
+    """Compare stored benchmarks on one figure."""
+    path: str = os.path.join(DATA, "single")
+    code, out, error, tmpath = benchmark(["--path", path])
+    assert code == 0, "Expected no errors."
+
+    response = subprocess.run(
+        ["benchmatcha", "compare", *args],
+        capture_output=True,
+        check=False,
+        cwd=tmpath,
+        env=os.environ,
+    )
+    assert response.returncode == status, response.stderr.decode()
+
+    output: str = os.path.join(tmpath, ".benchmatcha", "compare.html")
+    assert os.path.exists(output) == (status == 0), "Unexpected comparison output."
+
+
+def test_adaptive(
+    benchmark: Callable[[list[str]], tuple[int, str, str, str]],
+) -> None:
+    """Adaptively benchmark additional input sizes in a subprocess."""
+    path: str = os.path.join(DATA, "single")
+    status, _, error, tmpath = benchmark(
+        ["--path", path, "--adaptive", "--adaptive-confidence", "1.01", "-v"]
+    )
+    assert status == 0, error
+
+    with open_store(os.path.join(tmpath, ".benchmatcha")) as store:
+        ((_, bench),) = list(store.history())
+    assert bench.size.size > 3, "Expected additional input sizes."
+
+
+def test_changepoints(
+    benchmark: Callable[[list[str]], tuple[int, str, str, str]],
+) -> None:
+    """Detect change points across stored benchmark history."""
+    path: str = os.path.join(DATA, "single")
+    for _ in range(2):
+        status, _, error, tmpath = benchmark(["--path", path])
+        assert status == 0, error
+
+    response = subprocess.run(
+        ["benchmatcha", "changepoints", "-j", "1"],
+        capture_output=True,
+        check=False,
+        cwd=tmpath,
+        env=os.environ,
+    )
+    assert response.returncode == 0, response.stderr.decode()
+
+    output: str = os.path.join(tmpath, ".benchmatcha", "changepoints.json")
+    with open(output, "rb") as f:
+        assert isinstance(orjson.loads(f.read()), list), "Expected change points."
+
+
+_BISECT_BENCH: str = """
+import google_benchmark as gbench
+
+from work import work
+
+
+@gbench.register
+@gbench.option.repetitions(3)
+@gbench.option.range_multiplier(2)
+@gbench.option.range(2, 8)
+@gbench.option.complexity(gbench.oAuto)
+def bench_work(state: gbench.State) -> None:
+    while state:
+        work(state.range(0))
+    state.complexity_n = state.range(0)
+"""
+
+
+def _commit(repo: str, cost: int, message: str) -> str:
+    with open(os.path.join(repo, "work.py"), "w") as f:
+        f.write(f"# {message}\ndef work(n):\n    return sum(range(n * {cost}))\n")
+    subprocess.run(["git", "add", "-A"], cwd=repo, check=True)
+    subprocess.run(
+        ["git", "-c", "user.name=a", "-c", "user.email=a@b", "commit", "-qm", message],
+        cwd=repo,
+        check=True,
+    )
+
+    return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=repo, text=True)
+
+
+def test_bisect(tmp_path) -> None:
+    """Bisect the first revision where a benchmark regressed, caching results."""
+    repo: str = str(tmp_path)
+    subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+    with open(os.path.join(repo, "bench_work.py"), "w") as f:
+        f.write(_BISECT_BENCH)
+    shas: list[str] = [
+        _commit(repo, cost, str(j)).strip()
+        for j, cost in enumerate((10, 10, 10, 400, 400))
+    ]
+    command: list[str] = [
+        "benchmatcha",
+        "bisect",
+        "--good",
+        shas[0],
+        "--bad",
+        shas[-1],
+        "--function",
+        "bench_work",
+        "--path",
+        "bench_work.py",
+        "--cache",
+        os.path.join(repo, ".benchmatcha"),
+        "--benchmark_min_time=0.01s",
+        "--min-effect",
+        "0.5",
+        "-v",
+    ]
+    os.makedirs(os.path.join(repo, ".benchmatcha"))
+
+    for _ in range(2):
+        response = subprocess.run(
+            command, capture_output=True, check=False, cwd=repo, env=os.environ
+        )
+        assert response.returncode == 0, response.stderr.decode()
+        assert response.stdout.decode().split()[0] == shas[3], response.stderr.decode()
+        cached = os.listdir(os.path.join(repo, ".benchmatcha", "bisect"))
+        assert len(cached) == 4, "Expected raw results cached per tested sha."
+
+
+def test_bisect_unknown_revision(tmp_path) -> None:
+    """Report an unknown revision as an error, rather than a traceback."""
+    repo: str = str(tmp_path)
+    subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+    with open(os.path.join(repo, "bench_work.py"), "w") as f:
+        f.write(_BISECT_BENCH)
+    sha: str = _commit(repo, 10, "0").strip()
+    response = subprocess.run(
+        [
+            "benchmatcha",
+            "bisect",
+            "--good",
+            "0" * 40,
+            "--bad",
+            sha,
+            "--function",
+            "bench_work",
+            "--path",
+            "bench_work.py",
+        ],
+        capture_output=True,
+        check=False,
+        cwd=repo,
+        env=os.environ,
+    )
+    assert response.returncode == 1
+    assert "Traceback" not in response.stderr.decode(), response.stderr.decode()
+
+
+def test_ab(tmp_path) -> None:
+    """Compare two revisions with interleaved benchmark runs."""
+    repo: str = str(tmp_path)
+    subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+    with open(os.path.join(repo, "bench_work.py"), "w") as f:
+        f.write(_BISECT_BENCH)
+    shas: list[str] = [_commit(repo, cost, str(cost)).strip() for cost in (10, 40)]
+    os.makedirs(os.path.join(repo, ".benchmatcha"))
+    command: list[str] = [
+        "benchmatcha",
+        "ab",
+        "--baseline",
+        shas[0],
+        "--candidate",
+        shas[1],
+        "--path",
+        "bench_work.py",
+        "--rounds",
+        "4",
+        "--cache",
+        os.path.join(repo, ".benchmatcha"),
+        "--benchmark_min_time=0.01s",
+    ]
+    response = subprocess.run(
+        command, capture_output=True, check=False, cwd=repo, env=os.environ
+    )
+    assert response.returncode == 0, response.stderr.decode()
+    function, _, _, verdict = response.stdout.decode().strip().split("\t")
+    assert function == "bench_work"
+    assert verdict == "regressed"
+
+    with open(os.path.join(repo, ".benchmatcha", "ab.json"), "rb") as f:
+        result = orjson.loads(f.read())
+    assert result["rounds"] == 4
+    assert result["baseline"] == shas[0]
+    assert result["comparisons"]["bench_work"]["sizes"] == 3
+
+
+def test_precision(
+    benchmark: Callable[[list[str]], tuple[int, str, str, str]],
+) -> None:
+    """Adaptively rerun input sizes in a subprocess, until precise enough."""
+    path: str = os.path.join(DATA, "single")
+    status, _, error, tmpath = benchmark(
+        [
+            "--path",
+            path,
+            "--precision",
+            "1e-9",
+            "--precision-max-repetitions",
+            "4",
+            "--benchmark_min_time=0.01s",
+            "-v",
+        ]
+    )
+    assert status == 0, error
+
+    with open_store(os.path.join(tmpath, ".benchmatcha")) as store:
+        ((_, bench),) = list(store.history())
+    assert bench.real_time.shape[1] == 4, "Expected additional repetitions."
+    assert (np.sum(~np.isnan(bench.real_time), axis=1) >= 3).all()
+
+
+def test_time_budget(
+    benchmark: Callable[[list[str]], tuple[int, str, str, str]],
+) -> None:
+    """Schedule benchmarks in subprocesses within a time budget, using history."""
+    path: str = os.path.join(DATA, "handle_imports")
+    for _ in range(2):
+        status, _, error, tmpath = benchmark(
+            ["--path", path, "--time-budget", "120", "-v"]
+        )
+        assert status == 0, error
+
+    with open_store(os.path.join(tmpath, ".benchmatcha")) as store:
+        entries = store.entries()
+    assert len(entries) == 2, "Expected benchmark stored from each run."
+    assert "min_time=0.5" in error, "Expected schedule from historical cost."
+
+
+_CRASH_BENCH: str = """
+import os
+
+import google_benchmark as gbench
+
+
+@gbench.register
+@gbench.option.repetitions(2)
+@gbench.option.range_multiplier(2)
+@gbench.option.range(2, 8)
+@gbench.option.complexity(gbench.oAuto)
+def bench_fine(state: gbench.State) -> None:
+    while state:
+        sum(range(state.range(0)))
+    state.complexity_n = state.range(0)
+
+
+@gbench.register
+@gbench.option.range(2, 8)
+def bench_crash(state: gbench.State) -> None:
+    os.abort()
+"""
+
+
+def test_checkpoint(
+    benchmark: Callable[..., tuple[int, str, str, str]],
+) -> None:
+    """Store completed benchmarks, despite a crash, and resume skipping them."""
+
+    def setup(cursor: str) -> None:
+        with open(os.path.join(cursor, "bench_crash.py"), "w") as f:
+            f.write(_CRASH_BENCH)
+
+    args: list[str] = ["--path", "bench_crash.py", "--run-id", "resumable", "-v"]
+    status, _, error, tmpath = benchmark(["--checkpoint", *args], setup)
+    assert status == 0, error
+    assert "Benchmark bench_crash failed" in error
+
+    status, _, error, tmpath = benchmark(["--resume", *args])
+    assert status == 0, error
+    assert "Skipping completed benchmarks of run resumable" in error
+
+    cache: str = os.path.join(tmpath, ".benchmatcha")
+    with open_store(cache) as store:
+        assert store.completed("resumable") == ["bench_fine"]
+        assert len(store.runs()) == 1
+    assert not os.path.exists(os.path.join(cache, "checkpoint.json"))
+
+
+_LIMITS_BENCH: str = """
+import time
+
+import google_benchmark as gbench
+
+
+@gbench.register
+@gbench.option.repetitions(2)
+@gbench.option.range_multiplier(2)
+@gbench.option.range(2, 8)
+@gbench.option.complexity(gbench.oAuto)
+def bench_hang(state: gbench.State) -> None:
+    while state:
+        if state.range(0) == 8:
+            time.sleep(60)
+        sum(range(state.range(0)))
+    state.complexity_n = state.range(0)
+
+
+@gbench.register
+@gbench.option.repetitions(2)
+@gbench.option.range_multiplier(2)
+@gbench.option.range(2, 8)
+@gbench.option.complexity(gbench.oAuto)
+def bench_memory(state: gbench.State) -> None:
+    while state:
+        if state.range(0) == 8:
+            bytearray(1 << 34)
+        sum(range(state.range(0)))
+    state.complexity_n = state.range(0)
+"""
+
+
+def test_limits(
+    benchmark: Callable[..., tuple[int, str, str, str]],
+) -> None:
+    """Record runs exceeding resource limits, continuing with remaining ones."""
+
+    def setup(cursor: str) -> None:
+        with open(os.path.join(cursor, "bench_limits.py"), "w") as f:
+            f.write(_LIMITS_BENCH)
+
+    args: list[str] = ["--path", "bench_limits.py", "--run-timeout", "0.5"]
+    status, _, error, tmpath = benchmark(
+        [*args, "--memory-limit", "1G", "--no-report"], setup
+    )
+    assert status == 0, error
+    assert "Benchmark bench_hang timed out at sizes: [8]" in error
+    assert "Benchmark bench_memory out of memory at sizes: [8]" in error
+
+    with open_store(os.path.join(tmpath, ".benchmatcha")) as store:
+        (run,) = store.runs()
+        benchmarks = {j.function: j for j in store.load(run.run_id).benchmarks}
+    for function, expected in (
+        ("bench_hang", Status.TIMED_OUT),
+        ("bench_memory", Status.OUT_OF_MEMORY),
+    ):
+        bench = benchmarks[function]
+        assert bench.size.tolist() == [2, 4, 8]
+        assert (bench.status[-1] == expected).all(), function
+        assert bench.valid[:-1].all(), f"Expected valid smaller sizes of {function}"
+
+
+_STUCK_BENCH: str = """
+import google_benchmark as gbench
+
+
+@gbench.register
+@gbench.option.repetitions(2)
+@gbench.option.range_multiplier(2)
+@gbench.option.range(2, 8)
+@gbench.option.complexity(gbench.oAuto)
+def bench_stuck(state: gbench.State) -> None:
+    while state:
+        # NOTE: a single (long) call into C, which signals do not interrupt.
+        sum(range(1 << 40 if state.range(0) == 8 else state.range(0)))
+    state.complexity_n = state.range(0)
+"""
+
+
+def test_limits_backstop(
+    benchmark: Callable[..., tuple[int, str, str, str]],
+) -> None:
+    """Kill runs stuck beyond their timeout, recording them as timed out."""
+
+    def setup(cursor: str) -> None:
+        with open(os.path.join(cursor, "bench_stuck.py"), "w") as f:
+            f.write(_STUCK_BENCH)
+
+    args: list[str] = ["--path", "bench_stuck.py", "--run-timeout", "0.2"]
+    status, _, error, tmpath = benchmark([*args, "--no-report"], setup)
+    assert status == 0, error
+    assert "Benchmark bench_stuck stuck in bench_stuck/8" in error
+    assert "Benchmark bench_stuck timed out at sizes: [8]" in error
+
+    with open_store(os.path.join(tmpath, ".benchmatcha")) as store:
+        (run,) = store.runs()
+        (bench,) = store.load(run.run_id).benchmarks
+    assert bench.size.tolist() == [2, 4, 8]
+    assert (bench.status[-1] == Status.TIMED_OUT).all()
+    assert bench.valid[:-1].all(), "Expected valid smaller sizes."
+
+
+_FILTER_BENCH: str = """
+import google_benchmark as gbench
+
+
+@gbench.register
+@gbench.option.repetitions(2)
+@gbench.option.range_multiplier(2)
+@gbench.option.range(2, 8)
+@gbench.option.complexity(gbench.oAuto)
+def keep_me(state: gbench.State) -> None:
+    while state:
+        sum(range(state.range(0)))
+    state.complexity_n = state.range(0)
+
+
+@gbench.register
+@gbench.option.repetitions(2)
+@gbench.option.range_multiplier(2)
+@gbench.option.range(2, 8)
+@gbench.option.complexity(gbench.oAuto)
+def drop_me(state: gbench.State) -> None:
+    while state:
+        sum(range(state.range(0)))
+    state.complexity_n = state.range(0)
+"""
+
+
+@pytest.mark.parametrize("mode", [[], ["--checkpoint"], ["--run-timeout", "10"]])
+def test_benchmark_filter(
+    benchmark: Callable[..., tuple[int, str, str, str]],
+    mode: list[str],
+) -> None:
+    """Only benchmarks matching a user filter run, in process or in subprocesses."""
+
+    def setup(cursor: str) -> None:
+        with open(os.path.join(cursor, "bench_filter.py"), "w") as f:
+            f.write(_FILTER_BENCH)
+
+    status, _, error, tmpath = benchmark(
+        [*mode, "--no-report", "--path", "bench_filter.py"]
+        + ["--benchmark_filter=keep_me"],
+        setup,
+    )
+    assert status == 0, error
+
+    with open_store(os.path.join(tmpath, ".benchmatcha")) as store:
+        (run,) = store.runs()
+        assert store.completed(run.run_id) == ["keep_me"]
+
+
+def test_watch(tmp_path) -> None:
+    """Rerun benchmarks affected by a changed helper module, reporting the diff."""
+    root: str = str(tmp_path)
+    with open(os.path.join(root, "bench_work.py"), "w") as f:
+        f.write(_BISECT_BENCH)
+    with open(os.path.join(root, "work.py"), "w") as f:
+        f.write("def work(n):\n    return sum(range(n * 10))\n")
+
+    command: list[str] = [
+        "benchmatcha",
+        "watch",
+        "--path",
+        "bench_work.py",
+        "--max-iterations",
+        "2",
+        "--benchmark_min_time=0.01s",
+    ]
+    with subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=root,
+        env=os.environ,
+    ) as process:
+        assert process.stdout is not None
+        first: str = process.stdout.readline().decode()
+        assert first.strip() == "bench_work\tnew"
+        with open(os.path.join(root, "work.py"), "w") as f:
+            f.write("def work(n):\n    return sum(range(n * 40))\n")
+        output, error = process.communicate(timeout=60)
+
+    assert process.returncode == 0, error.decode()
+    lines: list[str] = output.decode().splitlines()
+    header: list[str] = [j for j in lines if j.startswith("bench_work\tx")]
+    assert len(header) == 1, output.decode()
+    assert header[0].endswith("regressed")
+
+
+_DISTRIBUTED_BENCH: str = (
+    _CRASH_BENCH
+    + """
+
+@gbench.register
+@gbench.option.repetitions(2)
+@gbench.option.range_multiplier(2)
+@gbench.option.range(2, 8)
+@gbench.option.complexity(gbench.oAuto)
+def bench_other(state: gbench.State) -> None:
+    while state:
+        sorted(range(state.range(0)))
+    state.complexity_n = state.range(0)
+"""
+)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_distributed() -> None:
+    """Hand out benchmarks to several local workers, storing results per host."""
+    # NOTE: within the git repository, as workers describe its revision
+    with tempfile.TemporaryDirectory(dir=HERE) as root:
+        with open(os.path.join(root, "bench_dist.py"), "w") as f:
+            f.write(_DISTRIBUTED_BENCH)
+        address: str = f"127.0.0.1:{_free_port()}"
+        host, port = address.split(":")
+        with open(os.path.join(root, "workers.log"), "w") as log:
+            workers = [
+                subprocess.Popen(
+                    ["benchmatcha", "worker", "--connect", address, "--host", name],
+                    stderr=log,
+                    cwd=root,
+                    env=os.environ,
+                )
+                for name in ("host-a", "host-b")
+            ]
+            response = subprocess.run(
+                ["benchmatcha", "coordinator", "--path", "bench_dist.py"]
+                + ["--bind", host, "--port", port, "--benchmark_dry_run"],
+                capture_output=True,
+                check=False,
+                cwd=root,
+                env=os.environ,
+                timeout=120,
+            )
+            codes: list[int] = [j.wait(timeout=30) for j in workers]
+        error: str = response.stderr.decode()
+        assert response.returncode == 0, error
+        assert codes == [0, 0], open(os.path.join(root, "workers.log")).read()
+        assert "Failed shards: [['bench_crash']]" in error
+
+        with open_store(os.path.join(root, ".benchmatcha")) as store:
+            runs = store.runs()
+            completed: list[str] = [j for r in runs for j in store.completed(r.run_id)]
+            assert sorted(completed) == ["bench_fine", "bench_other"]
+            assert {j.host_name for j in runs} <= {"host-a", "host-b"}
+            for r in runs:
+                context = store.load(r.run_id)
+                assert context.host_name == r.host_name
+                assert context.caches and context.num_cpus > 0
@@ -0,0 +1,244 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Test adaptive input size selection module."""
+
+from collections.abc import Mapping, Sequence
+
+import google_benchmark as gbench
+import numpy as np
+import pytest
+
+from BenchMatcha import adaptive
+from BenchMatcha import complexity as comp
+from BenchMatcha.handlers import load
+from BenchMatcha.structure import (
+    BenchmarkArray,
+    BenchmarkContext,
+    ComplexityInfo,
+    parse_version,
+)
+
+
+def _benchmark(size: np.ndarray, time: np.ndarray) -> BenchmarkArray:
+    return BenchmarkArray(
+        function="test",
+        unit="ns",
+        size=size,
+        iterations=np.ones(time.shape, dtype=np.int64),
+        real_time=time,
+        cpu_time=time.copy(),
+        complexity=ComplexityInfo("test", "N", 1.0, 1.0),
+    )
+
+
+@pytest.fixture
+def ambiguous() -> BenchmarkArray:
+    """Noisy O(NlogN) benchmark, over a narrow range of small input sizes."""
+    rng = np.random.default_rng(0)
+    size = np.asarray([8, 16, 32])
+    time = (5.0 * size * np.log2(size))[:, None] * rng.lognormal(0, 0.05, (3, 3))
+
+    return _benchmark(size, time)
+
+
+@pytest.fixture
+def options() -> adaptive.AdaptiveOptions:
+    """Adaptive options."""
+    return adaptive.AdaptiveOptions(paths=[], budget=10.0)
+
+
+def test_model_weights() -> None:
+    """Confirm weights favor lower criterion, and sum to one."""
+    fits = [
+        comp.FitResult("oN", np.ones(2), np.ones(2), 0.1, aic=0.0, bic=0.0),
+        comp.FitResult("oNLogN", np.ones(2), np.ones(2), 0.2, aic=2.0, bic=2.0),
+        comp.FitResult("oNCubed", np.ones(4), np.ones(4), 0.3, np.inf, np.inf),
+    ]
+    result = adaptive.model_weights(fits, "bic")
+
+    assert np.isclose(result.sum(), 1.0), "Expected normalized weights."
+    assert np.isclose(result[0] / result[1], np.e), "Expected relative likelihood."
+    assert result[2] == 0.0, "Expected no weight without a defined criterion."
+    assert np.array_equal(adaptive.model_weights(fits, "rms"), [1.0, 0.0, 0.0])
+
+
+def test_candidate_sizes() -> None:
+    """Confirm candidates extend beyond, and exclude, measured sizes."""
+    measured = np.asarray([8, 16, 32])
+    result = adaptive.candidate_sizes(measured, 4.0)
+
+    assert result.max() == 128, "Expected extended upper bound."
+    assert result.min() > 8, "Expected lower bound to be measured."
+    assert not np.isin(measured, result).any(), "Expected unmeasured sizes."
+    assert np.all(np.diff(result) > 0), "Expected sorted unique sizes."
+
+
+def test_discriminating_sizes(
+    ambiguous: BenchmarkArray,
+    options: adaptive.AdaptiveOptions,
+) -> None:
+    """Confirm selected sizes maximize separation of two leading fits."""
+    linear = comp.FitResult("oN", np.asarray([1.0, 0.0]), np.zeros(2), 0.0)
+    constant = comp.FitResult("o1", np.asarray([8.0]), np.zeros(1), 0.0)
+    result = adaptive.discriminating_sizes(ambiguous, [linear, constant], options)
+
+    assert result.size == options.sizes_per_round, "Expected sizes per round."
+    assert np.array_equal(result, [108, 128]), "Expected largest separation."
+
+
+def test_next_sizes(
+    ambiguous: BenchmarkArray,
+    options: adaptive.AdaptiveOptions,
+) -> None:
+    """Confirm additional sizes are requested only while selection is ambiguous."""
+    result = adaptive.next_sizes(ambiguous, options)
+    assert result is not None, "Expected additional sizes."
+    assert result.size == 2, "Expected two additional sizes."
+
+    options.confidence = 0.0
+    assert adaptive.next_sizes(ambiguous, options) is None, "Expected settled."
+
+
+def test_merge() -> None:
+    """Confirm input sizes are merged in order, padding repetitions."""
+    a = _benchmark(np.asarray([2, 8]), np.asarray([[1.0, 1.1], [3.0, 3.1]]))
+    b = _benchmark(np.asarray([4]), np.asarray([[2.0]]))
+    result = adaptive.merge(a, b)
+
+    assert np.array_equal(result.size, [2, 4, 8]), "Expected sorted sizes."
+    assert result.cpu_time.shape == (3, 2), "Expected padded repetitions."
+    assert np.isnan(result.cpu_time[1, 1]), "Expected NaN padding."
+    assert result.iterations[1, 1] == 0, "Expected zero iteration padding."
+    assert result.complexity is a.complexity, "Expected retained complexity."
+
+
+def test_benchmark_filter() -> None:
+    """Confirm filter matches benchmark names exactly."""
+    pattern = adaptive.benchmark_filter(["a.b", "c"])
+    assert pattern == r"^(a\.b|c)/", "Unexpected filter."
+
+
+class _Recorder:
+    """Mock benchmark builder, recording calls."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple] = []
+
+    def __getattr__(self, name: str):
+        def record(*args):
+            self.calls.append((name, *args))
+            return self
+
+        return record
+
+
+def test_override_sizes(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Confirm registered input sizes are replaced, retaining other options."""
+    registered: dict[str, _Recorder] = {}
+
+    def register(name, func):
+        registered[name] = _Recorder()
+        return registered[name]
+
+    monkeypatch.setattr(gbench._benchmark, "RegisterBenchmark", register)
+    with adaptive.override_sizes({"sized": [100, 200]}):
+
+        @gbench.register
+        @gbench.option.repetitions(3)
+        @gbench.option.range(2, 8)
+        def sized(state): ...
+
+        @gbench.register
+        @gbench.option.range(2, 8)
+        def other(state): ...
+
+    assert gbench._benchmark.RegisterBenchmark is register, "Expected restored."
+    assert registered["sized"].calls == [
+        ("arg", 100),
+        ("arg", 200),
+        ("repetitions", 3),
+    ], "Expected overridden input sizes."
+    assert registered["other"].calls == [("range", 2, 8)], "Expected no override."
+
+
+def test_override_repetitions(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Confirm user defined repetitions are replaced, when overridden."""
+    registered: dict[str, _Recorder] = {}
+
+    def register(name, func):
+        registered[name] = _Recorder()
+        return registered[name]
+
+    monkeypatch.setattr(gbench._benchmark, "RegisterBenchmark", register)
+    with adaptive.override_sizes({"sized": [100]}, repetitions=7):
+
+        @gbench.register
+        @gbench.option.repetitions(3)
+        @gbench.option.range(2, 8)
+        def sized(state): ...
+
+    assert registered["sized"].calls == [
+        ("arg", 100),
+        ("repetitions", 7),
+    ], "Expected overridden repetitions."
+
+
+def test_refine(
+    monkeypatch: pytest.MonkeyPatch,
+    mock_data: str,
+    ambiguous: BenchmarkArray,
+    options: adaptive.AdaptiveOptions,
+) -> None:
+    """Confirm additional input sizes are merged, until the budget is exhausted."""
+    context: BenchmarkContext = parse_version(load(mock_data))
+    context.benchmarks = [ambiguous]
+    requested: list[Mapping[str, Sequence[int]]] = []
+
+    def run_sizes(sizes, opts, timeout):
+        requested.append(sizes)
+        size = np.asarray(sizes["test"])
+        time = (5.0 * size * np.log2(size))[:, None] * np.asarray([[0.99, 1.0, 1.01]])
+        return BenchmarkContext(
+            **{**context.__dict__, "benchmarks": [_benchmark(size, time)]}
+        )
+
+    monkeypatch.setattr(adaptive, "run_sizes", run_sizes)
+    result = adaptive.refine(context, options)
+
+    assert requested, "Expected additional sizes to be requested."
+    assert len(requested) <= options.max_rounds, "Expected bounded rounds."
+    (bench,) = result.benchmarks
+    assert bench.size.size == 3 + 2 * len(requested), "Expected merged sizes."
+    assert context.benchmarks == [ambiguous], "Expected original left unchanged."
+
+    options.budget = 0.0
+    requested.clear()
+    adaptive.refine(context, options)
+    assert not requested, "Expected no additional sizes without a time budget."
@@ -0,0 +1,255 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Test programmatic benchmark interface module."""
+
+import asyncio
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from BenchMatcha import api
+
+
+_BENCH: str = """
+import os
+import time
+
+import google_benchmark as gbench
+
+
+def _work(state):
+    while state:
+        sum(range(state.range(0)))
+    state.complexity_n = state.range(0)
+
+
+@gbench.register
+@gbench.option.repetitions(2)
+@gbench.option.range_multiplier(2)
+@gbench.option.range(2, 8)
+@gbench.option.complexity(gbench.oAuto)
+def bench_one(state):
+    _work(state)
+
+
+@gbench.register
+@gbench.option.repetitions(2)
+@gbench.option.range_multiplier(2)
+@gbench.option.range(2, 8)
+@gbench.option.complexity(gbench.oAuto)
+def bench_two(state):
+    _work(state)
+
+
+@gbench.register
+@gbench.option.range(2, 8)
+def crash_abort(state):
+    os.abort()
+
+
+@gbench.register
+@gbench.option.range(2, 8)
+def hang_sleep(state):
+    while state:
+        time.sleep(60)
+"""
+
+
+@pytest.fixture
+def bench(tmp_path) -> str:
+    """Benchmark file path."""
+    path: str = os.path.join(tmp_path, "bench_api.py")
+    with open(path, "w") as f:
+        f.write(_BENCH)
+
+    return path
+
+
+def _functions(context) -> list[str]:
+    return sorted(j.function for j in context.benchmarks)
+
+
+def test_arguments() -> None:
+    """Test filters and options translate to google benchmark arguments."""
+    options = api.RunOptions(argv=["--benchmark_out=x.json", "-v"], min_time=0.5)
+    assert api._arguments(["a", "b$"], options) == [
+        "-v",
+        "--benchmark_filter=(a)|(b$)",
+        "--benchmark_min_time=0.5s",
+    ]
+    assert api._arguments(None, api.RunOptions()) == []
+
+    options = api.RunOptions(argv=["--benchmark_filter=a"])
+    assert api._arguments(None, options) == ["--benchmark_filter=a"]
+    with pytest.raises(ValueError, match="conflict"):
+        api._arguments(["b"], options)
+
+
+def test_run_forkserver_untouched(bench: str) -> None:
+    """Test runs use warm processes, without preloading the shared fork server."""
+    from multiprocessing import forkserver  # pylint: disable=C0415
+
+    server = forkserver._forkserver  # pylint: disable=W0212
+    preload = getattr(server, "_preload_modules", None)
+    options = api.RunOptions(argv=["--benchmark_dry_run"])
+    for _ in range(2):
+        assert _functions(api.run([bench], ["bench_one"], options)) == ["bench_one"]
+    assert getattr(server, "_preload_modules", None) == preload
+    assert api._pool and api._pool[-1].process.is_alive(), "Expected a warm process."
+
+
+def test_run_repeatedly(bench: str) -> None:
+    """Test repeated runs within a process leave global state untouched."""
+    argv: list[str] = sys.argv[:]
+    options = api.RunOptions(argv=["--benchmark_dry_run"])
+    results = [api.run([bench], j, options) for j in (["bench_one"], ["bench_"])]
+    assert _functions(results[0]) == ["bench_one"]
+    assert _functions(results[1]) == ["bench_one", "bench_two"]
+    assert sys.argv == argv, "Expected sys.argv untouched."
+
+
+def test_run_threads(bench: str) -> None:
+    """Test concurrent runs from a thread pool."""
+    options = api.RunOptions(argv=["--benchmark_dry_run"])
+    filters: list[list[str]] = [["bench_one"], ["bench_two"]] * 2
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda f: api.run([bench], f, options), filters))
+    assert [_functions(j) for j in results] == filters
+
+
+def test_run_errors(bench: str) -> None:
+    """Test failures surface as exceptions."""
+    with pytest.raises(FileNotFoundError):
+        api.run([bench + ".missing"])
+
+    with pytest.raises(RuntimeError, match="exit code"):
+        api.run([bench], ["crash_abort"])
+
+    with pytest.raises(TimeoutError):
+        api.run([bench], ["hang_sleep"], api.RunOptions(timeout=1.0))
+
+
+def test_run_standby_failed(bench: str, tmp_path, monkeypatch) -> None:
+    """Test a warm process which failed to start is replaced by a fresh one."""
+    cwd: str = os.getcwd()
+    removed: str = os.path.join(tmp_path, "removed")
+    os.mkdir(removed)
+    os.chdir(removed)
+    try:
+        standby = api._Standby()  # pylint: disable=W0212
+    finally:
+        os.chdir(cwd)
+    os.rmdir(removed)
+    monkeypatch.setattr(api, "_pool", [standby])
+
+    options = api.RunOptions(argv=["--benchmark_dry_run"])
+    assert _functions(api.run([bench], ["bench_one"], options)) == ["bench_one"]
+
+
+def test_run_exit_early(bench: str, monkeypatch) -> None:
+    """Test a child process exiting before its error log exists fails clearly."""
+
+    def start(*args):
+        process = multiprocessing.get_context("spawn").Process(
+            target=sys.exit, args=(3,)
+        )
+        process.start()
+        return process
+
+    monkeypatch.setattr(api, "_start", start)
+    with pytest.raises(RuntimeError, match="exit code 3"):
+        api.run([bench])
+
+
+async def _collect(*args) -> list[str]:
+    return sorted([j.function async for j in api.arun(*args)])
+
+
+def test_arun(bench: str) -> None:
+    """Test results stream from concurrent benchmark workers."""
+    options = api.RunOptions(argv=["--benchmark_dry_run"], concurrency=2)
+    functions: list[str] = asyncio.run(_collect([bench], ["bench_"], options))
+    assert functions == ["bench_one", "bench_two"]
+
+
+def test_arun_filters(bench: str) -> None:
+    """Test filters select runs (e.g. input sizes) of each benchmark worker."""
+
+    async def sizes(filters, options) -> dict[str, list[int]]:
+        return {
+            j.function: j.size.tolist()
+            async for j in api.arun([bench], filters, options)
+        }
+
+    options = api.RunOptions(argv=["--benchmark_dry_run"])
+    expected: dict[str, list[int]] = {"bench_one": [4, 8]}
+    assert asyncio.run(sizes(["bench_one/[48]"], options)) == expected
+
+    options.argv.append("--benchmark_filter=bench_two/[24]")
+    assert asyncio.run(sizes(None, options)) == {"bench_two": [2, 4]}
+
+
+def test_arun_failures(bench: str, caplog) -> None:
+    """Test failed and timed out benchmarks are skipped."""
+    options = api.RunOptions(argv=["--benchmark_dry_run"], timeout=5.0, concurrency=3)
+    filters: list[str] = ["crash_abort", "hang_sleep", "bench_one"]
+    functions: list[str] = asyncio.run(_collect([bench], filters, options))
+    assert functions == ["bench_one"]
+    assert "Benchmark crash_abort failed" in caplog.text
+    assert "Benchmark hang_sleep exceeded timeout" in caplog.text
+
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(_collect([bench + ".missing"]))
+
+
+def test_arun_cancel(bench: str, monkeypatch) -> None:
+    """Test cancellation kills running benchmark workers."""
+    processes: list[asyncio.subprocess.Process] = []
+    create = asyncio.create_subprocess_exec
+
+    async def record(*args, **kwargs) -> asyncio.subprocess.Process:
+        processes.append(process := await create(*args, **kwargs))
+        return process
+
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", record)
+
+    async def main() -> None:
+        task = asyncio.create_task(_collect([bench], ["hang_sleep"]))
+        while len(processes) < 2:  # NOTE: listing, then benchmark worker
+            await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(asyncio.wait_for(main(), 30.0))
+    assert all(j.returncode is not None for j in processes), "Expected killed."
@@ -0,0 +1,103 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Test bisection of performance regressions module."""
+
+import logging
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from BenchMatcha import bisect
+
+
+_REVISIONS: list[str] = ["a", "b", "c", "d", "e"]
+
+
+@pytest.fixture
+def options(monkeypatch: pytest.MonkeyPatch) -> bisect.BisectOptions:
+    """Bisection options over mock revisions, regressed from revision d."""
+    monkeypatch.setattr(bisect, "revisions", lambda *args: _REVISIONS)
+    monkeypatch.setattr(
+        bisect,
+        "compare_arrays",
+        lambda baseline, candidate, *args: SimpleNamespace(
+            ratio=1.0, pvalue=0.5, regressed=candidate >= "d"
+        ),
+    )
+
+    return bisect.BisectOptions("repo", "a", "e", "bench", ["bench.py"], "cache")
+
+
+def test_bisect(
+    monkeypatch: pytest.MonkeyPatch,
+    options: bisect.BisectOptions,  # pylint: disable=W0621
+) -> None:
+    """Test the first regressed revision is found."""
+    monkeypatch.setattr(bisect, "run_revision", lambda opts, sha: sha)
+    result = bisect.bisect(options)
+    assert result.culprit == "d"
+    assert [j.sha for j in result.steps] == ["e", "c", "d"]
+
+
+@pytest.mark.parametrize(
+    "failed, message",
+    [
+        ("a", "Unable to benchmark good revision a"),
+        ("e", "Unable to benchmark bad revision e"),
+        ("c", "Unable to benchmark revision c"),
+    ],
+)
+def test_bisect_failed(
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+    options: bisect.BisectOptions,  # pylint: disable=W0621
+    failed: str,
+    message: str,
+) -> None:
+    """Test revisions which fail to benchmark abort, rather than pass as good."""
+
+    def run_revision(opts: Any, sha: str) -> str | None:
+        return None if sha == failed else sha
+
+    monkeypatch.setattr(bisect, "run_revision", run_revision)
+    with caplog.at_level(logging.ERROR):
+        result = bisect.bisect(options)
+    assert result.culprit is None
+    assert message in caplog.text
+    assert "No regression" not in caplog.text
+
+
+def test_cache_path(options: bisect.BisectOptions) -> None:  # pylint: disable=W0621
+    """Test cached results are keyed by the build command."""
+    path: str = bisect.cache_path(options, "a")
+    assert bisect.cache_path(options, "a") == path
+    options.build = "make"
+    assert bisect.cache_path(options, "a") != path
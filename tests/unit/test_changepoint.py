@@ -0,0 +1,181 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Test change point detection module."""
+
+import dataclasses
+import tempfile
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from BenchMatcha import changepoint, store
+from BenchMatcha.handlers import load
+from BenchMatcha.structure import BenchmarkContext
+
+
+@pytest.fixture
+def steps() -> np.ndarray:
+    """Noisy series, half of which shift at run 30, and a quarter also at 12."""
+    rng = np.random.default_rng(0)
+    x = rng.normal(0, 0.02, (40, 50))
+    x[:20, 30:] += 0.1
+    x[:10, 12:] += 0.1
+
+    return x
+
+
+def _info(day: int) -> store.RunInfo:
+    return store.RunInfo(
+        run_id=f"run{day}",
+        date=datetime(2025, 1, 1, tzinfo=UTC) + timedelta(days=day),
+        host_name="host",
+        os_name="os",
+        git_sha=f"sha{day}",
+    )
+
+
+def _series(values: np.ndarray, size: int = 8) -> changepoint.Series:
+    return changepoint.Series(
+        "test", size, [_info(j) for j in range(values.size)], values
+    )
+
+
+def test_noise_ignores_shifts(steps: np.ndarray) -> None:
+    """Confirm noise is estimated from successive differences."""
+    result = changepoint.noise(steps)
+
+    np.testing.assert_allclose(result, 0.02, rtol=0.5)
+    assert changepoint.noise(np.zeros((2, 10))).tolist() == [1e-3, 1e-3]
+
+
+def test_pelt(steps: np.ndarray) -> None:
+    """Confirm shifts are located, vectorized across series."""
+    penalty = np.full(steps.shape[0], 3.0 * np.log(steps.shape[1]))
+    result = changepoint.pelt(steps / 0.02, penalty)
+
+    assert all(np.abs(j - [12, 30]).max() <= 1 for j in result[:10] if j.size == 2)
+    assert all(j.size == 1 and abs(j[0] - 30) <= 1 for j in result[10:20])
+    assert sum(j.size == 2 for j in result[:10]) == 10, "Expected both shifts."
+    assert sum(j.size for j in result[20:]) <= 1, "Expected few false positives."
+
+
+def test_detect_changes() -> None:
+    """Confirm first git sha after a shift, and its effect size, are reported."""
+    rng = np.random.default_rng(1)
+    values = np.log(100.0) + rng.normal(0, 0.01, 20)
+    values[8:] += np.log(1.5)
+    (result,) = changepoint.detect_changes([_series(values)], workers=1)
+
+    assert result.index == 8
+    assert result.git_sha == "sha8"
+    assert result.date == _info(8).date
+    assert result.ratio == pytest.approx(1.5, rel=0.02)
+    assert result.effect > 10, "Expected a large standardized effect."
+
+
+def test_detect_changes_pool(steps: np.ndarray) -> None:
+    """Confirm process pool detection agrees with in process detection."""
+    series = [_series(j, size) for size, j in enumerate(steps)]
+    series.append(_series(np.zeros(3)))
+    a = changepoint.detect_changes(series, workers=1, chunk=8)
+    b = changepoint.detect_changes(series, workers=2, chunk=8)
+
+    assert a == b
+    assert {(j.size, j.index) for j in a} >= {(0, 12), (0, 30), (10, 30)}
+
+
+@pytest.fixture
+def result_store(mock_data: str) -> Iterator[store.ResultStore]:
+    """Temporary result store, with a shift of timings at the fifth run."""
+    context = BenchmarkContext.from_json(load(mock_data))
+    bench = context.benchmarks[0]
+    rng = np.random.default_rng(2)
+    with tempfile.TemporaryDirectory() as tmp:
+        with store.open_store(tmp) as s:
+            for day in range(10):
+                scale = (2.0 if day >= 5 else 1.0) * rng.lognormal(0, 0.01)
+                s.add(
+                    dataclasses.replace(
+                        context,
+                        date=_info(day).date,
+                        git_sha=f"sha{day}",
+                        benchmarks=[
+                            dataclasses.replace(
+                                bench,
+                                cpu_time=bench.cpu_time * scale,
+                                real_time=bench.real_time * scale,
+                            )
+                        ],
+                    )
+                )
+            yield s
+
+
+def test_collect_series(result_store: store.ResultStore) -> None:
+    """Confirm a series per function and input size, in chronological order."""
+    result = changepoint.collect_series(result_store.history())
+
+    assert len(result) == 1
+    assert [j.git_sha for j in result[0].runs] == [f"sha{j}" for j in range(10)]
+    assert result[0].values.shape == (10,)
+
+
+def test_collect_series_hosts(result_store: store.ResultStore) -> None:
+    """Confirm histories of different hosts form separate series."""
+    for info in result_store.runs():
+        context = result_store.load(info.run_id)
+        bench = context.benchmarks[0]
+        result_store.add(
+            dataclasses.replace(
+                context,
+                host_name="other",
+                date=info.date + timedelta(hours=1),
+                benchmarks=[dataclasses.replace(bench, cpu_time=bench.cpu_time * 3)],
+            )
+        )
+    result = changepoint.collect_series(result_store.history())
+
+    assert len(result) == 2
+    assert all(len({j.host_name for j in k.runs}) == 1 for k in result)
+    changes = changepoint.store_changes(result_store, workers=1)
+    assert {(j.host_name, j.git_sha) for j in changes} == {
+        (result[0].runs[0].host_name, "sha5"),
+        (result[1].runs[0].host_name, "sha5"),
+    }, "Expected only the shift within each host."
+
+
+def test_store_changes(result_store: store.ResultStore) -> None:
+    """Confirm shifts are detected across stored history."""
+    (result,) = changepoint.store_changes(result_store, workers=1)
+
+    assert result.git_sha == "sha5"
+    assert result.ratio == pytest.approx(2.0, rel=0.05)
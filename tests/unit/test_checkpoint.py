@@ -0,0 +1,125 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Test checkpointing module."""
+
+import dataclasses
+import os
+import tempfile
+from collections.abc import Iterator
+
+import numpy as np
+import pytest
+
+from BenchMatcha import checkpoint, schedule, store
+from BenchMatcha.handlers import load
+from BenchMatcha.structure import BenchmarkContext
+
+
+@pytest.fixture
+def context(mock_data: str) -> BenchmarkContext:
+    """Sample benchmark context."""
+    return BenchmarkContext.from_json(load(mock_data))
+
+
+@pytest.fixture
+def cache_dir() -> Iterator[str]:
+    """Temporary cache directory."""
+    with tempfile.TemporaryDirectory() as tmp:
+        yield tmp
+
+
+def test_begin_finish(cache_dir: str) -> None:
+    """Test run identifier is recorded until finished, and resumed."""
+    run_id: str = checkpoint.begin(cache_dir)
+    assert os.path.exists(checkpoint.checkpoint_path(cache_dir))
+    assert checkpoint.begin(cache_dir, resume=True) == run_id, "Expected resumed."
+    assert checkpoint.begin(cache_dir) != run_id, "Expected a new run."
+    assert checkpoint.begin(cache_dir, True, "explicit") == "explicit"
+
+    checkpoint.finish(cache_dir)
+    assert not os.path.exists(checkpoint.checkpoint_path(cache_dir))
+    assert checkpoint.begin(cache_dir, resume=True) != "explicit"
+    checkpoint.finish(cache_dir)
+
+
+def test_run_checkpointed(
+    monkeypatch: pytest.MonkeyPatch,
+    cache_dir: str,
+    context: BenchmarkContext,
+) -> None:
+    """Test each benchmark is stored as it completes, and skipped when resumed."""
+    bench = context.benchmarks[0]
+    calls: list[str] = []
+    stored: list[list[str]] = []
+    failing: set[str] = {"second"}
+
+    def run_plan(plan, opts, timeout):
+        calls.append(plan.function)
+        if plan.function in failing:
+            return None  # NOTE: e.g. crashed subprocess
+        with store.open_store(cache_dir) as s:
+            stored.append(s.completed("run"))
+        return dataclasses.replace(
+            context, benchmarks=[dataclasses.replace(bench, function=plan.function)]
+        )
+
+    monkeypatch.setattr(schedule, "run_plan", run_plan)
+    options = schedule.ScheduleOptions(
+        paths=[], functions=["first", "second", "third"], budget=np.inf
+    )
+    with store.open_store(cache_dir) as s:
+        result = checkpoint.run_checkpointed(s, options, "run")
+        assert calls == ["first", "second", "third"]
+        assert stored == [[], ["first"]], "Expected benchmarks stored immediately."
+        assert result is not None
+        assert [j.function for j in result.benchmarks] == ["first", "third"]
+
+        calls.clear()
+        failing.clear()
+        result = checkpoint.run_checkpointed(s, options, "run")
+        assert calls == ["second"], "Expected completed benchmarks skipped."
+        assert result is not None
+        assert sorted(j.function for j in result.benchmarks) == [
+            "first",
+            "second",
+            "third",
+        ]
+        assert len(s.runs()) == 1
+
+
+def test_run_checkpointed_none(
+    monkeypatch: pytest.MonkeyPatch,
+    cache_dir: str,
+) -> None:
+    """Test nothing is returned when no benchmark completes."""
+    monkeypatch.setattr(schedule, "run_plan", lambda *args: None)
+    options = schedule.ScheduleOptions(paths=[], functions=["first"], budget=np.inf)
+    with store.open_store(cache_dir) as s:
+        assert checkpoint.run_checkpointed(s, options, "run") is None
@@ -0,0 +1,123 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Test statistical comparison module."""
+
+import numpy as np
+import pytest
+
+from BenchMatcha import comparison
+from BenchMatcha.structure import BenchmarkArray, ComplexityInfo
+
+
+def _benchmark(
+    scale: float,
+    seed: int = 0,
+    size: tuple[int, ...] = (8, 16, 32),
+    reps: int = 5,
+) -> BenchmarkArray:
+    rng = np.random.default_rng(seed)
+    sizes = np.asarray(size)
+    cpu = scale * sizes[:, None] * rng.lognormal(0, 0.01, (sizes.size, reps))
+
+    return BenchmarkArray(
+        function="test",
+        unit="ns",
+        size=sizes,
+        iterations=np.ones(cpu.shape, dtype=np.int64),
+        real_time=cpu.copy(),
+        cpu_time=cpu,
+        complexity=ComplexityInfo("test", "N", 1.0, 1.0),
+    )
+
+
+@pytest.mark.parametrize(
+    "scale,regressed,improved",
+    [
+        (1.0, False, False),
+        (1.02, False, False),
+        (1.5, True, False),
+        (0.5, False, True),
+    ],
+)
+def test_compare_arrays(scale: float, regressed: bool, improved: bool) -> None:
+    """Test regressions and improvements are reported beyond the minimum effect."""
+    result = comparison.compare_arrays(
+        _benchmark(1.0, 0), _benchmark(scale, 1), min_effect=0.05
+    )
+    assert result.sizes == 3
+    assert result.ratio == pytest.approx(scale, rel=0.02)
+    assert result.regressed == regressed
+    assert result.improved == improved
+
+
+def test_compare_arrays_single_repetition() -> None:
+    """Test per size log ratios are tested when repetitions are unavailable."""
+    result = comparison.compare_arrays(
+        _benchmark(1.0, 0, reps=1), _benchmark(2.0, 1, reps=1)
+    )
+    assert result.sizes == 3
+    assert result.pvalue < 0.05
+    assert result.regressed
+
+
+def test_compare_arrays_no_common_sizes() -> None:
+    """Test comparison without common input sizes is inconclusive."""
+    result = comparison.compare_arrays(
+        _benchmark(1.0, size=(8, 16)), _benchmark(2.0, size=(32, 64))
+    )
+    assert result.sizes == 0
+    assert np.isnan(result.ratio)
+    assert not result.regressed and not result.improved
+
+
+def test_compare_paired_cancels_drift() -> None:
+    """Test paired comparison detects small changes, despite shared drift."""
+    baseline = _benchmark(1.0, 0, reps=10)
+    drift = np.linspace(1.0, 1.3, 10)
+    baseline.cpu_time *= drift
+    candidate = _benchmark(1.02, 1, reps=10)
+    candidate.cpu_time *= drift
+
+    paired = comparison.compare_paired(baseline, candidate, min_effect=0.01)
+    assert paired.ratio == pytest.approx(1.02, rel=0.01)
+    assert paired.regressed
+
+    unpaired = comparison.compare_arrays(baseline, candidate, min_effect=0.01)
+    assert unpaired.pvalue > paired.pvalue
+    assert not unpaired.regressed
+
+
+def test_compare_paired_insufficient_pairs() -> None:
+    """Test paired comparison of a single pair is inconclusive."""
+    result = comparison.compare_paired(
+        _benchmark(1.0, 0, reps=1), _benchmark(2.0, 1, reps=1)
+    )
+    assert np.isnan(result.pvalue)
+    assert not result.regressed
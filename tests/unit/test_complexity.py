@@ -127,10 +127,226 @@ def test_analyze_complexity(shunt_fit) -> None:
     y = np.arange(1, 31).reshape(10, 3)
     result = comp.analyze_complexity(x, y)
     assert isinstance(result, list), "Expected list return type."
-    assert len(result) == 6, "Expected 6 elements"
+    assert len(result) == len(comp.complexity_functions) - 1, "Expected failed fit."
     assert all(isinstance(x, comp.FitResult) for x in result), (
         "Expected all elements to be a FitResult type."
     )
 
-    # Results should be sorted by best performing fit, by minimizing rmsd.
+    # Results should be sorted by best performing fit, by minimizing criterion.
     assert comp.get_best_fit(result) == result[0], "Expected same FitResult."
+    assert all(a.bic <= b.bic for a, b in zip(result, result[1:])), "Expected order."
+
+
+def test_fit_ignores_invalid_sigma() -> None:
+    """Confirm non-finite uncertainty falls back to an unweighted fit."""
+    x = np.asarray([1.0, 2.0, 3.0, 4.0])
+    y = 2.0 * x + 1.0
+    result = comp.fit(comp.linear, "N", x, y, np.full(4, np.nan))
+
+    assert isinstance(result, comp.FitResult), "Expected a fit result."
+    assert np.allclose(result.params, [2.0, 1.0]), "Unexpected param values."
+
+
+def test_fit_huber_loss() -> None:
+    """Confirm a robust loss resists a single corrupted observation."""
+    x = np.arange(1.0, 11.0)
+    y = 2.0 * x + 1.0
+    y[-2] *= 5.0
+    linear = comp.fit(comp.linear, "oN", x, y, None)
+    huber = comp.fit(comp.linear, "oN", x, y, None, "huber")
+
+    assert linear is not None and huber is not None, "Expected converged fits."
+    assert abs(huber.params[0] - 2.0) < abs(linear.params[0] - 2.0), (
+        "Expected robust slope closer to truth."
+    )
+    assert np.isclose(huber.params[0], 2.0, rtol=0.05), "Expected robust slope."
+
+
+def test_analyze_complexity_robust() -> None:
+    """Confirm robust analysis ignores preempted repetitions."""
+    rng = np.random.default_rng(5)
+    x = np.power(2.0, np.arange(3, 13))
+    y = (7.0 * x + 3.0)[:, None] * rng.lognormal(0.0, 0.02, (x.size, 5))
+    y[-1, 0] *= 20.0
+    y[-3, 2] *= 20.0
+    result = comp.analyze_complexity(x, y, robust=True)
+
+    assert result[0].bigo == "oN", "Expected linear complexity."
+    assert np.isclose(result[0].params[0], 7.0, rtol=0.05), "Expected coefficient."
+
+
+def test_robust_stats() -> None:
+    """Confirm outliers are excluded from median and MAD."""
+    y = np.asarray([[1.0, 1.2, 0.8, 1.0, 50.0]])
+    median, mad = comp.robust_stats(y)
+    assert np.allclose(median, 1.0), "Expected median of inliers."
+    assert mad[0] < 0.5, "Expected MAD of inliers."
+
+
+def test_predict() -> None:
+    """Confirm fitted equation is evaluated with fitted parameters."""
+    result = comp.FitResult("oN", np.asarray([2.0, 1.0]), np.zeros(2), 0.0)
+    assert np.allclose(comp.predict(result, np.asarray([1.0, 3.0])), [3.0, 7.0])
+
+
+def test_best_fit() -> None:
+    """Confirm best fit describes quadratic growth."""
+    x = np.asarray([8, 16, 32, 64, 128, 256], dtype=np.float64)
+    y = np.stack([3.0 * x**2 + 5.0] * 3, axis=1)
+    result = comp.best_fit(x, y)
+
+    assert result is not None, "Expected a converged fit."
+    assert np.allclose(comp.predict(result, x), y[:, 0]), "Expected exact fit."
+
+
+def test_crossover_points() -> None:
+    """Confirm intersection of linear and quadratic curves is located."""
+    linear = comp.FitResult("oN", np.asarray([100.0, 0.0]), np.zeros(2), 0.0)
+    quadratic = comp.FitResult(
+        "oNSquared", np.asarray([1.0, 0.0, 0.0]), np.zeros(3), 0.0
+    )
+    result = comp.crossover_points(linear, quadratic, 1.0, 1e4)
+
+    assert len(result) == 1, "Expected a single crossover."
+    assert np.isclose(result[0], 100.0), "Expected crossover at n=100."
+
+    none = comp.crossover_points(linear, quadratic, 200.0, 1e4)
+    assert len(none) == 0, "Expected no crossover outside of searched range."
+
+
+@pytest.mark.parametrize(
+    ["equation", "expected"],
+    [
+        (lambda n: 5.0 * n * np.log2(n) + 100.0, "oNLogN"),
+        (lambda n: 7.0 * n + 3.0, "oN"),
+        (lambda n: 40.0 * np.sqrt(n) + 10.0, "oSqrtN"),
+        (lambda n: 3.0 * np.power(n, 1.5) + 10.0, "oNPowerK"),
+        (lambda n: 2.0 * n * np.square(np.log2(n)) + 10.0, "oNLogSquaredN"),
+    ],
+)
+def test_best_fit_model_selection(equation, expected: str) -> None:
+    """Confirm information criteria select the generating model on noisy data."""
+    rng = np.random.default_rng(7)
+    x = np.power(2.0, np.arange(3, 13))
+    y = equation(x)[:, None] * rng.lognormal(0.0, 0.02, (x.size, 5))
+    result = comp.best_fit(x, y)
+
+    assert result is not None, "Expected a converged fit."
+    assert result.bigo == expected, f"Unexpected complexity: {result}"
+
+
+def test_best_fit_exponential() -> None:
+    """Confirm exponential growth is fit, without overflow on small inputs."""
+    x = np.arange(2.0, 20.0)
+    y = np.stack([0.5 * np.exp2(x) + 3.0] * 3, axis=1)
+    result = comp.best_fit(x, y)
+
+    assert result is not None, "Expected a converged fit."
+    assert result.bigo == "o2N", "Expected exponential complexity."
+
+
+def test_fit_exponential_overflow() -> None:
+    """Confirm exponential fit is rejected when input sizes overflow."""
+    x = np.power(2.0, np.arange(3, 13))
+    assert comp.fit(comp.exponential, "o2N", x, x, None) is None, "Expected no fit."
+
+
+def test_information_criteria() -> None:
+    """Confirm additional parameters are penalized for an identical deviance."""
+    y = np.arange(1.0, 11.0)
+    pred = y + 0.1
+    aic2, bic2 = comp.information_criteria(y, pred, 2, None)
+    aic4, bic4 = comp.information_criteria(y, pred, 4, None)
+
+    assert aic2 < aic4, "Expected AICc to penalize parameters."
+    assert bic2 < bic4, "Expected BIC to penalize parameters."
+    assert comp.information_criteria(y, pred, 8, None)[0] == np.inf, (
+        "Expected undefined AICc without residual degrees of freedom."
+    )
+
+
+def test_describe() -> None:
+    """Confirm fitted exponent is described."""
+    result = comp.FitResult("oNPowerK", np.asarray([1.0, 1.5, 0.0]), np.zeros(3), 0.0)
+    assert comp.describe(result) == "N^1.50", "Expected fitted exponent."
+    assert comp.describe(comp.FitResult("oN", result.params, result.cov, 0.0)) == "N"
+
+
+@pytest.fixture
+def nlogn_samples() -> tuple[np.ndarray, np.ndarray]:
+    """Noisy (log normal) repeated observations of O(NlogN) growth."""
+    rng = np.random.default_rng(0)
+    x = np.power(2.0, np.arange(3, 13))
+    y = (5.0 * x * np.log2(x) + 100.0)[:, None] * rng.lognormal(0, 0.1, (x.size, 5))
+
+    return x, y
+
+
+def test_resample_means() -> None:
+    """Confirm resampled means are bounded by observed repetitions."""
+    y = np.arange(12.0).reshape(3, 4)
+    result = comp.resample_means(y, 50, np.random.default_rng(0))
+
+    assert result.shape == (50, 3), "Expected a row per resample."
+    assert np.all(result >= y.min(axis=1)), "Expected mean above minimum."
+    assert np.all(result <= y.max(axis=1)), "Expected mean below maximum."
+
+
+def test_design_matrix() -> None:
+    """Confirm design matrix reproduces linear equation parameters."""
+    x = np.asarray([1.0, 2.0, 4.0])
+    design = comp.design_matrix(comp.quadratic, x, 3)
+    assert np.allclose(design @ [1.0, 2.0, 3.0], comp.quadratic(x, 1.0, 2.0, 3.0))
+
+
+def test_bootstrap_complexity(nlogn_samples: tuple[np.ndarray, np.ndarray]) -> None:
+    """Confirm bootstrap resampling identifies class, and bounds coefficients."""
+    x, y = nlogn_samples
+    result = comp.bootstrap_complexity(x, y, resamples=500, seed=1)
+
+    assert result[0].bigo == "oNLogN", "Expected most probable O(NlogN) class."
+    assert result[0].probability > 0.9, "Expected a confident classification."
+    assert np.isclose(sum(j.probability for j in result), 1.0), "Expected a total."
+    assert all("oNPowerK" != j.bigo for j in result), "Expected linear models only."
+
+    best = result[0]
+    assert best.samples.shape == (500, 2), "Expected resampled coefficients."
+    assert np.all(best.lower <= best.params), "Expected estimate above lower bound."
+    assert np.all(best.params <= best.upper), "Expected estimate below upper bound."
+    assert best.lower[0] < 5.0 < best.upper[0], "Expected interval to cover truth."
+
+
+def test_bootstrap_complexity_reproducible(
+    nlogn_samples: tuple[np.ndarray, np.ndarray],
+) -> None:
+    """Confirm seeded resampling is reproducible."""
+    x, y = nlogn_samples
+    a = comp.bootstrap_complexity(x, y, resamples=100, seed=3)
+    b = comp.bootstrap_complexity(x, y, resamples=100, seed=3)
+
+    assert [j.bigo for j in a] == [j.bigo for j in b], "Expected identical order."
+    assert all(np.array_equal(i.samples, j.samples) for i, j in zip(a, b))
+
+
+def test_bootstrap_complexity_invalid(
+    nlogn_samples: tuple[np.ndarray, np.ndarray],
+) -> None:
+    """Confirm sizes with invalid repetitions are excluded, and single runs skipped."""
+    x, y = nlogn_samples
+    y = y.copy()
+    y[0, 0] = np.nan
+    result = comp.bootstrap_complexity(x, y, resamples=100, seed=1)
+
+    assert result and all(np.isfinite(j.params).all() for j in result)
+    assert not comp.bootstrap_complexity(x, y[:, :1], resamples=100, seed=1)
+
+
+def test_predict_interval(nlogn_samples: tuple[np.ndarray, np.ndarray]) -> None:
+    """Confirm extrapolated confidence band contains the point estimate."""
+    x, y = nlogn_samples
+    best = comp.bootstrap_complexity(x, y, resamples=500, seed=1)[0]
+    grid = np.asarray([1e5, 1e6])
+    lower, upper = comp.predict_interval(best, grid)
+    estimate = comp.design_matrix(comp.nlogn, grid, 2) @ best.params
+
+    assert np.all(lower < estimate) and np.all(estimate < upper), "Expected band."
@@ -46,6 +46,10 @@ def toml_inner() -> dict:
         "line_color": "#333",
         "font": "Courier",
         "x_axis": 5,
+        "robust": True,
+        "outlier_threshold": 5.0,
+        "element_size": 4,
+        "metrics": False,
         "unsupported_key": "test",
     }
 
@@ -0,0 +1,174 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Test distributed coordinator and worker module."""
+
+import dataclasses
+import socket
+import tempfile
+import threading
+import zlib
+
+import pytest
+
+from BenchMatcha import distributed, wire
+from BenchMatcha.handlers import load
+from BenchMatcha.store import open_store
+from BenchMatcha.structure import BenchmarkContext
+
+
+@pytest.fixture
+def context(mock_data: str) -> BenchmarkContext:
+    """Sample benchmark context."""
+    return BenchmarkContext.from_json(load(mock_data))
+
+
+def test_shards() -> None:
+    """Test functions are split into shards of a size."""
+    result = distributed.shards(["a", "b", "c"], 2)
+    assert [(j.id, j.functions) for j in result] == [(0, ["a", "b"]), (1, ["c"])]
+    assert len(distributed.shards(["a", "b"], 0)) == 2
+
+
+def test_shard_queue() -> None:
+    """Test shards are handed out until resolved, and requeued up to max attempts."""
+    shards = distributed.ShardQueue(distributed.shards(["a", "b"]), max_attempts=2)
+    first = shards.next()
+    second = shards.next()
+    assert first is not None and second is not None
+    shards.complete(second)
+
+    # NOTE: waits on outstanding (first) shard, which may be handed out again
+    handed: list = []
+    waiter = threading.Thread(target=lambda: handed.append(shards.next()))
+    waiter.start()
+    shards.requeue(first)
+    waiter.join(timeout=5.0)
+    assert handed == [first] and first.attempts == 2
+
+    shards.requeue(first)
+    assert shards.failed == [first], "Expected failed after max attempts."
+    assert shards.done
+    assert shards.next() is None
+
+
+def _worker(
+    address: tuple[str, int],
+    context: BenchmarkContext,
+    host: str,
+    disconnect: bool = False,
+    malformed: tuple[bytes, bytes] | None = None,
+) -> None:
+    with socket.create_connection(address) as connection:
+        wire.send_json(connection, {"type": "ready", "host": host})
+        while (message := wire.receive_json(connection))["type"] == "shard":
+            if disconnect:
+                return
+            if malformed is not None:
+                wire.send_json(connection, {"type": "result", "id": message["id"]})
+                wire.send(connection, *malformed)
+                return
+            bench = dataclasses.replace(
+                context.benchmarks[0], function=message["functions"][0]
+            )
+            result = dataclasses.replace(context, host_name=host, benchmarks=[bench])
+            wire.send_json(connection, {"type": "result", "id": message["id"]})
+            wire.send(connection, wire.CONTEXT, wire.encode_context(result))
+
+
+def test_coordinate(context: BenchmarkContext) -> None:
+    """Test results of workers are stored per host, requeueing disconnected shards."""
+    options = distributed.CoordinatorOptions(paths=["bench.py"], functions=["f1", "f2"])
+    runs: list[str] = []
+    with (
+        tempfile.TemporaryDirectory() as tmp,
+        distributed.Coordinator(("127.0.0.1", 0), options) as server,
+    ):
+
+        def coordinate() -> None:
+            with open_store(tmp) as store:
+                runs.extend(distributed.coordinate(server, store))
+
+        thread = threading.Thread(target=coordinate)
+        thread.start()
+        address = server.server_address[:2]
+        _worker(address, context, "host-a", disconnect=True)
+        _worker(address, context, "host-b")
+        thread.join(timeout=30.0)
+
+        assert not server.shards.failed
+        with open_store(tmp) as store:
+            assert len(runs) == 1
+            assert sorted(store.completed(runs[0])) == ["f1", "f2"]
+            result = store.load(runs[0])
+    assert result.host_name == "host-b"
+    assert result.caches == context.caches
+    assert (result.num_cpus, result.mhz_per_cpu) == (
+        context.num_cpus,
+        context.mhz_per_cpu,
+    )
+
+
+_HEADER_ONLY: bytes = zlib.compress(
+    wire._HEADER.pack(wire._MAGIC, 2) + b"{}"  # pylint: disable=W0212
+)
+
+
+@pytest.mark.parametrize(
+    "malformed",
+    [(wire.CONTEXT, _HEADER_ONLY), (wire.JSON, b"{}")],
+    ids=["payload", "kind"],
+)
+def test_coordinate_malformed(
+    context: BenchmarkContext,
+    malformed: tuple[bytes, bytes],
+) -> None:
+    """Test shards with malformed results are handed out again, not left hanging."""
+    options = distributed.CoordinatorOptions(paths=["bench.py"], functions=["f1"])
+    runs: list[str] = []
+    with (
+        tempfile.TemporaryDirectory() as tmp,
+        distributed.Coordinator(("127.0.0.1", 0), options) as server,
+    ):
+
+        def coordinate() -> None:
+            with open_store(tmp) as store:
+                runs.extend(distributed.coordinate(server, store))
+
+        thread = threading.Thread(target=coordinate)
+        thread.start()
+        address = server.server_address[:2]
+        _worker(address, context, "host-a", malformed=malformed)
+        _worker(address, context, "host-b")
+        thread.join(timeout=30.0)
+        assert not thread.is_alive(), "Expected coordination to finish."
+
+        assert server.shards.done and not server.shards.failed
+        with open_store(tmp) as store:
+            assert [store.load(j).host_name for j in runs] == ["host-b"]
@@ -0,0 +1,123 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Test real versus cpu time divergence module."""
+
+import logging
+
+import numpy as np
+import pytest
+
+from BenchMatcha import divergence
+from BenchMatcha.structure import BenchmarkArray, ComplexityInfo
+
+
+def _benchmark(
+    ratio: float,
+    seed: int = 0,
+    threads: np.ndarray | None = None,
+) -> BenchmarkArray:
+    rng = np.random.default_rng(seed)
+    size = np.asarray([8, 16, 32])
+    cpu = np.ones((3, 4)) * size[:, None]
+    real = cpu * ratio * rng.lognormal(0, 0.01, cpu.shape)
+
+    return BenchmarkArray(
+        function="test",
+        unit="ns",
+        size=size,
+        iterations=np.ones(cpu.shape, dtype=np.int64),
+        real_time=real,
+        cpu_time=cpu,
+        complexity=ComplexityInfo("test", "N", 1.0, 1.0),
+        threads=np.ones(cpu.shape, dtype=np.int64) if threads is None else threads,
+    )
+
+
+def test_wall_cpu_ratio() -> None:
+    """Confirm ratio per measurement, NaN where cpu time is zero."""
+    bench = _benchmark(2.0)
+    bench.cpu_time[0, 0] = 0.0
+    result = divergence.wall_cpu_ratio(bench)
+
+    assert result.shape == bench.cpu_time.shape
+    assert np.isnan(result[0, 0])
+    np.testing.assert_allclose(result[1:], 2.0, rtol=0.05)
+
+
+def test_ratio_by_threads() -> None:
+    """Confirm ratio is separated by thread count."""
+    threads = np.asarray([[1, 1, 4, 4]] * 3)
+    bench = _benchmark(1.0, threads=threads)
+    bench.real_time[:, 2:] *= 3.0
+    result = divergence.ratio_by_threads(bench)
+
+    assert sorted(result) == [1, 4]
+    np.testing.assert_allclose(result[1], 1.0, rtol=0.05)
+    np.testing.assert_allclose(result[4], 3.0, rtol=0.05)
+
+
+def test_ratio_matrix() -> None:
+    """Confirm ratios are aligned by input size across runs."""
+    a, b = _benchmark(1.0), _benchmark(2.0)
+    b.size = np.asarray([16, 32, 64])
+    sizes, result = divergence.ratio_matrix([a, b])
+
+    assert sizes.tolist() == [8, 16, 32, 64]
+    assert result[1].shape == (2, 4)
+    assert np.isnan(result[1][0, 3]) and np.isnan(result[1][1, 0])
+
+
+def test_divergence_trends_flagged(caplog: pytest.LogCaptureFixture) -> None:
+    """Confirm a growing ratio is flagged, and logged."""
+    history = [_benchmark(1.0 + 0.05 * j, seed=j) for j in range(8)]
+    with caplog.at_level(logging.WARNING):
+        result = divergence.divergence_trends(history)
+
+    assert len(result) == 3, "Expected a trend per input size."
+    assert all(j.flagged for j in result), "Expected upward trends."
+    assert result[0].increase == pytest.approx(0.35, abs=0.05)
+    assert result[0].runs == 8
+    assert "wall/cpu time ratio grew" in caplog.text
+
+
+@pytest.mark.parametrize(
+    "history",
+    [
+        [_benchmark(1.2, seed=j) for j in range(8)],
+        [_benchmark(1.0 - 0.05 * j, seed=j) for j in range(8)],
+        [_benchmark(1.0 + 0.05 * j, seed=j) for j in range(3)],
+        [],
+    ],
+)
+def test_divergence_trends_not_flagged(history: list[BenchmarkArray]) -> None:
+    """Confirm stable, decreasing, or short histories are not flagged."""
+    result = divergence.divergence_trends(history)
+
+    assert not any(j.flagged for j in result)
@@ -0,0 +1,60 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Test interleaved benchmarking module."""
+
+import numpy as np
+
+from BenchMatcha import interleave
+from BenchMatcha.structure import BenchmarkArray, ComplexityInfo
+
+
+def _benchmark(size: list[int], reps: int, value: float) -> BenchmarkArray:
+    shape = (len(size), reps)
+
+    return BenchmarkArray(
+        function="test",
+        unit="ns",
+        size=np.asarray(size),
+        iterations=np.ones(shape, dtype=np.int64),
+        real_time=np.full(shape, value),
+        cpu_time=np.full(shape, value),
+        complexity=ComplexityInfo("test", "N", 1.0, 1.0),
+    )
+
+
+def test_extend() -> None:
+    """Test repetitions are appended over input sizes in common."""
+    result = interleave.extend(
+        _benchmark([8, 16, 32], 2, 1.0), _benchmark([16, 32], 3, 2.0)
+    )
+    np.testing.assert_array_equal(result.size, [16, 32])
+    assert result.cpu_time.shape == (2, 5)
+    assert result.threads.shape == (2, 5)
+    np.testing.assert_array_equal(result.real_time[0], [1.0, 1.0, 2.0, 2.0, 2.0])
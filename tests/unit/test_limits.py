@@ -0,0 +1,192 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Test resource limits of benchmark runs module."""
+
+import signal
+import time
+from collections.abc import Iterator
+from typing import Any
+
+import numpy as np
+import pytest
+from google_benchmark import _benchmark
+
+from BenchMatcha import limits
+from BenchMatcha.handlers import load
+from BenchMatcha.structure import BenchmarkContext, Status
+
+
+class _State:
+    """Minimal google benchmark state."""
+
+    def __init__(self, name: str, *arguments: int) -> None:
+        self.name = name
+        self.arguments = arguments
+        self.errors: list[str] = []
+
+    def range(self, pos: int) -> int:
+        if pos >= len(self.arguments):
+            raise IndexError("pos is out of range")
+        return self.arguments[pos]
+
+    def skip_with_error(self, message: str) -> None:
+        self.errors.append(message)
+
+
+@pytest.fixture
+def alarm() -> Iterator[None]:
+    """Restore the SIGALRM handler."""
+    handler = signal.getsignal(signal.SIGALRM)
+    yield
+    signal.signal(signal.SIGALRM, handler)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("1024", 1024),
+        ("512M", 512 << 20),
+        ("2g", 2 << 30),
+        ("1.5GiB", 3 << 29),
+        ("64KB", 64 << 10),
+    ],
+)
+def test_parse_memory(value: str, expected: int) -> None:
+    """Test memory sizes are parsed with binary units."""
+    assert limits.parse_memory(value) == expected
+
+
+@pytest.mark.parametrize("value", ["", "M", "-1G", "1X", "one"])
+def test_parse_memory_invalid(value: str) -> None:
+    """Test invalid memory sizes are rejected."""
+    with pytest.raises(ValueError):
+        limits.parse_memory(value)
+
+
+def test_guard_timeout(alarm: None) -> None:  # pylint: disable=W0613,W0621
+    """Test runs exceeding their timeout are interrupted, and skip repetitions."""
+    calls: list[str] = []
+
+    def bench(state: Any) -> None:
+        calls.append(state.name)
+        time.sleep(10)
+
+    limits.apply(limits.Limits(timeout=0.05))
+    timed_out: set[str] = set()
+    wrapped = limits.guard(bench, limits.Limits(timeout=0.05), timed_out)
+    start: float = time.monotonic()
+    for _ in range(3):
+        state = _State("bench", 8)
+        wrapped(state)
+        assert state.errors == ["Timed out after 0.05s"]
+
+    assert time.monotonic() - start < 5, "Expected interrupted run."
+    assert calls == ["bench"], "Expected remaining repetitions to be skipped."
+    assert timed_out == {"bench/8"}
+
+    state = _State("bench", 4)
+    calls.clear()
+    wrapped(state)
+    assert calls == ["bench"], "Expected other input sizes to run."
+    assert signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0), "Expected reset timer."
+
+
+def test_guard_progress(tmp_path: Any) -> None:
+    """Test the timed run in progress is written, and cleared once it returns."""
+    progress: str = str(tmp_path / "progress")
+    found: list[str | None] = []
+
+    def bench(state: Any) -> None:
+        found.append(limits.in_progress(progress, 0.0))
+
+    limits.guard(bench, limits.Limits(timeout=1.0), set(), progress)(_State("b", 8))
+    assert found == ["b/8"]
+    assert limits.in_progress(progress, 0.0) is None
+    assert limits.in_progress(str(tmp_path / "missing"), 0.0) is None
+
+
+def test_guard_timed_out() -> None:
+    """Test runs known to time out are skipped."""
+    state = _State("bench", 8)
+    limits.guard(lambda s: None, limits.Limits(timeout=1.0), {"bench/8"})(state)
+    assert state.errors == ["Timed out after 1s"]
+
+
+def test_guard_memory() -> None:
+    """Test runs exhausting memory are reported as errors."""
+
+    def bench(state: Any) -> None:
+        raise MemoryError
+
+    state = _State("bench", 8)
+    limits.guard(bench, limits.Limits(memory=1 << 20), set())(state)
+    assert state.errors == ["Out of memory"]
+    assert Status.from_error(state.errors[0]) == Status.OUT_OF_MEMORY
+
+
+def test_guard_passthrough() -> None:
+    """Test runs within limits are unaffected."""
+    state = _State("bench", 8)
+    assert limits.guard(lambda s: s.name, limits.Limits(), set())(state) == "bench"
+    assert not state.errors
+
+
+def test_enforce(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test benchmarks registered within context are guarded."""
+    registered: dict[str, Any] = {}
+    monkeypatch.setattr(
+        _benchmark,
+        "RegisterBenchmark",
+        lambda name, func: registered.setdefault(name, func),
+    )
+
+    def bench(state: Any) -> None:
+        raise MemoryError
+
+    with limits.enforce(limits.Limits(timeout=1.0)):
+        _benchmark.RegisterBenchmark("bench", bench)
+    _benchmark.RegisterBenchmark("other", bench)
+
+    state = _State("bench", 8)
+    registered["bench"](state)
+    assert state.errors == ["Out of memory"], "Expected guarded benchmark."
+    assert registered["other"] is bench, "Expected unguarded benchmark."
+
+
+def test_exceeded(mock_data: str) -> None:
+    """Test input sizes exceeding resource limits are summarized."""
+    benchmark = BenchmarkContext.from_json(load(mock_data)).benchmarks[0]
+    assert not limits.exceeded([benchmark])
+
+    benchmark.status = np.zeros_like(benchmark.status)
+    benchmark.status[-1, 0] = Status.TIMED_OUT
+    benchmark.status[-1, -1] = Status.FAILED
+    result = limits.exceeded([benchmark])
+    assert result == {benchmark.function: {Status.TIMED_OUT: [int(benchmark.size[-1])]}}
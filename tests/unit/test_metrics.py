@@ -0,0 +1,117 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Test derived benchmark metrics module."""
+
+import numpy as np
+import pytest
+
+from BenchMatcha import metrics
+from BenchMatcha.structure import BenchmarkArray, ComplexityInfo
+
+
+def _benchmark(size: np.ndarray, time: np.ndarray, unit: str = "ns") -> BenchmarkArray:
+    return BenchmarkArray(
+        function="test",
+        unit=unit,
+        size=size,
+        iterations=np.ones(time.shape, dtype=np.int64),
+        real_time=time,
+        cpu_time=time.copy(),
+        complexity=ComplexityInfo("test", "N", 1.0, 1.0),
+    )
+
+
+@pytest.mark.parametrize(
+    "unit,expected",
+    [("ns", 1e-9), ("us", 1e-6), ("ms", 1e-3), ("s", 1.0)],
+)
+def test_unit_scale(unit: str, expected: float) -> None:
+    """Confirm seconds per unit of time."""
+    assert metrics.unit_scale(unit) == expected
+
+
+def test_unit_scale_unsupported() -> None:
+    """Confirm unsupported units of time are rejected."""
+    with pytest.raises(ValueError):
+        metrics.unit_scale("fortnight")
+
+
+def test_ns_per_element() -> None:
+    """Confirm time per element is normalized to nanoseconds, and broadcasts."""
+    size = np.asarray([10, 0])
+    time = np.asarray([[2.0, 4.0], [1.0, 1.0]])
+    result = metrics.ns_per_element(size[:, None], time, "us")
+
+    np.testing.assert_allclose(result[0], [200.0, 400.0])
+    assert np.isnan(result[1]).all(), "Expected NaN for empty input size."
+
+
+def test_elements_per_second() -> None:
+    """Confirm throughput is elements per second, NaN on non positive time."""
+    result = metrics.elements_per_second(
+        np.asarray([1000, 1000]), np.asarray([1.0, 0.0]), "ms"
+    )
+
+    assert result[0] == pytest.approx(1e6)
+    assert np.isnan(result[1])
+
+
+def test_compute_metrics() -> None:
+    """Confirm bulk metrics of ragged benchmarks of mixed units."""
+    rng = np.random.default_rng(0)
+    size = 2 ** np.arange(4, 14)
+    a = _benchmark(size, (3.0 * size)[:, None] * rng.lognormal(0, 0.01, (10, 3)))
+    b = _benchmark(size[:5], (2e-3 * size[:5])[:, None] * np.ones((5, 5)), "us")
+    result = metrics.compute_metrics([a, b])
+
+    assert [j.ns_per_element.shape for j in result] == [(10, 3), (5, 5)]
+    np.testing.assert_allclose(result[0].ns_per_element, 3.0, rtol=0.05)
+    np.testing.assert_allclose(result[1].ns_per_element, 2.0)
+    np.testing.assert_allclose(result[1].throughput, 5e8)
+    assert result[0].fit is not None
+    assert result[0].fit.bigo == "oN", "Expected linear fit."
+    assert np.abs(result[0].residual).max() < 0.05, "Expected small residuals."
+
+
+def test_metrics_summary() -> None:
+    """Confirm summary averages repetitions per input size."""
+    size = np.asarray([4, 8, 16])
+    (result,) = metrics.compute_metrics(
+        [_benchmark(size, np.asarray([[4.0, 8.0], [8.0, 16.0], [16.0, 32.0]]))]
+    )
+    summary = result.summary()
+
+    np.testing.assert_allclose(summary["ns_per_element"], 1.5)
+    assert summary["residual"].shape == size.shape
+
+
+def test_compute_metrics_empty() -> None:
+    """Confirm an empty sequence of benchmarks is supported."""
+    assert metrics.compute_metrics([]) == []
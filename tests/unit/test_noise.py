@@ -0,0 +1,148 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Test background sampling of system noise module."""
+
+import time
+from typing import Any
+
+import numpy as np
+import pytest
+from google_benchmark import _benchmark
+
+from BenchMatcha import noise
+from BenchMatcha.handlers import load
+from BenchMatcha.structure import BenchmarkArray, BenchmarkContext
+
+
+def _profile(busy: list[float], frequency: list[float]) -> noise.NoiseProfile:
+    """Noise profile sampled each second, with a benchmark per two samples."""
+    count: int = len(busy)
+    samples = np.column_stack(
+        [np.arange(1, count + 1), np.ones(count), busy, frequency]
+    ).astype(np.float64)
+    intervals = {f"bench_{j}": (2.0 * j, 2.0 * j + 2) for j in range(count // 2)}
+
+    return noise.NoiseProfile(samples, intervals)
+
+
+def test_readers(tmp_path) -> None:
+    """Test system noise sources are parsed, or NaN when unavailable."""
+    loadavg = tmp_path / "loadavg"
+    loadavg.write_text("0.50 0.40 0.30 2/73 1234\n")
+    stat = tmp_path / "stat"
+    stat.write_text("cpu  100 0 50 800 50 0 0 0 0 0\ncpu0 100 0 50 800 50 0 0 0 0 0\n")
+    for j, value in enumerate((1000000, 3000000)):
+        (tmp_path / f"cpu{j}").mkdir()
+        (tmp_path / f"cpu{j}" / "scaling_cur_freq").write_text(f"{value}\n")
+
+    assert noise.read_load(str(loadavg)) == 0.5
+    assert noise.read_cpu_times(str(stat)) == (150, 1000)
+    assert noise.read_frequency(str(tmp_path / "cpu*" / "scaling_cur_freq")) == 2000
+    missing: str = str(tmp_path / "missing")
+    assert np.isnan(noise.read_load(missing))
+    assert noise.read_cpu_times(missing) is None
+    assert np.isnan(noise.read_frequency(missing))
+
+
+def test_sampler() -> None:
+    """Test the background thread samples at an interval, until stopped."""
+    sampler = noise.NoiseSampler(0.01)
+    sampler.start()
+    time.sleep(0.2)
+    samples = sampler.stop()
+    assert samples.shape[1] == len(noise.COLUMNS)
+    assert len(samples) >= 3, "Expected samples throughout."
+    assert (np.diff(samples[:, 0]) > 0).all(), "Expected increasing timestamps."
+    time.sleep(0.05)
+    assert len(sampler.samples()) == len(samples), "Expected stopped sampling."
+
+
+def test_timeline(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test intervals of benchmarks registered within context are recorded."""
+    registered: dict[str, Any] = {}
+    monkeypatch.setattr(
+        _benchmark,
+        "RegisterBenchmark",
+        lambda name, func: registered.setdefault(name, func),
+    )
+    timeline = noise.Timeline()
+    with timeline.track():
+        _benchmark.RegisterBenchmark("bench", lambda state: time.sleep(0.01))
+
+    before: float = time.time()
+    registered["bench"](None)
+    registered["bench"](None)
+    start, end = timeline.intervals["bench"]
+    assert before <= start < end <= time.time()
+    assert end - start >= 0.02, "Expected interval spanning both calls."
+
+
+@pytest.mark.parametrize(
+    "busy, frequency, expected",
+    [
+        ([1, 1, 1, 1, 1, 1], [3000] * 6, []),
+        ([1, 1, 2.5, 1, 1, 1], [3000] * 6, ["bench_1"]),
+        ([1, 1, 1, 1, 1, 1], [3000, 3000, 3000, 3000, 3000, 2000], ["bench_2"]),
+        ([1, 1, 1, 1, 1, 1], [np.nan] * 6, []),
+    ],
+)
+def test_flag(busy: list[float], frequency: list[float], expected: list[str]) -> None:
+    """Test benchmarks which ran during a noise spike are flagged."""
+    options = noise.NoiseOptions(paths=[], interval=0.0)
+    result = noise.flag(_profile(busy, frequency), options)
+    assert [j.function for j in result] == expected
+
+
+def test_settle(monkeypatch: pytest.MonkeyPatch, mock_data: str) -> None:
+    """Test noisy benchmarks are rerun, keeping the quieter run."""
+    context = BenchmarkContext.from_json(load(mock_data))
+    bench: BenchmarkArray = context.benchmarks[0]
+    rerun = BenchmarkArray(
+        **{**bench.__dict__, "real_time": bench.real_time * 2},
+    )
+    monitor = noise.NoiseMonitor(noise.NoiseOptions(paths=[], interval=0, reruns=2))
+    # NOTE: a spike of busy cores while the benchmark ran, quiet afterwards.
+    samples = np.asarray(
+        [[1, 1, 1, 3000], [2, 1, 4, 3000], [3, 1, 1, 3000], [5, 1, 1, 3000]],
+        dtype=np.float64,
+    )
+    monkeypatch.setattr(monitor.sampler, "samples", lambda: samples)
+    monitor.timeline.record(bench.function, 1.5, 2.5)
+    calls: list[str] = []
+
+    def quiet(b: BenchmarkArray, *args: Any) -> tuple[BenchmarkArray, tuple]:
+        calls.append(b.function)
+        return rerun, (4.0, 5.0)
+
+    monkeypatch.setattr(noise, "_rerun", quiet)
+    result = monitor.settle(context)
+    assert calls == [bench.function], "Expected a single rerun."
+    assert result.benchmarks[0] is rerun, "Expected quieter rerun."
+    assert monitor.timeline.intervals[bench.function] == (4.0, 5.0)
@@ -0,0 +1,140 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Test cache hierarchy aware change point detection module."""
+
+import numpy as np
+import pytest
+
+from BenchMatcha import piecewise
+from BenchMatcha.structure import BenchmarkArray, Cache, ComplexityInfo
+
+
+@pytest.fixture
+def caches() -> list[Cache]:
+    """Typical cache hierarchy (64 KiB L1, 4 MiB L2)."""
+    return [
+        Cache("Data", 1, 65536, 1),
+        Cache("Instruction", 1, 65536, 1),
+        Cache("Unified", 2, 4194304, 1),
+    ]
+
+
+@pytest.fixture
+def sizes() -> np.ndarray:
+    """Power of two input sizes."""
+    return 2.0 ** np.arange(6, 24)
+
+
+def _timings(size: np.ndarray, per_element: np.ndarray, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return (size * per_element)[:, None] * rng.lognormal(0, 0.02, (size.size, 5))
+
+
+def test_cache_regimes(caches: list[Cache]) -> None:
+    """Confirm regime boundaries are cache sizes in elements, skipping icache."""
+    result = piecewise.cache_regimes(caches, 8)
+
+    assert [j.name for j in result] == ["L1", "L2", "Memory"]
+    assert result[0].lower == 0
+    assert result[0].upper == 8192
+    assert result[1].lower == 8192
+    assert result[1].upper == 524288
+    assert np.isinf(result[-1].upper)
+    assert result[0].contains(np.asarray([1, 8191, 8192])).tolist() == [
+        True,
+        True,
+        False,
+    ]
+
+
+def test_change_points_step(sizes: np.ndarray) -> None:
+    """Confirm level shifts of time per element are detected."""
+    per_element = np.where(sizes < 8192, 1.0, np.where(sizes < 524288, 1.6, 3.0))
+    result = piecewise.change_points(sizes, _timings(sizes, per_element))
+
+    assert result.tolist() == [7, 13]
+
+
+@pytest.mark.parametrize(
+    "func",
+    [
+        np.log2,
+        np.sqrt,
+        lambda n: np.log2(n) ** 2,
+        lambda n: n,
+        np.ones_like,
+    ],
+)
+def test_change_points_smooth(sizes: np.ndarray, func) -> None:
+    """Confirm smooth complexity curves are not mistaken for cache knees."""
+    result = piecewise.change_points(sizes, _timings(sizes, func(sizes)))
+
+    assert result.size == 0
+
+
+def test_change_points_too_few() -> None:
+    """Confirm too few input sizes yield no change points."""
+    size = np.asarray([8.0, 16.0, 32.0, 64.0])
+
+    assert piecewise.change_points(size, _timings(size, size)).size == 0
+
+
+def test_nearest_level(caches: list[Cache]) -> None:
+    """Confirm change points are attributed to nearby cache boundaries only."""
+    regimes = piecewise.cache_regimes(caches, 8)
+
+    assert piecewise.nearest_level(8192 * 1.4, regimes) == "L1"
+    assert piecewise.nearest_level(524288 / 1.4, regimes) == "L2"
+    assert piecewise.nearest_level(65536, regimes) is None
+    assert piecewise.nearest_level(100, []) is None
+
+
+def test_analyze_cache(sizes: np.ndarray, caches: list[Cache]) -> None:
+    """Confirm knees align with cache levels, and segments are fit per regime."""
+    per_element = np.where(sizes < 8192, 1.0, np.where(sizes < 524288, 1.6, 3.0))
+    time = _timings(sizes, per_element)
+    bench = BenchmarkArray(
+        function="test",
+        unit="ns",
+        size=sizes.astype(np.int64),
+        iterations=np.ones(time.shape, dtype=np.int64),
+        real_time=time,
+        cpu_time=time.copy(),
+        complexity=ComplexityInfo("test", "N", 1.0, 1.0),
+    )
+    result = piecewise.analyze_cache(bench, caches, 8)
+
+    assert [j.level for j in result.knees] == ["L1", "L2"]
+    assert result.knees[0].ratio == pytest.approx(1.6, rel=0.1)
+    assert result.knees[1].ratio == pytest.approx(1.875, rel=0.1)
+    assert [j.regime.name for j in result.segments] == ["L1", "L2", "Memory"]
+    for segment in result.segments:
+        assert segment.fit is not None
+        assert segment.fit.bigo == "oN", "Expected linear complexity per regime."
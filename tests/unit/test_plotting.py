@@ -29,15 +29,21 @@
 
 """unit test plotting module."""
 
+import base64
+import dataclasses
 import tempfile
+from datetime import UTC, datetime, timedelta
 
 import numpy as np
 import plotly.graph_objs as go
 import pytest
 
 from BenchMatcha import plotting
+from BenchMatcha.complexity import FitResult
 from BenchMatcha.config import ConfigBase
-from BenchMatcha.structure import BenchmarkArray, ComplexityInfo
+from BenchMatcha.divergence import RatioTrend
+from BenchMatcha.metrics import compute_metrics
+from BenchMatcha.structure import BenchmarkArray, Cache, ComplexityInfo
 
 
 @pytest.fixture
@@ -64,6 +70,17 @@ def bench_arr():
     return b
 
 
+def _resized(bench: BenchmarkArray, size: np.ndarray, time: np.ndarray):
+    return dataclasses.replace(
+        bench,
+        size=size,
+        iterations=np.ones(time.shape, dtype=np.int64),
+        real_time=time.copy(),
+        cpu_time=time,
+        threads=np.ones(time.shape, dtype=np.int64),
+    )
+
+
 def test_serialization_to_html():
     """Confirm a plotly figure is saved to a html file."""
     figure = go.Figure()
@@ -88,6 +105,70 @@ def test_serialization_to_json():
     assert data.startswith("{"), "Expected json serialization."
 
 
+def test_serialization_to_html_appends_header_once(bench_arr: BenchmarkArray):
+    """Confirm plotly.js is referenced once, when appending multiple figures."""
+    figure = plotting.plot_benchmark_array(bench_arr, ConfigBase())
+
+    with tempfile.NamedTemporaryFile("w+") as file:
+        for _ in range(3):
+            plotting.to_html(figure, file.name, "a")
+        file.seek(0)
+        data: str = file.read()
+
+    assert data.count("cdn.plot.ly") == 1, "Expected a single plotly.js reference."
+    assert data.count("Plotly.newPlot") == 3, "Expected three figures."
+    assert '"$template"' in data, "Expected default template to be referenced."
+
+
+def test_serialization_to_json_typed_arrays(bench_arr: BenchmarkArray):
+    """Confirm numeric trace data is serialized as base64 typed arrays."""
+    figure = plotting.plot_benchmark_array(bench_arr, ConfigBase())
+
+    with tempfile.NamedTemporaryFile("w+") as file:
+        plotting.to_json(figure, file.name)
+        file.seek(0)
+        data: str = file.read()
+
+    assert '"bdata"' in data, "Expected base64 typed arrays."
+
+
+@pytest.mark.parametrize(
+    ["x", "dtype", "code"],
+    [
+        ([2, 4, 8], np.int64, "u1"),
+        ([-2, 4, 8], np.int64, "i1"),
+        ([2, 4, 1 << 20], np.int64, "u4"),
+        ([-(1 << 20), 4], np.int64, "i4"),
+        ([1 << 40, 4], np.int64, "f8"),
+        ([1.5, 2.5], np.float64, "f8"),
+    ],
+)
+def test_encode_typed_array(x: list, dtype: type, code: str) -> None:
+    """Confirm arrays are encoded with the narrowest lossless plotly dtype."""
+    arr = np.asarray(x, dtype=dtype)
+    result = plotting.encode_typed_array(arr)
+    assert result["dtype"] == code, "Unexpected typed array code."
+
+    decoded = np.frombuffer(
+        base64.b64decode(result["bdata"]),
+        dtype=np.dtype(code).newbyteorder("<"),
+    )
+    assert np.array_equal(decoded, arr), "Expected lossless round trip."
+
+
+def test_compact_figure_deduplicates_shared_axes(bench_arr: BenchmarkArray) -> None:
+    """Confirm the repeated size array is stored once and referenced by traces."""
+    figure = plotting.plot_benchmark_array(bench_arr, ConfigBase())
+    fig, shared = plotting.compact_figure(figure)
+
+    assert len(shared) == 1, "Expected a single shared array."
+    key = next(iter(shared))
+    assert all(trace["x"] == {"$ref": key} for trace in fig["data"]), (
+        "Expected traces to reference the shared size array."
+    )
+    assert "bdata" in fig["data"][0]["y"], "Expected unique arrays inline."
+
+
 @pytest.mark.parametrize(
     ["x", "length", "vals", "labels"],
     [
@@ -154,6 +235,12 @@ def test_create_annotation_text() -> None:
     assert isinstance(result, dict), "expected a dictionary return type."
     assert "text" in result, "Expected text annotation key."
 
+    result = plotting.create_annotation_text("N", 0.01, [("N", 0.9), ("N^2", 0.1)])
+    assert result["text"].split("<br>")[2:] == [
+        "    P(O(N)):   90% ",
+        "  P(O(N^2)):   10% ",
+    ]
+
 
 @pytest.mark.parametrize(
     ["key"],
@@ -172,7 +259,223 @@ def test_draw_complexity_line() -> None:
     assert isinstance(result, go.Scatter)
 
 
+def test_draw_fit_line() -> None:
+    """Confirm a fitted equation is evaluated at each input size."""
+    x = np.asarray([2, 4, 8, 16])
+    fit = FitResult("oN", np.asarray([2.0, 0.0]), np.zeros(2), 0.0)
+    result = plotting.draw_fit_line(x, fit, "test", "red")
+    assert isinstance(result, go.Scatter)
+    assert np.allclose(result.y, 2 * x)
+
+
+def test_plot_benchmark_array_fit(bench_arr: BenchmarkArray) -> None:
+    """Confirm the annotated complexity is fit to observed timings."""
+    size = 2 ** np.arange(2, 12)
+    rng = np.random.default_rng(0)
+    time = (size * size)[:, None] * rng.lognormal(0, 0.01, (size.size, 5))
+    bench_arr = _resized(bench_arr, size, time)
+    result = plotting.plot_benchmark_array(bench_arr, ConfigBase())
+    names = [j.name for j in result.data]
+
+    assert "CPU Time Fit (N^2.00)" in names, "Expected fitted complexity."
+    assert not any(j.startswith("95% Band") for j in names), (
+        "Expected no band of another model than the (power law) fit."
+    )
+    assert "O(N^2.00)" in result.layout.annotations[-1].text
+    assert "P(O(N^2))" in result.layout.annotations[-1].text
+
+
+def test_plot_benchmark_array_band(bench_arr: BenchmarkArray) -> None:
+    """Confirm the bootstrap confidence band describes the fitted complexity."""
+    size = 2 ** np.arange(2, 12)
+    rng = np.random.default_rng(0)
+    time = (size * np.log2(size))[:, None] * rng.lognormal(0, 0.01, (size.size, 5))
+    bench_arr = _resized(bench_arr, size, time)
+    result = plotting.plot_benchmark_array(bench_arr, ConfigBase())
+    names = [j.name for j in result.data]
+
+    assert "CPU Time Fit (NlgN)" in names, "Expected fitted complexity."
+    assert "95% Band (NlgN)" in names, "Expected band of fitted complexity."
+
+
+def test_create_scatter_trace_robust() -> None:
+    """Confirm robust scatter trace reports median of repetitions."""
+    y = np.asarray([[1.0, 1.1, 0.9, 1.0, 40.0]])
+    result = plotting.create_scatter_trace(np.asarray([2]), y, "test", "red", True)
+    assert np.allclose(result.y, [1.0]), "Expected median."
+
+
+def test_outlier_trace() -> None:
+    """Confirm outlier trace contains only flagged repetitions."""
+    x = np.asarray([2, 4])
+    y = np.asarray([[1.0, 9.0], [2.0, 3.0]])
+    mask = np.asarray([[False, True], [False, False]])
+    result = plotting.outlier_trace(x, y, mask, "Outliers")
+
+    assert list(result.x) == [2], "Expected size of outlier."
+    assert list(result.y) == [9.0], "Expected outlier value."
+
+
+def test_plot_benchmark_array_outliers(bench_arr: BenchmarkArray) -> None:
+    """Confirm flagged repetitions are drawn."""
+    time = np.asarray([[5.2, 5.2, 5.0, 5.1, 90.0], [10.1, 10.0, 9.9, 10.0, 10.1]])
+    bench_arr = _resized(bench_arr, np.asarray([2, 4]), time)
+    result = plotting.plot_benchmark_array(bench_arr, ConfigBase())
+    names = [j.name for j in result.data]
+
+    assert "Outliers" in names, "Expected an outlier trace."
+
+
 def test_plot_benchmark_array(bench_arr: BenchmarkArray):
     """Confirm an array is constructed."""
     result = plotting.plot_benchmark_array(bench_arr, ConfigBase())
     assert isinstance(result, go.Figure), "Expected a figure object."
+
+
+def test_plot_benchmark_array_caches(bench_arr: BenchmarkArray) -> None:
+    """Confirm cache boundaries, knees and per regime fits are annotated."""
+    rng = np.random.default_rng(0)
+    size = 2 ** np.arange(6, 24)
+    per_element = np.where(size < 8192, 1.0, np.where(size < 524288, 1.6, 3.0))
+    time = (size * per_element)[:, None] * rng.lognormal(0, 0.02, (18, 5))
+    bench_arr = _resized(bench_arr, size, time)
+    caches = [Cache("Data", 1, 65536, 1), Cache("Unified", 2, 4194304, 1)]
+    result = plotting.plot_benchmark_array(bench_arr, ConfigBase(), caches)
+    names = [j.name for j in result.data]
+    text = [j.text for j in result.layout.annotations]
+
+    assert "L1 Fit (N)" in names, "Expected a fit per cache regime."
+    assert "Memory Fit (N)" in names, "Expected a fit per cache regime."
+    assert "L1 (64 KiB)" in text, "Expected cache boundary annotation."
+    assert any(j.startswith("L2: x1.") for j in text), "Expected knee annotation."
+    assert len(result.layout.shapes) == 4, "Expected boundary and knee lines."
+
+
+def test_plot_benchmark_array_caches_disabled(bench_arr: BenchmarkArray) -> None:
+    """Confirm cache analysis is skipped when element size is zero."""
+    caches = [Cache("Data", 1, 64, 1)]
+    result = plotting.plot_benchmark_array(
+        bench_arr, ConfigBase(element_size=0), caches
+    )
+
+    assert not result.layout.shapes, "Expected no cache annotations."
+
+
+def test_history_matrix(bench_arr: BenchmarkArray) -> None:
+    """Confirm mean timings are aligned by input size across runs."""
+    other = dataclasses.replace(
+        bench_arr,
+        size=np.asarray([4, 16]),
+        cpu_time=np.asarray([[1.0, 3.0], [2.0, 4.0]]),
+    )
+    sizes, matrix = plotting.history_matrix([bench_arr, other])
+
+    assert sizes.tolist() == [2, 4, 8, 16], "Expected union of sizes."
+    assert matrix.shape == (2, 4), "Unexpected shape."
+    assert np.isnan(matrix[0, 3]) and np.isnan(matrix[1, 0]), "Expected NaN gaps."
+    assert np.allclose(matrix[1, [1, 3]], [2.0, 3.0]), "Unexpected mean values."
+
+
+def test_plot_history(bench_arr: BenchmarkArray) -> None:
+    """Confirm a downsampled WebGL trace is drawn per input size."""
+    start = datetime(2025, 1, 1, tzinfo=UTC)
+    dates = [start + timedelta(hours=j) for j in range(50)]
+    shas = [f"sha{j}" for j in range(50)]
+    result = plotting.plot_history(
+        "test", dates, shas, [bench_arr] * 50, ConfigBase(), max_points=10
+    )
+
+    assert isinstance(result, go.Figure), "Expected a figure object."
+    assert len(result.data) == 3, "Expected a trace per input size."
+    assert all(isinstance(j, go.Scattergl) for j in result.data), "Expected WebGL."
+    assert all(len(j.x) == 10 for j in result.data), "Expected downsampled traces."
+
+
+@pytest.mark.parametrize(
+    "metric,title", [("ns_per_element", "ns / element"), ("throughput", "elements / s")]
+)
+def test_plot_history_metric(
+    bench_arr: BenchmarkArray, metric: str, title: str
+) -> None:
+    """Confirm history of size normalized metrics."""
+    dates = [datetime(2025, 1, 1, tzinfo=UTC)]
+    result = plotting.plot_history(
+        "test", dates, ["sha"], [bench_arr], ConfigBase(), metric=metric
+    )
+    expected = plotting.history_matrix([bench_arr])[1][0] / bench_arr.size
+
+    assert result.layout.yaxis.title.text == title, "Expected metric axis title."
+    if metric == "ns_per_element":
+        assert result.data[0].y[0] == pytest.approx(expected[0] * 1e9)
+
+
+def test_plot_metrics(bench_arr: BenchmarkArray) -> None:
+    """Confirm time per element, throughput and residual subplots."""
+    (metrics,) = compute_metrics([bench_arr])
+    result = plotting.plot_metrics(metrics, ConfigBase())
+    names = [j.name for j in result.data]
+
+    assert names[:2] == ["Time / Element", "Throughput"], "Expected metric traces."
+    assert names[2].startswith("Residual"), "Expected residual trace."
+    assert isinstance(result.data[2], go.Bar), "Expected residual bars."
+    assert result.data[2].yaxis == "y3", "Expected residual subplot."
+
+
+def test_divergence_traces(bench_arr: BenchmarkArray) -> None:
+    """Confirm a wall / cpu time ratio trace on the secondary axis."""
+    (result,) = plotting.divergence_traces(bench_arr)
+
+    assert result.name == "Real / CPU"
+    assert result.yaxis == "y2", "Expected secondary y axis."
+    assert len(result.y) == bench_arr.size.size
+
+
+def test_plot_benchmark_array_real_time(bench_arr: BenchmarkArray) -> None:
+    """Confirm real time series and ratio are drawn."""
+    result = plotting.plot_benchmark_array(bench_arr, ConfigBase())
+    names = [j.name for j in result.data]
+
+    assert "Real Time" in names, "Expected real time series."
+    assert "Real / CPU" in names, "Expected real / cpu time ratio."
+    assert result.layout.yaxis2.overlaying == "y"
+
+
+def test_plot_divergence_history(bench_arr: BenchmarkArray) -> None:
+    """Confirm a ratio series per input size, emphasizing flagged trends."""
+    dates = [datetime(2025, 1, 1, tzinfo=UTC) + timedelta(days=j) for j in range(2)]
+    trend = RatioTrend("test", 1, 4, 2, 1.0, 0.1, 0.1, 0.01, True)
+    result = plotting.plot_divergence_history(
+        "test", dates, ["a", "b"], [bench_arr] * 2, ConfigBase(), [trend]
+    )
+    names = [j.name for j in result.data]
+
+    assert len(names) == 3, "Expected a trace per input size."
+    assert names[1] == "n=4 ▲", "Expected flagged series marker."
+    assert result.data[1].line.color == "crimson"
+
+
+def test_ratio_trace(bench_arr: BenchmarkArray) -> None:
+    """Confirm ratio of identical benchmarks is unity."""
+    result = plotting.ratio_trace(bench_arr, bench_arr, "test", "red", "cpu_time")
+
+    assert isinstance(result, go.Scatter), "Expected a scatter trace."
+    assert np.allclose(result.y, 1.0), "Expected a unit ratio."
+
+
+def test_plot_comparison(bench_arr: BenchmarkArray) -> None:
+    """Confirm overlay figure draws ratios and annotates crossovers."""
+    other = dataclasses.replace(
+        bench_arr,
+        function="other",
+        cpu_time=bench_arr.cpu_time[::-1].copy(),
+    )
+    result = plotting.plot_comparison(
+        [bench_arr, other], ["test", "other"], ConfigBase()
+    )
+
+    assert isinstance(result, go.Figure), "Expected a figure object."
+    ratios = [j for j in result.data if j.yaxis == "y2"]
+    assert len(ratios) == 1, "Expected a ratio trace per non reference benchmark."
+    assert any("n≈" in j.text for j in result.layout.annotations), (
+        "Expected crossover annotation of opposing trends."
+    )
@@ -0,0 +1,133 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Test adaptive repetition module."""
+
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from BenchMatcha import repetition
+from BenchMatcha.handlers import load
+from BenchMatcha.structure import (
+    BenchmarkArray,
+    BenchmarkContext,
+    ComplexityInfo,
+    parse_version,
+)
+
+
+def _benchmark(noise: list[float], reps: int = 4, seed: int = 0) -> BenchmarkArray:
+    rng = np.random.default_rng(seed)
+    size = np.asarray([8, 16, 32][: len(noise)])
+    shape = (size.size, reps)
+    real = 1e6 * size[:, None] * rng.lognormal(0, np.asarray(noise)[:, None], shape)
+
+    return BenchmarkArray(
+        function="test",
+        unit="ns",
+        size=size,
+        iterations=np.full(shape, 10, dtype=np.int64),
+        real_time=real,
+        cpu_time=real.copy(),
+        complexity=ComplexityInfo("test", "N", 1.0, 1.0),
+    )
+
+
+@pytest.fixture
+def options() -> repetition.RepetitionOptions:
+    return repetition.RepetitionOptions(paths=[], precision=0.05, time_cap=5.0)
+
+
+def test_relative_precision() -> None:
+    """Test interval width grows with noise, and is unbounded for single repetitions."""
+    width = repetition.relative_precision(_benchmark([0.001, 0.01, 0.2]))
+    assert width[0] < width[1] < width[2]
+    assert np.isinf(repetition.relative_precision(_benchmark([0.01], reps=1))).all()
+
+
+def test_needed_repetitions(options: repetition.RepetitionOptions) -> None:
+    """Test projected repetitions at most double, up to the maximum."""
+    n = np.asarray([4, 4, 1, 48])
+    width = np.asarray([0.01, 0.1, np.inf, 1.0])
+    needed = repetition.needed_repetitions(width, n, options)
+    np.testing.assert_array_equal(needed, [0, 4, 2, 2])
+
+
+def test_append_repetitions() -> None:
+    """Test valid repetitions are packed, and padded to the largest count."""
+    a = _benchmark([0.01, 0.01, 0.01], reps=3)
+    a.real_time[0, 2] = np.nan
+    b = _benchmark([0.01, 0.01], reps=2, seed=1)
+
+    result = repetition.append_repetitions(a, b)
+    np.testing.assert_array_equal(result.size, a.size)
+    assert result.real_time.shape == (3, 5)
+    assert np.isnan(result.real_time[0, 4]) and not np.isnan(result.real_time[0, 3])
+    assert np.isnan(result.real_time[2, 3:]).all()
+    assert (result.iterations[2, 3:] == 0).all()
+    assert result.iterations.dtype == a.iterations.dtype
+
+
+def test_plan(options: repetition.RepetitionOptions) -> None:
+    """Test imprecise sizes are rerun, with a companion size, within time cap."""
+    bench = _benchmark([0.001, 0.001, 0.2])
+    repetitions, sizes = repetition.plan(bench, options, 5.0)
+    assert repetitions == 4
+    assert sizes == [8, 32], "Expected cheapest precise size as companion."
+
+    assert repetition.plan(bench, options, 0.0) is None, "Expected exhausted cap."
+    assert repetition.plan(_benchmark([0.001] * 3), options, 5.0) is None
+
+
+def test_repeat(
+    monkeypatch: pytest.MonkeyPatch,
+    mock_data: str,
+    options: repetition.RepetitionOptions,
+) -> None:
+    """Test repetitions are appended, until target precision is reached."""
+    bench = _benchmark([0.001, 0.001, 0.2])
+    context: BenchmarkContext = parse_version(load(mock_data))
+    context.benchmarks = [bench]
+    calls: list[tuple[dict, int]] = []
+
+    def run_sizes(sizes, opts, timeout, repetitions):
+        calls.append((sizes, repetitions))
+        rerun = _benchmark([0.001, 0.001], reps=repetitions, seed=len(calls))
+        rerun.size = np.asarray(sizes["test"])
+        rerun.real_time[-1] = 32e6
+        rerun.cpu_time = rerun.real_time.copy()
+        return replace(context, benchmarks=[rerun])
+
+    monkeypatch.setattr(repetition, "run_sizes", run_sizes)
+    result = repetition.repeat(context, options)
+    assert calls[0] == ({"test": [8, 32]}, 4)
+    assert result.benchmarks[0].real_time.shape[1] > bench.real_time.shape[1]
+    assert len(calls) <= options.max_rounds
@@ -0,0 +1,148 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Unit test report module."""
+
+import os
+import re
+import tempfile
+from collections.abc import Iterator
+
+import numpy as np
+import pytest
+
+from BenchMatcha import report
+from BenchMatcha.config import ConfigBase
+from BenchMatcha.structure import BenchmarkArray, Cache, ComplexityInfo
+
+
+def _bench(name: str, scale: float = 1.0) -> BenchmarkArray:
+    return BenchmarkArray(
+        function=name,
+        unit="ns",
+        size=np.asarray([2, 4, 8]),
+        iterations=np.full((3, 2), 10),
+        real_time=np.asarray([[1.0, 1.1], [2.0, 2.1], [4.0, 4.2]]) * scale,
+        cpu_time=np.asarray([[1.0, 1.0], [2.0, 2.0], [4.0, 4.1]]) * scale,
+        complexity=ComplexityInfo(name, "N", 0.5, 0.5),
+    )
+
+
+def _ids(fragment: str) -> str:
+    return re.sub(r"[0-9a-f]{8}(-[0-9a-f]{4}){3}-[0-9a-f]{12}", "", fragment)
+
+
+@pytest.fixture
+def cache() -> Iterator[report.FigureCache]:
+    """Temporary figure cache."""
+    with tempfile.TemporaryDirectory() as tmp:
+        yield report.FigureCache(os.path.join(tmp, "figures"))
+
+
+def test_figure_key_is_content_hash() -> None:
+    """Confirm key depends on benchmark content and configuration values."""
+    config = ConfigBase()
+    key: str = report.figure_key(_bench("a"), config)
+
+    assert key == report.figure_key(_bench("a"), ConfigBase()), "Expected stable key."
+    assert key != report.figure_key(_bench("a", 2.0), config), (
+        "Expected key to change with benchmark data."
+    )
+    assert key != report.figure_key(_bench("a"), ConfigBase(color="red")), (
+        "Expected key to change with configuration."
+    )
+    assert key != report.figure_key(_bench("a"), config, [Cache("Data", 1, 64, 1)]), (
+        "Expected key to change with cache information."
+    )
+
+
+def test_figure_cache_roundtrip(cache: report.FigureCache) -> None:
+    """Confirm fragments are stored and retrieved."""
+    assert cache.get("missing") is None, "Expected cache miss."
+    cache.put("key", "<div></div>")
+    assert cache.get("key") == "<div></div>", "Expected cache hit."
+
+
+@pytest.mark.parametrize(["workers"], [(1,), (2,)])
+def test_render_fragments(workers: int, cache: report.FigureCache) -> None:
+    """Confirm fragments are rendered in order, serially or in a process pool."""
+    benchmarks = [_bench("first"), _bench("second"), _bench("third", 3.0)]
+    result = report.render_fragments(benchmarks, ConfigBase(), cache, workers)
+
+    assert len(result) == 3, "Expected a fragment per benchmark."
+    for fragment, bench in zip(result, benchmarks, strict=True):
+        assert bench.function in fragment, "Expected fragments in benchmark order."
+    assert len(os.listdir(cache.directory)) == 3, "Expected rendered fragments cached."
+
+
+def test_render_fragments_reuses_cache(
+    cache: report.FigureCache,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Confirm unchanged benchmarks are not rendered again."""
+    benchmarks = [_bench("first"), _bench("second")]
+    expected = report.render_fragments(benchmarks, ConfigBase(), cache, 1)
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("Expected cached fragment to be reused.")
+
+    monkeypatch.setattr(report, "render_fragment", _fail)
+    result = report.render_fragments(benchmarks, ConfigBase(), cache, 1)
+    assert [_ids(j) for j in result] == [_ids(j) for j in expected], (
+        "Expected identical cached fragments, apart from div ids."
+    )
+
+
+def test_render_fragments_fresh_ids(cache: report.FigureCache) -> None:
+    """Confirm repeated (cached) fragments within a report have unique div ids."""
+    benchmarks = [_bench("first")]
+    config = ConfigBase(metrics=True)
+    first = report.render_fragments(benchmarks, config, cache, 1)
+    second = report.render_fragments(benchmarks, config, cache, 1)
+
+    ids: list[str] = re.findall(r'<div id="([^"]+)"', first[0] + second[0])
+    assert len(ids) == len(set(ids)) == 4, "Expected a unique id per figure."
+    for j in ids:
+        assert f'Plotly.newPlot("{j}"' in first[0] + second[0], (
+            "Expected figure drawn into its own div."
+        )
+
+
+def test_write_report() -> None:
+    """Confirm header is written once, and fragments are appended."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path: str = os.path.join(tmp, "out.html")
+        report.write_report(path, ["<div>a</div>"])
+        report.write_report(path, ["<div>b</div>"])
+        with open(path) as f:
+            data: str = f.read()
+
+    assert data.startswith("<div>"), "Expected html serialization."
+    assert data.count("cdn.plot.ly") == 1, "Expected a single header."
+    assert data.endswith("<div>a</div><div>b</div>"), "Expected appended fragments."
@@ -29,6 +29,10 @@
 
 """unit test runner module."""
 
+import math
+import subprocess
+import sys
+
 import pytest
 
 from BenchMatcha import runner
@@ -40,3 +44,55 @@ def test_manage_registration_file_not_found_error():
         runner.manage_registration("cthulu")
 
     assert err.type is FileNotFoundError
+
+
+# NOTE: generous bound of self import time of BenchMatcha modules (excluding third
+#       party dependencies), the best of a few runs, which is stable under load.
+_MAX_IMPORT_TIME: float = 1.0
+
+
+def test_import_time():
+    """Confirm start-up of runner imports few (and light) BenchMatcha modules."""
+    best: float = math.inf
+    for _ in range(3):
+        response = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import BenchMatcha.runner"],
+            capture_output=True,
+            check=True,
+        )
+        # NOTE: lines formatted as "import time: self [us] | cumulative | name"
+        elapsed: int = 0
+        for line in response.stderr.decode().splitlines():
+            if line.startswith("import time:") and "[us]" not in line:
+                value, _, name = line.removeprefix("import time:").split("|")
+                if name.strip().startswith("BenchMatcha"):
+                    elapsed += int(value)
+        best = min(best, elapsed * 1e-6)
+
+    assert 0 < best < _MAX_IMPORT_TIME
+
+
+def test_lazy_imports():
+    """Confirm heavy dependencies are not imported on start-up of runner."""
+    heavy: list[str] = [
+        "plotly",
+        "scipy.optimize",
+        "scipy.stats",
+        "BenchMatcha.bisect",
+        "BenchMatcha.changepoint",
+        "BenchMatcha.distributed",
+        "BenchMatcha.interleave",
+        "BenchMatcha.server",
+        "BenchMatcha.watch",
+    ]
+    code: str = (
+        "import sys, BenchMatcha.runner;"
+        f"print(*(j for j in {heavy!r} if j in sys.modules))"
+    )
+    # NOTE: wall clock import time is not asserted, being unreliable under load.
+    response = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        check=True,
+    )
+    assert response.stdout.decode().strip() == "", "Expected lazy imports."
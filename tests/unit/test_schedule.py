@@ -0,0 +1,214 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Test time budget scheduler module."""
+
+import dataclasses
+import tempfile
+from collections.abc import Iterator
+from datetime import UTC, datetime
+
+import google_benchmark as gbench
+import numpy as np
+import pytest
+
+from BenchMatcha import schedule, store
+from BenchMatcha.handlers import load
+from BenchMatcha.structure import BenchmarkArray, BenchmarkContext, ComplexityInfo
+
+
+def _benchmark(
+    function: str,
+    time: float,
+    noise: float = 0.01,
+    seed: int = 0,
+) -> BenchmarkArray:
+    rng = np.random.default_rng(seed)
+    size = np.asarray([8, 16])
+    real = time * size[:, None] * rng.lognormal(0, noise, (2, 3))
+
+    return BenchmarkArray(
+        function=function,
+        unit="ms",
+        size=size,
+        iterations=np.ones(real.shape, dtype=np.int64),
+        real_time=real,
+        cpu_time=real.copy(),
+        complexity=ComplexityInfo(function, "N", 1.0, 1.0),
+    )
+
+
+@pytest.fixture
+def context(mock_data: str) -> BenchmarkContext:
+    """Sample benchmark context."""
+    return BenchmarkContext.from_json(load(mock_data))
+
+
+@pytest.fixture
+def result_store(context: BenchmarkContext) -> Iterator[store.ResultStore]:
+    """Temporary result store, with history of a stable and a noisy benchmark."""
+    with tempfile.TemporaryDirectory() as tmp:
+        with store.open_store(tmp) as s:
+            for day in range(1, 5):
+                s.add(
+                    dataclasses.replace(
+                        context,
+                        date=datetime(2025, 7, day, 12, tzinfo=UTC),
+                        host_name="host",
+                        git_sha=f"sha{day}",
+                        benchmarks=[
+                            _benchmark("stable", 1.0, 0.01, day),
+                            _benchmark("noisy", 1.0 + 0.3 * (day % 2), 0.2, day),
+                        ],
+                    )
+                )
+            yield s
+
+
+@pytest.fixture
+def options() -> schedule.ScheduleOptions:
+    return schedule.ScheduleOptions(
+        paths=[], functions=["stable", "noisy", "new"], budget=60.0, host="host"
+    )
+
+
+def test_estimate() -> None:
+    """Test cost is estimated per iteration, and variability grows with noise."""
+    history = [_benchmark("f", 1.0, 0.01, j) for j in range(4)]
+    stable = schedule.estimate("f", history)
+    assert stable is not None
+    np.testing.assert_allclose(stable.iteration_time, [8e-3, 16e-3], rtol=0.05)
+    assert stable.repetitions == 3
+
+    noisy = schedule.estimate("f", [_benchmark("f", 1.0, 0.2, j) for j in range(4)])
+    assert noisy is not None and noisy.variability > stable.variability
+    assert schedule.estimate("f", []) is None
+
+
+def test_weights() -> None:
+    """Test shares range from stable to most variable, unknown first."""
+    estimates = {
+        "stable": schedule.estimate("stable", [_benchmark("stable", 1.0, 0.0)]),
+        "noisy": schedule.estimate("noisy", [_benchmark("noisy", 1.0, 0.2)]),
+        "new": None,
+    }
+    weight = schedule.weights(estimates)
+    assert weight["stable"] == pytest.approx(1.0)
+    assert weight["noisy"] == pytest.approx(2.0)
+    assert weight["new"] == 2.0
+
+
+def test_plan(options: schedule.ScheduleOptions) -> None:
+    """Test repetitions and minimum time fit a share of the budget."""
+    estimated = schedule.estimate("f", [_benchmark("f", 1.0)])
+    assert estimated is not None
+
+    generous = schedule.plan("f", estimated, 100.0, 2.0, options)
+    assert generous == schedule.Plan("f", 6, options.min_time)
+    assert estimated.cost(6, options.min_time) <= 100.0
+
+    tight = schedule.plan("f", estimated, 1.5, 1.0, options)
+    assert tight.repetitions == 1
+    assert options.min_time_floor <= tight.min_time < options.min_time
+
+    assert schedule.plan("new", None, 10.0, 2.0, options) == schedule.Plan("new")
+
+
+def test_override_runs(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test repetitions and minimum time are replaced, retaining other options."""
+    calls: dict[str, list[tuple]] = {}
+
+    class Recorder:
+        def __init__(self, name: str) -> None:
+            self.name = name
+
+        def __getattr__(self, method: str):
+            def record(*args):
+                calls[self.name].append((method, *args))
+                return self
+
+            return record
+
+    def register(name, func):
+        calls[name] = []
+        return Recorder(name)
+
+    monkeypatch.setattr(gbench._benchmark, "RegisterBenchmark", register)
+    plans = {"planned": schedule.Plan("planned", 4, 0.1)}
+    with schedule.override_runs(plans), schedule.collect_names() as names:
+
+        @gbench.register
+        @gbench.option.repetitions(3)
+        @gbench.option.min_time(2.0)
+        @gbench.option.range(2, 8)
+        def planned(state): ...
+
+        @gbench.register
+        @gbench.option.repetitions(3)
+        def other(state): ...
+
+    assert names == ["planned", "other"]
+    assert calls["planned"] == [
+        ("repetitions", 4),
+        ("min_time", 0.1),
+        ("range", 2, 8),
+    ], "Expected overridden repetitions and minimum time."
+    assert calls["other"] == [("repetitions", 3)], "Expected no override."
+
+
+def test_schedule(
+    monkeypatch: pytest.MonkeyPatch,
+    result_store: store.ResultStore,
+    context: BenchmarkContext,
+    options: schedule.ScheduleOptions,
+) -> None:
+    """Test benchmarks run by priority, and partial results are kept."""
+    scheduled: list[schedule.Plan] = []
+
+    def run_plan(plan, opts, timeout):
+        scheduled.append(plan)
+        if plan.function == "stable":
+            return None  # NOTE: e.g. exceeded time budget
+        return dataclasses.replace(context, benchmarks=[_benchmark(plan.function, 1.0)])
+
+    monkeypatch.setattr(schedule, "run_plan", run_plan)
+    result = schedule.schedule(result_store, options)
+    assert [j.function for j in scheduled] == ["new", "noisy", "stable"]
+    assert scheduled[0] == schedule.Plan("new"), "Expected user defined options."
+    assert result is not None
+    assert [j.function for j in result.benchmarks] == ["new", "noisy"]
+
+
+def test_schedule_exhausted(
+    result_store: store.ResultStore,
+    options: schedule.ScheduleOptions,
+) -> None:
+    """Test nothing runs without sufficient time budget."""
+    options.budget = 0.0
+    assert schedule.schedule(result_store, options) is None
@@ -0,0 +1,166 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Unit test dashboard server module."""
+
+import dataclasses
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+from collections.abc import Callable, Iterator
+from datetime import UTC, datetime
+
+import orjson
+import pytest
+
+from BenchMatcha import server, store
+from BenchMatcha.handlers import load
+from BenchMatcha.structure import BenchmarkContext
+
+
+Fetch = Callable[..., tuple[int, dict[str, str], bytes]]
+
+
+@pytest.fixture
+def dashboard(mock_data: str) -> Iterator[tuple[server.Dashboard, Fetch]]:
+    """Dashboard serving a temporary store of three runs, on an ephemeral port."""
+    context = BenchmarkContext.from_json(load(mock_data))
+    with tempfile.TemporaryDirectory() as tmp:
+        with store.open_store(tmp) as s:
+            for day in range(1, 4):
+                s.add(
+                    dataclasses.replace(
+                        context,
+                        date=datetime(2025, 7, day, tzinfo=UTC),
+                        git_sha=f"sha{day}",
+                    )
+                )
+
+        with server.Dashboard(("127.0.0.1", 0), tmp, lru_size=2) as d:
+            thread = threading.Thread(target=d.serve_forever, daemon=True)
+            thread.start()
+            host, port = d.server_address[:2]
+
+            def fetch(path: str, headers: dict | None = None):
+                request = urllib.request.Request(
+                    f"http://{host}:{port}{path}", headers=headers or {}
+                )
+                try:
+                    with urllib.request.urlopen(request) as response:
+                        return response.status, dict(response.headers), response.read()
+                except urllib.error.HTTPError as e:
+                    return e.code, dict(e.headers), e.read()
+
+            yield d, fetch
+
+            d.shutdown()
+            thread.join()
+
+
+def test_index(dashboard: tuple[server.Dashboard, Fetch]) -> None:
+    """Confirm dashboard html page is served."""
+    _, fetch = dashboard
+    status, headers, body = fetch("/")
+    assert status == 200
+    assert headers["Content-Type"].startswith("text/html")
+    assert b"Plotly" in body
+
+
+def test_functions(dashboard: tuple[server.Dashboard, Fetch]) -> None:
+    """Confirm function names are listed."""
+    _, fetch = dashboard
+    status, _, body = fetch("/api/functions")
+    assert status == 200
+    assert orjson.loads(body) == {"items": ["function"]}
+
+
+def test_runs_pagination(dashboard: tuple[server.Dashboard, Fetch]) -> None:
+    """Confirm runs are paginated."""
+    _, fetch = dashboard
+    _, _, body = fetch("/api/runs?limit=2")
+    page = orjson.loads(body)
+    assert [j["git_sha"] for j in page["items"]] == ["sha1", "sha2"]
+    assert page["next"] == 2
+
+    _, _, body = fetch(f"/api/runs?limit=2&offset={page['next']}")
+    page = orjson.loads(body)
+    assert [j["git_sha"] for j in page["items"]] == ["sha3"]
+    assert page["next"] is None
+
+
+def test_history_sha_range(dashboard: tuple[server.Dashboard, Fetch]) -> None:
+    """Confirm history is filtered by sha range, and decoded runs are cached."""
+    d, fetch = dashboard
+    status, _, body = fetch("/api/history?function=function&min_sha=sha2&max_sha=sha3")
+    assert status == 200
+    items = orjson.loads(body)["items"]
+    assert [j["run"]["git_sha"] for j in items] == ["sha2", "sha3"]
+    assert items[0]["size"] == [8], "Expected summarized input sizes."
+    assert len(items[0]["cpu_time"]) == 1, "Expected mean per input size."
+    assert len(items[0]["ns_per_element"]) == 1, "Expected time per element."
+    assert len(items[0]["throughput"]) == 1, "Expected throughput."
+
+    fetch("/api/history?function=function&min_sha=sha3")
+    info = d.load_benchmark.cache_info()  # type: ignore[attr-defined]
+    assert info.currsize == 2, "Expected bounded lru of decoded runs."
+    assert info.hits >= 1, "Expected decoded runs to be reused."
+
+
+def test_etag(dashboard: tuple[server.Dashboard, Fetch]) -> None:
+    """Confirm unchanged resources respond with 304 Not Modified."""
+    _, fetch = dashboard
+    status, headers, _ = fetch("/api/history")
+    assert status == 200
+    etag: str = headers["ETag"]
+
+    status, _, body = fetch("/api/history", {"If-None-Match": etag})
+    assert status == 304, "Expected not modified response."
+    assert body == b""
+
+    _, headers, _ = fetch("/api/history?limit=1")
+    assert headers["ETag"] != etag, "Expected distinct etag per resource."
+
+
+@pytest.mark.parametrize(
+    ["path", "code"],
+    [
+        ("/missing", 404),
+        ("/api/runs?limit=abc", 400),
+        ("/api/runs?offset=-1", 400),
+        ("/api/runs?min_date=notadate", 400),
+    ],
+)
+def test_errors(
+    path: str, code: int, dashboard: tuple[server.Dashboard, Fetch]
+) -> None:
+    """Confirm invalid requests respond with an error status."""
+    _, fetch = dashboard
+    status, _, _ = fetch(path)
+    assert status == code
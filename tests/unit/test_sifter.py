@@ -94,3 +94,62 @@ def test_collect(mock_scandir: MagicMock, mock_get: MagicMock):
         assert a == b, "Unexpected DirEntry."
 
     assert len(set(result).difference(set(expected))) == 0, "expected identical output."
+
+
+def test_builder_proxy() -> None:
+    """Confirm chained builder calls are forwarded, recorded, or ignored."""
+    builder = MagicMock()
+    calls: list = []
+    proxy = sifter.BuilderProxy(builder, frozenset({"range"}), calls)
+    assert proxy.arg(8).range(2, 8).repetitions(3) is proxy
+
+    builder.arg.assert_called_once_with(8)
+    builder.repetitions.assert_called_once_with(3)
+    builder.range.assert_not_called()
+    assert calls == [
+        ("arg", (8,), {}),
+        ("range", (2, 8), {}),
+        ("repetitions", (3,), {}),
+    ]
+    assert sifter.BuilderProxy().arg(8).anything() is not None, "Expected discarded."
+
+
+def test_hook_registration() -> None:
+    """Confirm hooks nest, intercepting registrations only within context."""
+    registered: list[str] = []
+    order: list[str] = []
+
+    def hook(label: str):
+        def inner(name, func, register):
+            order.append(label)
+            return register(f"{name}-{label}", func)
+
+        return inner
+
+    with patch.object(
+        sifter._benchmark,  # pylint: disable=W0212
+        "RegisterBenchmark",
+        lambda name, func: registered.append(name),
+    ):
+        with sifter.hook_registration(hook("a")), sifter.hook_registration(hook("b")):
+            sifter._benchmark.RegisterBenchmark("bench", print)  # pylint: disable=W0212
+        sifter._benchmark.RegisterBenchmark("other", print)  # pylint: disable=W0212
+
+    assert order == ["b", "a"], "Expected inner hook first."
+    assert registered == ["bench-b-a", "other"]
+
+
+def test_select_registration() -> None:
+    """Confirm only selected benchmarks are registered, others are discarded."""
+    registered: list[str] = []
+    with patch.object(
+        sifter._benchmark,  # pylint: disable=W0212
+        "RegisterBenchmark",
+        lambda name, func: registered.append(name) or MagicMock(),
+    ):
+        with sifter.select_registration(["keep"]):
+            for name in ("keep", "drop"):
+                builder = sifter._benchmark.RegisterBenchmark(name, print)  # pylint: disable=W0212
+                builder.range(2, 8).repetitions(2)
+
+    assert registered == ["keep"]
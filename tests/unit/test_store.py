@@ -0,0 +1,205 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Unit test store module."""
+
+import dataclasses
+import os
+import tempfile
+from collections.abc import Iterator
+from datetime import UTC, datetime
+
+import numpy as np
+import orjson
+import pytest
+
+from BenchMatcha import store
+from BenchMatcha.metrics import compute_metrics
+from BenchMatcha.noise import NoiseProfile
+from BenchMatcha.handlers import load
+from BenchMatcha.structure import BenchmarkContext
+
+
+@pytest.fixture
+def context(mock_data: str) -> BenchmarkContext:
+    """Sample benchmark context."""
+    return BenchmarkContext.from_json(load(mock_data))
+
+
+@pytest.fixture
+def result_store() -> Iterator[store.ResultStore]:
+    """Temporary result store."""
+    with tempfile.TemporaryDirectory() as tmp:
+        with store.open_store(tmp) as s:
+            yield s
+
+
+def _variant(
+    context: BenchmarkContext,
+    day: int,
+    host: str = "host",
+    function: str = "function",
+) -> BenchmarkContext:
+    bench = dataclasses.replace(context.benchmarks[0], function=function)
+    return dataclasses.replace(
+        context,
+        date=datetime(2025, 7, day, 12, tzinfo=UTC),
+        host_name=host,
+        git_sha=f"sha{day}",
+        benchmarks=[bench],
+    )
+
+
+def test_roundtrip(result_store: store.ResultStore, context: BenchmarkContext) -> None:
+    """Confirm a stored benchmark run is loaded back identically."""
+    run_id: str = result_store.add(context)
+    result = result_store.load(run_id)
+
+    assert result.date == context.date, "Unexpected date."
+    assert result.caches == context.caches, "Unexpected caches."
+    assert result.git_sha == context.git_sha, "Unexpected git sha."
+    assert len(result.benchmarks) == 1, "Expected a single benchmark."
+    a, b = result.benchmarks[0], context.benchmarks[0]
+    assert a.complexity == b.complexity, "Unexpected complexity information."
+    for key in ("size", "iterations", "real_time", "cpu_time", "status"):
+        assert np.array_equal(getattr(a, key), getattr(b, key)), f"Unexpected {key}."
+
+
+def test_incremental(
+    result_store: store.ResultStore,
+    context: BenchmarkContext,
+) -> None:
+    """Confirm benchmarks are added to an existing run, retaining its metadata."""
+    first = _variant(context, 1, function="first")
+    second = _variant(context, 2, function="second")
+    run_id: str = result_store.add(first)
+    assert result_store.add(second, run_id) == run_id
+    assert result_store.add(first, run_id) == run_id, "Expected replacement."
+
+    assert result_store.completed(run_id) == ["second", "first"]
+    result = result_store.load(run_id)
+    assert result.git_sha == first.git_sha, "Expected retained run metadata."
+    assert len(result_store.runs()) == 1
+    assert result_store.completed("missing") == []
+
+
+def test_load_unknown_run(result_store: store.ResultStore) -> None:
+    """Confirm unknown run ids raise a KeyError."""
+    with pytest.raises(KeyError):
+        result_store.load("missing")
+
+
+def test_noise(result_store: store.ResultStore, context: BenchmarkContext) -> None:
+    """Confirm system noise samples are stored alongside a run."""
+    run_id: str = result_store.add(context)
+    assert result_store.noise(run_id) is None, "Expected no noise samples."
+
+    samples = np.asarray([[1.0, 0.5, 1.0, np.nan], [2.0, 0.6, 1.5, 2400.0]])
+    profile = NoiseProfile(samples, {"function": (0.5, 1.5)})
+    result_store.add_noise(run_id, profile)
+    result = result_store.noise(run_id)
+    assert result is not None
+    np.testing.assert_array_equal(result.samples, samples)
+    assert result.intervals == profile.intervals
+
+
+@pytest.mark.parametrize(
+    ["query", "expected"],
+    [
+        (store.Query(), ["sha1", "sha2", "sha3"]),
+        (store.Query(host="other"), ["sha2"]),
+        (store.Query(os="missing"), []),
+        (store.Query(function="other"), ["sha3"]),
+        (store.Query(min_date="2025-07-02"), ["sha2", "sha3"]),
+        (store.Query(max_date="2025-07-02"), ["sha1", "sha2"]),
+        (store.Query(min_date="2025-07-02", max_date="2025-07-02"), ["sha2"]),
+        (store.Query(max_date="2025-07-02T00:00:00+00:00"), ["sha1"]),
+    ],
+)
+def test_query(
+    query: store.Query,
+    expected: list[str],
+    result_store: store.ResultStore,
+    context: BenchmarkContext,
+) -> None:
+    """Confirm runs are filtered by query."""
+    result_store.add(_variant(context, 1))
+    result_store.add(_variant(context, 2, host="other"))
+    result_store.add(_variant(context, 3, function="other"))
+
+    runs = result_store.runs(query)
+    assert [j.git_sha for j in runs] == expected, "Unexpected filtered runs."
+
+    history = list(result_store.history(query))
+    assert [j.git_sha for j, _ in history] == sorted(
+        expected, key=lambda x: (x == "sha3", x)
+    ), "Expected history ordered by function and date."
+
+
+def test_functions(result_store: store.ResultStore, context: BenchmarkContext) -> None:
+    """Confirm distinct function names are listed."""
+    result_store.add(_variant(context, 1))
+    result_store.add(_variant(context, 2, function="other"))
+    assert result_store.functions() == ["function", "other"]
+    assert result_store.functions(store.Query(max_date="2025-07-01")) == ["function"]
+
+
+def test_metrics(result_store: store.ResultStore, context: BenchmarkContext) -> None:
+    """Confirm per size metrics are stored alongside a run."""
+    variant = _variant(context, 1)
+    expected = compute_metrics(variant.benchmarks)[0].summary()
+    run_id = result_store.add(variant, metrics=compute_metrics(variant.benchmarks))
+    result_store.add(_variant(context, 2))
+
+    (info, function, result), *rest = result_store.metrics()
+    assert not rest, "Expected metrics of a single run."
+    assert info.run_id == run_id
+    assert function == "function"
+    for key, value in expected.items():
+        np.testing.assert_allclose(result[key], value, err_msg=key)
+
+
+def test_migrate_legacy_json(context: BenchmarkContext) -> None:
+    """Confirm legacy json database is imported on open."""
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy: str = os.path.join(tmp, "benchmark.json")
+        with open(legacy, "bw") as f:
+            f.write(
+                orjson.dumps(
+                    [context.to_json()],
+                    option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_SERIALIZE_DATACLASS,
+                )
+            )
+
+        with store.open_store(tmp) as s:
+            runs = s.runs()
+
+        assert len(runs) == 1, "Expected legacy run to be imported."
+        assert not os.path.exists(legacy), "Expected legacy database to be moved."
+        assert os.path.exists(f"{legacy}.migrated")
@@ -32,6 +32,7 @@
 from collections.abc import Callable, Iterator
 from datetime import UTC, datetime
 
+import numpy as np
 import pytest
 
 from BenchMatcha import errors, structure
@@ -204,12 +205,72 @@ def test_parse_full_json_data(
     assert result.aslr_enabled is False
     assert isinstance(result.python_version, str), "Expected a string"
     assert isinstance(result.git_sha, str), "Expected a string"
+    assert isinstance(result.os_name, str), "Expected a string"
 
     assert isinstance(result.benchmarks, list), "Expected benchmarks to be a list."
     assert len(result.benchmarks) == 1
     _check_complexity_info(result.benchmarks[0].complexity, complexity_info)
 
 
+def test_benchmark_array_outliers(mock_data: str) -> None:
+    """Confirm outlier repetitions are flagged on a timing attribute."""
+    data = load(mock_data)
+    benchmark = structure.BenchmarkContext.from_json(data).benchmarks[0]
+    benchmark.cpu_time = np.asarray([[423.2, 428.0, 425.1, 424.7, 4250.0]])
+
+    result = benchmark.outliers("cpu_time")
+    assert result.shape == benchmark.cpu_time.shape, "Expected mask per repetition."
+    assert result[0, -1], "Expected flagged outlier."
+    assert result.sum() == 1, "Expected a single outlier."
+
+
+def test_benchmark_array_threads(mock_data: str) -> None:
+    """Confirm thread count per measurement is parsed, defaulting to one."""
+    data = load(mock_data)
+    benchmark = structure.BenchmarkContext.from_json(data).benchmarks[0]
+    assert benchmark.threads.shape == benchmark.cpu_time.shape
+    assert (benchmark.threads == 1).all(), "Expected single threaded measurements."
+
+    default = structure.BenchmarkArray(
+        function="test",
+        unit="ns",
+        size=benchmark.size,
+        iterations=benchmark.iterations,
+        real_time=benchmark.real_time,
+        cpu_time=benchmark.cpu_time,
+        complexity=benchmark.complexity,
+    )
+    assert np.array_equal(default.threads, benchmark.threads), "Expected default."
+
+
+@pytest.mark.parametrize(
+    "message, expected",
+    [
+        ("Timed out after 1s", structure.Status.TIMED_OUT),
+        ("Out of memory", structure.Status.OUT_OF_MEMORY),
+        ("custom error", structure.Status.FAILED),
+    ],
+)
+def test_benchmark_array_status(
+    mock_data: str,
+    message: str,
+    expected: structure.Status,
+) -> None:
+    """Confirm error runs are parsed into the validity mask, without timings."""
+    data = load(mock_data)
+    runs = [j for j in data["benchmarks"] if j["run_type"] == "iteration"]
+    runs[-1].update(error_occurred=True, error_message=message)
+    benchmark = structure.BenchmarkContext.from_json(data).benchmarks[0]
+
+    assert benchmark.status.shape == benchmark.real_time.shape
+    assert benchmark.status.dtype == np.int8
+    assert benchmark.status[-1, -1] == expected, "Expected error status."
+    assert np.isnan(benchmark.real_time[-1, -1]), "Expected no timing of error run."
+    assert np.isnan(benchmark.cpu_time[-1, -1]), "Expected no timing of error run."
+    assert benchmark.valid.sum() == benchmark.valid.size - 1, "Expected one invalid."
+    assert not benchmark.valid[-1, -1], "Expected invalid error run."
+
+
 def test_convert_benchmark_context_to_json(mock_data: str) -> None:
     """Test we convert dataclass into dictionary json like objects."""
     data = load(mock_data)
@@ -62,6 +62,51 @@ def test_simple_stats() -> None:
     assert np.all(result[1] == np.asarray([1, 1, 1]))
 
 
+def test_robust_stats() -> None:
+    """Test median and scaled MAD resist a single outlier."""
+    x = np.asarray([[1.0, 2.0, 3.0, 2.0, 100.0], [2.0, 2.0, 2.0, 2.0, 2.0]])
+    median, mad = utils._robust_stats(x)
+    assert np.allclose(median, [2.0, 2.0]), "Expected median."
+    assert np.allclose(mad, [utils._MAD_SCALE, 0.0]), "Expected scaled MAD."
+
+
+@pytest.mark.parametrize(
+    ["x", "expected"],
+    [
+        ([[1.0, 1.1, 0.9, 1.0, 9.0]], [[False, False, False, False, True]]),
+        ([[1.0, 1.0, 1.0, 1.0, 5.0]], [[False, False, False, False, True]]),
+        ([[2.0, 2.0, 2.0, 2.0, 2.0]], [[False, False, False, False, False]]),
+        ([[1.0, 2.0, 3.0, 4.0, 5.0]], [[False, False, False, False, False]]),
+        ([[1.0, np.nan, 1.1, 0.9, 7.0]], [[False, False, False, False, True]]),
+    ],
+)
+def test_outlier_mask(x: list, expected: list) -> None:
+    """Test outliers are flagged along repetition axis."""
+    result = utils.outlier_mask(np.asarray(x))
+    assert np.array_equal(result, np.asarray(expected)), "Unexpected outlier mask."
+
+
+@pytest.mark.parametrize(["threshold"], [(2,), (3,), (50,), (999,), (1000,), (5000,)])
+def test_lttb(threshold: int) -> None:
+    """Test largest triangle three buckets downsampling."""
+    x = np.arange(1000)
+    y = np.sin(x / 25.0)
+    result = utils.lttb(x, y, threshold)
+
+    expected: int = threshold if 3 <= threshold < 1000 else 1000
+    assert result.size == expected, "Unexpected number of retained points."
+    assert result[0] == 0 and result[-1] == 999, "Expected endpoints retained."
+    assert np.all(np.diff(result) > 0), "Expected sorted, unique indices."
+
+
+def test_lttb_retains_extrema() -> None:
+    """Confirm a spike is retained after downsampling."""
+    x = np.arange(1000)
+    y = np.zeros(1000)
+    y[517] = 10.0
+    assert 517 in utils.lttb(x, y, 20), "Expected spike to be retained."
+
+
 @pytest.mark.parametrize(
     ["value", "expected"],
     [
@@ -72,6 +117,10 @@ def test_simple_stats() -> None:
         ("oLogN", "lgN"),
         ("oNLogN", "NlgN"),
         ("oLambda", "f(N)"),
+        ("oSqrtN", "sqrtN"),
+        ("oNLogSquaredN", "Nlg^2N"),
+        ("oNPowerK", "N^k"),
+        ("o2N", "2^N"),
     ],
 )
 def test_bigo_enum_get(value: str, expected: str) -> None:
@@ -90,6 +139,7 @@ def test_bigo_enum_get(value: str, expected: str) -> None:
         ("lgN", "oLogN"),
         ("NlgN", "oNLogN"),
         ("f(N)", "oLambda"),
+        ("N^k", "oNPowerK"),
     ],
 )
 def test_bigo_enum_back(value: str, expected: str) -> None:
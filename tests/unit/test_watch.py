@@ -0,0 +1,189 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Test watch mode module."""
+
+import os
+import sys
+from collections.abc import Iterator
+
+import numpy as np
+import pytest
+
+from BenchMatcha import watch
+from BenchMatcha.structure import BenchmarkArray, ComplexityInfo
+
+
+_BENCH: str = """
+import google_benchmark as gbench
+
+from helper_watched import cost
+
+
+@gbench.register
+@gbench.option.range(2, 8)
+def bench_watched(state):
+    while state:
+        cost(state.range(0))
+"""
+
+
+def _benchmark(size: list[int], value: float) -> BenchmarkArray:
+    shape = (len(size), 3)
+
+    return BenchmarkArray(
+        function="test",
+        unit="ns",
+        size=np.asarray(size),
+        iterations=np.ones(shape, dtype=np.int64),
+        real_time=np.full(shape, value) + np.arange(3) * 1e-3 * value,
+        cpu_time=np.full(shape, value) + np.arange(3) * 1e-3 * value,
+        complexity=ComplexityInfo("test", "N", 1.0, 1.0),
+    )
+
+
+@pytest.fixture
+def session(tmp_path, monkeypatch) -> Iterator[watch.WatchSession]:
+    """Watch session of a benchmark file importing a helper module."""
+    with open(os.path.join(tmp_path, "bench_watched.py"), "w") as f:
+        f.write(_BENCH)
+    with open(os.path.join(tmp_path, "helper_watched.py"), "w") as f:
+        f.write("def cost(n):\n    return n\n")
+    monkeypatch.setattr(sys, "dont_write_bytecode", False)
+    monkeypatch.setattr(sys, "path", list(sys.path))
+
+    yield watch.WatchSession([str(tmp_path)])
+
+    for name in ("bench_watched", "helper_watched"):
+        sys.modules.pop(name, None)
+
+
+def test_record_replay(monkeypatch) -> None:
+    """Test registrations are recorded without registering, and replayed."""
+    registered: list[tuple] = []
+
+    class Builder:
+        """Stub benchmark builder."""
+
+        def __getattr__(self, name):
+            return lambda *args: registered.append((name, args)) or self
+
+    def register(name, func):
+        registered.append((name, func))
+        return Builder()
+
+    monkeypatch.setattr(watch._benchmark, "RegisterBenchmark", register)
+    with watch.record_registrations() as recorded:
+        watch._benchmark.RegisterBenchmark("bench", len).range(2, 8).repetitions(3)
+    assert not registered, "Expected no registration while recording."
+    assert watch._benchmark.RegisterBenchmark is register, "Expected restored."
+    assert recorded[0].calls == [("range", (2, 8), {}), ("repetitions", (3,), {})]
+
+    watch.replay(recorded)
+    assert registered == [("bench", len), ("range", (2, 8)), ("repetitions", (3,))]
+
+
+def test_polling_watcher(tmp_path) -> None:
+    """Test changed, created and deleted python files are detected."""
+    path: str = os.path.join(tmp_path, "bench_a.py")
+    with open(path, "w") as f:
+        f.write("a = 1\n")
+    watcher = watch.PollingWatcher([str(tmp_path)], interval=0.01)
+    assert watcher.changes(timeout=0.0) == set()
+
+    with open(path, "w") as f:
+        f.write("a = 22\n")
+    with open(os.path.join(tmp_path, "notes.txt"), "w") as f:
+        f.write("ignored")
+    assert watcher.changes(timeout=1.0) == {path}
+
+    os.remove(path)
+    assert watcher.changes(timeout=1.0) == {path}
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Requires inotify.")
+def test_inotify_watcher(tmp_path) -> None:
+    """Test changed python files are detected with inotify."""
+    watcher = watch.open_watcher([str(tmp_path)])
+    assert isinstance(watcher, watch.InotifyWatcher)
+    try:
+        assert watcher.changes(timeout=0.0) == set()
+        path: str = os.path.join(tmp_path, "bench_a.py")
+        with open(path, "w") as f:
+            f.write("a = 1\n")
+        assert watcher.changes(timeout=1.0) == {path}
+    finally:
+        watcher.close()
+
+
+def test_reload(session: watch.WatchSession) -> None:
+    """Test only changed modules are re-imported, or all on changed helpers."""
+    bench: str = os.path.join(session.paths[0], "bench_watched.py")
+    helper: str = os.path.join(session.paths[0], "helper_watched.py")
+    assert session.reload() == ["bench_watched"]
+    module = sys.modules["bench_watched"]
+    assert session.reload({os.path.join(session.paths[0], "other.py")}) == []
+    assert sys.modules["bench_watched"] is module, "Expected no re-import."
+
+    assert session.reload({bench}) == ["bench_watched"]
+    assert sys.modules["bench_watched"] is not module, "Expected re-import."
+
+    with open(helper, "w") as f:
+        f.write("def cost(n):\n    return n * 2\n")
+    assert session.reload({helper}) == ["bench_watched"]
+    func = session.registrations[bench][0].func
+    assert func.__globals__["cost"](2) == 4, "Expected updated helper module."
+
+    assert sys.dont_write_bytecode is False, "Expected restored global state."
+    assert not os.path.exists(os.path.join(session.paths[0], "__pycache__"))
+
+
+def test_reload_failure(session: watch.WatchSession, caplog) -> None:
+    """Test a module failing to import registers no benchmarks."""
+    bench: str = os.path.join(session.paths[0], "bench_watched.py")
+    session.reload()
+    with open(bench, "w") as f:
+        f.write("raise ValueError('broken')\n")
+    assert session.reload({bench}) == []
+    assert "Failed to import" in caplog.text
+    assert session.run([]) is None
+
+
+def test_diff_lines() -> None:
+    """Test differences are reported per function and input size."""
+    lines: list[str] = watch.diff_lines({}, [_benchmark([8, 16], 1.0)])
+    assert lines[0] == "test\tnew"
+    assert len(lines) == 3
+
+    previous = {"test": _benchmark([8, 16], 1.0)}
+    lines = watch.diff_lines(previous, [_benchmark([8, 16, 32], 2.0)])
+    assert lines[0].startswith("test\tx2.000\t")
+    assert lines[0].endswith("regressed")
+    assert lines[1].endswith("(+100.0%)")
+    assert "->" not in lines[3], "Expected no difference of a new input size."
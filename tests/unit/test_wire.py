@@ -0,0 +1,121 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Test compact binary encoding and message framing module."""
+
+import dataclasses
+import socket
+
+import numpy as np
+import orjson
+import pytest
+
+from BenchMatcha import wire
+from BenchMatcha.handlers import load
+from BenchMatcha.structure import BenchmarkContext
+
+
+@pytest.fixture
+def context(mock_data: str) -> BenchmarkContext:
+    """Sample benchmark context."""
+    return BenchmarkContext.from_json(load(mock_data))
+
+
+def test_roundtrip(context: BenchmarkContext) -> None:
+    """Test contexts (with metadata and arrays) are decoded as encoded."""
+    result = wire.decode_context_bytes(wire.encode_context(context))
+    for name in ("host_name", "num_cpus", "mhz_per_cpu", "caches", "git_sha", "date"):
+        assert getattr(result, name) == getattr(context, name), name
+
+    assert len(result.benchmarks) == len(context.benchmarks)
+    for a, b in zip(result.benchmarks, context.benchmarks, strict=True):
+        assert (a.function, a.unit, a.complexity) == (b.function, b.unit, b.complexity)
+        for name in (
+            "size",
+            "iterations",
+            "real_time",
+            "cpu_time",
+            "threads",
+            "status",
+        ):
+            np.testing.assert_array_equal(getattr(a, name), getattr(b, name))
+            assert getattr(a, name).dtype == getattr(b, name).dtype
+            assert getattr(a, name).flags.writeable
+
+
+def test_compact(context: BenchmarkContext) -> None:
+    """Test encoding is smaller than json, for larger arrays."""
+    bench = context.benchmarks[0]
+    shape = (64, 10)
+    rng = np.random.default_rng(0)
+    larger = dataclasses.replace(
+        context,
+        benchmarks=[
+            dataclasses.replace(
+                bench,
+                size=np.arange(shape[0]),
+                iterations=np.ones(shape, dtype=np.int64),
+                real_time=rng.random(shape),
+                cpu_time=rng.random(shape),
+                threads=np.ones(shape, dtype=np.int64),
+            )
+        ],
+    )
+    text: bytes = orjson.dumps(
+        larger.to_json(),
+        option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_SERIALIZE_DATACLASS,
+    )
+    assert len(wire.encode_context(larger)) < len(text) / 2
+
+
+def test_invalid() -> None:
+    """Test invalid data raises a ValueError."""
+    with pytest.raises(ValueError):
+        wire.decode_context_bytes(b"not compressed")
+    with pytest.raises(ValueError):
+        wire.decode_context_bytes(wire.zlib.compress(b"XXXX\0\0\0\0"))
+
+
+def test_framing(context: BenchmarkContext) -> None:
+    """Test framed messages are received as sent, over a socket."""
+    a, b = socket.socketpair()
+    with a, b:
+        wire.send_json(a, {"type": "ready"})
+        wire.send(a, wire.CONTEXT, wire.encode_context(context))
+        assert wire.receive_json(b) == {"type": "ready"}
+        kind, payload = wire.receive(b)
+        assert kind == wire.CONTEXT
+        assert wire.decode_context_bytes(payload).host_name == context.host_name
+
+        wire.send(a, wire.CONTEXT, b"")
+        with pytest.raises(ValueError):
+            wire.receive_json(b)
+        a.close()
+        with pytest.raises(ConnectionError):
+            wire.receive(b)
@@ -0,0 +1,90 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2025, Spill-Tea
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Test benchmark (subprocess) worker module."""
+
+import json
+import os
+
+import pytest
+
+from BenchMatcha import worker
+
+
+_BENCH: str = """
+import google_benchmark as gbench
+
+
+@gbench.register
+@gbench.option.range(2, 8)
+def bench_one(state):
+    while state:
+        sum(range(state.range(0)))
+
+
+@gbench.register
+@gbench.option.range(2, 8)
+def bench_two(state):
+    while state:
+        sum(range(state.range(0)))
+"""
+
+
+@pytest.fixture
+def bench(tmp_path) -> str:
+    """Benchmark file path."""
+    path: str = os.path.join(tmp_path, "bench_worker.py")
+    with open(path, "w") as f:
+        f.write(_BENCH)
+
+    return path
+
+
+def test_list_functions(bench: str) -> None:
+    """Test benchmark functions are listed as selected by a user filter."""
+    assert worker.list_functions([bench], []) == ["bench_one", "bench_two"]
+    assert worker.list_functions([bench], ["--benchmark_filter=two"]) == ["bench_two"]
+
+
+def test_run_worker(bench: str, tmp_path) -> None:
+    """Test only selected benchmark functions are run, retaining any user filter."""
+    output: str = os.path.join(tmp_path, "out.json")
+    argv: list[str] = ["--benchmark_dry_run", "--benchmark_filter=/8"]
+    assert worker.run_worker(str(tmp_path), [bench], ["bench_two"], argv, output)
+
+    with open(output, encoding="utf-8") as f:
+        names: list[str] = [j["name"] for j in json.load(f)["benchmarks"]]
+    assert names == ["bench_two/8"]
+
+
+def test_run_worker_failed(tmp_path) -> None:
+    """Test a failed benchmark subprocess is reported."""
+    output: str = os.path.join(tmp_path, "out.json")
+    missing: str = os.path.join(tmp_path, "missing.py")
+    assert not worker.run_worker(str(tmp_path), [missing], [], [], output)